@@ -1,4 +1,23 @@
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+DEFAULT_FPT_API_BASE_URL = "https://mkp-api.fptcloud.com"
+
+# Local HTTP API of the daemon mode (`main.py --daemon`)
+DEFAULT_DAEMON_HOST = "127.0.0.1"
+DEFAULT_DAEMON_PORT = 8787
+
+
+def get_fpt_api_base_url() -> str:
+    """
+    Base URL of the FPT Cloud chat completions and embeddings endpoints.
+
+    Set the FPT_API_BASE_URL environment variable to use another deployment, e.g. the local mock server of
+    `benchmarks/mock_fpt_server.py` for load tests.
+    """
+    return os.getenv("FPT_API_BASE_URL", DEFAULT_FPT_API_BASE_URL).rstrip("/")
+
 
 @dataclass
 class GuardrailsConfig:
@@ -14,4 +33,101 @@ class GuardrailsConfig:
     MAX_ARTICLES_READ: int = 10
 
     # Generation node limit
-    MAX_DOCUMENTS_TO_LLM: int = 10
\ No newline at end of file
+    MAX_DOCUMENTS_TO_LLM: int = 10
+
+    # Generation token budget
+    MAX_INPUT_TOKENS: int = 12000
+    CHUNK_TOKENS: int = 4000
+    MAX_CHUNK_SUMMARY_WORKERS: int = 8
+
+    # Per-document branches (scoring, segment generation) running at the same time
+    MAX_PARALLEL_BRANCHES: int = 16
+
+    # Streaming mode: bounded queues between stages and micro-batches of deduplication and embeddings
+    STREAM_QUEUE_SIZE: int = 256
+    STREAM_BATCH_SIZE: int = 32
+    STREAM_BATCH_WAIT_SECONDS: float = 0.5
+
+
+@dataclass
+class SourcesConfig:
+    '''Sources scraped by a run, and how often each one is refreshed'''
+
+    # Sources of a run, by name (scrapers of `services/scrapers/registry.py` and "arXiv"). None for all of them
+    ENABLED_SOURCES: List[str] | None = None
+
+    # Hours between two scrapes of a source. Within its interval, a source is not scraped again: the articles of
+    # its last scrape are reused from the cache. Sources not listed are scraped on every run
+    REFRESH_INTERVAL_HOURS: Dict[str, float] = field(default_factory=lambda: {
+        "arXiv": 1,
+        "GoogleResearch": 6,
+        "HuggingfaceBlog": 6,
+        "MITNews": 6,
+        "NVIDIADevBlog": 6,
+        "OpenAINews": 6,
+        "NeuronDaily": 24,
+        "TLDRNews": 24,
+        "TechRepublic": 24,  # Selenium, the slowest source
+    })
+
+    # Last scrape of each source
+    CACHE_DIR: str = os.path.join("FCI_NewsAgents", "workflow_output", "source_cache")
+
+
+@dataclass
+class DigestConfig:
+    '''Weekly and monthly digests, built from the documents stored by the daily runs (`workflows/digest.py`)'''
+
+    # Days covered by each digest period, ending on the digest date
+    PERIOD_DAYS: Dict[str, int] = field(default_factory=lambda: {"weekly": 7, "monthly": 30})
+
+    # Documents of the digest, among the stored ones that have a report segment
+    MAX_PAPERS: int = 5
+    MAX_ARTICLES: int = 10
+    SCORE_THRESHOLD: float = 4
+
+
+@dataclass
+class DedupConfig:
+    '''URL deduplication store (`services/article_url_cache`)'''
+
+    # Answer lookups of URLs that are definitely not stored from an in-memory counting Bloom filter, persisted next to
+    # the database, instead of querying SQLite. Almost every URL checked is new
+    URL_FILTER: bool = True
+    URL_FILTER_ERROR_RATE: float = 0.01
+
+    # Pragmas of every connection to the database (see `database.py`). In WAL mode, synchronous=NORMAL only syncs
+    # the log at checkpoints instead of on every commit: a power loss can lose the last inserts, never corrupt the file
+    JOURNAL_MODE: str = "WAL"
+    SYNCHRONOUS: str = "NORMAL"
+    BUSY_TIMEOUT_MS: int = 5000
+    CACHE_SIZE_KIB: int = 16 * 1024
+    MMAP_SIZE_BYTES: int = 64 * 1024 * 1024
+    TEMP_STORE: str = "MEMORY"
+    # Lets the purge give the pages of deleted rows back to the file system. Only applies to new databases
+    AUTO_VACUUM: str = "INCREMENTAL"
+
+    # Retention (see `cleanup.py`): days a URL is kept after its scrape date, by default and by source (the `source`
+    # of the documents, e.g. "TLDR News"). A URL that is purged is deemed new again if it is scraped later
+    RETENTION_DAYS: int = 7
+    SOURCE_RETENTION_DAYS: Dict[str, int] = field(default_factory=dict)
+
+    # Expired rows are deleted by batches, each in its own short transaction, so that the purge never holds the write
+    # lock for long. It runs in the background at most once per interval and process
+    PURGE_BATCH_SIZE: int = 500
+    PURGE_INTERVAL_MINUTES: float = 60
+    # Free pages given back after each purge
+    VACUUM_PAGES: int = 1000
+
+    # Backend of the store (see `store.py`): "sqlite" (a local database), "redis" (any server speaking the Redis
+    # protocol, with URLs expiring after their retention window) or "sharded" (a directory of hash-sharded entry files,
+    # e.g. on a network file system). Pipelines on several nodes sharing a "redis" or "sharded" backend never report
+    # the same article twice
+    BACKEND: str = field(default_factory=lambda: os.getenv("DEDUPLICATION_BACKEND", "sqlite"))
+    REDIS_URL: str = field(default_factory=lambda: os.getenv("DEDUPLICATION_REDIS_URL", "redis://127.0.0.1:6379/0"))
+    REDIS_KEY_PREFIX: str = "fci:url:"
+    # Commands sent per round trip by the batch operations
+    REDIS_PIPELINE_SIZE: int = 1000
+    # Directory of the sharded backend. Defaults to `<DEDUPLICATION_DB_PATH>.shards`
+    SHARDED_DIR: str | None = field(default_factory=lambda: os.getenv("DEDUPLICATION_SHARDED_DIR"))
+    SHARD_COUNT: int = 256
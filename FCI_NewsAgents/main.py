@@ -1,60 +1,130 @@
 import os
 import sys
-import time
 import argparse
+from datetime import date
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 sys.stdout.reconfigure(encoding="utf-8")
 sys.stderr.reconfigure(encoding="utf-8")
 
-from FCI_NewsAgents.services.scrapers.csai_scraper import scrape_papers
-from FCI_NewsAgents.services.scrapers.run_article_scrapers import scrape_articles
-from FCI_NewsAgents.utils.utils import (
-    convert_article_to_document,
-    convert_paper_to_document,
-)
-from FCI_NewsAgents.workflows.workflow_builder import workflow_execution
+# Only the modules of the selected mode are imported (see `benchmarks/import_time.py`):
+# LangGraph, the PDF backends and the scrapers are not needed by `--help`, `--dry-run` or `--trigger`
+from FCI_NewsAgents.core.config import DEFAULT_DAEMON_HOST, DEFAULT_DAEMON_PORT
+from FCI_NewsAgents.workflows.checkpointing import DEFAULT_RUNS_DIR
 
 
 parser = argparse.ArgumentParser(description="Run the FCI News Agents workflow.")
 parser.add_argument("--md-path", type=str, required=False, default=r"FCI_NewsAgents\workflow_output\md", help="Path to save markdown output files.")
 parser.add_argument("--pdf-path", type=str, required=False, default=r"FCI_NewsAgents\workflow_output\pdf", help="Path to save PDF output files.")
+parser.add_argument("--metrics-path", type=str, required=False, default=os.path.join("FCI_NewsAgents", "workflow_output", "metrics"), help="Folder to save the Prometheus textfile and the JSON run summary.")
+parser.add_argument("--trace-path", type=str, required=False, default=os.path.join("FCI_NewsAgents", "workflow_output", "traces"), help="Folder to save the OTLP/JSON trace of the run.")
+parser.add_argument("--metrics-port", type=int, required=False, default=None, help="If set, serve Prometheus metrics on this port during the run.")
+parser.add_argument("--metrics-host", type=str, required=False, default=DEFAULT_DAEMON_HOST, help="Interface of the metrics server, e.g. 0.0.0.0 to let other hosts scrape it.")
+parser.add_argument("--runs-path", type=str, required=False, default=DEFAULT_RUNS_DIR, help="Folder to save the stage outputs and checkpoints of the runs.")
+parser.add_argument("--resume", type=str, required=False, default=None, metavar="RUN_ID", help="Resume a failed run at the node that failed, without scraping again.")
+parser.add_argument("--streaming", action="store_true", help="Deduplicate, align and score documents while the scrapers are still running.")
+parser.add_argument("--daemon", action="store_true", help="Keep running, with warm clients and caches, and run the pipeline on schedule or on demand.")
+parser.add_argument("--schedule", type=str, action="append", default=[], metavar="HH:MM", help="Daemon mode: run the pipeline every day at this local time (repeatable).")
+parser.add_argument("--interval-minutes", type=float, required=False, default=None, help="Daemon mode: run the pipeline every N minutes.")
+parser.add_argument("--daemon-host", type=str, required=False, default=DEFAULT_DAEMON_HOST, help="Interface of the daemon's HTTP API.")
+parser.add_argument("--daemon-port", type=int, required=False, default=DEFAULT_DAEMON_PORT, help="Port of the daemon's HTTP API.")
+parser.add_argument("--sources", type=str, nargs="+", default=None, metavar="NAME", help="Sources to use (article scrapers and/or arXiv), instead of SourcesConfig.ENABLED_SOURCES.")
+parser.add_argument("--force-refresh", action="store_true", help="Scrape the selected sources even if their refresh interval has not elapsed.")
+parser.add_argument("--digest", type=str, choices=["weekly", "monthly"], default=None, help="Generate a digest from the documents stored by the daily runs, without scraping or scoring again, then exit.")
+parser.add_argument("--digest-date", type=date.fromisoformat, default=None, metavar="YYYY-MM-DD", help="Last day covered by the digest (default: today).")
+parser.add_argument("--dry-run", action="store_true", help="Print what a run would do (sources, mode, output folders), then exit.")
+parser.add_argument("--trigger", action="store_true", help="Ask the running daemon to start a run now (with --streaming, --resume, --sources or --force-refresh if given), then exit.")
 args = parser.parse_args()
 
 if __name__ == "__main__":
-    output_folder_md = args.md_path
-    output_folder_pdf = args.pdf_path
-
-
-    overall_start = time.time()
-
-    # Scrape articles (now parallel internally)
-    print("=" * 50)
-    print("SCRAPING ARTICLES")
-    print("=" * 50)
-    article_dicts = scrape_articles(parallel=True)
-    articles = [convert_article_to_document(a) for a in article_dicts]
-
-    # Scrape papers
-    print("\n" + "=" * 50)
-    print("SCRAPING PAPERS")
-    print("=" * 50)
-    paper_dicts = scrape_papers(max_results=50)
-    papers = [convert_paper_to_document(p) for p in paper_dicts]
-
-    print(f"\nTotal articles scraped: {len(articles)}")
-    print(f"Total papers scraped: {len(papers)}")
-
-    # Run workflow
-    print("\n" + "=" * 50)
-    print("RUNNING WORKFLOW")
-    print("=" * 50)
-    workflow_execution(
-        papers=papers, 
-        articles=articles, 
-        output_folder_md=output_folder_md,
-        output_folder_pdf=output_folder_pdf
-    )
-
-    total_time = time.time() - overall_start
-    print(f"\nTotal execution time of the workflow: {total_time:.2f}s")
+    from FCI_NewsAgents.services.scrapers.sources import resolve_sources
+
+    try:
+        sources = resolve_sources(args.sources) if args.sources is not None else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.dry_run:
+        from FCI_NewsAgents.core.config import SourcesConfig
+        from FCI_NewsAgents.services.scrapers.sources import plan_sources
+
+        mode = f"{args.digest} digest" if args.digest else "daemon" if args.daemon else "streaming" if args.streaming else "batch"
+        print(f"Mode: {mode}")
+        if args.digest:
+            from FCI_NewsAgents.workflows.digest import digest_period
+
+            start, end = digest_period(args.digest, args.digest_date or date.today())
+            print(f"Digest of the documents scraped from {start.isoformat()} to {end.isoformat()}, without scraping")
+        elif args.resume:
+            print(f"Resume run {args.resume} from {args.runs_path}, without scraping")
+        else:
+            plan = plan_sources(SourcesConfig(), sources, args.force_refresh)
+            for source in plan.due:
+                print(f"{source}: scrape")
+            for source in plan.cached:
+                print(f"{source}: reuse the cache, last scraped at {plan.last_scraped[source]:%Y-%m-%d %H:%M}")
+        print(f"Reports: {args.md_path} (Markdown), {args.pdf_path} (PDF)")
+        print(f"Runs: {args.runs_path}, metrics: {args.metrics_path}, traces: {args.trace_path}")
+        sys.exit(0)
+
+    if args.trigger:
+        from FCI_NewsAgents.workflows.daemon import trigger_run
+
+        status_code, answer = trigger_run(
+            args.daemon_host,
+            args.daemon_port,
+            streaming=args.streaming or None,
+            resume=args.resume,
+            sources=sources,
+            force_refresh=args.force_refresh,
+        )
+        print(f"Daemon answered {status_code}: {answer}")
+        sys.exit(0 if status_code == 202 else 1)
+
+    if args.digest:
+        from FCI_NewsAgents.workflows.digest import run_digest
+
+        run_digest(
+            args.digest,
+            output_folder_md=args.md_path,
+            output_folder_pdf=args.pdf_path,
+            end=args.digest_date,
+            runs_dir=args.runs_path,
+        )
+        sys.exit(0)
+
+    from FCI_NewsAgents.utils.metrics import start_metrics_server
+
+    if args.metrics_port is not None:
+        start_metrics_server(args.metrics_port, host=args.metrics_host)
+
+    if args.daemon:
+        from FCI_NewsAgents.workflows.daemon import NewsAgentsDaemon, Schedule
+
+        NewsAgentsDaemon(
+            output_folder_md=args.md_path,
+            output_folder_pdf=args.pdf_path,
+            metrics_path=args.metrics_path,
+            trace_path=args.trace_path,
+            runs_dir=args.runs_path,
+            schedule=Schedule(args.schedule, args.interval_minutes),
+            streaming=args.streaming,
+            host=args.daemon_host,
+            port=args.daemon_port,
+            sources=sources,
+        ).serve_forever()
+    else:
+        from FCI_NewsAgents.workflows.pipeline import run_pipeline
+
+        run_pipeline(
+            output_folder_md=args.md_path,
+            output_folder_pdf=args.pdf_path,
+            metrics_path=args.metrics_path,
+            trace_path=args.trace_path,
+            runs_dir=args.runs_path,
+            run_id=args.resume,
+            resume=args.resume is not None,
+            streaming=args.streaming,
+            sources=sources,
+            force_refresh=args.force_refresh,
+        )
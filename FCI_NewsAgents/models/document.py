@@ -1,5 +1,5 @@
 # models/document.py
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 from enum import Enum
 from typing import List, Literal
@@ -10,13 +10,16 @@ class ContentType(Enum):
     TWEET = "tweet" 
     ARTICLE = "article"
 
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class Document:
     """
     Input document schema.
 
     - The `Document` dataclass is frozen, so you have to create a new instance for copying.
     - A document is identified by its (canonical) URL, and `__eq__` and `__hash__` have been overridden accordingly.
+    - Instances have `__slots__` and no `__dict__`, to keep thousands of documents in memory. Stages annotate documents
+      in tables keyed by URL (e.g. `WorkflowState.document_scores`) instead of copying them, and only the selected
+      documents get their `score`, with `with_score`.
     """
     url: str
     """The URL of the document."""
@@ -35,6 +38,10 @@ class Document:
     score: float | None = None
     """Relevance score from guardrails"""
 
+    def with_score(self, score: float) -> "Document":
+        """The document with a score. The fields are shared, not copied"""
+        return self if self.score == score else replace(self, score=score)
+
     def __eq__(self, other):
         if not isinstance(other, Document):
             return False
@@ -0,0 +1,114 @@
+# models/document_batch.py
+from datetime import datetime, timezone
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from FCI_NewsAgents.models.document import Document
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _to_datetime64(value: datetime | None) -> np.datetime64:
+    """A date as a naive UTC `datetime64`, NaT if missing"""
+    value = _naive_utc(value)
+    return np.datetime64("NaT", "s") if value is None else np.datetime64(value, "s")
+
+
+class DocumentBatch:
+    """
+    Columnar view of a list of documents, for the filtering stages.
+
+    The fields the stages filter and rank on are NumPy arrays (one entry per document), so that date windows,
+    per-type counts and caps, and top-k ranking are array operations instead of loops over `Document` objects.
+    The documents themselves are kept as they are, and are only rebuilt with their score by `to_documents`, for the
+    ones selected for the report.
+    """
+
+    def __init__(
+        self,
+        documents: Sequence[Document],
+        scores: Mapping[str, float] | Sequence[float] | None = None,
+        embeddings: np.ndarray | None = None,
+    ):
+        """
+        Args:
+            documents (Sequence[Document]): The documents.
+            scores (Mapping[str, float] | Sequence[float] | None): Score of each document, by URL or in order. Documents
+                without a score get NaN. Defaults to the `score` of the documents.
+            embeddings (np.ndarray | None): Embedding of each document, size (n, d).
+        """
+        self.documents: List[Document] = list(documents)
+        self.published_date = np.array(
+            [_naive_utc(doc.published_date) for doc in self.documents], dtype="datetime64[s]"
+        )
+        self.content_type = np.array([doc.content_type for doc in self.documents], dtype=str)
+        self.source = np.array([doc.source for doc in self.documents], dtype=str)
+        if scores is None:
+            scores = [doc.score for doc in self.documents]
+        elif isinstance(scores, Mapping):
+            scores = [scores.get(doc.url) for doc in self.documents]
+        self.scores = np.array([np.nan if score is None else score for score in scores], dtype=np.float64)
+        self.embeddings = embeddings
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def take(self, indices: np.ndarray) -> "DocumentBatch":
+        """The documents at some positions (or of a boolean mask), as a new batch"""
+        indices = np.flatnonzero(indices) if indices.dtype == bool else indices
+        batch = DocumentBatch.__new__(DocumentBatch)
+        batch.documents = [self.documents[i] for i in indices]
+        batch.published_date = self.published_date[indices]
+        batch.content_type = self.content_type[indices]
+        batch.source = self.source[indices]
+        batch.scores = self.scores[indices]
+        batch.embeddings = self.embeddings[indices] if self.embeddings is not None else None
+        return batch
+
+    def published_between(self, start: datetime | None = None, end: datetime | None = None) -> np.ndarray:
+        """Mask of the documents published in a window (bounds included). Documents without a date are kept"""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= ~(self.published_date < _to_datetime64(start))
+        if end is not None:
+            mask &= ~(self.published_date > _to_datetime64(end))
+        return mask
+
+    def count_by_type(self) -> Dict[str, int]:
+        """Number of documents of each content type"""
+        types, counts = np.unique(self.content_type, return_counts=True)
+        return {str(content_type): int(count) for content_type, count in zip(types, counts)}
+
+    def top_k(self, threshold: float, max_per_type: Mapping[str, int]) -> np.ndarray:
+        """
+        Positions of the best scored documents of each type, best first.
+
+        Args:
+            threshold (float): The minimum score of a selected document. Unscored documents are never selected.
+            max_per_type (Mapping[str, int]): Maximum number of documents of each content type, -1 for no limit.
+                Documents of other types are not selected.
+
+        Returns:
+            np.ndarray: Positions of the selected documents, by decreasing score (ties in batch order).
+        """
+        candidates = np.flatnonzero(self.scores >= threshold)
+        order = candidates[np.argsort(-self.scores[candidates], kind="stable")]
+        types = self.content_type[order]
+        keep = np.zeros(len(order), dtype=bool)
+        for content_type, limit in max_per_type.items():
+            positions = np.flatnonzero(types == content_type)
+            keep[positions if limit == -1 else positions[:limit]] = True
+        return order[keep]
+
+    def to_documents(self, indices: np.ndarray | None = None) -> List[Document]:
+        """The documents at some positions (all by default), with their scores"""
+        indices = range(len(self)) if indices is None else indices
+        return [
+            self.documents[i] if np.isnan(self.scores[i]) else self.documents[i].with_score(float(self.scores[i]))
+            for i in indices
+        ]
@@ -2,9 +2,7 @@
 import os
 import sys
 from dataclasses import dataclass, field
-from typing import Dict, List
-
-from markdown_pdf import MarkdownPdf
+from typing import Annotated, Dict, List, Literal
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
@@ -12,14 +10,29 @@ from FCI_NewsAgents.core.config import GuardrailsConfig
 from FCI_NewsAgents.models.document import Document
 
 
+def merge_dicts(left: Dict, right: Dict) -> Dict:
+    '''Reducer joining the outputs of parallel branches, keyed by document URL'''
+    return {**left, **right}
+
+
+@dataclass
+class DocumentTask:
+    '''Input of a per-document branch of the workflow, sent with LangGraph's `Send`'''
+    document: Document
+    segment: Literal["highlight", "report"] = "report"
+
+
 @dataclass
 class WorkflowState:
     '''Langgraph workflow state'''
     raw_documents: List[Document] = field(default_factory=list)
+    candidate_documents: List[Document] = field(default_factory=list)  # Deduplicated and aligned, scored one by one
+    document_scores: Annotated[Dict[str, float], merge_dicts] = field(default_factory=dict)  # URL -> guardrails score
     filtered_documents: List[Document] = field(default_factory=list)
+    highlight_url: str = ""
+    segments: Annotated[Dict[str, str], merge_dicts] = field(default_factory=dict)  # URL -> report segment
     direct_tweets: List[Document] = field(default_factory=list)  # Tweets from URLs that bypass filtering
     final_report: str = ""
-    pdf_object: MarkdownPdf = None
     processing_stats: Dict[str, any] = field(default_factory=dict)
     config: GuardrailsConfig = field(default_factory=GuardrailsConfig)
     error_log: List[str] = field(default_factory=list)
\ No newline at end of file
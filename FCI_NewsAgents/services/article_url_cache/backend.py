@@ -0,0 +1,72 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from FCI_NewsAgents.core.config import DedupConfig
+
+BACKENDS = ("sqlite", "redis", "sharded")
+"""Names of the backends of `ArticleURLStore`, as set in `DedupConfig.BACKEND`."""
+
+
+class DedupBackend(ABC):
+    """
+    Storage of the canonical URLs behind `ArticleURLStore`.
+
+    Every backend stores the first scrape date of each URL and implements the same keep/duplicate rules (see
+    `ArticleURLStore`), so that pipelines on several nodes sharing a backend never report the same article twice.
+    """
+
+    EXPIRES_ENTRIES = False
+    """True if the backend drops expired URLs by itself, so that `purge_expired` has nothing to do."""
+
+    location: str
+    """Where the URLs are stored (path or server), e.g. to tell two stores apart."""
+
+    @abstractmethod
+    def exists(self, canonical_url: str) -> bool:
+        """True if the URL is stored with a scrape date before today."""
+
+    @abstractmethod
+    def insert_if_new(self, canonical_url: str, scrape_date: str, source: str | None = None) -> bool:
+        """Store the URL unless it is stored, and return False if it was stored with a scrape date before today."""
+
+    @abstractmethod
+    def insert_many_if_new(self, entries: Iterable[Sequence[str | None]]) -> List[bool]:
+        """`insert_if_new` for a batch of (canonical_url, scrape_date[, source]), where repeated URLs are duplicates."""
+
+    @abstractmethod
+    def remove_all(self) -> None:
+        ...
+
+    @abstractmethod
+    def count(self) -> int:
+        ...
+
+    def purge_expired(self, config: DedupConfig, today: date | None = None) -> Dict[str | None, int]:
+        """Delete the URLs past the retention window of their source, and return the number deleted per source."""
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+def first_occurrences(entries: Iterable[Sequence[str | None]]) -> Tuple[int, Dict[str, Tuple[int, str, str | None]]]:
+    """
+    The first occurrence of each URL of a batch, the only one that can be kept.
+
+    Returns:
+        Tuple[int, Dict[str, Tuple[int, str, str | None]]]: The size of the batch, and the position, scrape date and
+        source of the first occurrence of each URL, in batch order.
+    """
+    firsts: Dict[str, Tuple[int, str, str | None]] = {}
+    size = 0
+    for position, entry in enumerate(entries):
+        size += 1
+        if entry[0] not in firsts:
+            firsts[entry[0]] = (position, entry[1], entry[2] if len(entry) > 2 else None)
+    return size, firsts
+
+
+def retention_days(config: DedupConfig, source: str | None) -> int:
+    """Days a URL of a source is kept after its scrape date"""
+    return config.SOURCE_RETENTION_DAYS.get(source, config.RETENTION_DAYS)
@@ -1,36 +1,187 @@
-import sqlite3
+import threading
+import time
 from pathlib import Path
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
 
-from .schema import init_db, connect_db
+from FCI_NewsAgents.core.config import DedupConfig
+from FCI_NewsAgents.utils.metrics import inc, timer
+
+from .backend import retention_days
+from .database import DatabaseHandle, get_database
+from .store import open_backend
+
+
+def _delete_in_batches(
+    database: DatabaseHandle,
+    condition: str,
+    params: Tuple,
+    batch_size: int,
+) -> List[Tuple[int, str]]:
+    """
+    Delete the rows matching a condition by batches of at most `batch_size` rows.
+
+    Each batch is its own autocommit statement, so that the write lock is released between batches and the cost of
+    a batch only depends on its size (the condition must be answered by an index).
+
+    Returns:
+        List[Tuple[int, str]]: The IDs and canonical URLs of the deleted rows.
+    """
+    conn = database.connection()
+    deleted: List[Tuple[int, str]] = []
+    while True:
+        batch = conn.execute(
+            f"""
+            DELETE FROM articles WHERE id IN (SELECT id FROM articles WHERE {condition} LIMIT ?)
+            RETURNING id, canonical_url;
+            """,
+            (*params, batch_size),
+        ).fetchall()
+        deleted.extend(batch)
+        if len(batch) < batch_size:
+            return deleted
+
+
+def _after_purge(database: DatabaseHandle, deleted: List[Tuple[int, str]], vacuum_pages: int) -> None:
+    """Update the URL filter, give free pages back, and refresh the query planner statistics"""
+    if not deleted:
+        return
+    # The purged URLs are removed from the URL filter instead of rebuilding it
+    database.rows_deleted(deleted)
+    conn = database.connection()
+    conn.execute(f"PRAGMA incremental_vacuum({int(vacuum_pages)});").fetchall()
+    conn.execute("PRAGMA optimize;")
 
 
 def purge_older_than(
     db_path: str | Path | None = None,
     days: int = 7,
+    batch_size: int | None = None,
 ) -> int:
     """
-    Purge entries older than the specified number of days from the database.
+    Purge entries older than the specified number of days from the database, whatever their source.
 
     Args:
         db_path (str | Path | None): Path to the SQLite database file. If None, uses the default DEDUPLICATION_DB_PATH from environment (look at `schema.py`).
         days (int): Number of days to retain entries. Entries older than this will be deleted.
+        batch_size (int | None): Number of rows deleted per transaction. Defaults to `DedupConfig.PURGE_BATCH_SIZE`.
 
     Returns:
         int: Number of rows deleted.
     """
-    init_db(db_path)
+    database = get_database(db_path)
+    config = database.config
 
     cutoff_date = date.today() - timedelta(days=days)
-    conn = connect_db(db_path)
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            "DELETE FROM articles WHERE scrape_date < ?",
-            (cutoff_date.strftime("%Y-%m-%d"),)
-        )
-        deleted_rows = cursor.rowcount
-        conn.commit()
-        return deleted_rows
-    finally:
-        conn.close()
\ No newline at end of file
+    deleted = _delete_in_batches(
+        database, "scrape_date < ?", (cutoff_date.isoformat(),), batch_size or config.PURGE_BATCH_SIZE
+    )
+    _after_purge(database, deleted, config.VACUUM_PAGES)
+    return len(deleted)
+
+
+_STORED_SOURCES = """
+WITH RECURSIVE stored (source) AS (
+    SELECT MIN(source) FROM articles
+    UNION ALL
+    SELECT (SELECT MIN(source) FROM articles WHERE articles.source > stored.source) FROM stored
+    WHERE stored.source IS NOT NULL
+)
+SELECT source FROM stored WHERE source IS NOT NULL;
+"""
+"""Distinct sources of the table, one index lookup per source (instead of scanning the table like SELECT DISTINCT)."""
+
+
+def purge_expired(
+    db_path: str | Path | None = None,
+    config: DedupConfig | None = None,
+    today: date | None = None,
+) -> Dict[str | None, int]:
+    """
+    Purge the entries past the retention window of their source.
+
+    Sources listed in `SOURCE_RETENTION_DAYS` are purged with their own window, every other entry (including the ones
+    stored without a source) with `RETENTION_DAYS`. Each source is purged through the index on (source, scrape_date),
+    so that a batch never walks over the rows another window keeps.
+
+    Args:
+        db_path (str | Path | None): Path to the SQLite database file. If None, uses the default DEDUPLICATION_DB_PATH from environment (look at `schema.py`).
+        config (DedupConfig | None): Retention windows and batch size. Defaults to `DedupConfig()`.
+        today (date | None): The current date. Defaults to today.
+
+    Returns:
+        Dict[str | None, int]: Number of rows deleted per stored source, and under None for the rows without a source.
+    """
+    config = config or DedupConfig()
+    today = today or date.today()
+    database = get_database(db_path, config)
+
+    with timer("dedup_purge"):
+        sources = [None] + [source for (source,) in database.connection().execute(_STORED_SOURCES)]
+        deleted: List[Tuple[int, str]] = []
+        counts: Dict[str | None, int] = {}
+        for source in sources:
+            cutoff_date = today - timedelta(days=retention_days(config, source))
+            source_deleted = _delete_in_batches(
+                database, "source IS ? AND scrape_date < ?", (source, cutoff_date.isoformat()), config.PURGE_BATCH_SIZE
+            )
+            counts[source] = len(source_deleted)
+            deleted.extend(source_deleted)
+
+        _after_purge(database, deleted, config.VACUUM_PAGES)
+
+    inc("dedup_purged_rows", len(deleted))
+    return counts
+
+
+_last_purges: Dict[str, float] = {}
+_running_purges: Dict[str, threading.Thread] = {}
+_purges_lock = threading.Lock()
+
+
+def schedule_purge(
+    db_path: str | Path | None = None,
+    config: DedupConfig | None = None,
+) -> threading.Thread | None:
+    """
+    Purge the expired entries in a background thread, outside of the deduplication of the caller, unless a purge of
+    the store is running or the last one of this process started less than `PURGE_INTERVAL_MINUTES` ago.
+    Backends that expire entries by themselves (Redis) are never purged.
+
+    Args:
+        db_path (str | Path | None): Path to the SQLite database file (or directory of the sharded backend). If None, uses the default DEDUPLICATION_DB_PATH from environment (look at `schema.py`).
+        config (DedupConfig | None): Backend, retention windows, batch size and interval. Defaults to `DedupConfig()`.
+
+    Returns:
+        threading.Thread | None: The thread of the purge, or None if none was started.
+    """
+    config = config or DedupConfig()
+    backend = open_backend(db_path, config)
+    key = backend.location
+    now = time.monotonic()
+
+    with _purges_lock:
+        running = _running_purges.get(key)
+        last_purge = _last_purges.get(key)
+        if (
+            backend.EXPIRES_ENTRIES
+            or (running is not None and running.is_alive())
+            or (last_purge is not None and now - last_purge < config.PURGE_INTERVAL_MINUTES * 60)
+        ):
+            backend.close()
+            return None
+        _last_purges[key] = now
+
+        def run() -> None:
+            try:
+                counts = backend.purge_expired(config)
+                print(f"Purged {sum(counts.values())} expired URLs from the deduplication store.")
+            except Exception as e:
+                print(f"Error purging the deduplication store: {e}")
+            finally:
+                backend.close()
+
+        # Not a daemon: the interpreter waits for the current batch and the filter update before exiting
+        thread = _running_purges[key] = threading.Thread(target=run, name="dedup-purge")
+        thread.start()
+        return thread
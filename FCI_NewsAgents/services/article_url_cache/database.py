@@ -0,0 +1,175 @@
+import atexit
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+from FCI_NewsAgents.core.config import DedupConfig
+
+from .schema import DDL, migrate, resolve_db_path
+from .url_filter import URLFilter, remove_from_sidecar, sidecar_path
+
+
+class DatabaseHandle:
+    """
+    Process-wide handle to one deduplication database, shared by `ArticleURLStore` and `cleanup`.
+
+    The schema is created once, when the handle is created. Each thread gets its own connection, opened on first use
+    with the pragmas of the `DedupConfig` and reused by every later call of that thread. The connections of the threads
+    that ended (LangGraph runs each invocation on new threads, the purge runs in its own) are closed when another one
+    is opened, so that they do not pile up in a long-running process. Connections are in autocommit
+    mode: the store opens its own transactions. The URL filter of the database (see `url_filter.py`) is also loaded
+    once and shared, so that the store and the purge keep the same filter in sync.
+
+    Use `get_database` instead of creating handles directly.
+    """
+
+    def __init__(self, db_path: str | Path, config: DedupConfig):
+        self.db_path = db_path
+        self.config = config
+        self.url_filter: URLFilter | None = None
+        """The URL filter, once loaded by `open_url_filter`."""
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        # By owning thread, None for the shared in-memory connection
+        self._connections: Dict[threading.Thread | None, sqlite3.Connection] = {}
+        # An in-memory database only exists in the connection that created it: every thread shares that one
+        self._shared_conn: sqlite3.Connection | None = None
+
+        conn = self.connection()
+        # Only applies to a new database: lets the purge give the pages of deleted rows back (see `cleanup.py`)
+        conn.execute(f"PRAGMA auto_vacuum={config.AUTO_VACUUM};")
+        conn.executescript(DDL)
+        migrate(conn)
+        conn.execute(f"PRAGMA journal_mode={config.JOURNAL_MODE};")
+
+    @property
+    def in_memory(self) -> bool:
+        return str(self.db_path) == ":memory:"
+
+    def _connect(self) -> sqlite3.Connection:
+        config = self.config
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout={int(config.BUSY_TIMEOUT_MS)};")
+        conn.execute(f"PRAGMA synchronous={config.SYNCHRONOUS};")
+        # A negative cache size is in KiB instead of pages
+        conn.execute(f"PRAGMA cache_size={-int(config.CACHE_SIZE_KIB)};")
+        conn.execute(f"PRAGMA mmap_size={int(config.MMAP_SIZE_BYTES)};")
+        conn.execute(f"PRAGMA temp_store={config.TEMP_STORE};")
+        conn.execute("PRAGMA foreign_keys=ON;")
+        with self._lock:
+            ended = [thread for thread in self._connections if thread is not None and not thread.is_alive()]
+            for thread in ended:
+                self._connections.pop(thread).close()
+            self._connections[None if self.in_memory else threading.current_thread()] = conn
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """The connection of the current thread, opened on first use"""
+        if self.in_memory:
+            with self._lock:
+                if self._shared_conn is None:
+                    self._shared_conn = self._connect()
+                return self._shared_conn
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def open_url_filter(self) -> URLFilter | None:
+        """
+        Load the URL filter, or add the rows inserted by other processes since it was loaded.
+
+        Returns:
+            URLFilter | None: The filter, or None for an in-memory database.
+        """
+        if self.in_memory:
+            return None
+        with self._lock:
+            conn = self.connection()
+            if self.url_filter is None:
+                self.url_filter = URLFilter.open(conn, self.db_path, self.config.URL_FILTER_ERROR_RATE)
+            elif not self.url_filter.sync(conn):
+                # Rows were deleted behind the filter's back, or the table outgrew it
+                self.url_filter = URLFilter.build(conn, self.url_filter.bloom.error_rate)
+                self.url_filter.dirty = True
+            return self.url_filter
+
+    def save_url_filter(self) -> None:
+        """Add the rows inserted since the last save to the URL filter, and persist it next to the database"""
+        with self._lock:
+            if self.url_filter is None or not self.url_filter.dirty:
+                return
+            conn = self.connection()
+            if not self.url_filter.sync(conn):
+                self.url_filter = URLFilter.build(conn, self.url_filter.bloom.error_rate)
+            self.url_filter.save(sidecar_path(self.db_path))
+
+    def rows_deleted(self, deleted: Sequence[Tuple[int, str]]) -> None:
+        """
+        Remove rows just deleted from the table from the URL filter, so that it does not have to be rebuilt.
+
+        Args:
+            deleted (Sequence[Tuple[int, str]]): The IDs and canonical URLs of the deleted rows.
+        """
+        if not deleted or self.in_memory:
+            return
+        with self._lock:
+            if self.url_filter is None:
+                # Not loaded by this process: update the persisted filter instead
+                remove_from_sidecar(self.connection(), self.db_path, deleted)
+                return
+            # Rows inserted after the last sync were never added to the bloom filter
+            covered = [url for row_id, url in deleted if row_id <= self.url_filter.max_id]
+            self.url_filter.remove(covered, self.url_filter.rows - len(covered))
+            self.save_url_filter()
+
+    def close(self) -> None:
+        """Save the URL filter and close the connections of every thread"""
+        try:
+            self.save_url_filter()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Could not save the URL filter of {self.db_path}: {e}")
+        with self._lock:
+            connections, self._connections = list(self._connections.values()), {}
+            self._local = threading.local()
+            self._shared_conn = None
+        for conn in connections:
+            conn.close()
+
+
+_databases: Dict[str, DatabaseHandle] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(db_path: str | Path | None = None, config: DedupConfig | None = None) -> DatabaseHandle:
+    """
+    Get the process-wide handle of a deduplication database, created on first use.
+
+    Args:
+        db_path (str | Path | None): Path to the SQLite database file. If None, uses the default DEDUPLICATION_DB_PATH from environment (look at `schema.py`).
+        config (DedupConfig | None): Pragmas of the connections. Only used when the handle is created.
+
+    Returns:
+        DatabaseHandle: The handle of the database.
+    """
+    db_path = resolve_db_path(db_path)
+    key = str(db_path)
+    with _databases_lock:
+        database = _databases.get(key)
+        if database is None:
+            database = _databases[key] = DatabaseHandle(db_path, config or DedupConfig())
+        return database
+
+
+def close_databases() -> None:
+    """Close the handles of every database, e.g. before deleting or moving the files. Done at exit."""
+    with _databases_lock:
+        databases = list(_databases.values())
+        _databases.clear()
+    for database in databases:
+        database.close()
+
+
+atexit.register(close_databases)
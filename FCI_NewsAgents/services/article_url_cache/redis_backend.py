@@ -0,0 +1,221 @@
+import socket
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+from urllib.parse import unquote, urlparse
+
+from FCI_NewsAgents.core.config import DedupConfig
+
+from .backend import DedupBackend, first_occurrences, retention_days
+
+
+class RedisError(Exception):
+    """Error reply of the server."""
+
+
+class RedisConnection:
+    """
+    Minimal client of the Redis serialization protocol (RESP2), enough for the deduplication commands, so that any
+    compatible server (Redis, Valkey, KeyDB, ...) can be used without a client library.
+
+    Commands of a pipeline are sent in one write and their replies read back in order: a batch costs one round trip.
+    The connection is opened on first use and shared by the threads of the process, one command or pipeline at a time.
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported Redis URL '{url}', expected redis://[:password@]host[:port][/db]")
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        setup: List[Tuple[Any, ...]] = []
+        if self.password is not None:
+            setup.append(("AUTH", self.username, self.password) if self.username else ("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        for reply in self._round_trip(setup):
+            if isinstance(reply, RedisError):
+                raise reply
+
+    @staticmethod
+    def _encode(args: Sequence[Any]) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection to the Redis server closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            # Returned instead of raised, so that the other replies of a pipeline are still read
+            return RedisError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2].decode("utf-8")
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"Invalid reply from the Redis server: {line!r}")
+
+    def _round_trip(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        if not commands:
+            return []
+        self._sock.sendall(b"".join(self._encode(command) for command in commands))
+        return [self._read_reply() for _ in commands]
+
+    def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """
+        Send commands in one round trip.
+
+        Returns:
+            List[Any]: The reply of each command, a `RedisError` for the failed ones.
+        """
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            try:
+                return self._round_trip(commands)
+            except (OSError, ValueError):
+                # The replies of the commands are lost: the next call reconnects
+                self.close()
+                raise
+
+    def execute(self, *args: Any) -> Any:
+        """
+        Send one command.
+
+        Raises:
+            RedisError: If the server replies with an error.
+        """
+        reply = self.pipeline([args])[0]
+        if isinstance(reply, RedisError):
+            raise reply
+        return reply
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+            self._sock = self._reader = None
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _check(replies: List[Any]) -> List[Any]:
+    for reply in replies:
+        if isinstance(reply, RedisError):
+            raise reply
+    return replies
+
+
+class RedisBackend(DedupBackend):
+    """
+    URLs in a server speaking the Redis protocol, shared by every node pointing at it.
+
+    Each URL is a key (`DedupConfig.REDIS_KEY_PREFIX` + canonical URL) holding its first scrape date, set with
+    `SET NX` so that concurrent pipelines agree on which one stored it first. Keys expire at the end of the retention
+    window of their source, so no purge is needed. Batches are checked in two pipelined round trips: the `SET NX` of
+    every URL, then the `GET` of the ones already stored.
+    """
+
+    EXPIRES_ENTRIES = True
+
+    def __init__(self, config: DedupConfig | None = None, connection: RedisConnection | None = None):
+        self.config = config or DedupConfig()
+        self.connection = connection or RedisConnection(self.config.REDIS_URL)
+        self.location = f"{self.config.REDIS_URL}#{self.config.REDIS_KEY_PREFIX}"
+
+    def _key(self, canonical_url: str) -> str:
+        return f"{self.config.REDIS_KEY_PREFIX}{canonical_url}"
+
+    def _expires_at(self, scrape_date: str, source: str | None) -> int:
+        """Unix time at which a URL leaves its retention window (local midnight, like the SQLite purge)"""
+        last_day = date.fromisoformat(scrape_date) + timedelta(days=retention_days(self.config, source))
+        return int(datetime.combine(last_day + timedelta(days=1), time()).timestamp())
+
+    def _set_command(self, canonical_url: str, scrape_date: str, source: str | None) -> Tuple[Any, ...]:
+        return ("SET", self._key(canonical_url), scrape_date, "NX", "EXAT", self._expires_at(scrape_date, source))
+
+    def exists(self, canonical_url: str) -> bool:
+        stored = self.connection.execute("GET", self._key(canonical_url))
+        return stored is not None and stored < date.today().isoformat()
+
+    def insert_if_new(self, canonical_url: str, scrape_date: str, source: str | None = None) -> bool:
+        if self.connection.execute(*self._set_command(canonical_url, scrape_date, source)) is not None:
+            return True
+        stored = self.connection.execute("GET", self._key(canonical_url))
+        # Expired between the two commands: deemed new, like a purged URL
+        return stored is None or stored == date.today().isoformat()
+
+    def insert_many_if_new(self, entries: Iterable[Sequence[str | None]]) -> List[bool]:
+        size, firsts = first_occurrences(entries)
+        results = [False] * size
+        today_str = date.today().isoformat()
+        pipeline_size = self.config.REDIS_PIPELINE_SIZE
+
+        urls = list(firsts)
+        stored_urls: List[str] = []
+        for chunk in _chunks(urls, pipeline_size):
+            replies = _check(self.connection.pipeline(
+                [self._set_command(url, firsts[url][1], firsts[url][2]) for url in chunk]
+            ))
+            for url, reply in zip(chunk, replies):
+                if reply is None:
+                    stored_urls.append(url)
+                else:
+                    results[firsts[url][0]] = True
+
+        for chunk in _chunks(stored_urls, pipeline_size):
+            replies = _check(self.connection.pipeline([("GET", self._key(url)) for url in chunk]))
+            for url, stored in zip(chunk, replies):
+                results[firsts[url][0]] = stored is None or stored == today_str
+        return results
+
+    def _scan_keys(self) -> Iterator[List[str]]:
+        """The keys of the backend, a page at a time"""
+        cursor = "0"
+        while True:
+            cursor, keys = self.connection.execute(
+                "SCAN", cursor, "MATCH", f"{self.config.REDIS_KEY_PREFIX}*", "COUNT", self.config.REDIS_PIPELINE_SIZE
+            )
+            if keys:
+                yield keys
+            if cursor == "0":
+                return
+
+    def remove_all(self) -> None:
+        for keys in self._scan_keys():
+            self.connection.execute("DEL", *keys)
+
+    def count(self) -> int:
+        # SCAN can return a key twice while keys are added: count distinct keys
+        return len({key for keys in self._scan_keys() for key in keys})
+
+    def close(self) -> None:
+        self.connection.close()
@@ -6,37 +6,71 @@ DDL = """
 CREATE TABLE IF NOT EXISTS articles (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     canonical_url TEXT NOT NULL UNIQUE,
-    scrape_date TEXT NOT NULL
+    scrape_date TEXT NOT NULL,
+    source TEXT
 );
 
-CREATE INDEX IF NOT EXISTS idx_articles_canonical_url
-    ON articles (canonical_url);
+-- Lookups by URL use the index of the UNIQUE constraint
+DROP INDEX IF EXISTS idx_articles_canonical_url;
 
 CREATE INDEX IF NOT EXISTS idx_articles_scrape_date
     ON articles (scrape_date);
 """
 
-def init_db(db_path: str | Path | None = None) -> None:
+
+def migrate(conn: sqlite3.Connection) -> None:
     """
-    Initialize the SQLite database with the required schema.
-    If set to None, uses the default DEDUPLICATION_DB_PATH from environment.
+    Add the columns of newer versions to a database created by an older one, then their indexes.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the database, after running the DDL.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(articles);")}
+    if "source" not in columns:
+        # Rows of older versions have no source: they follow the default retention window
+        conn.execute("ALTER TABLE articles ADD COLUMN source TEXT;")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_source_scrape_date ON articles (source, scrape_date);")
+
+_dotenv_loaded = False
+
+
+def resolve_db_path(db_path: str | Path | None = None) -> str | Path:
+    """
+    Path of the SQLite database: `db_path`, or the default DEDUPLICATION_DB_PATH from environment if None.
 
     Args:
         db_path (str | Path | None): Path to the SQLite database file.
     """
     if db_path is None:
         import os
-        from dotenv import load_dotenv
 
-        load_dotenv()
+        global _dotenv_loaded
+        if not _dotenv_loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            _dotenv_loaded = True
 
         BASE_DIR = Path(__file__).resolve().parent
         db_path = BASE_DIR / os.environ["DEDUPLICATION_DB_PATH"]
+    return db_path
+
+
+def init_db(db_path: str | Path | None = None) -> None:
+    """
+    Initialize the SQLite database with the required schema.
+    If set to None, uses the default DEDUPLICATION_DB_PATH from environment.
+
+    Args:
+        db_path (str | Path | None): Path to the SQLite database file.
+    """
+    db_path = resolve_db_path(db_path)
 
     print(f"Initializing database at: {db_path}")
     conn = sqlite3.connect(db_path)
     try:
         conn.executescript(DDL)
+        migrate(conn)
         conn.commit()
     finally:
         conn.close()
@@ -55,13 +89,4 @@ def connect_db(db_path: str | Path | None = None, *args: P.args, **kwargs: P.kwa
     Returns:
         sqlite3.Connection: SQLite database connection.
     """
-    if db_path is None:
-        import os
-        from dotenv import load_dotenv
-
-        load_dotenv()
-
-        BASE_DIR = Path(__file__).resolve().parent
-        db_path = BASE_DIR / os.environ["DEDUPLICATION_DB_PATH"]
-
-    return _connect(db_path, *args, **kwargs)
+    return _connect(resolve_db_path(db_path), *args, **kwargs)
@@ -0,0 +1,109 @@
+import os
+import uuid
+from datetime import date, timedelta
+from hashlib import sha1
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from FCI_NewsAgents.core.config import DedupConfig
+
+from .backend import DedupBackend, first_occurrences, retention_days
+
+
+class ShardedBackend(DedupBackend):
+    """
+    URLs in a directory of entry files, sharded by hash, e.g. on a file system shared by several nodes.
+
+    Each URL is a file named after the SHA-1 of the URL, in one of `DedupConfig.SHARD_COUNT` shard directories, holding
+    its scrape date, source and URL. Entries are written to a temporary file and hard-linked to their name, which fails
+    if the entry exists: like `SET NX`, exactly one of concurrent writers stores a URL, and readers never see a partial
+    entry. Lookups open a single file, whatever the number of URLs. Shard directories are created by their first
+    write, so that opening a store on a network file system does not pay a round trip per shard.
+    """
+
+    def __init__(self, root: str | Path, config: DedupConfig | None = None):
+        self.config = config or DedupConfig()
+        self.root = Path(root)
+        self.location = str(self.root)
+        self._shards = [self.root / f"{index:04x}" for index in range(self.config.SHARD_COUNT)]
+        self._temp_dir = self.root / "tmp"
+        self._temp_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, canonical_url: str) -> Path:
+        digest = sha1(canonical_url.encode("utf-8")).hexdigest()
+        return self._shards[int(digest[:8], 16) % len(self._shards)] / digest
+
+    @staticmethod
+    def _read(path: Path) -> Tuple[str, str | None] | None:
+        """The scrape date and source of an entry, or None if there is none"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                scrape_date, source, _ = f.read().split("\t", 2)
+        except FileNotFoundError:
+            return None
+        return scrape_date, source or None
+
+    def _create(self, canonical_url: str, scrape_date: str, source: str | None) -> bool:
+        """Store an entry, and return False if the URL is stored"""
+        temp_path = self._temp_dir / uuid.uuid4().hex
+        temp_path.write_text(f"{scrape_date}\t{source or ''}\t{canonical_url}\n", encoding="utf-8")
+        path = self._path(canonical_url)
+        try:
+            try:
+                os.link(temp_path, path)
+            except FileNotFoundError:
+                # First entry of the shard
+                path.parent.mkdir(exist_ok=True)
+                os.link(temp_path, path)
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            temp_path.unlink()
+
+    def exists(self, canonical_url: str) -> bool:
+        entry = self._read(self._path(canonical_url))
+        return entry is not None and entry[0] < date.today().isoformat()
+
+    def insert_if_new(self, canonical_url: str, scrape_date: str, source: str | None = None) -> bool:
+        if self._create(canonical_url, scrape_date, source):
+            return True
+        entry = self._read(self._path(canonical_url))
+        return entry is None or entry[0] == date.today().isoformat()
+
+    def insert_many_if_new(self, entries: Iterable[Sequence[str | None]]) -> List[bool]:
+        size, firsts = first_occurrences(entries)
+        results = [False] * size
+        for url, (position, scrape_date, source) in firsts.items():
+            results[position] = self.insert_if_new(url, scrape_date, source)
+        return results
+
+    def _entries(self) -> Iterator[os.DirEntry]:
+        for shard in self._shards:
+            try:
+                with os.scandir(shard) as it:
+                    yield from it
+            except FileNotFoundError:
+                # Nothing was ever written to the shard
+                continue
+
+    def remove_all(self) -> None:
+        for entry in self._entries():
+            Path(entry.path).unlink(missing_ok=True)
+
+    def count(self) -> int:
+        return sum(1 for _ in self._entries())
+
+    def purge_expired(self, config: DedupConfig, today: date | None = None) -> Dict[str | None, int]:
+        """Walk every entry and delete the expired ones. Unlike the SQLite purge, the cost grows with the store"""
+        today = today or date.today()
+        counts: Dict[str | None, int] = {}
+        for entry in self._entries():
+            stored = self._read(Path(entry.path))
+            if stored is None:
+                continue
+            scrape_date, source = stored
+            if scrape_date < (today - timedelta(days=retention_days(config, source))).isoformat():
+                Path(entry.path).unlink(missing_ok=True)
+                counts[source] = counts.get(source, 0) + 1
+        return counts
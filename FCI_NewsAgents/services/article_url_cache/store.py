@@ -1,20 +1,213 @@
 import sqlite3
 from datetime import date
 from pathlib import Path
-from queue import Queue
-from threading import Thread
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Sequence
 
-from FCI_NewsAgents.utils.logger import file_writer
+from FCI_NewsAgents.core.config import DedupConfig
 
-from .schema import init_db, connect_db
+from .backend import BACKENDS, DedupBackend
+from .database import DatabaseHandle, get_database
+from .schema import resolve_db_path
+from .url_filter import URLFilter
+
+
+DEDUPLICATION_LOG_PATH = "deduplication.log"
+
+_CREATE_BATCH_TABLE = """
+CREATE TEMP TABLE IF NOT EXISTS url_batch (
+    canonical_url TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    scrape_date TEXT NOT NULL,
+    source TEXT
+) WITHOUT ROWID;
+"""
+"""Per-connection table holding the batch of `insert_many_if_new` while it is checked and inserted."""
+
+
+def _write_log(lines: List[str]) -> None:
+    """Append the messages of a batch to the deduplication log, in one write"""
+    with open(DEDUPLICATION_LOG_PATH, "a", encoding="utf-8") as f:
+        f.write("".join(f"{line}\n" for line in lines))
+
+
+class SQLiteBackend(DedupBackend):
+    """
+    URLs in a local SQLite database, the default backend.
+
+    With `DedupConfig.URL_FILTER`, URLs that are definitely not stored are recognised by an in-memory filter
+    (see `url_filter.py`) without querying the database. The filter is saved next to the database on `close`.
+
+    Backends of the same database share its process-wide handle (see `database.py`): the schema is created once, and
+    each thread reuses its own connection. Closing a backend does not close the connections.
+    """
+
+    __slots__ = ("_database", "_use_url_filter", "location")
+
+    def __init__(self, db_path: str | Path | None = None, config: DedupConfig | None = None) -> None:
+        config = config or DedupConfig()
+        self._database: DatabaseHandle = get_database(db_path, config)
+        self._use_url_filter = config.URL_FILTER
+        self.location = str(self._database.db_path)
+        if self._use_url_filter:
+            self._database.open_url_filter()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self._database.connection()
+
+    @property
+    def _url_filter(self) -> URLFilter | None:
+        return self._database.url_filter if self._use_url_filter else None
+
+    def exists(self, canonical_url: str) -> bool:
+        url_filter = self._url_filter
+        if url_filter is not None and not url_filter.might_contain(canonical_url):
+            return False
+
+        today_str = date.today().isoformat()
+
+        cursor = self._conn.execute(
+            "SELECT 1 FROM articles WHERE canonical_url = ? AND scrape_date < ? LIMIT 1;",
+            (canonical_url, today_str),
+        )
+        return cursor.fetchone() is not None
+
+    def insert_if_new(self, canonical_url: str, scrape_date: str, source: str | None = None) -> bool:
+        today_str = date.today().isoformat()
+
+        url_filter = self._url_filter
+        if url_filter is not None and not url_filter.might_contain(canonical_url):
+            # Definitely new, unless another process inserted it since the filter was loaded
+            if self._insert(canonical_url, scrape_date, source):
+                return True
+
+        cur = self._conn.execute(
+            "SELECT scrape_date FROM articles WHERE canonical_url = ? LIMIT 1;",
+            (canonical_url,),
+        )
+        row = cur.fetchone()
+
+        if row:
+            existing_scrape_date = row[0]
+            return existing_scrape_date == today_str
+        else:
+            self._insert(canonical_url, scrape_date, source)
+            return True
+
+    def _insert(self, canonical_url: str, scrape_date: str, source: str | None) -> bool:
+        """Insert a URL, and return False if it already exists"""
+        inserted = self._conn.execute(
+            "INSERT INTO articles (canonical_url, scrape_date, source) VALUES (?, ?, ?) ON CONFLICT (canonical_url) DO NOTHING RETURNING id;",
+            (canonical_url, scrape_date, source),
+        ).fetchall()
+        url_filter = self._url_filter
+        if inserted and url_filter is not None:
+            url_filter.add(canonical_url)
+        return bool(inserted)
+
+    def insert_many_if_new(self, entries: Iterable[Sequence[str | None]]) -> List[bool]:
+        """
+        The batch is loaded into a temporary table and checked and inserted with set-based queries in a single transaction,
+        so the cost does not depend on the SQLite variable limit and stays a few queries for any batch size.
+        """
+        entries = list(entries)
+        if not entries:
+            return []
+
+        today_str = date.today().isoformat()
+
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            conn.execute(_CREATE_BATCH_TABLE)
+            conn.execute("DELETE FROM temp.url_batch;")
+            # The primary key keeps the first occurrence of each URL of the batch
+            conn.executemany(
+                "INSERT OR IGNORE INTO temp.url_batch (canonical_url, position, scrape_date, source) VALUES (?, ?, ?, ?);",
+                (
+                    (entry[0], position, entry[1], entry[2] if len(entry) > 2 else None)
+                    for position, entry in enumerate(entries)
+                ),
+            )
+            first_positions = [
+                position for (position,) in conn.execute("SELECT position FROM temp.url_batch;")
+            ]
+            scraped_before_today = [
+                position
+                for (position,) in conn.execute(
+                    """
+                    SELECT batch.position FROM temp.url_batch AS batch
+                    JOIN articles ON articles.canonical_url = batch.canonical_url
+                    WHERE articles.scrape_date <> ?;
+                    """,
+                    (today_str,),
+                )
+            ]
+
+            inserted = conn.execute(
+                """
+                INSERT INTO articles (canonical_url, scrape_date, source)
+                SELECT canonical_url, scrape_date, source FROM temp.url_batch WHERE true
+                ON CONFLICT (canonical_url) DO NOTHING
+                RETURNING canonical_url, scrape_date;
+                """
+            ).fetchall()
+
+            conn.execute("DELETE FROM temp.url_batch;")
+            conn.execute("COMMIT;")
+        except BaseException:
+            conn.execute("ROLLBACK;")
+            raise
+
+        url_filter = self._url_filter
+        if url_filter is not None:
+            for url, _ in inserted:
+                url_filter.add(url)
+
+        # Keep the first occurrence of each URL, unless it was scraped before today
+        results = [False] * len(entries)
+        for position in first_positions:
+            results[position] = True
+        for position in scraped_before_today:
+            results[position] = False
+
+        _write_log(
+            [f"Checking {len(entries)} URLs against existing database entries."]
+            + [f"New URL passes the DB dedup check: {url} (scrape_date: {scrape_date})" for url, scrape_date in inserted]
+            + [f"{len(inserted)} new URLs to insert after checking against database.", "Insertion complete."]
+        )
+        return results
+
+    def remove_all(self) -> None:
+        self._conn.execute("DELETE FROM articles;")
+        if self._database.url_filter is not None:
+            self._database.url_filter.clear()
+
+    def count(self) -> int:
+        cursor = self._conn.execute("SELECT COUNT(*) FROM articles;")
+        result = cursor.fetchone()
+        return result[0] if result else 0
+
+    def purge_expired(self, config: DedupConfig, today: date | None = None) -> Dict[str | None, int]:
+        from .cleanup import purge_expired
+
+        return purge_expired(self._database.db_path, config, today)
+
+    def close(self) -> None:
+        """
+        Save the URL filter. The connections stay open for the next stores of the database (see `database.close_databases`).
+        """
+        self._database.save_url_filter()
 
 
 class ArticleURLStore:
     """
-    SQLite-based store for deduplicating article URLs.
+    Store for deduplicating article URLs, in the backend of `DedupConfig.BACKEND`: a local SQLite database
+    (`SQLiteBackend`), a server speaking the Redis protocol (`redis_backend.py`) or a directory of hash-sharded
+    entry files (`sharded_backend.py`). The last two can be shared by pipelines running on several nodes.
 
     If this is initialised with no db_path, it uses the default DEDUPLICATION_DB_PATH from environment (look at `schema.py`).
+    With the sharded backend, db_path is the directory of the shards.
 
     Intended usage:
 
@@ -33,13 +226,16 @@ class ArticleURLStore:
         is _**not**_ deemed a duplicate.
     """
 
-    __slots__ = ("_conn",)
+    __slots__ = ("backend",)
 
-    def __init__(self, db_path: str | Path | None = None) -> None:
-        init_db(db_path)
-        self._conn = connect_db(db_path, isolation_level=None, check_same_thread=False)
-        self._conn.execute("PRAGMA foreign_keys=ON;")
-        self._conn.execute("PRAGMA journal_mode=WAL;")
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        config: DedupConfig | None = None,
+        backend: DedupBackend | None = None,
+    ) -> None:
+        config = config or DedupConfig()
+        self.backend: DedupBackend = backend or open_backend(db_path, config)
 
     def exists(self, canonical_url: str) -> bool:
         """
@@ -51,15 +247,9 @@ class ArticleURLStore:
         Returns:
             bool: True if the URL exists and was scraped before today, False otherwise.
         """
-        today_str = date.today().isoformat()
+        return self.backend.exists(canonical_url)
 
-        cursor = self._conn.execute(
-            "SELECT 1 FROM articles WHERE canonical_url = ? AND scrape_date < ? LIMIT 1;",
-            (canonical_url, today_str),
-        )
-        return cursor.fetchone() is not None
-
-    def insert_if_new(self, canonical_url: str, scrape_date: str) -> bool:
+    def insert_if_new(self, canonical_url: str, scrape_date: str, source: str | None = None) -> bool:
         """
         Insert the canonical URL into the store if it does not already exist.
 
@@ -72,107 +262,33 @@ class ArticleURLStore:
         Args:
             canonical_url (str): The canonical URL to insert.
             scrape_date (str): The date the article was scraped, should be in 'YYYY-MM-DD' format.
+            source (str | None): The source of the article, for its retention window (see `cleanup.py`).
         Returns:
             bool: True if the URL was inserted, False if it already existed.
         """
-        today_str = date.today().isoformat()
-
-        cur = self._conn.execute(
-            "SELECT scrape_date FROM articles WHERE canonical_url = ? LIMIT 1;",
-            (canonical_url,),
-        )
-        row = cur.fetchone()
+        return self.backend.insert_if_new(canonical_url, scrape_date, source)
 
-        if row:
-            existing_scrape_date = row[0]
-            return existing_scrape_date == today_str
-        else:
-            self._conn.execute(
-                "INSERT INTO articles (canonical_url, scrape_date) VALUES (?, ?);",
-                (canonical_url, scrape_date),
-            )
-            return True
-
-    def insert_many_if_new(self, entries: Iterable[Tuple[str, str]]) -> List[bool]:
+    def insert_many_if_new(self, entries: Iterable[Sequence[str | None]]) -> List[bool]:
         """
         Insert multiple canonical URLs into the store if they do not already exist. This also handles within-batch deduplication.
 
-        Deduplication logic is as follows:
-        - **(TL;DR)** Return True if the URL is not a duplicate of any URL fetched BEFORE today.
-        - If URL A was scraped before today, and A was fetched again today, insertion does not happen and this returns False (for existence).
-        - If URL A was scraped today, and A is fetched again today, insertion does not happen, but this returns True (for non-existence, as if insertion is successful).
-        - If URL A was scraped for the first time (today), insertion happens and this returns True (for non-existence).
-        - Within the same batch, if the same URL appears multiple times, only the first occurrence is considered for insertion;
-        subsequent occurrences are treated as duplicates and return False, regardless of their scrape_date.
+        Deduplication logic is the one of `insert_if_new`. Within the same batch, if the same URL appears multiple times,
+        only the first occurrence is considered for insertion; subsequent occurrences are treated as duplicates and
+        return False, regardless of their scrape_date. Backends check a batch in a few round trips, whatever its size.
 
         Args:
-            entries (Iterable[tuple[str, str]]): An iterable of tuples containing
-                (canonical_url, scrape_date). The scrape_date should be in 'YYYY-MM-DD' format.
+            entries (Iterable[Sequence[str | None]]): An iterable of tuples containing
+                (canonical_url, scrape_date) or (canonical_url, scrape_date, source). The scrape_date should be in 'YYYY-MM-DD' format.
         Returns:
             List[bool]: A list of booleans indicating for each entry whether it was "inserted" (True) or already "existed" (False).
         """
-        if not entries:
-            return []
-
-        info_queue: Queue[str] = Queue()
-        log_thread = Thread(target=file_writer, args=("deduplication.log", info_queue))
-        log_thread.start()
-
-        today_str = date.today().isoformat()
-        urls = [canonical_url for canonical_url, _ in entries]
-
-        placeholder = ",".join("?" for _ in urls)
-        cur = self._conn.execute(
-            f"SELECT canonical_url, scrape_date FROM articles WHERE canonical_url IN ({placeholder});",
-            urls,
-        )
-        existing_rows = {row[0]: row[1] for row in cur.fetchall()}
-
-        results: List[bool] = []
-        to_insert: List[Tuple[str, str]] = []
-        seen_in_batch: Dict[str, bool] = {}  # Track URLs already seen in this batch
-
-        info_queue.put(f"Checking {len(urls)} URLs against existing database entries.")
-
-        # De-duplication against the database
-        for url, scrape_date in entries:
-            if url in seen_in_batch:
-                # Duplicate within batch - always flag as duplicate
-                results.append(False)
-            elif url in existing_rows:
-                existing_scrape_date = existing_rows[url]
-                results.append(existing_scrape_date == today_str)
-                seen_in_batch[url] = True
-            else:
-                info_queue.put(
-                    f"New URL passes the DB dedup check: {url} (scrape_date: {scrape_date})"
-                )
-                to_insert.append((url, scrape_date))
-                results.append(True)
-                seen_in_batch[url] = True
-
-        info_queue.put(
-            f"{len(to_insert)} new URLs to insert after checking against database."
-        )
-
-        info_queue.put("Insertion complete.")
-        info_queue.put(None)
-        log_thread.join()
-
-        # insertion
-        if to_insert:
-            self._conn.executemany(
-                "INSERT INTO articles (canonical_url, scrape_date) VALUES (?, ?);",
-                to_insert,
-            )
-
-        return results
+        return self.backend.insert_many_if_new(entries)
 
     def remove_all(self) -> None:
         """
         Remove all entries from the store.
         """
-        self._conn.execute("DELETE FROM articles;")
+        self.backend.remove_all()
 
     def count(self) -> int:
         """
@@ -181,18 +297,51 @@ class ArticleURLStore:
         Returns:
             int: The count of unique canonical URLs.
         """
-        cursor = self._conn.execute("SELECT COUNT(*) FROM articles;")
-        result = cursor.fetchone()
-        return result[0] if result else 0
+        return self.backend.count()
+
+    def purge_expired(self, config: DedupConfig | None = None) -> Dict[str | None, int]:
+        """
+        Delete the URLs past the retention window of their source (see `DedupConfig.RETENTION_DAYS`).
+
+        Returns:
+            Dict[str | None, int]: Number of URLs deleted per source, empty if the backend expires URLs by itself.
+        """
+        return self.backend.purge_expired(config or DedupConfig())
 
     def close(self) -> None:
         """
-        Close the database connection.
+        Close the store (the SQLite backend saves its URL filter and keeps its connections for the next stores).
         """
-        self._conn.close()
+        self.backend.close()
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
         self.close()
+
+
+def open_backend(db_path: str | Path | None = None, config: DedupConfig | None = None) -> DedupBackend:
+    """
+    Open the backend of `DedupConfig.BACKEND`.
+
+    Args:
+        db_path (str | Path | None): Path to the SQLite database file, or to the directory of the sharded backend.
+            If None, uses the default DEDUPLICATION_DB_PATH from environment (look at `schema.py`).
+        config (DedupConfig | None): The backend and its settings. Defaults to `DedupConfig()`.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    config = config or DedupConfig()
+    if config.BACKEND == "sqlite":
+        return SQLiteBackend(db_path, config)
+    if config.BACKEND == "redis":
+        from .redis_backend import RedisBackend
+
+        return RedisBackend(config)
+    if config.BACKEND == "sharded":
+        from .sharded_backend import ShardedBackend
+
+        return ShardedBackend(db_path or config.SHARDED_DIR or f"{resolve_db_path(None)}.shards", config)
+    raise ValueError(f"Unknown deduplication backend '{config.BACKEND}'. Available backends: {', '.join(BACKENDS)}")
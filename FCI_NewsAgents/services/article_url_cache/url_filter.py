@@ -0,0 +1,246 @@
+import json
+import math
+import os
+import sqlite3
+from hashlib import blake2b
+from pathlib import Path
+from typing import Iterable, List, Set, Tuple
+
+SIDECAR_SUFFIX = ".urlfilter"
+"""Suffix of the file next to the database where the filter is persisted."""
+
+MIN_CAPACITY = 10_000
+"""Smallest number of URLs a filter is sized for."""
+
+_FORMAT_VERSION = 1
+
+_MASK_64 = (1 << 64) - 1
+
+
+def _hash_pair(url: str) -> Tuple[int, int]:
+    digest = blake2b(url.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+def sidecar_path(db_path: str | Path) -> Path:
+    return Path(f"{db_path}{SIDECAR_SUFFIX}")
+
+
+class CountingBloomFilter:
+    """
+    Probabilistic set of URLs, answering "definitely not stored" without a database query.
+
+    `might_contain` never returns False for an added URL, and returns True for a URL that was not added with a
+    probability of about `error_rate` while the filter holds at most `capacity` URLs. Each slot is a counter instead
+    of a bit, so that URLs can be removed again when they are purged from the database (counters saturate at 255
+    and are then never decremented: the filter errs on the side of "might be stored").
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(capacity, MIN_CAPACITY)
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.counters = bytearray(self.size)
+
+    def _slots(self, url: str) -> List[int]:
+        # Double hashing: k slots from the two 64-bit halves of one 128-bit digest, in 64-bit arithmetic
+        h1, h2 = _hash_pair(url)
+        size = self.size
+        return [((h1 + i * h2) & _MASK_64) % size for i in range(self.hash_count)]
+
+    def add(self, url: str) -> None:
+        counters = self.counters
+        for slot in self._slots(url):
+            if counters[slot] < 255:
+                counters[slot] += 1
+
+    def add_many(self, urls: Iterable[str]) -> None:
+        """Add URLs in bulk: the slots and counters are computed with vectorised operations"""
+        import numpy as np
+
+        digests = b"".join(blake2b(url.encode("utf-8"), digest_size=16).digest() for url in urls)
+        if not digests:
+            return
+        halves = np.frombuffer(digests, dtype="<u8").reshape(-1, 2)
+        h1, h2 = halves[:, :1], halves[:, 1:] | np.uint64(1)
+        # uint64 arithmetic wraps around like `_slots`
+        slots = (h1 + np.arange(self.hash_count, dtype=np.uint64) * h2) % np.uint64(self.size)
+        counts = np.bincount(slots.ravel().astype(np.int64), minlength=self.size)
+        counters = np.frombuffer(self.counters, dtype=np.uint8) + np.minimum(counts, 255)
+        self.counters = bytearray(np.minimum(counters, 255).astype(np.uint8).tobytes())
+
+    def remove(self, url: str) -> None:
+        """Remove a URL that was added. Removing a URL that was not added can cause false negatives"""
+        counters = self.counters
+        slots = self._slots(url)
+        if all(counters[slot] for slot in slots):
+            for slot in slots:
+                if 0 < counters[slot] < 255:
+                    counters[slot] -= 1
+
+    def might_contain(self, url: str) -> bool:
+        counters = self.counters
+        for slot in self._slots(url):
+            if not counters[slot]:
+                return False
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        return self.might_contain(url)
+
+
+class URLFilter:
+    """
+    Counting Bloom filter of the canonical URLs of the `articles` table, kept in sync with it.
+
+    The filter is persisted in a sidecar file next to the database (`<db_path>.urlfilter`), with the number of rows
+    and the last row ID it covers, so that opening a store loads it and only adds the rows inserted since.
+    It is rebuilt from the table when rows were deleted without updating it, or when the table outgrew its capacity.
+    URLs inserted by the store are tracked apart until the next `sync`, so rows are never counted twice.
+    """
+
+    def __init__(self, bloom: CountingBloomFilter, rows: int = 0, max_id: int = 0):
+        self.bloom = bloom
+        self.rows = rows
+        """Number of rows of the table covered by the filter."""
+        self.max_id = max_id
+        """ID of the last row added to the filter (IDs only grow: the table uses AUTOINCREMENT)."""
+        self._pending: Set[str] = set()
+        self.dirty = False
+
+    @classmethod
+    def build(cls, conn: sqlite3.Connection, error_rate: float = 0.01) -> "URLFilter":
+        """Build the filter of every row of the table"""
+        capacity = 2 * _count_rows(conn)
+        url_filter = cls(CountingBloomFilter(capacity, error_rate))
+        # Rows inserted by other processes meanwhile can outgrow the capacity (the rows are read in one snapshot)
+        while not url_filter.sync(conn):
+            capacity *= 2
+            url_filter = cls(CountingBloomFilter(capacity, error_rate))
+        return url_filter
+
+    @classmethod
+    def open(cls, conn: sqlite3.Connection, db_path: str | Path, error_rate: float = 0.01) -> "URLFilter":
+        """Load the filter from its sidecar file and add the rows inserted since it was saved, or build it"""
+        url_filter = cls.load(sidecar_path(db_path))
+        if url_filter is not None and url_filter.bloom.error_rate == error_rate and url_filter.sync(conn):
+            return url_filter
+        url_filter = cls.build(conn, error_rate)
+        url_filter.dirty = True
+        return url_filter
+
+    def might_contain(self, url: str) -> bool:
+        """False if the URL is definitely not in the table"""
+        return url in self._pending or self.bloom.might_contain(url)
+
+    def add(self, url: str) -> None:
+        """Track a URL inserted into the table, until the next `sync`"""
+        self._pending.add(url)
+        self.dirty = True
+
+    def sync(self, conn: sqlite3.Connection) -> bool:
+        """
+        Add the rows inserted since the last sync.
+
+        Returns:
+            bool: False if rows were deleted without updating the filter, or if the table outgrew the capacity of the
+            filter: the filter must be rebuilt.
+        """
+        # One read transaction, so that the count and the new rows are of the same snapshot
+        own_transaction = not conn.in_transaction
+        if own_transaction:
+            conn.execute("BEGIN;")
+        try:
+            rows = _count_rows(conn)
+            new_rows = conn.execute(
+                "SELECT id, canonical_url FROM articles WHERE id > ? ORDER BY id;", (self.max_id,)
+            ).fetchall()
+        finally:
+            if own_transaction:
+                conn.execute("COMMIT;")
+        if self.rows + len(new_rows) != rows or rows > self.bloom.capacity:
+            return False
+
+        self.bloom.add_many(url for _, url in new_rows)
+        if new_rows:
+            self.max_id = new_rows[-1][0]
+            self.dirty = True
+        self.rows = rows
+        self._pending.clear()
+        return True
+
+    def remove(self, urls: Iterable[str], rows: int) -> None:
+        """Remove URLs deleted from the table, which now has `rows` rows"""
+        for url in urls:
+            self.bloom.remove(url)
+        self.rows = rows
+        self.dirty = True
+
+    def clear(self) -> None:
+        """Empty the filter, after every row of the table was deleted"""
+        self.bloom.counters = bytearray(self.bloom.size)
+        self._pending.clear()
+        self.rows = 0
+        self.dirty = True
+
+    def save(self, path: str | Path) -> None:
+        header = {
+            "version": _FORMAT_VERSION,
+            "capacity": self.bloom.capacity,
+            "error_rate": self.bloom.error_rate,
+            "rows": self.rows,
+            "max_id": self.max_id,
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            f.write(self.bloom.counters)
+        os.replace(temp_path, path)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: str | Path) -> "URLFilter | None":
+        """The filter saved in a sidecar file, or None if there is none or it cannot be read"""
+        try:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                counters = f.read()
+        except (OSError, ValueError):
+            return None
+        if header.get("version") != _FORMAT_VERSION:
+            return None
+
+        bloom = CountingBloomFilter(header["capacity"], header["error_rate"])
+        if len(counters) != bloom.size:
+            return None
+        bloom.counters = bytearray(counters)
+        return cls(bloom, rows=header["rows"], max_id=header["max_id"])
+
+
+def _count_rows(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COUNT(*) FROM articles;").fetchone()[0]
+
+
+def remove_from_sidecar(conn: sqlite3.Connection, db_path: str | Path, deleted: Iterable[Tuple[int, str]]) -> None:
+    """
+    Remove the rows just deleted from the table from the persisted filter, so that it does not have to be rebuilt.
+    If the filter does not match the table, it is dropped and rebuilt on next open.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the database.
+        db_path (str | Path): Path to the database, next to which the filter is persisted.
+        deleted (Iterable[Tuple[int, str]]): The IDs and canonical URLs of the deleted rows.
+    """
+    path = sidecar_path(db_path)
+    url_filter = URLFilter.load(path)
+    if url_filter is None:
+        return
+
+    # Rows inserted after the filter was saved were never added to it
+    covered = [url for row_id, url in deleted if row_id <= url_filter.max_id]
+    url_filter.remove(covered, url_filter.rows - len(covered))
+    if url_filter.sync(conn):
+        url_filter.save(path)
+    else:
+        path.unlink(missing_ok=True)
@@ -0,0 +1,301 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import zlib
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Literal, Sequence
+
+import numpy as np
+from w3lib.url import canonicalize_url
+
+from FCI_NewsAgents.models.document import Document
+
+DOCUMENTS_DB_NAME = "documents.sqlite"
+"""File name of the repository, in the folder of the persisted runs (next to the LangGraph checkpoints)."""
+
+SegmentKind = Literal["highlight", "report"]
+
+DDL = """
+CREATE TABLE IF NOT EXISTS documents (
+    canonical_url TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    source TEXT NOT NULL,
+    authors TEXT NOT NULL,
+    published_date TEXT,
+    content_type TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_documents_source ON documents (source);
+CREATE INDEX IF NOT EXISTS idx_documents_published_date ON documents (published_date);
+CREATE INDEX IF NOT EXISTS idx_documents_first_seen ON documents (first_seen);
+
+CREATE TABLE IF NOT EXISTS texts (
+    canonical_url TEXT PRIMARY KEY,
+    text BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS embeddings (
+    canonical_url TEXT PRIMARY KEY,
+    text_hash TEXT NOT NULL,
+    vector BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS scores (
+    canonical_url TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    score REAL NOT NULL,
+    scored_at TEXT NOT NULL,
+    PRIMARY KEY (canonical_url, prompt_hash)
+);
+
+CREATE INDEX IF NOT EXISTS idx_scores_score ON scores (prompt_hash, score);
+
+CREATE TABLE IF NOT EXISTS segments (
+    canonical_url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (canonical_url, kind, prompt_hash)
+);
+"""
+
+
+def document_key(url: str) -> str:
+    """
+    Key of a document in the repository: its URL, normalised offline (no request, unlike the canonical URL of the
+    deduplication), so that every stage can compute it.
+    """
+    return canonicalize_url("".join(url.split()))
+
+
+def text_hash(text: str) -> str:
+    """Short hash of a prompt or an embedded text, so that results computed from another one are not reused"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class DocumentRepository:
+    """
+    Everything computed about the scraped documents, kept across runs in one SQLite database: metadata, full text
+    (zlib-compressed), embedding vector, guardrails scores and report segments, keyed by `document_key`.
+
+    Stages look a document up before paying for it (LLM scoring, text extraction, segment generation, embeddings),
+    so re-scoring, resuming or building a weekly digest (see `workflows/digest.py`) does not go back to the network.
+    Scores and segments are stored per hash of the prompt that produced them, and embeddings with the hash of the
+    embedded text: changing a prompt computes them again.
+
+    One connection is shared by all the threads (the per-document branches of the workflow), each statement holding a
+    lock: LangGraph runs every invocation on new threads, so per-thread connections would pile up.
+    """
+
+    def __init__(self, db_path: str | Path, compression_level: int = 6):
+        self.db_path = db_path
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA busy_timeout=5000;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.executescript(DDL)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+
+    def _execute(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _executemany(self, sql: str, rows: Iterable[Sequence]) -> None:
+        with self._lock:
+            self._conn.executemany(sql, rows)
+
+    def save_documents(self, documents: Iterable[Document], seen: date | None = None) -> None:
+        """Insert or update the metadata of documents, scraped on `seen` (today by default)"""
+        seen_str = (seen or date.today()).isoformat()
+        rows = [
+            (
+                document_key(doc.url), doc.url, doc.title, doc.summary, doc.source, json.dumps(list(doc.authors)),
+                doc.published_date.isoformat() if doc.published_date else None, doc.content_type, seen_str, seen_str,
+            )
+            for doc in documents
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN;")
+            try:
+                self._conn.executemany(
+                    """
+                    INSERT INTO documents (
+                        canonical_url, url, title, summary, source, authors, published_date, content_type, first_seen, last_seen
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (canonical_url) DO UPDATE SET
+                        title = excluded.title, summary = excluded.summary, authors = excluded.authors,
+                        published_date = excluded.published_date, last_seen = MAX(last_seen, excluded.last_seen);
+                    """,
+                    rows,
+                )
+                self._conn.execute("COMMIT;")
+            except BaseException:
+                self._conn.execute("ROLLBACK;")
+                raise
+
+    def load_score(self, url: str, prompt: str) -> float | None:
+        rows = self._execute(
+            "SELECT score FROM scores WHERE canonical_url = ? AND prompt_hash = ?;", (document_key(url), text_hash(prompt))
+        )
+        return rows[0][0] if rows else None
+
+    def save_score(self, url: str, prompt: str, score: float) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO scores (canonical_url, prompt_hash, score, scored_at) VALUES (?, ?, ?, ?);",
+            (document_key(url), text_hash(prompt), score, datetime.now().isoformat()),
+        )
+
+    def load_text(self, url: str) -> str | None:
+        """The full text extracted from a document, or None if it was never extracted"""
+        rows = self._execute("SELECT text FROM texts WHERE canonical_url = ?;", (document_key(url),))
+        return zlib.decompress(rows[0][0]).decode("utf-8") if rows else None
+
+    def save_text(self, url: str, text: str) -> None:
+        compressed = zlib.compress(text.encode("utf-8"), self.compression_level)
+        self._execute(
+            "INSERT OR REPLACE INTO texts (canonical_url, text) VALUES (?, ?);", (document_key(url), compressed)
+        )
+
+    def load_embeddings(self, urls: Sequence[str], texts: Sequence[str]) -> List[np.ndarray | None]:
+        """
+        The stored embeddings of documents, or None for the ones whose embedded text changed or that were never embedded.
+
+        Args:
+            urls (Sequence[str]): URLs of the documents.
+            texts (Sequence[str]): The text embedded for each document.
+        """
+        keys = [document_key(url) for url in urls]
+        stored = {}
+        # Bounded by the SQLite variable limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            stored.update(
+                (key, (stored_hash, vector))
+                for key, stored_hash, vector in self._execute(
+                    f"SELECT canonical_url, text_hash, vector FROM embeddings WHERE canonical_url IN ({', '.join('?' * len(chunk))});",
+                    chunk,
+                )
+            )
+        embeddings: List[np.ndarray | None] = []
+        for key, text in zip(keys, texts):
+            entry = stored.get(key)
+            embeddings.append(
+                np.frombuffer(entry[1], dtype=np.float32) if entry and entry[0] == text_hash(text) else None
+            )
+        return embeddings
+
+    def save_embeddings(self, urls: Sequence[str], texts: Sequence[str], vectors: np.ndarray) -> None:
+        """Store the embedding of the text of each document, as float32"""
+        self._executemany(
+            "INSERT OR REPLACE INTO embeddings (canonical_url, text_hash, vector) VALUES (?, ?, ?);",
+            [
+                (document_key(url), text_hash(text), np.asarray(vector, dtype=np.float32).tobytes())
+                for url, text, vector in zip(urls, texts, vectors)
+            ],
+        )
+
+    def load_segment(self, url: str, kind: SegmentKind, prompt: str) -> str | None:
+        rows = self._execute(
+            "SELECT segment FROM segments WHERE canonical_url = ? AND kind = ? AND prompt_hash = ?;",
+            (document_key(url), kind, text_hash(prompt)),
+        )
+        return rows[0][0] if rows else None
+
+    def save_segment(self, url: str, kind: SegmentKind, prompt: str, segment: str) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO segments (canonical_url, kind, prompt_hash, segment, created_at) VALUES (?, ?, ?, ?, ?);",
+            (document_key(url), kind, text_hash(prompt), segment, datetime.now().isoformat()),
+        )
+
+    def load_segments(self, urls: Sequence[str], kind: SegmentKind, prompt: str) -> Dict[str, str]:
+        """The stored segments of documents, by URL, for the ones that have one"""
+        keys = {document_key(url): url for url in urls}
+        segments: Dict[str, str] = {}
+        key_list = list(keys)
+        # Bounded by the SQLite variable limit
+        for start in range(0, len(key_list), 500):
+            chunk = key_list[start:start + 500]
+            for key, segment in self._execute(
+                f"SELECT canonical_url, segment FROM segments WHERE kind = ? AND prompt_hash = ? "
+                f"AND canonical_url IN ({', '.join('?' * len(chunk))});",
+                [kind, text_hash(prompt), *chunk],
+            ):
+                segments[keys[key]] = segment
+        return segments
+
+    def find_documents(
+        self,
+        prompt: str,
+        seen_from: date | None = None,
+        seen_to: date | None = None,
+        source: str | None = None,
+        content_type: str | None = None,
+        min_score: float | None = None,
+    ) -> List[Document]:
+        """
+        Stored documents, with their score for a scoring prompt (None if they were not scored with it).
+
+        Args:
+            prompt (str): The guardrails prompt of the scores.
+            seen_from (date | None): Keep documents first scraped on or after this date.
+            seen_to (date | None): Keep documents first scraped on or before this date.
+            source (str | None): Keep the documents of this source.
+            content_type (str | None): Keep the documents of this type ('paper', 'article', ...).
+            min_score (float | None): Keep the documents scored at least this much.
+
+        Returns:
+            List[Document]: The documents, best scored first.
+        """
+        conditions, params = [], [text_hash(prompt)]
+        if seen_from is not None:
+            conditions.append("documents.first_seen >= ?")
+            params.append(seen_from.isoformat())
+        if seen_to is not None:
+            conditions.append("documents.first_seen <= ?")
+            params.append(seen_to.isoformat())
+        if source is not None:
+            conditions.append("documents.source = ?")
+            params.append(source)
+        if content_type is not None:
+            conditions.append("documents.content_type = ?")
+            params.append(content_type)
+        if min_score is not None:
+            conditions.append("scores.score >= ?")
+            params.append(min_score)
+
+        rows = self._execute(
+            f"""
+            SELECT documents.url, title, summary, source, authors, published_date, content_type, scores.score
+            FROM documents
+            LEFT JOIN scores ON scores.canonical_url = documents.canonical_url AND scores.prompt_hash = ?
+            {"WHERE " + " AND ".join(conditions) if conditions else ""}
+            ORDER BY scores.score DESC NULLS LAST, documents.first_seen DESC;
+            """,
+            params,
+        )
+        return [
+            Document(
+                url=url,
+                title=title,
+                summary=summary,
+                source=source,
+                authors=json.loads(authors),
+                published_date=datetime.fromisoformat(published_date) if published_date else None,
+                content_type=content_type,
+                score=score,
+            )
+            for url, title, summary, source, authors, published_date, content_type, score in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
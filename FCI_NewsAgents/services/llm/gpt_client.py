@@ -1,15 +1,25 @@
 import os
-from typing import Literal
+from typing import Any, Dict, Literal
 
 import dotenv
 import requests
 
+from FCI_NewsAgents.core.config import get_fpt_api_base_url
+from FCI_NewsAgents.utils.http_client import get_session
+from FCI_NewsAgents.utils.metrics import inc, timer
+from FCI_NewsAgents.utils.tracing import current_span, span
+
+
+class EmptyResponseError(Exception):
+    """The GPT API (or its configuration) gave no content to return. Retryable, like any unparsable answer."""
+
 
 def call_gpt(
     user_prompt: str, 
     system_prompt: str, 
     model: Literal["gpt-oss-20b", "gpt-oss-120b"] = "gpt-oss-120b",
     max_tokens: int = 8192,
+    response_format: Dict[str, Any] | None = None,
 ) -> str:
     """
     Make a call to FPT's GPT-OSS model.
@@ -19,20 +29,24 @@ def call_gpt(
         system_prompt (str): The system-level instructions for the model.
         model (str): The model to use, either "gpt-oss-20b" or "gpt-oss-120b".
         max_tokens (int): The maximum number of tokens to generate. Defaults to 8192.
+        response_format (Dict[str, Any] | None): OpenAI-style `response_format` (e.g. a JSON schema) to constrain the output. Defaults to None (free text).
 
     Returns:
         str: The response from the GPT model.
+
+    Raises:
+        EmptyResponseError: If the API key is missing or the response has no content.
     """
     dotenv.load_dotenv()
     api_key = os.getenv("FPT_120B")
 
     if not api_key:
         print("API key not found. Please set the FPT_120B environment variable.")
-        return None
+        raise EmptyResponseError("API key not found, FPT_120B is not set")
     
     print("API key found, proceeding with the request...")
 
-    url = "https://mkp-api.fptcloud.com/v1/chat/completions"
+    url = f"{get_fpt_api_base_url()}/v1/chat/completions"
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {api_key.strip()}"
@@ -47,15 +61,33 @@ def call_gpt(
         "temperature": 0.1,
         "frequency_penalty": 0.5
     }
+    if response_format is not None:
+        data["response_format"] = response_format
+
+    with span("llm_call", model=model, max_tokens=max_tokens), timer("llm_call", model=model):
+        response = get_session().post(url, headers=headers, json=data, timeout=(10, 300))
 
-    response = requests.post(url, headers=headers, json=data)
+    if not response.ok:
+        # Keep the body in the message, the status code is used by the retry policy to classify the error
+        raise requests.HTTPError(f"Error from GPT API ({response.status_code}): {response.text[:1000]}", response=response)
 
     data = response.json()
 
+    usage = data.get("usage") or {}
+    for kind in ("prompt_tokens", "completion_tokens"):
+        if isinstance(usage.get(kind), int):
+            inc("llm_tokens", usage[kind], model=model, kind=kind.removesuffix("_tokens"))
+            # Accumulated on the enclosing span (e.g. "score" or "generate" of a document)
+            if current_span() is not None:
+                current_span().add(f"llm.{kind}", usage[kind])
+
     try:
-        return data['choices'][0]['message']['content']
-    except KeyError:
+        content = data['choices'][0]['message']['content']
+    except (KeyError, IndexError, TypeError):
         raise Exception(f"Error from GPT API: {data}")
+    if not content:
+        raise EmptyResponseError(f"Empty response from GPT API: {data}")
+    return content
 
 
 if __name__ == "__main__":
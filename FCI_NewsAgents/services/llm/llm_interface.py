@@ -2,7 +2,7 @@ import os
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
-from typing import Literal
+from typing import Any, Dict, Literal
 
 from FCI_NewsAgents.services.llm.gpt_client import call_gpt
 
@@ -12,6 +12,7 @@ def call_llm(
     system_prompt: str,
     model: Literal["gpt-oss-20b", "gpt-oss-120b"] = "gpt-oss-120b",
     max_tokens: int = 8192,
+    response_format: Dict[str, Any] | None = None,
 ) -> str:
     """
     A unified interface to call different LLM models. Currently supporting 2 models: "gpt-oss-20b" and "gpt-oss-120b".
@@ -25,11 +26,12 @@ def call_llm(
         system_prompt (str): The system-level instructions for the model.
         model (Literal["gpt-oss-20b", "gpt-oss-120b"]): The specific model to use within the chosen provider.
         max_tokens (int): The maximum number of tokens to generate. Defaults to 8192.
+        response_format (Dict[str, Any] | None): OpenAI-style `response_format` to constrain the output, e.g. a JSON schema. Defaults to None.
 
     Returns:
         str: The response from the selected LLM model.
     """
-    return call_gpt(user_prompt, system_prompt, model, max_tokens)
+    return call_gpt(user_prompt, system_prompt, model, max_tokens, response_format=response_format)
     
 if __name__ == "__main__":
     user_prompt = "Print a question mark"
@@ -0,0 +1,317 @@
+import json
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Literal, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from FCI_NewsAgents.services.llm.llm_interface import call_llm
+from FCI_NewsAgents.utils.metrics import inc
+from FCI_NewsAgents.utils.retry import LLM_RETRY_POLICY
+
+M = TypeVar("M", bound=BaseModel)
+
+_FENCED_JSON_PATTERN = re.compile(r"```(?:json)?\s*([\s\S]*?)```", flags=re.IGNORECASE)
+_TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+
+
+class StructuredOutputError(ValueError):
+    """Raised when no valid structured output could be parsed from an LLM response."""
+
+
+@dataclass
+class ParseStats:
+    """Per-task counters of structured output parsing."""
+    calls: int = 0
+    """Number of structured calls made (one per task invocation)."""
+    first_try_successes: int = 0
+    """Number of calls whose first LLM response parsed successfully."""
+    retries: int = 0
+    """Number of extra LLM round trips caused by parse failures."""
+    failures: int = 0
+    """Number of calls that never produced a valid output."""
+
+    @property
+    def first_try_rate(self) -> float:
+        """The share of calls that parsed on the first try."""
+        return self.first_try_successes / self.calls if self.calls else 0.0
+
+
+_stats_lock = threading.Lock()
+_parse_stats: Dict[str, ParseStats] = {}
+
+# Set to False the first time the endpoint rejects `response_format`, so later calls skip it
+_response_format_supported = True
+
+
+def get_parse_stats() -> Dict[str, ParseStats]:
+    """
+    Get a snapshot of the parse statistics, keyed by task name.
+
+    Returns:
+        Dict[str, ParseStats]: The statistics of each task.
+    """
+    with _stats_lock:
+        return {task: ParseStats(**vars(stats)) for task, stats in _parse_stats.items()}
+
+
+def reset_parse_stats() -> None:
+    """Reset all parse statistics."""
+    with _stats_lock:
+        _parse_stats.clear()
+
+
+def _record(task: str, attempts: int, success: bool) -> None:
+    inc("structured_output_calls", task=task, outcome="ok" if success else "failed")
+    inc("structured_output_retries", attempts - 1, task=task)
+    with _stats_lock:
+        stats = _parse_stats.setdefault(task, ParseStats())
+        stats.calls += 1
+        stats.retries += attempts - 1
+        if success and attempts == 1:
+            stats.first_try_successes += 1
+        if not success:
+            stats.failures += 1
+
+
+def _loads_tolerant(text: str) -> Any:
+    """`json.loads`, retried once with trailing commas removed."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return json.loads(_TRAILING_COMMA_PATTERN.sub(r"\1", text))
+
+
+def iter_json_values(text: str) -> Iterator[Any]:
+    """
+    Yield every JSON object or array that can be decoded from a text, in order of appearance.
+
+    Fenced ```json blocks are tried first, then the text is scanned for any `{` or `[` where a JSON value starts,
+    so JSON surrounded by reasoning or prose is still found. Trailing commas are tolerated.
+
+    Args:
+        text (str): The text to search.
+
+    Yields:
+        Any: The decoded JSON values.
+    """
+    for match in _FENCED_JSON_PATTERN.finditer(text):
+        try:
+            yield _loads_tolerant(match.group(1).strip())
+        except json.JSONDecodeError:
+            pass
+
+    text = _TRAILING_COMMA_PATTERN.sub(r"\1", text)
+    decoder = json.JSONDecoder()
+    position = 0
+    while True:
+        starts = [i for i in (text.find("{", position), text.find("[", position)) if i != -1]
+        if not starts:
+            return
+        start = min(starts)
+        try:
+            value, end = decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            position = start + 1
+            continue
+        yield value
+        position = end
+
+
+def parse_structured(text: str, schema: Type[M]) -> M:
+    """
+    Parse the first JSON value of a text that validates against the given schema.
+
+    Args:
+        text (str): The LLM response.
+        schema (Type[M]): The pydantic model to validate against.
+
+    Returns:
+        M: The validated model.
+
+    Raises:
+        StructuredOutputError: If no JSON value in the text validates against the schema.
+    """
+    if text is None:
+        raise StructuredOutputError("Empty LLM response.")
+
+    errors: List[str] = []
+    for value in iter_json_values(text):
+        try:
+            return schema.model_validate(value)
+        except ValidationError as e:
+            errors.append(str(e))
+
+    raise StructuredOutputError(
+        f"No JSON value matching {schema.__name__} found in response"
+        + (f" ({len(errors)} candidates rejected)" if errors else "")
+    )
+
+
+def json_schema_response_format(schema: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Build an OpenAI-style `response_format` constraining the output to the given schema.
+
+    Args:
+        schema (Type[BaseModel]): The pydantic model of the output.
+
+    Returns:
+        Dict[str, Any]: The `response_format` payload.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": schema.__name__,
+            "schema": schema.model_json_schema(),
+            "strict": True,
+        },
+    }
+
+
+def _is_response_format_rejection(e: Exception) -> bool:
+    message = str(e).lower()
+    return "response_format" in message or "json_schema" in message
+
+
+def call_llm_structured(
+    user_prompt: str,
+    system_prompt: str,
+    schema: Type[M],
+    task: str,
+    model: Literal["gpt-oss-20b", "gpt-oss-120b"] = "gpt-oss-120b",
+    max_tokens: int = 8192,
+    max_attempts: int = 3,
+    parse: Callable[[str], M] | None = None,
+) -> M:
+    """
+    Call the LLM and parse its response into the given schema.
+
+    The endpoint is asked to follow the JSON schema through `response_format`. If the endpoint rejects
+    `response_format`, it is turned off for the rest of the process and the output is parsed from free text with
+    the tolerant extractor. Only responses that cannot be parsed at all cost another round trip.
+
+    Args:
+        user_prompt (str): The prompt provided by the user.
+        system_prompt (str): The system-level instructions for the model.
+        schema (Type[M]): The pydantic model of the expected output.
+        task (str): The name under which parse statistics are recorded (see `get_parse_stats`).
+        model (Literal["gpt-oss-20b", "gpt-oss-120b"]): The model to use.
+        max_tokens (int): The maximum number of tokens to generate. Defaults to 8192.
+        max_attempts (int): Maximum number of LLM calls before giving up. Defaults to 3.
+        parse (Callable[[str], M] | None): Custom parser of the response, raising `StructuredOutputError` on failure. Defaults to `parse_structured` against `schema`.
+
+    Returns:
+        M: The validated output.
+
+    Raises:
+        StructuredOutputError: If no attempt produced a valid output.
+        Exception: The error of the endpoint, if the retry policy gave up before a response was received.
+    """
+    global _response_format_supported
+
+    last_error: StructuredOutputError | None = None
+    attempt = 0
+    while attempt < max_attempts:
+        attempt += 1
+        response_format = json_schema_response_format(schema) if _response_format_supported else None
+
+        try:
+            # Transport errors are retried (with backoff) by the policy, parse errors by this loop
+            response = LLM_RETRY_POLICY.call(
+                call_llm,
+                user_prompt=user_prompt,
+                system_prompt=system_prompt,
+                model=model,
+                max_tokens=max_tokens,
+                response_format=response_format,
+            )
+        except Exception as e:
+            if response_format is not None and _is_response_format_rejection(e):
+                print(f"[{task}] Endpoint rejected response_format, falling back to free-text parsing: {e}")
+                _response_format_supported = False
+                attempt -= 1  # the rejected request did not produce a response to parse
+                continue
+            _record(task, attempt, success=False)
+            raise
+
+        try:
+            result = parse(response) if parse is not None else parse_structured(response, schema)
+            _record(task, attempt, success=True)
+            return result
+        except StructuredOutputError as e:
+            print(f"[{task}] Attempt {attempt} returned unparsable output: {e}")
+            last_error = e
+
+        budget = LLM_RETRY_POLICY.budget
+        if attempt < max_attempts and budget is not None and not budget.try_acquire():
+            print(f"[{task}] Retry budget exhausted for this run.")
+            break
+
+    _record(task, attempt, success=False)
+    raise StructuredOutputError(f"[{task}] No valid output after {attempt} attempts: {last_error}")
+
+
+_SCALE_BEFORE = re.compile(r"(?:/|\bout\s+of|\bscale\s+of|\d\s*(?:[-–]|to))\s*$", re.IGNORECASE)
+_SCALE_AFTER = re.compile(r"^\s*(?:[-–]|to)\s*\d", re.IGNORECASE)
+
+
+def _score_candidates(line: str, low: int, high: int) -> List[int]:
+    """The integers of a line within [low, high], except the ones that state a scale ("/10", "out of 10", "0-10")"""
+    candidates = []
+    for match in re.finditer(r"(?<![\d.])(\d+)(?![\d.])", line):
+        if _SCALE_BEFORE.search(line[:match.start()]) or _SCALE_AFTER.match(line[match.end():]):
+            continue
+        if low <= int(match.group(1)) <= high:
+            candidates.append(int(match.group(1)))
+    return candidates
+
+
+def extract_score(text: str, low: int = 0, high: int = 10) -> int:
+    """
+    Extract an integer score from an LLM response without trusting the first number it contains.
+
+    In order of preference: a JSON object with a `score` field, a response that is only an integer, the first integer
+    within [low, high] after the last `score` label (e.g. "Score: 7/10"), and the last integer within [low, high] on
+    the last non-empty line. Integers that state the scale rather than the score (after "/", "out of" or "scale of",
+    and the bounds of a range such as "0-10") are skipped.
+
+    Args:
+        text (str): The LLM response.
+        low (int): The lowest valid score. Defaults to 0.
+        high (int): The highest valid score. Defaults to 10.
+
+    Returns:
+        int: The score.
+
+    Raises:
+        StructuredOutputError: If no valid score is found.
+    """
+    if text is None:
+        raise StructuredOutputError("Empty LLM response.")
+
+    for value in iter_json_values(text):
+        if isinstance(value, dict) and "score" in value:
+            try:
+                score = int(value["score"])
+            except (TypeError, ValueError):
+                continue
+            if low <= score <= high:
+                return score
+
+    stripped = text.strip().strip("`*").strip()
+    if re.fullmatch(r"\d+", stripped) and low <= int(stripped) <= high:
+        return int(stripped)
+
+    for label in reversed(list(re.finditer(r"\bscore\b", text, re.IGNORECASE))):
+        candidates = _score_candidates(text[label.end():].split("\n", 1)[0], low, high)
+        if candidates:
+            return candidates[0]
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    if lines:
+        candidates = _score_candidates(lines[-1], low, high)
+        if candidates:
+            return candidates[-1]
+
+    raise StructuredOutputError(f"No score in [{low}, {high}] found in response.")
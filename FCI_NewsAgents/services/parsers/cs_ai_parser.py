@@ -3,10 +3,8 @@ import tempfile
 from pathlib import Path
 from typing import List
 
-import pymupdf4llm
-import requests
-
 from FCI_NewsAgents.models.document import Document
+from FCI_NewsAgents.utils.http_client import http_get
 
 
 def extract_text_from_paper(doc: Document) -> str:
@@ -32,11 +30,13 @@ def extract_text_from_paper(doc: Document) -> str:
             pdf_path = temp_path / f"{id}.pdf"
 
             # Download the paper tarball from arXiv
-            r = requests.get(doc.url.replace("/abs/", "/pdf/"), stream=True, timeout=60)
+            r = http_get(doc.url.replace("/abs/", "/pdf/"), document=doc.url, stream=True, timeout=60)
             r.raise_for_status()
             pdf_path.write_bytes(r.content)
 
-            # Extract text from the PDF
+            # Extract text from the PDF (PyMuPDF is only imported once a paper is read)
+            import pymupdf4llm
+
             md_text = pymupdf4llm.to_markdown(str(pdf_path))
 
             # remove references and everything after
@@ -1,6 +1,6 @@
 from FCI_NewsAgents.models.document import Document
+from FCI_NewsAgents.utils.http_client import http_get
 import bs4
-import requests
 
 
 def extract_text_from_web_article(doc: Document):
@@ -30,7 +30,7 @@ def extract_text_from_web_article(doc: Document):
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.9",
         }
-        response = requests.get(doc.url, headers=request_headers, timeout=10)
+        response = http_get(doc.url, document=doc.url, headers=request_headers, timeout=10)
         response.raise_for_status()
 
         soup = bs4.BeautifulSoup(response.text, 'html.parser')
@@ -1,7 +1,21 @@
-from .mit_news_scraper import MITNewsScraper
-from .neuron_daily_scraper import NeuronDailyScraper
-from .google_research_scraper import GoogleResearchScraper
-from .tech_republic_scraper import TechRepublicScraper
-from .tldr_news_scraper import TLDRNewsScraper
-from .openai_news_scraper import OpenAINewsScraper
-from .nvidia_dev_blog_scraper import NVIDIADevBlogScraper
\ No newline at end of file
+import importlib
+
+# The scrapers are imported on first access, so that importing one scraper (or `registry`) does not import
+# the dependencies of every other scraper, e.g. Selenium for TechRepublic
+_SCRAPER_MODULES = {
+    "MITNewsScraper": ".mit_news_scraper",
+    "NeuronDailyScraper": ".neuron_daily_scraper",
+    "GoogleResearchScraper": ".google_research_scraper",
+    "TechRepublicScraper": ".tech_republic_scraper",
+    "TLDRNewsScraper": ".tldr_news_scraper",
+    "OpenAINewsScraper": ".openai_news_scraper",
+    "NVIDIADevBlogScraper": ".nvidia_dev_blog_scraper",
+}
+
+__all__ = list(_SCRAPER_MODULES)
+
+
+def __getattr__(name: str):
+    if name not in _SCRAPER_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_SCRAPER_MODULES[name], __name__), name)
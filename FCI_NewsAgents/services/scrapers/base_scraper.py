@@ -1,11 +1,42 @@
+import datetime as datetime_module
+import re
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TypeVar
 
 from FCI_NewsAgents.models.article import Article
+from FCI_NewsAgents.utils.circuit_breaker import host_of
+from FCI_NewsAgents.utils.metrics import inc
+
+T = TypeVar("T")
+
+MAX_ARTICLE_AGE_DAYS = 14
+"""Articles published more than this many days ago are not scraped."""
+
+_LISTING_DATE = re.compile(r"\b([A-Z][a-z]{2,8}\.? \d{1,2}, \d{4})\b")
+
+
+def feed_entry_date(entry: Dict[str, Any]) -> datetime_module.datetime | None:
+    """The published (or else updated) date of a feedparser entry, in UTC, or None if the feed has none"""
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    return datetime_module.datetime(*parsed[:6]) if parsed else None
+
+
+def find_listing_date(text: str) -> datetime_module.date | None:
+    """The first 'December 18, 2025' or 'Dec 18, 2025' date of a listing card, or None"""
+    for match in _LISTING_DATE.finditer(text):
+        value = match.group(1).replace(".", "")
+        for date_format in ("%B %d, %Y", "%b %d, %Y"):
+            try:
+                return datetime_module.datetime.strptime(value, date_format).date()
+            except ValueError:
+                continue
+    return None
 
 
 class BaseScraper(ABC):
     """Base class for all article scrapers"""
+
+    max_age_days: int = MAX_ARTICLE_AGE_DAYS
     
     @abstractmethod
     def get_name(self) -> str:
@@ -19,4 +50,69 @@ class BaseScraper(ABC):
     
     def is_enabled(self) -> bool:
         """Check if this scraper is enabled (override in subclass if needed)"""
-        return True
\ No newline at end of file
+        return True
+
+    def get_hosts(self) -> List[str]:
+        """
+        Return the hosts this scraper fetches from, derived from its `rss_url` and `base_url` (override in subclass if needed).
+        The scraper is skipped while the circuits of all its hosts are open.
+        """
+        urls = [getattr(self, attr, None) for attr in ("rss_url", "base_url")]
+        return sorted({host_of(url) for url in urls if isinstance(url, str) and url})
+
+    def cutoff_date(self) -> datetime_module.date:
+        """Oldest publication date of the articles kept by this scraper"""
+        return datetime_module.date.today() - datetime_module.timedelta(days=self.max_age_days)
+
+    def is_stale(self, published: datetime_module.date | str | None) -> bool:
+        """
+        Check if an article was published before the cutoff date.
+        Unknown or unparsable dates are not stale: the article is kept, as when no date is found at all.
+        """
+        if isinstance(published, str):
+            try:
+                published = datetime_module.datetime.fromisoformat(published)
+            except ValueError:
+                return False
+        if published is None:
+            return False
+        if isinstance(published, datetime_module.datetime):
+            published = published.date()
+        return published < self.cutoff_date()
+
+    def iter_recent(
+        self,
+        items: Iterable[T],
+        get_date: Callable[[T], datetime_module.date | None],
+        sorted_by_date: bool = False,
+    ) -> Iterator[T]:
+        """
+        Yield the items of a listing or feed that are not older than the cutoff date, based on the date of the listing
+        itself (RSS metadata, date of a card), so that the article pages of stale items are never fetched.
+
+        Items without a date in the listing are yielded: the caller checks the date of their article page with `is_stale`.
+
+        Args:
+            items (Iterable[T]): Entries of a feed, cards of a listing, ...
+            get_date (Callable[[T], date | None]): Date of an item in the listing, or None if the listing has none.
+            sorted_by_date (bool): The listing is sorted newest first: stop at the first stale item.
+        """
+        skipped = 0
+        for item in items:
+            try:
+                published = get_date(item)
+            except Exception:
+                published = None
+            if not self.is_stale(published):
+                yield item
+                continue
+
+            skipped += 1
+            if sorted_by_date:
+                print(f"{self.get_name()}: stopping at the first article older than {self.max_age_days} days")
+                break
+
+        if skipped:
+            if not sorted_by_date:
+                print(f"{self.get_name()}: skipped {skipped} articles older than {self.max_age_days} days")
+            inc("scraper_stale_skipped", skipped, scraper=self.get_name())
@@ -0,0 +1,80 @@
+import atexit
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List
+
+
+class BrowserPool:
+    """
+    Pool of Selenium drivers, so that a browser is launched once and reused across pages (and across runs when
+    the pipeline runs in the daemon) instead of launching Chrome for every article.
+
+    A driver that raised while borrowed is quit instead of being returned, as its page may be left in any state.
+    """
+
+    def __init__(self, factory: Callable[[], Any], max_idle: int = 2):
+        """
+        Args:
+            factory (Callable[[], Any]): Creates a new driver.
+            max_idle (int): Maximum number of idle drivers kept open. Defaults to 2.
+        """
+        self.factory = factory
+        self.max_idle = max_idle
+        self._idle: List[Any] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def driver(self) -> Iterator[Any]:
+        """Borrow a driver from the pool, launching one if none is idle"""
+        with self._lock:
+            driver = self._idle.pop() if self._idle else None
+        if driver is None:
+            driver = self.factory()
+
+        try:
+            yield driver
+        except BaseException:
+            self._quit(driver)
+            raise
+
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(driver)
+                return
+        self._quit(driver)
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def close(self) -> None:
+        """Quit every idle driver"""
+        with self._lock:
+            drivers, self._idle = self._idle, []
+        for driver in drivers:
+            self._quit(driver)
+
+    @staticmethod
+    def _quit(driver: Any) -> None:
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+
+
+_pools: List[BrowserPool] = []
+
+
+def create_browser_pool(factory: Callable[[], Any], max_idle: int = 2) -> BrowserPool:
+    """A `BrowserPool` whose browsers are quit when the process exits"""
+    pool = BrowserPool(factory, max_idle=max_idle)
+    _pools.append(pool)
+    return pool
+
+
+def close_browser_pools() -> None:
+    for pool in _pools:
+        pool.close()
+
+
+atexit.register(close_browser_pools)
@@ -1,28 +1,33 @@
 import json
 import os
 import time
-from typing import List, Literal
+from dataclasses import asdict
+from datetime import datetime
+from typing import Iterator, List, Literal
 
 import feedparser
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from FCI_NewsAgents.core.config import SourcesConfig
 from FCI_NewsAgents.models.paper import Paper
-from FCI_NewsAgents.utils.utils import run_with_retry
+from FCI_NewsAgents.services.scrapers.sources import ARXIV_SOURCE, SourceCache, SourcePlan, plan_sources
+from FCI_NewsAgents.utils.retry import HTTP_RETRY_POLICY
+from FCI_NewsAgents.utils.http_client import http_get
 
 
-def scrape_arxiv_cs_ai(max_results=10, sort_by: Literal["relevance", "lastUpdatedDate", "submittedDate"]="submittedDate", batch_size=10) -> List[Paper]:
+def iter_arxiv_cs_ai(max_results=10, sort_by: Literal["relevance", "lastUpdatedDate", "submittedDate"]="submittedDate", batch_size=10) -> Iterator[List[Paper]]:
     """
-    Scrape arXiv papers from the cs.AI category.
+    Scrape arXiv papers from the cs.AI category, yielding each page of results as soon as it is fetched.
     
     Parameters:
         max_results (int): Number of results to fetch.
         sort_by (Literal["relevance", "lastUpdatedDate", "submittedDate"]): The sorting criteria for the results.
         batch_size (int): Number of results to fetch per request. Defaults to 10.
     
-    Returns:
-        List[Paper]: List of Paper objects containing paper metadata.
+    Yields:
+        List[Paper]: Paper objects of one page of results.
     """
     base_url = "http://export.arxiv.org/api/query?"
     query = f"cat:cs.AI"
@@ -40,7 +45,6 @@ def scrape_arxiv_cs_ai(max_results=10, sort_by: Literal["relevance", "lastUpdate
         "User-Agent": "FCI_NewsAgents/1.0 (ducdm67@fpt.com)"
     }
 
-    papers: List[Paper] = []
     fetched = 0
 
     def fetch_and_parse_batch(start: int, max_results: int) -> List[Paper]:
@@ -51,12 +55,13 @@ def scrape_arxiv_cs_ai(max_results=10, sort_by: Literal["relevance", "lastUpdate
             "sortBy": sort_by
         }
 
-        response = requests.get(
-            url=base_url, 
+        response = http_get(
+            base_url,
             headers=headers, 
             params=params, 
             timeout=(5, 30) # connect timeout, read timeout
         )
+        response.raise_for_status()
 
         feed = feedparser.parse(response.text)
         batch_papers: List[Paper] = []
@@ -82,36 +87,85 @@ def scrape_arxiv_cs_ai(max_results=10, sort_by: Literal["relevance", "lastUpdate
         current_batch = min(batch_size, max_results - fetched)
 
         try:
-            batch_papers = run_with_retry(
-                fn=lambda: fetch_and_parse_batch(start=fetched, max_results=current_batch),
-                max_retries=3,
+            batch_papers = HTTP_RETRY_POLICY.call(
+                fetch_and_parse_batch,
+                start=fetched,
+                max_results=current_batch,
                 on_exception=on_exception
             )
-            papers.extend(batch_papers)
         except Exception as e:
             print(f"Failed to fetch batch starting at {fetched}: {e}")
             break
 
+        if not batch_papers:
+            # No more results, asking again for the same page would loop forever
+            break
+
+        yield batch_papers
         fetched += len(batch_papers)
         time.sleep(3)  # Respect arXiv's rate limits
 
-    return papers
+
+def scrape_arxiv_cs_ai(max_results=10, sort_by: Literal["relevance", "lastUpdatedDate", "submittedDate"]="submittedDate", batch_size=10) -> List[Paper]:
+    """
+    Scrape arXiv papers from the cs.AI category.
+    
+    Parameters:
+        max_results (int): Number of results to fetch.
+        sort_by (Literal["relevance", "lastUpdatedDate", "submittedDate"]): The sorting criteria for the results.
+        batch_size (int): Number of results to fetch per request. Defaults to 10.
+    
+    Returns:
+        List[Paper]: List of Paper objects containing paper metadata.
+    """
+    return [paper for batch_papers in iter_arxiv_cs_ai(max_results, sort_by, batch_size) for paper in batch_papers]
  
-def scrape_papers(max_results=50) -> List[Paper]:
+def iter_papers(max_results=50, plan: SourcePlan | None = None, config: SourcesConfig | None = None) -> Iterator[List[Paper]]:
     """
-    Scrape arXiv papers.
+    Yield the arXiv cs.AI papers page by page, or at once from the cache if arXiv was scraped within its refresh interval.
+    The papers are cached once every page was fetched.
 
     Parameters:
         max_results (int): Number of results to fetch.
+        plan (SourcePlan | None): Sources to scrape and to reuse from the cache. Defaults to `plan_sources(config)`.
+        config (SourcesConfig | None): Refresh intervals and cache folder. Defaults to `SourcesConfig()`.
 
-    Returns:
-        List[Paper]: List of Paper objects containing paper metadata.
+    Yields:
+        List[Paper]: Paper objects of one page of results, or every cached paper.
     """
+    config = config or SourcesConfig()
+    plan = plan or plan_sources(config)
+    cache = SourceCache(config.CACHE_DIR)
+
+    if ARXIV_SOURCE in plan.cached:
+        papers = [Paper(**item) for item in cache.load(ARXIV_SOURCE)]
+        print(f"{ARXIV_SOURCE}: reusing {len(papers)} papers scraped at {plan.last_scraped[ARXIV_SOURCE]:%Y-%m-%d %H:%M}")
+        yield papers
+        return
+    if ARXIV_SOURCE not in plan.due:
+        return
+
     print(f"Scraping {max_results} papers from arXiv cs.AI...")
-    papers = scrape_arxiv_cs_ai(max_results=max_results, sort_by="submittedDate")
-    print(f"Successfully scraped {len(papers)} papers")
-    return papers
-    
+    started_at = datetime.now()
+    papers = []
+    for batch_papers in iter_arxiv_cs_ai(max_results=max_results, sort_by="submittedDate"):
+        papers.extend(batch_papers)
+        yield batch_papers
+    cache.save(ARXIV_SOURCE, [asdict(paper) for paper in papers], started_at)
 
 
+def scrape_papers(max_results=50, plan: SourcePlan | None = None, config: SourcesConfig | None = None) -> List[Paper]:
+    """
+    Scrape arXiv papers, unless they were scraped within the refresh interval of arXiv.
 
+    Parameters:
+        max_results (int): Number of results to fetch.
+        plan (SourcePlan | None): Sources to scrape and to reuse from the cache. Defaults to `plan_sources(config)`.
+        config (SourcesConfig | None): Refresh intervals and cache folder. Defaults to `SourcesConfig()`.
+
+    Returns:
+        List[Paper]: List of Paper objects containing paper metadata.
+    """
+    papers = [paper for batch_papers in iter_papers(max_results, plan, config) for paper in batch_papers]
+    print(f"Successfully scraped {len(papers)} papers")
+    return papers
@@ -5,8 +5,10 @@ import requests
 from bs4 import BeautifulSoup
 
 from FCI_NewsAgents.models.article import Article
-from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper
+from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper, find_listing_date
 from FCI_NewsAgents.services.scrapers.registry import register
+from FCI_NewsAgents.utils.circuit_breaker import CircuitOpenError
+from FCI_NewsAgents.utils.http_client import http_get
 
 
 @register("GoogleResearch")
@@ -25,7 +27,7 @@ class GoogleResearchScraper(BaseScraper):
         full_url = self.base_url + blog_path
         
         try:
-            response = requests.get(full_url, timeout=10)
+            response = http_get(full_url, timeout=10)
             response.raise_for_status()
         except requests.RequestException as e:
             print(f"Error fetching article content from {full_url}: {e}")
@@ -67,7 +69,7 @@ class GoogleResearchScraper(BaseScraper):
         print(f"Scraping articles from {self.blog_url}...")
         
         try:
-            response = requests.get(self.blog_url, timeout=10)
+            response = http_get(self.blog_url, timeout=10)
             response.raise_for_status()
         except requests.RequestException as e:
             print(f"Error fetching URL: {e}")
@@ -77,7 +79,9 @@ class GoogleResearchScraper(BaseScraper):
         a_tags = soup.find_all("a", attrs={"class": "glue-card not-glue"})
         
         blog_posts: List[Article] = []
-        for a_tag in a_tags:
+        # The cards show the date of the posts: stale posts are skipped before fetching their page.
+        # The listing is not sorted by date (featured posts come first)
+        for a_tag in self.iter_recent(a_tags, lambda a_tag: find_listing_date(a_tag.get_text(" ", strip=True))):
             try:
                 # Get the blog path from href (e.g., "/blog/article-name")
                 blog_path = a_tag.get("href")
@@ -95,12 +99,10 @@ class GoogleResearchScraper(BaseScraper):
 
                 published_date = content['published_date']
 
-                if published_date:
-                    # Filter articles older than 14 days
-                    article_date = datetime_module.datetime.fromisoformat(published_date)
-                    if article_date.date() < datetime_module.date.today() - datetime_module.timedelta(days=14):
-                        print(f"Skipping article '{title}' as it is older than 14 days.")
-                        continue
+                # Cards without a date are checked against the date of their page
+                if self.is_stale(published_date):
+                    print(f"Skipping article '{title}' as it is older than {self.max_age_days} days.")
+                    continue
 
                 article = Article(
                     title=title,
@@ -113,6 +115,9 @@ class GoogleResearchScraper(BaseScraper):
                 
                 blog_posts.append(article)
                 
+            except CircuitOpenError as e:
+                print(f"Skipping remaining articles: {e}")
+                break
             except Exception as e:
                 print(f"Error processing article: {e}")
                 continue
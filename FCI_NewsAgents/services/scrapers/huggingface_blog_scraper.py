@@ -1,17 +1,16 @@
 import datetime as datetime_module
 from typing import Any, Dict, List, Tuple
 
-import feedparser
-import requests
 from bs4 import BeautifulSoup
 
 from FCI_NewsAgents.models.article import Article
 from FCI_NewsAgents.services.parsers.web_article_parser import (
     extract_text_from_web_article,
 )
-from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper
+from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper, feed_entry_date
 from FCI_NewsAgents.services.scrapers.registry import register
-from FCI_NewsAgents.utils.utils import run_with_retry
+from FCI_NewsAgents.utils.retry import HTTP_RETRY_POLICY
+from FCI_NewsAgents.utils.http_client import http_get, parse_feed
 
 
 @register("HuggingfaceBlog")
@@ -35,7 +34,7 @@ class HuggingfaceBlogScraper(BaseScraper):
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
                 "Accept-Language": "en-US,en;q=0.9",
             }
-            response = requests.get(url, headers=request_headers, timeout=10)
+            response = http_get(url, headers=request_headers, timeout=10)
             response.raise_for_status()
 
             return response.text
@@ -44,8 +43,8 @@ class HuggingfaceBlogScraper(BaseScraper):
             print(f"Attempt {attempt} failed for URL {url} with error: {e}")
 
         try:
-            html_content = run_with_retry(
-                fn=get_html_content, max_retries=3, on_exception=on_exception
+            html_content = HTTP_RETRY_POLICY.call(
+                get_html_content, on_exception=on_exception
             )
 
             soup = BeautifulSoup(html_content, "html.parser")
@@ -78,30 +77,12 @@ class HuggingfaceBlogScraper(BaseScraper):
                 "Accept-Language": "en-US,en;q=0.9",
             }
 
-            feed = feedparser.parse(self.rss_url, request_headers=request_headers)
+            feed = parse_feed(self.rss_url, request_headers=request_headers)
             articles = []
 
-            for entry in feed["entries"]:
+            # Stale entries are skipped before fetching their page
+            for entry in self.iter_recent(feed["entries"], feed_entry_date):
                 try:
-                    published_date_str = entry.get("published", "")
-
-                    if published_date_str:
-                        # Example format: 'Wed, 14 Aug 2024 10:00:00 GMT'
-                        published_date_str = published_date_str[5:16]
-                        published_date = datetime_module.datetime.strptime(
-                            published_date_str, "%d %b %Y"
-                        ).date()
-
-                        # Filter articles older than 14 days
-                        if (
-                            published_date
-                            < datetime_module.date.today()
-                            - datetime_module.timedelta(days=14)
-                        ):
-                            continue
-
-                        published_date_str = published_date.isoformat()
-
                     authors, summary = self._get_author_and_summary(entry["link"])
 
                     article = Article(
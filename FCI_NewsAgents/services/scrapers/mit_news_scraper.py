@@ -1,13 +1,12 @@
-import datetime as datetime_module
 from typing import Any, Dict, List
 
 import dateparser
-import feedparser
 from bs4 import BeautifulSoup
 
 from FCI_NewsAgents.models.article import Article
-from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper
+from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper, feed_entry_date
 from FCI_NewsAgents.services.scrapers.registry import register
+from FCI_NewsAgents.utils.http_client import parse_feed
 
 
 @register("MITNews")
@@ -31,10 +30,11 @@ class MITNewsScraper(BaseScraper):
         print(f"Scraping articles from {self.rss_url}...")
         
         try:
-            feed = feedparser.parse(self.rss_url)
+            feed = parse_feed(self.rss_url)
             articles = []
             
-            for entry in feed.entries:
+            # The dates of the feed are checked before parsing the dates of the kept entries with dateparser, which is slow
+            for entry in self.iter_recent(feed.entries, feed_entry_date):
                 try:
                     title = entry.get("title", "").strip()
                     url = entry.get("link") or entry.get("id")
@@ -43,15 +43,7 @@ class MITNewsScraper(BaseScraper):
                     published_date = ""
                     if "published" in entry:
                         try:
-                            published_date = dateparser.parse(entry.published)
-                            published_date = published_date.isoformat()
-
-                            if published_date:
-                                # Filter articles older than 14 days
-                                pub_date_obj = datetime_module.datetime.fromisoformat(published_date)
-                                if pub_date_obj.date() < datetime_module.date.today() - datetime_module.timedelta(days=14):
-                                    print(f"Skipping article '{title}' as it is older than 14 days.")
-                                    continue
+                            published_date = dateparser.parse(entry.published).isoformat()
                         except Exception:
                             published_date = ""
                     
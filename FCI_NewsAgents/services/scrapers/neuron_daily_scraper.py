@@ -6,8 +6,10 @@ import requests
 from bs4 import BeautifulSoup
 
 from FCI_NewsAgents.models.article import Article
-from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper
+from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper, find_listing_date
 from FCI_NewsAgents.services.scrapers.registry import register
+from FCI_NewsAgents.utils.circuit_breaker import CircuitOpenError
+from FCI_NewsAgents.utils.http_client import http_get
 
 
 @register("NeuronDaily")
@@ -39,7 +41,7 @@ class NeuronDailyScraper(BaseScraper):
         }
 
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_get(url, headers=headers, timeout=10)
             response.raise_for_status()
         except requests.RequestException as e:
             print(f"Error fetching article content from {url}: {e}")
@@ -80,7 +82,7 @@ class NeuronDailyScraper(BaseScraper):
         }
 
         try:
-            response = requests.get(self.base_url, headers=headers, timeout=10)
+            response = http_get(self.base_url, headers=headers, timeout=10)
             response.raise_for_status() 
         except requests.RequestException as e:
             print(f"Error fetching URL: {e}")
@@ -92,7 +94,8 @@ class NeuronDailyScraper(BaseScraper):
         article_links = soup.find_all("a", attrs={'data-discover': "true"})
         
         news_list = []
-        for link_tag in article_links:
+        # Articles are in descending order: stop at the first card dated before the cutoff, without fetching it
+        for link_tag in self.iter_recent(article_links, lambda link_tag: find_listing_date(link_tag.get_text(" ", strip=True)), sorted_by_date=True):
             # Find the h2 tag within the current 'a' tag
             title_tag = link_tag.find("h2")
             
@@ -110,12 +113,10 @@ class NeuronDailyScraper(BaseScraper):
                 try:
                     authors, date, content = self.get_article_text(full_url)
 
-                    if date:
-                        # Filter articles older than 14 days
-                        article_date = datetime_module.datetime.fromisoformat(date)
-                        if article_date.date() < datetime_module.date.today() - datetime_module.timedelta(days=14):
-                            print(f"Skipping article '{title}' as it is older than 14 days.")
-                            break # articles are in descending order, so we can stop here
+                    # Cards without a date are checked against the date of their page
+                    if self.is_stale(date):
+                        print(f"Skipping article '{title}' as it is older than {self.max_age_days} days.")
+                        break # articles are in descending order, so we can stop here
 
                     article = Article(
                         url=full_url,
@@ -128,6 +129,9 @@ class NeuronDailyScraper(BaseScraper):
                     news_list.append(article)
 
                     print(f"Successfully scraped: {title}")
+                except CircuitOpenError as e:
+                    print(f"Skipping remaining articles: {e}")
+                    break
                 except Exception as e:
                     print(f"Error processing article {full_url}: {e}")
                     continue
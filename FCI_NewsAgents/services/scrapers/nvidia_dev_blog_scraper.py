@@ -1,12 +1,11 @@
-import datetime as datetime_module
 from typing import Any, Dict, List
 
-import feedparser
 from bs4 import BeautifulSoup
 
 from FCI_NewsAgents.models.article import Article
-from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper
+from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper, feed_entry_date
 from FCI_NewsAgents.services.scrapers.registry import register
+from FCI_NewsAgents.utils.http_client import parse_feed
 
 
 @register("NVIDIADevBlog")
@@ -36,17 +35,13 @@ class NVIDIADevBlogScraper(BaseScraper):
         
         for rss_url in self.rss_urls:
             try:
-                feed = feedparser.parse(rss_url)
+                feed = parse_feed(rss_url)
                 
-                for entry in feed["entries"]:
+                # The feeds are sorted newest first
+                for entry in self.iter_recent(feed["entries"], feed_entry_date, sorted_by_date=True):
                     try:
                         published_date = entry.get("published", "")
 
-                        if published_date:
-                            published_datetime = datetime_module.datetime.fromisoformat(published_date)
-                            if published_datetime.date() < datetime_module.date.today() - datetime_module.timedelta(days=14):
-                                continue
-
                         soup = BeautifulSoup(entry["summary"], "lxml")
                         for img in soup.find_all("img"):
                             img.decompose()
@@ -1,11 +1,11 @@
 import datetime as datetime_module
 from typing import Any, Dict, List
 
-import feedparser
 
 from FCI_NewsAgents.models.article import Article
-from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper
+from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper, feed_entry_date
 from FCI_NewsAgents.services.scrapers.registry import register
+from FCI_NewsAgents.utils.http_client import parse_feed
 
 
 @register("OpenAINews")
@@ -31,23 +31,17 @@ class OpenAINewsScraper(BaseScraper):
                 "Accept-Language": "en-US,en;q=0.9",
             }
 
-            feed = feedparser.parse(self.rss_url, request_headers=request_headers)
+            feed = parse_feed(self.rss_url, request_headers=request_headers)
             articles = []
 
-            for entry in feed['entries']:
+            for entry in self.iter_recent(feed['entries'], feed_entry_date):
                 try:
                     published_date_str = entry.get('published', '')
 
                     if published_date_str:
                         # Example format: 'Wed, 14 Aug 2024 10:00:00 GMT'
                         published_date_str = published_date_str[5:16]
-                        published_date = datetime_module.datetime.strptime(published_date_str, '%d %b %Y').date()
-
-                        # Filter articles older than 14 days
-                        if published_date < datetime_module.date.today() - datetime_module.timedelta(days=14):
-                            continue
-
-                        published_date_str = published_date.isoformat()
+                        published_date_str = datetime_module.datetime.strptime(published_date_str, '%d %b %Y').date().isoformat()
 
                     article = Article(
                         url=entry['link'],
@@ -1,8 +1,78 @@
-SCRAPERS = {}
+import importlib
+from typing import Dict, Iterator, Mapping, Type
+
+ENTRY_POINT_GROUP = "fci_newsagents.scrapers"
+"""Entry point group under which installed packages can register more scrapers (`name = "module:Class"`)."""
+
+BUILTIN_SCRAPERS: Dict[str, str] = {
+    "GoogleResearch": "FCI_NewsAgents.services.scrapers.google_research_scraper:GoogleResearchScraper",
+    "HuggingfaceBlog": "FCI_NewsAgents.services.scrapers.huggingface_blog_scraper:HuggingfaceBlogScraper",
+    "MITNews": "FCI_NewsAgents.services.scrapers.mit_news_scraper:MITNewsScraper",
+    "NeuronDaily": "FCI_NewsAgents.services.scrapers.neuron_daily_scraper:NeuronDailyScraper",
+    "NVIDIADevBlog": "FCI_NewsAgents.services.scrapers.nvidia_dev_blog_scraper:NVIDIADevBlogScraper",
+    "OpenAINews": "FCI_NewsAgents.services.scrapers.openai_news_scraper:OpenAINewsScraper",
+    "TechRepublic": "FCI_NewsAgents.services.scrapers.tech_republic_scraper:TechRepublicScraper",
+    "TLDRNews": "FCI_NewsAgents.services.scrapers.tldr_news_scraper:TLDRNewsScraper",
+}
+"""Entry points of the built-in scrapers, by registered name."""
+
+
+class ScraperRegistry(Mapping[str, Type]):
+    """
+    Scraper classes by name, imported on first access.
+
+    Scrapers are known by their entry points (`module:Class`), so listing them does not import their modules
+    and their dependencies (Selenium, dateparser, ...): a run only imports the scrapers it executes.
+    Classes decorated with `@register` are added when their module is imported.
+    """
+
+    def __init__(self, builtin: Dict[str, str]):
+        self._entry_points: Dict[str, str] = dict(builtin)
+        self._classes: Dict[str, Type] = {}
+        self._discovered = False
+
+    def _discover(self) -> None:
+        """Add the scrapers of the installed packages declaring the `ENTRY_POINT_GROUP` entry point group"""
+        if self._discovered:
+            return
+        self._discovered = True
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            self._entry_points.setdefault(entry_point.name, entry_point.value)
+
+    def add(self, name: str, cls: Type) -> None:
+        self._classes[name] = cls
+
+    def __getitem__(self, name: str) -> Type:
+        if name not in self._classes:
+            self._discover()
+            if name not in self._entry_points:
+                raise KeyError(name)
+            module_name, _, class_name = self._entry_points[name].partition(":")
+            module = importlib.import_module(module_name)
+            # Importing the module registers the class, unless it is not decorated (third-party entry points)
+            self._classes.setdefault(name, getattr(module, class_name))
+        return self._classes[name]
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        yield from self._entry_points
+        yield from (name for name in self._classes if name not in self._entry_points)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, name: object) -> bool:
+        self._discover()
+        return name in self._entry_points or name in self._classes
+
+
+SCRAPERS = ScraperRegistry(BUILTIN_SCRAPERS)
+
 
 def register(name: str):
     def decorator(cls):
-        SCRAPERS[name] = cls
+        SCRAPERS.add(name, cls)
         return cls
     return decorator
-
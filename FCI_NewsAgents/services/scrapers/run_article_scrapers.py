@@ -2,19 +2,23 @@ import sys
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
 
 # Add current directory to path for local imports
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
+from FCI_NewsAgents.core.config import SourcesConfig
+from FCI_NewsAgents.models.article import Article
 from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper
-from FCI_NewsAgents.services.scrapers.huggingface_blog_scraper import (
-    HuggingfaceBlogScraper,
-)
-from FCI_NewsAgents.services.scrapers.mit_news_scraper import MITNewsScraper
 from FCI_NewsAgents.services.scrapers.registry import SCRAPERS
+from FCI_NewsAgents.services.scrapers.sources import SourceCache, SourcePlan, plan_sources
+from FCI_NewsAgents.utils.circuit_breaker import CIRCUIT_BREAKERS
+from FCI_NewsAgents.utils.metrics import inc, timer
+from FCI_NewsAgents.utils.tracing import span
 
 
 def _run_scraper_safe(scraper: BaseScraper) -> tuple:
@@ -38,8 +42,17 @@ def _run_scraper_safe(scraper: BaseScraper) -> tuple:
             print(f"[{thread_name}] {scraper_name} is disabled, skipping")
             return (scraper_name, [], "Scraper disabled", 0)
 
-        articles = scraper.scrape()
+        # Skip the scraper when all its hosts are known to be down, instead of waiting for every timeout again
+        breakers = [CIRCUIT_BREAKERS.get(host) for host in scraper.get_hosts()]
+        if breakers and all(breaker.is_open() for breaker in breakers):
+            error_msg = f"Skipped: {breakers[0].open_error()}"
+            print(f"[{thread_name}] {scraper_name} {error_msg}")
+            return (scraper_name, [], error_msg, 0)
+
+        with span("scrape", source=scraper_name), timer("scraper", scraper=scraper_name):
+            articles = scraper.scrape()
         duration = time.time() - start_time
+        inc("scraped_articles", len(articles or []), scraper=scraper_name)
 
         if articles:
             print(
@@ -50,6 +63,9 @@ def _run_scraper_safe(scraper: BaseScraper) -> tuple:
             print(
                 f"[{thread_name}]{scraper_name} completed: 0 articles in {duration:.2f}s"
             )
+            open_breakers = [breaker for breaker in breakers if breaker.is_open()]
+            if open_breakers:
+                return (scraper_name, [], str(open_breakers[0].open_error()), duration)
             return (scraper_name, [], "No articles found", duration)
 
     except Exception as e:
@@ -61,17 +77,125 @@ def _run_scraper_safe(scraper: BaseScraper) -> tuple:
         return (scraper_name, [], error_msg, duration)
 
 
+def _iter_scraper_results(
+    scrapers: List[BaseScraper], parallel: bool = True, max_workers: int = -1
+) -> Iterator[Tuple[str, List[Any], str | None, float]]:
+    """
+    Run the scrapers and yield `(scraper_name, articles_list, error_message, duration)` as each scraper completes.
+
+    If `max_workers` is -1, use 1 worker per scraper, capped at 16 workers. `max_workers` is ignored if `parallel` is False.
+    """
+    if max_workers == -1:
+        max_workers = min(len(scrapers), 16)
+
+    if not scrapers:
+        return
+
+    if not parallel:
+        # Sequential execution (original behavior)
+        print("Running scrapers sequentially...")
+        for scraper in scrapers:
+            yield _run_scraper_safe(scraper)
+        return
+
+    print(
+        f"Running {len(scrapers)} scrapers in parallel with {max_workers} workers..."
+    )
+
+    # Use ThreadPoolExecutor for parallel execution
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="Scraper"
+    ) as executor:
+        # Submit all scraper tasks
+        future_to_scraper = {
+            executor.submit(_run_scraper_safe, scraper): scraper.get_name()
+            for scraper in scrapers
+        }
+
+        # Collect results as they complete
+        for future in as_completed(future_to_scraper):
+            scraper_name = future_to_scraper[future]
+
+            try:
+                # Get the result (this will re-raise any exception from the thread)
+                yield future.result(timeout=300)  # 5 min timeout per scraper
+            except Exception as e:
+                print(
+                    f"✗ Unexpected error retrieving result from {scraper_name}: {e}"
+                )
+                yield (scraper_name, [], str(e), 0)
+
+
+def _iter_planned_results(
+    plan: SourcePlan, config: SourcesConfig, parallel: bool, max_workers: int
+) -> Iterator[Tuple[str, List[Any], str | None, float]]:
+    """
+    Yield the cached articles of the sources of the plan that are not due, then run the due scrapers and yield their
+    results as each one completes, saving the articles of the successful ones to the cache.
+    """
+    cache = SourceCache(config.CACHE_DIR)
+    for name in plan.cached:
+        if name in SCRAPERS:
+            articles = [Article(**item) for item in cache.load(name)]
+            print(f"{name}: reusing {len(articles)} articles scraped at {plan.last_scraped[name]:%Y-%m-%d %H:%M}")
+            inc("source_cache_hits", source=name)
+            yield (name, articles, None, 0)
+
+    due = [name for name in plan.due if name in SCRAPERS]
+    scrapers = [SCRAPERS[name]() for name in due]
+    registry_names = {scraper.get_name(): name for scraper, name in zip(scrapers, due)}
+    started_at = datetime.now()
+    for scraper_name, articles, error, duration in _iter_scraper_results(scrapers, parallel, max_workers):
+        if error is None:
+            # Failed scrapes are not cached: the source is due again on the next run
+            cache.save(registry_names.get(scraper_name, scraper_name), [asdict(article) for article in articles], started_at)
+        yield (scraper_name, articles, error, duration)
+
+
+def iter_scraped_articles(
+    parallel: bool = True,
+    max_workers: int = -1,
+    plan: SourcePlan | None = None,
+    config: SourcesConfig | None = None,
+) -> Iterator[Any]:
+    """
+    Run the article scrapers and yield their articles as soon as each scraper completes,
+    instead of waiting for the slowest one (streaming mode of the workflow).
+
+    Args:
+        parallel: If True, run scrapers in parallel. If False, run sequentially (default: True)
+        max_workers: Maximum number of concurrent threads (default: -1, 1 worker per scraper capped at 16)
+        plan: Sources to scrape and to reuse from the cache (default: `plan_sources(config)`)
+        config: Enabled sources, refresh intervals and cache folder (default: `SourcesConfig()`)
+
+    Yields:
+        Articles of the scrapers, grouped by scraper in completion order (cached sources first)
+    """
+    config = config or SourcesConfig()
+    plan = plan or plan_sources(config)
+    for name, articles, error, duration in _iter_planned_results(plan, config, parallel, max_workers):
+        if error is not None:
+            print(f"{name}: {error}")
+        yield from articles
+
+
 def scrape_articles(
-    parallel: bool = True, max_workers: int = -1
+    parallel: bool = True,
+    max_workers: int = -1,
+    plan: SourcePlan | None = None,
+    config: SourcesConfig | None = None,
 ) -> List[Dict[str, Any]]:
     """
-    Run all article scrapers and return results as a list.
+    Run the article scrapers whose refresh interval has elapsed and return their results, with the cached results
+    of the other selected scrapers, as a list.
 
     If `max_workers` is -1, use 1 worker per scraper, capped at 16 workers. `max_workers` is ignored if `parallel` is False.
 
     Args:
         parallel: If True, run scrapers in parallel. If False, run sequentially (default: True)
         max_workers: Maximum number of concurrent threads (default: -1)
+        plan: Sources to scrape and to reuse from the cache (default: `plan_sources(config)`)
+        config: Enabled sources, refresh intervals and cache folder (default: `SourcesConfig()`)
 
     Returns:
         List of article dictionaries from all scrapers
@@ -79,11 +203,9 @@ def scrape_articles(
     print("Starting article scraping...")
     overall_start_time = time.time()
 
-    scrapers = [scraper_cls() for scraper_cls in SCRAPERS.values()]
-    # scrapers = [HuggingfaceBlogScraper()]
-
-    if max_workers == -1:
-        max_workers = min(len(scrapers), 16)
+    config = config or SourcesConfig()
+    plan = plan or plan_sources(config)
+    scrapers = [name for name in plan.due + plan.cached if name in SCRAPERS]
 
     all_articles = []
     scraping_stats = {
@@ -93,78 +215,21 @@ def scrape_articles(
         "per_scraper": {},
     }
 
-    if parallel:
-        print(
-            f"Running {len(scrapers)} scrapers in parallel with {max_workers} workers..."
-        )
-
-        # Use ThreadPoolExecutor for parallel execution
-        with ThreadPoolExecutor(
-            max_workers=max_workers, thread_name_prefix="Scraper"
-        ) as executor:
-            # Submit all scraper tasks
-            future_to_scraper = {
-                executor.submit(_run_scraper_safe, scraper): scraper.get_name()
-                for scraper in scrapers
-            }
-
-            # Collect results as they complete
-            for future in as_completed(future_to_scraper):
-                scraper_name = future_to_scraper[future]
-
-                try:
-                    # Get the result (this will re-raise any exception from the thread)
-                    name, articles, error, duration = future.result(
-                        timeout=300
-                    )  # 5 min timeout per scraper
-
-                    # Store statistics
-                    scraping_stats["per_scraper"][name] = {
-                        "article_count": len(articles),
-                        "duration": duration,
-                        "error": error,
-                        "success": error is None,
-                    }
-
-                    if error is None:
-                        all_articles.extend(articles)
-                        scraping_stats["successful_scrapers"] += 1
-                        scraping_stats["total_articles"] += len(articles)
-                    else:
-                        scraping_stats["failed_scrapers"] += 1
-
-                except Exception as e:
-                    print(
-                        f"✗ Unexpected error retrieving result from {scraper_name}: {e}"
-                    )
-                    scraping_stats["failed_scrapers"] += 1
-                    scraping_stats["per_scraper"][scraper_name] = {
-                        "article_count": 0,
-                        "duration": 0,
-                        "error": str(e),
-                        "success": False,
-                    }
-
-    else:
-        # Sequential execution (original behavior)
-        print("Running scrapers sequentially...")
-
-        for scraper in scrapers:
-            name, articles, error, duration = _run_scraper_safe(scraper)
-
-            scraping_stats["per_scraper"][name] = {
-                "article_count": len(articles),
-                "duration": duration,
-                "error": error,
-                "success": error is None,
-            }
-
-            if error is None:
-                all_articles.extend(articles)
-                scraping_stats["successful_scrapers"] += 1
-                scraping_stats["total_articles"] += len(articles)
-            else:
-                scraping_stats["failed_scrapers"] += 1
+    for name, articles, error, duration in _iter_planned_results(plan, config, parallel, max_workers):
+        # Store statistics
+        scraping_stats["per_scraper"][name] = {
+            "article_count": len(articles),
+            "duration": duration,
+            "error": error,
+            "success": error is None,
+        }
+
+        if error is None:
+            all_articles.extend(articles)
+            scraping_stats["successful_scrapers"] += 1
+            scraping_stats["total_articles"] += len(articles)
+        else:
+            scraping_stats["failed_scrapers"] += 1
 
     # Print summary
     total_duration = time.time() - overall_start_time
@@ -186,6 +251,12 @@ def scrape_articles(
         if stats["error"]:
             print(f"Error: {stats['error']}")
 
+    open_circuits = CIRCUIT_BREAKERS.open_circuits()
+    if open_circuits:
+        print("\nOpen circuits:")
+        for host, error in open_circuits.items():
+            print(f"{host}: {error}")
+
     print("=" * 60 + "\n")
     return all_articles
 
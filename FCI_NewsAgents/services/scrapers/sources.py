@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from FCI_NewsAgents.core.config import SourcesConfig
+from FCI_NewsAgents.services.scrapers.registry import SCRAPERS
+
+ARXIV_SOURCE = "arXiv"
+"""Name of the arXiv cs.AI papers source, selected like the article scrapers."""
+
+REFRESH_TOLERANCE = 0.05
+"""Share of its interval by which a source may be early and still be due, so that e.g. an hourly source scraped
+a few seconds later than the previous hourly run is not skipped until the run after."""
+
+
+def all_sources() -> List[str]:
+    """Names of every source: the registered article scrapers, then arXiv."""
+    return list(SCRAPERS) + [ARXIV_SOURCE]
+
+
+def resolve_sources(requested: List[str] | None) -> List[str]:
+    """
+    Validate a selection of sources, case-insensitively.
+
+    Args:
+        requested (List[str] | None): Names of the sources, or None for every source.
+
+    Returns:
+        List[str]: The registered names of the selected sources.
+
+    Raises:
+        ValueError: If a source is unknown.
+    """
+    names = all_sources()
+    if requested is None:
+        return names
+
+    by_lowercase = {name.lower(): name for name in names}
+    unknown = [name for name in requested if name.lower() not in by_lowercase]
+    if unknown:
+        raise ValueError(f"Unknown source(s): {', '.join(unknown)}. Available sources: {', '.join(names)}")
+    return list(dict.fromkeys(by_lowercase[name.lower()] for name in requested))
+
+
+class SourceCache:
+    """
+    Results of the last successful scrape of each source, in `<root>/<source>.json`, so that a run can reuse them
+    instead of scraping a source again within its refresh interval.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, source: str) -> str:
+        # Source names are ASCII identifiers, the hash only guards against path separators in plugin names
+        safe_name = source if source.isidentifier() else hashlib.sha1(source.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, f"{safe_name}.json")
+
+    def _read(self, source: str) -> Dict[str, Any] | None:
+        path = self._path(source)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring the cache of {source}: {e}")
+            return None
+
+    def last_scraped(self, source: str) -> datetime | None:
+        entry = self._read(source)
+        return datetime.fromisoformat(entry["scraped_at"]) if entry else None
+
+    def load(self, source: str) -> List[Dict[str, Any]] | None:
+        """The items of the last scrape of a source, as saved, or None if it was never cached."""
+        entry = self._read(source)
+        return entry["items"] if entry else None
+
+    def save(self, source: str, items: List[Dict[str, Any]], scraped_at: datetime) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(source)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"source": source, "scraped_at": scraped_at.isoformat(), "items": items}, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+
+@dataclass
+class SourcePlan:
+    """Which selected sources a run scrapes, and which ones it reuses from the cache."""
+    due: List[str] = field(default_factory=list)
+    cached: List[str] = field(default_factory=list)
+    last_scraped: Dict[str, datetime] = field(default_factory=dict)
+
+    def includes(self, source: str) -> bool:
+        return source in self.due or source in self.cached
+
+
+def plan_sources(
+    config: SourcesConfig,
+    requested: List[str] | None = None,
+    force_refresh: bool = False,
+    now: datetime | None = None,
+) -> SourcePlan:
+    """
+    Split the selected sources into the ones whose refresh interval has elapsed (or that were never scraped)
+    and the ones whose last scrape is recent enough to be reused.
+
+    Args:
+        config (SourcesConfig): The enabled sources, refresh intervals and cache folder.
+        requested (List[str] | None): Sources selected for this run. Defaults to the enabled sources of the config.
+        force_refresh (bool): Scrape every selected source, whatever its interval.
+        now (datetime | None): The current time. Defaults to now.
+
+    Raises:
+        ValueError: If a source is unknown.
+    """
+    now = now or datetime.now()
+    cache = SourceCache(config.CACHE_DIR)
+    plan = SourcePlan()
+    for source in resolve_sources(requested if requested is not None else config.ENABLED_SOURCES):
+        interval = timedelta(hours=config.REFRESH_INTERVAL_HOURS.get(source, 0))
+        last_scraped = cache.last_scraped(source) if interval and not force_refresh else None
+        if last_scraped is not None and now - last_scraped >= interval * (1 - REFRESH_TOLERANCE):
+            last_scraped = None
+
+        if last_scraped is None:
+            plan.due.append(source)
+        else:
+            plan.cached.append(source)
+            plan.last_scraped[source] = last_scraped
+    return plan
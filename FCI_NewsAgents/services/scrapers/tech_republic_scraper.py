@@ -2,7 +2,6 @@ import datetime as datetime_module
 from dataclasses import asdict
 from typing import Any, Dict, List
 
-import feedparser
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -11,8 +10,35 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium_stealth import stealth
 
 from FCI_NewsAgents.models.article import Article
-from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper
+from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper, feed_entry_date
+from FCI_NewsAgents.services.scrapers.browser_pool import create_browser_pool
 from FCI_NewsAgents.services.scrapers.registry import register
+from FCI_NewsAgents.utils.circuit_breaker import CIRCUIT_BREAKERS, CircuitOpenError
+from FCI_NewsAgents.utils.http_client import parse_feed
+
+
+def _new_chrome_driver() -> webdriver.Chrome:
+    """A headless Chrome with stealth settings"""
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    driver = webdriver.Chrome(options=options)
+
+    # Apply stealth
+    stealth(driver,
+        languages=["en-US", "en"],
+        vendor="Google Inc.",
+        platform="Win32",
+        webgl_vendor="Intel Inc.",
+        renderer="Intel Iris OpenGL Engine",
+        fix_hairline=True,
+    )
+    return driver
+
+
+# The articles are scraped one by one, a single browser is reused for all of them
+BROWSER_POOL = create_browser_pool(_new_chrome_driver, max_idle=1)
 
 
 @register("TechRepublic")
@@ -27,31 +53,26 @@ class TechRepublicScraper(BaseScraper):
     
     def get_content(self, url: str) -> Dict[str, Any]:
         """Extract content from a TechRepublic article URL"""
-        options = webdriver.ChromeOptions()
-        options.add_argument("--headless=new")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        driver = webdriver.Chrome(options=options)
-
-        # Apply stealth
-        stealth(driver,
-            languages=["en-US", "en"],
-            vendor="Google Inc.",
-            platform="Win32",
-            webgl_vendor="Intel Inc.",
-            renderer="Intel Iris OpenGL Engine",
-            fix_hairline=True,
-        )
-
-        driver.get(url)
+        # Fail fast before launching a browser when the host is known to be down
+        breaker = CIRCUIT_BREAKERS.for_url(url)
+        breaker.before_call()
 
         try:
-            # wait until article loads
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "article"))
-            )
+            with BROWSER_POOL.driver() as driver:
+                try:
+                    driver.get(url)
 
-            soup = BeautifulSoup(driver.page_source, "html.parser")
+                    # wait until article loads
+                    WebDriverWait(driver, 20).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, "article"))
+                    )
+                except Exception as e:
+                    breaker.record_failure(e)
+                    raise
+                breaker.record_success()
+                page_source = driver.page_source
+
+            soup = BeautifulSoup(page_source, "html.parser")
 
             # === extract metadata ===
             authors: List[str] = [span.get_text(strip=True) for span in soup.select('span[property="name"]')]
@@ -101,8 +122,6 @@ class TechRepublicScraper(BaseScraper):
         except Exception as e:
             print("Error extracting content:", e)
             return None
-        finally:
-            driver.quit()
     
     def scrape(self) -> List[Article]:
         """Scrape articles from TechRepublic RSS feed"""
@@ -111,25 +130,25 @@ class TechRepublicScraper(BaseScraper):
         articles: List[Article] = []
         
         try:
-            feed = feedparser.parse(self.rss_url)
+            feed = parse_feed(self.rss_url)
             
-            for entry in feed.entries:
+            # The feed is sorted newest first: stale entries are skipped before a browser loads their page
+            for entry in self.iter_recent(feed.entries, feed_entry_date, sorted_by_date=True):
                 try:
                     print(f"Scraping article: {entry.title}")
                     article_data = self.get_content(entry.link)
 
                     if article_data:
-                        published_date_str = article_data.get('published', '')
-
-                        if published_date_str:
-                            published_date = datetime_module.datetime.fromisoformat(published_date_str).date()
-                            if published_date < datetime_module.date.today() - datetime_module.timedelta(days=14):
-                                print(f"Skipping article '{entry.title}' as it is older than 14 days.")
-                                continue
+                        if self.is_stale(article_data.get('published_date')):
+                            print(f"Skipping article '{entry.title}' as it is older than {self.max_age_days} days.")
+                            continue
 
                         article_data["title"] = entry.title
                         articles.append(Article(**article_data))
                         print(f"Successfully scraped: {entry.title}")
+                except CircuitOpenError as e:
+                    print(f"Skipping remaining articles: {e}")
+                    break
                 except Exception as e:
                     print(f"Error scraping article {entry.link}: {e}")
                     continue
@@ -2,12 +2,12 @@ import datetime as datetime_module
 from typing import Any, Dict, List
 import re
 
-import feedparser
 from bs4 import BeautifulSoup
 
 from FCI_NewsAgents.models.article import Article
 from FCI_NewsAgents.services.scrapers.base_scraper import BaseScraper
 from FCI_NewsAgents.services.scrapers.registry import register
+from FCI_NewsAgents.utils.http_client import parse_feed
 
 
 @register("TLDRNews")
@@ -52,7 +52,7 @@ class TLDRNewsScraper(BaseScraper):
             print(f"Scraping articles from {url}...")
 
             try:
-                feed = feedparser.parse(url)
+                feed = parse_feed(url)
                 soup = BeautifulSoup(feed['feed']['summary'], 'html.parser')
 
                 articles = soup.find_all('article')
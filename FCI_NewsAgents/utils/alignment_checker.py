@@ -1,18 +1,23 @@
 import os
 import sys
 from queue import Queue
-from threading import Thread
+from threading import Lock, Thread
 from typing import Dict, List, Literal, Tuple
 
 import numpy as np
-import requests
 from dotenv import load_dotenv
 from pydantic import BaseModel
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
+from FCI_NewsAgents.core.config import get_fpt_api_base_url
 from FCI_NewsAgents.models.document import Document
+from FCI_NewsAgents.services.document_repository.repository import DocumentRepository
+from FCI_NewsAgents.utils.http_client import get_session
 from FCI_NewsAgents.utils.logger import file_writer
+from FCI_NewsAgents.utils.metrics import inc, timer
+from FCI_NewsAgents.utils.retry import EMBEDDING_RETRY_POLICY
+from FCI_NewsAgents.utils.tracing import TRACER, span
 
 
 class EmbeddingRequest(BaseModel):
@@ -63,7 +68,7 @@ def get_embedding(texts: List[str]) -> np.ndarray:
     
     print(f"API key found, proceeding with the request...")
 
-    url: str = "https://mkp-api.fptcloud.com/v1/embeddings"
+    url: str = f"{get_fpt_api_base_url()}/v1/embeddings"
 
     headers: Dict[str, str] = {
         "Content-Type": "application/json",
@@ -79,11 +84,80 @@ def get_embedding(texts: List[str]) -> np.ndarray:
         input_type="passage"
     ).model_dump()
 
-    response = requests.post(url, headers=headers, json=payload)
-    json_response = response.json()
-    embedding_response = EmbeddingResponse.model_validate(json_response)
+    def post_embedding_request() -> Dict:
+        with timer("embedding_call", model=payload["model"]):
+            response = get_session().post(url, headers=headers, json=payload, timeout=(10, 120))
+        response.raise_for_status()
+        return response.json()
+
+    def on_exception(e: Exception, attempt: int):
+        print(f"Attempt {attempt} to get embeddings failed with error: {e}")
+
+    with span("embedding_call", model=payload["model"], inputs=len(texts)) as embedding_span:
+        json_response = EMBEDDING_RETRY_POLICY.call(post_embedding_request, on_exception=on_exception)
+        embedding_response = EmbeddingResponse.model_validate(json_response)
+        embedding_span.set_attribute("tokens", embedding_response.usage.prompt_tokens)
+    inc("embedding_tokens", embedding_response.usage.prompt_tokens, model=embedding_response.model)
     return np.array([item.embedding for item in embedding_response.data])
 
+_QUERY_EMBEDDINGS: Dict[Tuple[str, ...], np.ndarray] = {}
+_QUERY_EMBEDDINGS_LOCK = Lock()
+
+def build_query_strings(positive_query_strings: List[str], negative_query_strings: List[str]) -> List[str]:
+    """The alignment queries as embedded by multilingual-e5-large: positive then negative keywords, prefixed with 'query: '."""
+    return ['query: ' + qs for qs in positive_query_strings + negative_query_strings]
+
+def get_query_embeddings(query_strings: List[str]) -> np.ndarray:
+    """
+    Get embeddings for the alignment queries, computed once per process.
+
+    The queries are the same for every call, which matters when documents are aligned in many micro-batches (streaming mode).
+
+    Args:
+        query_strings (List[str]): The query texts.
+
+    Returns:
+        A numpy array of embeddings for the queries.
+    """
+    key = tuple(query_strings)
+    with _QUERY_EMBEDDINGS_LOCK:
+        if key not in _QUERY_EMBEDDINGS:
+            embeddings = get_embedding(query_strings)
+            if embeddings is None:
+                return None
+            _QUERY_EMBEDDINGS[key] = embeddings
+        return _QUERY_EMBEDDINGS[key]
+
+def get_document_embeddings(
+    documents: List[Document], key_strings: List[str], repository: DocumentRepository | None = None
+) -> np.ndarray:
+    """
+    Get the embeddings of the documents, reusing the ones stored in the repository.
+
+    Args:
+        documents (List[Document]): The documents.
+        key_strings (List[str]): The text embedded for each document.
+        repository (DocumentRepository | None): The document repository, or None to embed every document.
+
+    Returns:
+        A numpy array of embeddings for the documents.
+    """
+    if repository is None:
+        return get_embedding(key_strings)
+
+    urls = [d.url for d in documents]
+    embeddings = repository.load_embeddings(urls, key_strings)
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    inc("embedding_cache_hits", len(documents) - len(missing))
+    if missing:
+        new_embeddings = get_embedding([key_strings[i] for i in missing])
+        if new_embeddings is None:
+            return None
+        repository.save_embeddings([urls[i] for i in missing], [key_strings[i] for i in missing], new_embeddings)
+        for i, embedding in zip(missing, new_embeddings):
+            embeddings[i] = embedding
+    return np.array(embeddings)
+
 def cosine_similarity(query_embeddings: np.ndarray, key_embeddings: np.ndarray) -> np.ndarray:
     """
     Compute cosine similarity between query embeddings and key embeddings.
@@ -164,6 +238,7 @@ def get_most_aligned_documents(
     negative_query_strings: List[str],
     documents: List[Document],
     threshold: float = 0.0,
+    repository: DocumentRepository | None = None,
 ) -> List[Document]:
     """
     Get the most aligned documents to the query string based on cosine similarity of embeddings.
@@ -177,6 +252,8 @@ def get_most_aligned_documents(
         negative_query_strings (List[str]): Irrelevant keywords to check for the documents' alignment
         documents (List[Document]): A list of Document objects.
         threshold (float): Similarity score threshold to filter documents. This will be clamped between -1 and 1 if out of range. Default is 0.0.
+        repository (DocumentRepository | None): Where the embeddings of the documents are kept across runs. Only the documents
+            without a stored embedding of their current title and summary are embedded.
     Returns:
         List[Document]: The most aligned Document objects based on the criterion.
     """
@@ -186,12 +263,13 @@ def get_most_aligned_documents(
     
     # According to the specifications of multilingual-e5-large, 
     # queries must be prefixed with 'query: ' and passages with 'passage: '
-    query_strings = ['query: ' + qs for qs in positive_query_strings + negative_query_strings]
+    query_strings = build_query_strings(positive_query_strings, negative_query_strings)
     key_strings = [f'passage: Title: {d.title} Summary: {d.summary}' for d in documents]
     threshold = max(-1.0, min(1.0, threshold))
 
-    query_embeddings = get_embedding(query_strings)
-    key_embeddings = get_embedding(key_strings)
+    query_embeddings = get_query_embeddings(query_strings)
+    with span("embed_batch", documents=len(documents)) as batch_span:
+        key_embeddings = get_document_embeddings(documents, key_strings, repository)
     similarities = cosine_similarity(query_embeddings, key_embeddings)
     positive_similarities = similarities[:, :len(positive_query_strings)]
     negative_similarities = similarities[:, len(positive_query_strings):]
@@ -201,6 +279,12 @@ def get_most_aligned_documents(
 
     documents_with_scores: List[Tuple[Document, float, float]] = list(zip(documents, best_positive_scores, best_negative_scores))
 
+    # The batch is embedded in one call, so each document is attributed the span of the whole batch
+    for doc, pos, neg in documents_with_scores:
+        TRACER.record_span(
+            "embed", batch_span.start_ns, batch_span.end_ns, document=doc.url, alignment_score=float(pos - neg)
+        )
+
     with open("alignment_checker.csv", "w", encoding="utf-8") as f:
         import csv
         writer = csv.writer(f)
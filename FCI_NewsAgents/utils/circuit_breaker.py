@@ -0,0 +1,241 @@
+import threading
+import time
+from enum import Enum
+from typing import Dict
+from urllib.parse import urlsplit
+
+from FCI_NewsAgents.utils.metrics import inc
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit is open. Carries the error that opened the circuit."""
+
+    def __init__(self, endpoint: str, retry_in: float | None, last_error: str = ""):
+        when = "until the next run" if retry_in is None else f"for {retry_in:.1f}s"
+        message = f"Circuit for '{endpoint}' is open {when}"
+        if last_error:
+            message += f" (last error: {last_error})"
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        self.last_error = last_error
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single endpoint (host).
+
+    - CLOSED: calls go through. After `failure_threshold` consecutive failures, the circuit opens.
+    - OPEN: calls are rejected with `CircuitOpenError`, carrying the cached error that opened the circuit.
+        If `recovery_timeout` is None, the circuit stays open until `half_open()` is called (at the start of the next
+        run), otherwise until `recovery_timeout` seconds have passed.
+    - HALF_OPEN: a single trial call goes through. Success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, endpoint: str, failure_threshold: int = 3, recovery_timeout: float | None = None):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._last_error = ""
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    @property
+    def last_error(self) -> str:
+        """The error that last opened the circuit."""
+        return self._last_error
+
+    def _current_state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and self.recovery_timeout is not None
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def is_open(self) -> bool:
+        """Check whether calls are currently rejected, without taking the half-open trial slot."""
+        with self._lock:
+            state = self._current_state()
+            return state == CircuitState.OPEN or (state == CircuitState.HALF_OPEN and self._trial_in_flight)
+
+    def open_error(self) -> CircuitOpenError:
+        """Build the error raised for rejected calls."""
+        retry_in = None
+        if self.recovery_timeout is not None:
+            retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+        return CircuitOpenError(self.endpoint, retry_in, self._last_error)
+
+    def before_call(self) -> None:
+        """
+        Check that a call may go through.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a trial call already in flight.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.CLOSED:
+                return
+            if state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            inc("circuit_rejections", endpoint=self.endpoint)
+            raise self.open_error()
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self, error: BaseException | str | None = None) -> None:
+        """
+        Record a failed call, opening the circuit when the threshold is reached or a trial call failed.
+
+        Args:
+            error (BaseException | str | None): The error of the call, cached and reported while the circuit is open.
+        """
+        with self._lock:
+            self._consecutive_failures += 1
+            if error is not None:
+                self._last_error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+
+            if self._state == CircuitState.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != CircuitState.OPEN:
+                    print(f"Circuit for '{self.endpoint}' opened after {self._consecutive_failures} consecutive failures")
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def half_open(self) -> None:
+        """Let an open circuit try one call again. Called at the start of a new run."""
+        with self._lock:
+            if self._state == CircuitState.OPEN:
+                self._state = CircuitState.HALF_OPEN
+                self._trial_in_flight = False
+
+
+def host_of(url: str) -> str:
+    """Get the lowercase host of a URL, used as circuit breaker key."""
+    return urlsplit(url).netloc.lower() or url
+
+
+class CircuitBreakerRegistry:
+    """
+    Process-wide registry of circuit breakers keyed by host (or any endpoint name).
+
+    Hosts can be given their own threshold and recovery timeout with `configure`; others use the registry defaults.
+    """
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float | None = None):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._overrides: Dict[str, Dict[str, float | int | None]] = {}
+
+    def configure(self, key: str, failure_threshold: int | None = None, recovery_timeout: float | None = None) -> None:
+        """
+        Override the threshold and recovery timeout of one key. Applies to the existing breaker too.
+
+        Args:
+            key (str): The host or endpoint name.
+            failure_threshold (int | None): Consecutive failures before opening. None keeps the default.
+            recovery_timeout (float | None): Seconds before an open circuit allows a trial call. None means "next run".
+        """
+        with self._lock:
+            override = {"recovery_timeout": recovery_timeout}
+            if failure_threshold is not None:
+                override["failure_threshold"] = failure_threshold
+            self._overrides[key] = override
+
+            breaker = self._breakers.get(key)
+            if breaker is not None:
+                breaker.failure_threshold = override.get("failure_threshold", breaker.failure_threshold)
+                breaker.recovery_timeout = recovery_timeout
+
+    def get(self, key: str) -> CircuitBreaker:
+        """Get the breaker of a key, creating it on first use."""
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                override = self._overrides.get(key, {})
+                breaker = CircuitBreaker(
+                    key,
+                    failure_threshold=override.get("failure_threshold", self.failure_threshold),
+                    recovery_timeout=override.get("recovery_timeout", self.recovery_timeout),
+                )
+                self._breakers[key] = breaker
+            return breaker
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        """Get the breaker of the host of a URL."""
+        return self.get(host_of(url))
+
+    def start_new_run(self) -> None:
+        """Move every open circuit to half-open, so each dead host gets one trial call in the new run."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        for breaker in breakers:
+            breaker.half_open()
+
+    def open_circuits(self) -> Dict[str, str]:
+        """
+        Get the currently open circuits.
+
+        Returns:
+            Dict[str, str]: The cached error of each open circuit, keyed by host.
+        """
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.endpoint: b.last_error for b in breakers if b.state == CircuitState.OPEN}
+
+
+CIRCUIT_BREAKERS = CircuitBreakerRegistry()
+"""The process-wide circuit breaker registry."""
+
+
+def get_circuit_breaker(
+    endpoint: str,
+    failure_threshold: int | None = None,
+    recovery_timeout: float | None = None,
+) -> CircuitBreaker:
+    """
+    Get the process-wide circuit breaker of an endpoint (usually a host), creating it on first use.
+
+    Args:
+        endpoint (str): The host or endpoint name.
+        failure_threshold (int | None): If given, overrides the threshold of this endpoint.
+        recovery_timeout (float | None): If given, overrides the recovery timeout of this endpoint.
+
+    Returns:
+        CircuitBreaker: The circuit breaker of the endpoint.
+    """
+    if failure_threshold is not None or recovery_timeout is not None:
+        CIRCUIT_BREAKERS.configure(endpoint, failure_threshold, recovery_timeout)
+    return CIRCUIT_BREAKERS.get(endpoint)
+
+
+def start_new_run() -> None:
+    """Half-open every open circuit. Called at the start of each run."""
+    CIRCUIT_BREAKERS.start_new_run()
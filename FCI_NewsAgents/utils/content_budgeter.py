@@ -0,0 +1,208 @@
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Callable, List
+
+TokenCounter = Callable[[str], int]
+
+
+def heuristic_token_count(text: str) -> int:
+    """
+    Estimate the number of tokens of a text without a tokenizer.
+
+    BPE tokenizers average roughly 4 bytes per token on English text. Counting UTF-8 bytes instead of
+    characters keeps the estimate conservative for Vietnamese, where diacritics take more than one byte.
+
+    Args:
+        text (str): The text to estimate.
+
+    Returns:
+        int: The estimated token count.
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text.encode("utf-8")) / 4)
+
+
+def _load_tiktoken_counter() -> TokenCounter | None:
+    """
+    Load a tiktoken-based counter if tiktoken is installed. gpt-oss uses the o200k (harmony) encoding.
+
+    Returns:
+        TokenCounter | None: The token counter, or None if tiktoken is unavailable.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    for encoding_name in ("o200k_harmony", "o200k_base"):
+        try:
+            encoding = tiktoken.get_encoding(encoding_name)
+        except Exception:
+            continue
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+    return None
+
+
+_token_counter: TokenCounter | None = None
+
+
+def set_token_counter(counter: TokenCounter | None) -> None:
+    """
+    Plug in the tokenizer used to count tokens. Pass None to go back to auto-detection.
+
+    Args:
+        counter (TokenCounter | None): A function mapping a text to its token count.
+    """
+    global _token_counter
+    _token_counter = counter
+
+
+def get_token_counter() -> TokenCounter:
+    """
+    Get the active token counter: the one set by `set_token_counter`, else tiktoken if installed, else the heuristic.
+
+    Returns:
+        TokenCounter: The token counter.
+    """
+    global _token_counter
+    if _token_counter is None:
+        _token_counter = _load_tiktoken_counter() or heuristic_token_count
+    return _token_counter
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens of a text with the active token counter."""
+    return get_token_counter()(text)
+
+
+def choose_max_tokens(
+    expected_output_words: int,
+    tokens_per_word: float = 3.0,
+    reasoning_tokens: int = 4096,
+    min_tokens: int = 1024,
+    max_tokens: int = 16384,
+) -> int:
+    """
+    Choose the `max_tokens` of a call from the expected length of the answer.
+
+    gpt-oss is a reasoning model, and its reasoning is counted against `max_tokens`, so an allowance for it is
+    added on top of the answer itself. Vietnamese text takes around 2-3 tokens per word.
+
+    Args:
+        expected_output_words (int): The expected number of words in the answer.
+        tokens_per_word (float): Tokens per output word. Defaults to 3.0.
+        reasoning_tokens (int): Allowance for reasoning tokens. Defaults to 4096.
+        min_tokens (int): Lower bound of the result. Defaults to 1024.
+        max_tokens (int): Upper bound of the result. Defaults to 16384.
+
+    Returns:
+        int: The number of tokens to request.
+    """
+    budget = math.ceil(expected_output_words * tokens_per_word) + reasoning_tokens
+    return max(min_tokens, min(max_tokens, budget))
+
+
+@dataclass
+class ContentBudgeter:
+    """
+    Keeps the content pasted into a prompt under a token budget.
+
+    - `fits` tells whether a text can be sent as-is.
+    - `split` cuts an over-budget text into chunks of at most `chunk_tokens`, on paragraph boundaries when possible.
+    - `truncate` cuts a text down to a number of tokens, keeping the beginning.
+    """
+    max_input_tokens: int = 12000
+    """Maximum number of tokens of content sent in a single prompt."""
+    chunk_tokens: int = 4000
+    """Maximum number of tokens per chunk on the map-reduce path."""
+    count_tokens: TokenCounter = field(default_factory=get_token_counter)
+    """The token counter. Defaults to the active one (see `set_token_counter`)."""
+
+    def fits(self, text: str) -> bool:
+        """Check whether the text fits in `max_input_tokens`."""
+        return self.count_tokens(text) <= self.max_input_tokens
+
+    def truncate(self, text: str, max_tokens: int | None = None) -> str:
+        """
+        Truncate a text to at most `max_tokens` tokens, keeping the beginning.
+
+        Args:
+            text (str): The text to truncate.
+            max_tokens (int | None): The token limit. Defaults to `max_input_tokens`.
+
+        Returns:
+            str: The truncated text (the text itself if it already fits).
+        """
+        max_tokens = self.max_input_tokens if max_tokens is None else max_tokens
+        if self.count_tokens(text) <= max_tokens:
+            return text
+
+        # Binary search the longest prefix that fits
+        low, high = 0, len(text)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.count_tokens(text[:mid]) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+
+        return text[:low]
+
+    def split(self, text: str) -> List[str]:
+        """
+        Split a text into chunks of at most `chunk_tokens` tokens.
+
+        Paragraphs (separated by blank lines) are packed greedily into chunks. A paragraph that is too long on its own
+        is split by lines, then hard-truncated into pieces.
+
+        Args:
+            text (str): The text to split.
+
+        Returns:
+            List[str]: The chunks, in order.
+        """
+        chunks: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+
+        def flush():
+            nonlocal current, current_tokens
+            if current:
+                chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+
+        for piece in self._pieces(text):
+            piece_tokens = self.count_tokens(piece)
+            if current_tokens + piece_tokens > self.chunk_tokens:
+                flush()
+            current.append(piece)
+            current_tokens += piece_tokens
+
+        flush()
+        return chunks
+
+    def _pieces(self, text: str) -> List[str]:
+        """Break a text into paragraph-sized pieces that each fit in `chunk_tokens`."""
+        pieces: List[str] = []
+
+        for paragraph in re.split(r"\n\s*\n", text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if self.count_tokens(paragraph) <= self.chunk_tokens:
+                pieces.append(paragraph)
+                continue
+
+            for line in paragraph.splitlines():
+                rest = line.strip()
+                while rest:
+                    head = self.truncate(rest, self.chunk_tokens)
+                    if not head:  # a single character over budget, should not happen with sane budgets
+                        head = rest[:1]
+                    pieces.append(head)
+                    rest = rest[len(head):].strip()
+
+        return pieces
@@ -7,11 +7,20 @@ from typing import List
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
 
 from FCI_NewsAgents.models.document import Document
-from FCI_NewsAgents.services.article_url_cache.cleanup import purge_older_than
+from FCI_NewsAgents.services.article_url_cache.cleanup import schedule_purge
 from FCI_NewsAgents.services.article_url_cache.store import ArticleURLStore
+from FCI_NewsAgents.utils.tracing import span
 from FCI_NewsAgents.utils.utils import get_canonical_url
 
 
+def _canonicalise(url: str) -> str:
+    """Get the canonical URL of a document, traced in the document's span tree."""
+    with span("canonicalise", document=url) as canonicalise_span:
+        canonical_url = get_canonical_url(url)
+        canonicalise_span.set_attribute("canonical_url", canonical_url)
+        return canonical_url
+
+
 def remove_duplicate_documents(
     documents: List[Document], 
     db_path: str | None = None,
@@ -40,15 +49,16 @@ def remove_duplicate_documents(
         if parallel:
             urls = [doc.url for doc in documents]
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                canonical_urls = list(executor.map(get_canonical_url, urls))
+                canonical_urls = list(executor.map(_canonicalise, urls))
 
-            to_insert = [(canonical_urls[idx], today_str) for idx in range(len(documents))]
+            to_insert = [(canonical_urls[idx], today_str, doc.source) for idx, doc in enumerate(documents)]
         else:
-            to_insert = [(get_canonical_url(doc.url), today_str) for doc in documents]
+            to_insert = [(_canonicalise(doc.url), today_str, doc.source) for doc in documents]
 
         insert_results = article_store.insert_many_if_new(to_insert)
 
-    purge_older_than(days=7)
+    # Expired URLs are purged in the background, at most once per `DedupConfig.PURGE_INTERVAL_MINUTES`
+    schedule_purge(db_path)
 
     for idx, doc in enumerate(documents):
         print(f"[{'KEEP' if insert_results[idx] else 'DUPLICATE'}] {doc.url}")
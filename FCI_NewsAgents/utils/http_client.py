@@ -0,0 +1,124 @@
+import threading
+from typing import Any, Dict, Tuple
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+
+from FCI_NewsAgents.utils.circuit_breaker import CIRCUIT_BREAKERS, host_of
+from FCI_NewsAgents.utils.metrics import timer
+from FCI_NewsAgents.utils.retry import is_endpoint_failure
+from FCI_NewsAgents.utils.tracing import span
+
+_FAILURE_STATUS_CODES = (429,)
+
+_SESSION_POOL_SIZE = 32
+"""Kept-alive connections per host, at least the concurrency of the LLM-bound stages."""
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    The process-wide `requests.Session` of the FPT Cloud API calls (chat completions and embeddings).
+
+    Its connection pool keeps the TLS connections to the API open between calls, and between runs when the
+    pipeline runs in the daemon, instead of opening a new connection for every LLM call.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=_SESSION_POOL_SIZE)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def _is_failure_status(status_code: int | None) -> bool:
+    return status_code is not None and (status_code in _FAILURE_STATUS_CODES or status_code >= 500)
+
+
+def http_get(url: str, document: str | None = None, **kwargs: Any) -> requests.Response:
+    """
+    `requests.get` guarded by the circuit breaker of the URL's host.
+
+    Connection errors, timeouts, 429 and 5xx responses count as failures of the host. Once its circuit is open,
+    every call to the host fails immediately with the cached error instead of waiting for another timeout.
+    `raise_for_status` is left to the caller.
+
+    Args:
+        url (str): The URL to fetch.
+        document (str | None): URL of the document the fetch belongs to, if any (e.g. the paper of a PDF download),
+            so that it is traced in the span tree of that document. Scraper listing pages and feeds are not documents.
+        **kwargs: Keyword arguments for `requests.get` (headers, params, timeout, ...).
+
+    Returns:
+        requests.Response: The response.
+
+    Raises:
+        CircuitOpenError: If the circuit of the host is open.
+        requests.RequestException: If the request fails.
+    """
+    breaker = CIRCUIT_BREAKERS.for_url(url)
+    breaker.before_call()
+
+    try:
+        with span("fetch", document=document, url=url, host=host_of(url)) as fetch_span, timer("http_request", host=host_of(url), kind="get"):
+            response = requests.get(url, **kwargs)
+            fetch_span.set_attribute("http.status_code", response.status_code)
+    except Exception as e:
+        if is_endpoint_failure(e):
+            breaker.record_failure(e)
+        else:
+            breaker.record_success()
+        raise
+
+    if _is_failure_status(response.status_code):
+        breaker.record_failure(f"HTTP {response.status_code} from {url}")
+    else:
+        breaker.record_success()
+    return response
+
+
+def parse_feed(
+    url: str,
+    request_headers: Dict[str, str] | None = None,
+    timeout: float | Tuple[float, float] = (10, 30),
+) -> feedparser.FeedParserDict:
+    """
+    Fetch a feed with `http_get` and parse it with feedparser.
+
+    Fetching through `requests` instead of letting feedparser open the URL puts feeds behind the same circuit
+    breaker, timeouts, metrics and benchmark replay layer as every other fetch. As with `feedparser.parse`,
+    network and HTTP errors do not raise: they are reported through `bozo` and `bozo_exception` of an empty feed.
+
+    Args:
+        url (str): The URL of the feed.
+        request_headers (Dict[str, str] | None): Headers of the request (User-Agent, ...).
+        timeout (float | Tuple[float, float]): Connect and read timeouts, in seconds. Defaults to (10, 30).
+
+    Returns:
+        feedparser.FeedParserDict: The parsed feed.
+
+    Raises:
+        CircuitOpenError: If the circuit of the host is open.
+    """
+    with span("fetch_feed", url=url):
+        try:
+            response = http_get(url, headers=request_headers, timeout=timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            feed = feedparser.FeedParserDict(feed=feedparser.FeedParserDict(), entries=[], bozo=1, bozo_exception=e)
+            if e.response is not None:
+                feed["status"] = e.response.status_code
+            return feed
+
+        feed = feedparser.parse(
+            response.content,
+            response_headers={name.lower(): value for name, value in response.headers.items()},
+        )
+        feed["status"] = response.status_code
+        feed["href"] = response.url
+        return feed
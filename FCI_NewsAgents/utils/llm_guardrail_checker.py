@@ -1,7 +1,7 @@
 import json
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from queue import PriorityQueue, Queue
+from queue import Queue
 from typing import List, Tuple
 from threading import Thread
 
@@ -11,8 +11,9 @@ from FCI_NewsAgents.models.document import Document
 from FCI_NewsAgents.prompts.get_prompts import get_guardrails_prompt
 from FCI_NewsAgents.services.llm.llm_interface import call_llm
 from FCI_NewsAgents.utils.doc_benchmark import *
-from FCI_NewsAgents.utils.utils import run_with_retry 
+from FCI_NewsAgents.utils.retry import LLM_RETRY_POLICY
 from FCI_NewsAgents.utils.logger import file_writer
+from FCI_NewsAgents.utils.top_k_selector import StreamingTopKSelector
 
 
 class GuardrailResponse(BaseModel):
@@ -128,9 +129,8 @@ def _get_llm_score(
 ==================================================
         """)
 
-    score = run_with_retry(
-        fn=call_llm_and_parse,
-        max_retries=3,
+    score = LLM_RETRY_POLICY.call(
+        call_llm_and_parse,
         on_exception=on_exception
     )
     
@@ -228,11 +228,18 @@ def filter_documents_by_guardrail_score(
         print("No documents provided for guardrail scoring.")
         return []
 
-    pq: PriorityQueue[Tuple[float, int]] = PriorityQueue()
+    # `min_score` applies to the relevance score, checked by `_score_doc`. Scores are products of win rates, at most 1
+    selector = StreamingTopKSelector(
+        documents, 0.0, {"paper": max_papers, "article": max_articles}, max_score=1.0
+    )
     info_queue: Queue[str] = Queue()
     log_thread = Thread(target=file_writer, args=("guardrail_checker.log", info_queue))
     log_thread.start()
 
+    def add(result: Tuple[float, int] | None, index: int) -> None:
+        selector.add(index, -result[0] if result is not None else None)
+
+    skipped = 0
     if parallel:
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_index = {
@@ -241,46 +248,26 @@ def filter_documents_by_guardrail_score(
             }
 
             for future in as_completed(future_to_index):
-                result = future.result()
-                if result is not None:
-                    pq.put(result)
+                add(future.result(), future_to_index[future])
+                if selector.stable.is_set():
+                    break
+            skipped = sum(future.cancel() for future in future_to_index)
     else:
         for idx, doc in enumerate(documents):
-            result = _score_doc((idx, doc, min_score, info_queue))
-            if result is not None:
-                pq.put(result)
+            if selector.stable.is_set():
+                skipped = len(documents) - idx
+                break
+            add(_score_doc((idx, doc, min_score, info_queue)), idx)
 
     info_queue.put(None)
     log_thread.join()
+    if skipped:
+        print(f"Selection complete, skipped the scoring of {skipped} documents")
 
-    filtered_articles: List[Document] = []
-    filtered_papers: List[Document] = []
-
-    while not pq.empty():
-        negative_score, doc_index = pq.get()
-        doc = documents[doc_index]
-
-        scored_doc = Document(
-            url=doc.url,
-            title=doc.title,
-            summary=doc.summary,
-            source=doc.source,
-            authors=doc.authors,
-            published_date=doc.published_date,
-            content_type=doc.content_type,
-            score=-negative_score
-        )
-
-        if scored_doc.content_type == "paper":
-            if max_papers != -1 and len(filtered_papers) >= max_papers:
-                continue
-            filtered_papers.append(scored_doc)
-        elif scored_doc.content_type == "article":
-            if max_articles != -1 and len(filtered_articles) >= max_articles:
-                continue
-            filtered_articles.append(scored_doc)
-            
-    filtered_documents = filtered_papers + filtered_articles
+    selected = selector.selected()
+    filtered_documents = [doc for doc in selected if doc.content_type == "paper"] + [
+        doc for doc in selected if doc.content_type == "article"
+    ]
 
     return filtered_documents
 
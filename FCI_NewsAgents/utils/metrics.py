@@ -0,0 +1,300 @@
+import json
+import math
+import os
+import threading
+import time
+from contextlib import ContextDecorator
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+METRIC_PREFIX = "fci_newsagents"
+"""Prefix of every exported metric name."""
+
+LabelKey = Tuple[Tuple[str, str], ...]
+SeriesKey = Tuple[str, LabelKey]
+
+SUMMARY_QUANTILES = (0.5, 0.95)
+"""Quantiles exported for every timer."""
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _quantile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank quantile of a sorted list."""
+    if not sorted_values:
+        return math.nan
+    index = max(0, math.ceil(q * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class MetricsRegistry:
+    """
+    In-process store of counters, gauges and timers of a run.
+
+    - Counters only go up (documents, tokens, retries, ...).
+    - Gauges hold the last value set.
+    - Timers keep every observed duration, exported as a summary (count, sum and quantiles).
+
+    Every series is identified by a metric name and a set of labels, e.g. `("stage_documents_out", {"stage": "dedup"})`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[SeriesKey, float] = {}
+        self._gauges: Dict[SeriesKey, float] = {}
+        self._timers: Dict[SeriesKey, List[float]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """Increase a counter."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge."""
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        """Record a duration, in seconds."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._timers.setdefault(key, []).append(seconds)
+
+    def reset(self) -> None:
+        """Drop every series, at the start of a run."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timers.clear()
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get a JSON-serializable snapshot of every series.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: The counters, gauges and timers, each as a list of
+                `{"name", "labels", ...}` entries. Timers carry count, total, mean, p50, p95 and max in seconds.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            timers = {key: sorted(values) for key, values in self._timers.items()}
+
+        def entry(key: SeriesKey, **fields: Any) -> Dict[str, Any]:
+            name, labels = key
+            return {"name": name, "labels": dict(labels), **fields}
+
+        return {
+            "counters": [entry(key, value=value) for key, value in sorted(counters.items())],
+            "gauges": [entry(key, value=value) for key, value in sorted(gauges.items())],
+            "timers": [
+                entry(
+                    key,
+                    count=len(values),
+                    total=sum(values),
+                    mean=sum(values) / len(values),
+                    p50=_quantile(values, 0.5),
+                    p95=_quantile(values, 0.95),
+                    max=values[-1],
+                )
+                for key, values in sorted(timers.items())
+                if values
+            ],
+        }
+
+    def render_prometheus(self) -> str:
+        """
+        Render every series in the Prometheus text exposition format (also accepted by OpenMetrics scrapers).
+
+        Counters are exported as `<prefix>_<name>_total`, gauges as `<prefix>_<name>` and timers as summaries named
+        `<prefix>_<name>_seconds`.
+
+        Returns:
+            str: The exposition text.
+        """
+        snapshot = self.snapshot()
+        lines: List[str] = []
+        declared = set()
+
+        def declare(metric: str, metric_type: str) -> None:
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} {metric_type}")
+
+        for counter in snapshot["counters"]:
+            metric = f"{METRIC_PREFIX}_{counter['name']}_total"
+            declare(metric, "counter")
+            lines.append(f"{metric}{_render_labels(counter['labels'])} {_render_value(counter['value'])}")
+
+        for gauge in snapshot["gauges"]:
+            metric = f"{METRIC_PREFIX}_{gauge['name']}"
+            declare(metric, "gauge")
+            lines.append(f"{metric}{_render_labels(gauge['labels'])} {_render_value(gauge['value'])}")
+
+        for timer in snapshot["timers"]:
+            metric = f"{METRIC_PREFIX}_{timer['name']}_seconds"
+            declare(metric, "summary")
+            for q, field in zip(SUMMARY_QUANTILES, ("p50", "p95")):
+                labels = {**timer["labels"], "quantile": str(q)}
+                lines.append(f"{metric}{_render_labels(labels)} {_render_value(timer[field])}")
+            lines.append(f"{metric}_sum{_render_labels(timer['labels'])} {_render_value(timer['total'])}")
+            lines.append(f"{metric}_count{_render_labels(timer['labels'])} {timer['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _render_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in sorted(labels.items())) + "}"
+
+
+def _render_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+METRICS = MetricsRegistry()
+"""The process-wide metrics registry."""
+
+
+def inc(name: str, value: float = 1.0, **labels: Any) -> None:
+    """Increase a counter of the process-wide registry."""
+    METRICS.inc(name, value, **labels)
+
+
+def set_gauge(name: str, value: float, **labels: Any) -> None:
+    """Set a gauge of the process-wide registry."""
+    METRICS.set_gauge(name, value, **labels)
+
+
+def observe(name: str, seconds: float, **labels: Any) -> None:
+    """Record a duration in the process-wide registry."""
+    METRICS.observe(name, seconds, **labels)
+
+
+def reset_metrics() -> None:
+    """Reset the process-wide registry. Called at the start of each run."""
+    METRICS.reset()
+
+
+class timer(ContextDecorator):
+    """
+    Time a block or a function into a timer of the process-wide registry.
+
+    The outcome (`ok` or `error`) is added as a label, so failed calls do not skew the timings of successful ones.
+
+    ```python
+    with timer("llm_call", model="gpt-oss-120b"):
+        ...
+
+    @timer("node", node="guardrails")
+    def guardrails_node(state): ...
+    ```
+    """
+
+    def __init__(self, name: str, **labels: Any):
+        self.name = name
+        self.labels = labels
+        self._local = threading.local()  # the same decorated function can run in several threads
+
+    def __enter__(self) -> "timer":
+        self._local.__dict__.setdefault("starts", []).append(time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = time.perf_counter() - self._local.starts.pop()
+        observe(self.name, duration, **self.labels, outcome="ok" if exc_type is None else "error")
+        return False
+
+
+def record_stage(stage: str, documents_in: int, documents_out: int) -> None:
+    """
+    Count the documents going in and out of a filter stage.
+
+    Args:
+        stage (str): The name of the stage (e.g. "dedup", "alignment", "guardrails").
+        documents_in (int): The number of documents given to the stage.
+        documents_out (int): The number of documents kept by the stage.
+    """
+    inc("stage_documents_in", documents_in, stage=stage)
+    inc("stage_documents_out", documents_out, stage=stage)
+
+
+def write_prometheus_textfile(path: str) -> None:
+    """
+    Write the metrics to a Prometheus textfile (for the node_exporter textfile collector).
+
+    The file is written next to its destination and renamed, so the collector never reads a partial file.
+
+    Args:
+        path (str): The path of the `.prom` file.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(METRICS.render_prometheus())
+    os.replace(temp_path, path)
+
+
+def write_run_summary(path: str, **extra: Any) -> Dict[str, Any]:
+    """
+    Write a JSON summary of the run metrics.
+
+    Args:
+        path (str): The path of the JSON file.
+        **extra: Additional top-level fields (e.g. run id, total duration).
+
+    Returns:
+        Dict[str, Any]: The written summary.
+    """
+    summary = {**extra, "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"), **METRICS.snapshot()}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False, default=str)
+    return summary
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+    """
+    Serve the metrics on `http://<host>:<port>/metrics` from a daemon thread.
+
+    Args:
+        port (int): The port to listen on.
+        host (str): The interface to bind. Defaults to the loopback interface, use "0.0.0.0" to let other hosts scrape.
+
+    Returns:
+        ThreadingHTTPServer: The running server (call `shutdown()` to stop it).
+    """
+    # Only imported by the runs serving their metrics
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = METRICS.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="MetricsServer", daemon=True).start()
+    print(f"Serving metrics on http://{host}:{port}/metrics")
+    return server
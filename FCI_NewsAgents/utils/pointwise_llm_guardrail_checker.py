@@ -1,10 +1,25 @@
-import re
 from typing import List, Tuple
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from pydantic import BaseModel, ConfigDict, Field
 
 from FCI_NewsAgents.models.document import Document
-from FCI_NewsAgents.services.llm.llm_interface import call_llm
-from FCI_NewsAgents.utils.utils import run_with_retry
+from FCI_NewsAgents.models.document_batch import DocumentBatch
+from FCI_NewsAgents.services.llm.structured_output import (
+    call_llm_structured,
+    extract_score,
+)
+from FCI_NewsAgents.utils.top_k_selector import StreamingTopKSelector
+from FCI_NewsAgents.utils.tracing import span
+
+MAX_SCORE = 10
+"""Best score of the pointwise guardrails."""
+
+
+class DocumentScore(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    score: int = Field(ge=0, le=MAX_SCORE)
 
 
 def get_score(doc: Document, system_prompt: str) -> float:
@@ -26,26 +41,22 @@ Summary: {doc.summary}
 
 Assign an integer score from 0 to 10 for this document.
 """
-    def call_llm_and_parse_score() -> float:
-        response = call_llm(
+    def parse_score(response: str) -> DocumentScore:
+        print(f"Document scoring response for {doc.title}: {response}")
+        return DocumentScore(score=extract_score(response, low=0, high=MAX_SCORE))
+
+    with span("score", document=doc.url, source=doc.source) as score_span:
+        result = call_llm_structured(
             user_prompt=user_prompt,
             system_prompt=system_prompt,
+            schema=DocumentScore,
+            task="get_score",
             model="gpt-oss-120b",
             max_tokens=2048,
+            parse=parse_score,
         )
-
-        print(f"Document scoring response: {response}")
-        score_match = re.search(r"(\d+)", response)
-        if score_match:
-            score = float(score_match.group(1))
-            return score
-        else:
-            raise ValueError("No valid score found in LLM response.")
-        
-    def on_exception(e: Exception, attempt: int):
-        print(f"Exception on attempt {attempt} for document {doc.title}: {e}")
-        
-    return run_with_retry(fn=call_llm_and_parse_score, max_retries=3, on_exception=on_exception)
+        score_span.set_attribute("score", result.score)
+    return float(result.score)
 
 def filter_documents_by_score(
     docs: List[Document],
@@ -59,6 +70,9 @@ def filter_documents_by_score(
     """
     Filter documents based on a score threshold.
 
+    Documents are scored in order, so put the most promising ones first: once the caps are filled with documents that
+    no remaining score can displace, the documents not scored yet are skipped (see `StreamingTopKSelector`).
+
     Args:
         docs (List[Document]): List of Document objects to be scored and filtered.
         threshold (float): The minimum score required for a document to be included.
@@ -71,50 +85,52 @@ def filter_documents_by_score(
     Returns:
         List[Document]: List of Document objects that meet or exceed the score threshold.
     """
-    filtered_docs: List[Document] = []
-    paper_count = 0
-    article_count = 0
-
+    selector = StreamingTopKSelector(
+        docs, threshold, {"paper": max_papers, "article": max_articles}, max_score=MAX_SCORE
+    )
     if parallel:
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            docs_with_scores: List[Tuple[Document, float]] = list(executor.map(lambda d: (d, get_score(d, system_prompt)), docs))
+            future_to_index = {executor.submit(get_score, doc, system_prompt): i for i, doc in enumerate(docs)}
+            for future in as_completed(future_to_index):
+                selector.add(future_to_index[future], future.result())
+                if selector.stable.is_set():
+                    break
+            skipped = sum(future.cancel() for future in future_to_index)
     else:
-        docs_with_scores: List[Tuple[Document, float]] = [(doc, get_score(doc, system_prompt)) for doc in docs]
-
-    docs_with_scores.sort(key=lambda x: x[1], reverse=True)
-
-    for doc, score in docs_with_scores:
-        print(f"Document: {doc.title}, Score: {score}")
-
-        if doc.content_type == "paper":
-            if (max_papers == -1 or paper_count < max_papers) and score >= threshold:
-                scored_doc = Document(
-                    title=doc.title,
-                    url=doc.url,
-                    summary=doc.summary,
-                    content_type=doc.content_type,
-                    authors=doc.authors,
-                    source=doc.source,
-                    published_date=doc.published_date,
-                    score=score
-                )
-
-                filtered_docs.append(scored_doc)
-                paper_count += 1
-
-        elif doc.content_type == "article":
-            if (max_articles == -1 or article_count < max_articles) and score >= threshold:
-                scored_doc = Document(
-                    title=doc.title,
-                    url=doc.url,
-                    summary=doc.summary,
-                    content_type=doc.content_type,
-                    authors=doc.authors,
-                    source=doc.source,
-                    published_date=doc.published_date,
-                    score=score
-                )
-                filtered_docs.append(scored_doc)
-                article_count += 1
-    
-    return filtered_docs
\ No newline at end of file
+        skipped = 0
+        for i, doc in enumerate(docs):
+            if selector.stable.is_set():
+                skipped = len(docs) - i
+                break
+            selector.add(i, get_score(doc, system_prompt))
+
+    if skipped:
+        print(f"Selection complete, skipped the scoring of {skipped} documents")
+    return selector.selected()
+
+def select_top_documents(
+    docs_with_scores: List[Tuple[Document, float]],
+    threshold: float,
+    max_papers: int = -1,
+    max_articles: int = -1,
+) -> List[Document]:
+    """
+    Keep the best scored documents of each type.
+
+    Args:
+        docs_with_scores (List[Tuple[Document, float]]): Documents with their scores.
+        threshold (float): The minimum score required for a document to be included.
+        max_papers (int): Maximum number of paper documents to include. -1 for no limit.
+        max_articles (int): Maximum number of article documents to include. -1 for no limit
+
+    Returns:
+        List[Document]: Documents that meet or exceed the score threshold, with their scores, best first.
+    """
+    batch = DocumentBatch(
+        [doc for doc, _ in docs_with_scores], scores=[score for _, score in docs_with_scores]
+    )
+    selected = batch.top_k(threshold, {"paper": max_papers, "article": max_articles})
+    for i in selected:
+        print(f"Document: {batch.documents[i].title}, Score: {batch.scores[i]}")
+
+    return batch.to_documents(selected)
@@ -1,20 +1,44 @@
-import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
 
-from markdown_pdf import MarkdownPdf, Section
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_LEFT
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from pydantic import BaseModel, ConfigDict
 
 from FCI_NewsAgents.models.document import Document
 from FCI_NewsAgents.services.llm.llm_interface import call_llm
-from FCI_NewsAgents.utils.utils import run_with_retry
+from FCI_NewsAgents.services.llm.structured_output import (
+    StructuredOutputError,
+    call_llm_structured,
+)
+from FCI_NewsAgents.utils.content_budgeter import ContentBudgeter, choose_max_tokens
+from FCI_NewsAgents.utils.retry import LLM_RETRY_POLICY
+from FCI_NewsAgents.utils.tracing import propagate
+
+# The PDF backends (markdown_pdf and its PyMuPDF, reportlab) are imported on first use, not with the workflow
+if TYPE_CHECKING:
+    from markdown_pdf import MarkdownPdf
+
+# Expected answer lengths (in words), used to size `max_tokens`
+HIGHLIGHT_SELECTION_WORDS = 100
+HIGHLIGHT_SEGMENT_WORDS = 125
+REPORT_SEGMENT_WORDS = 80
+CHUNK_SUMMARY_WORDS = 200
+OPENING_AND_CONCLUSION_WORDS = 400
+
+
+class HighlightSelection(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    index: int
+    explanation: str
+
+
+class OpeningAndConclusion(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    opening: str
+    conclusion: str
 
 
 def is_newsletter(source: str) -> bool:
@@ -48,51 +72,127 @@ Trả lời theo format sau:
 
 ```json
 {{
-    "index": [số thứ tự của bài báo được chọn, bắt đầu từ 1]
+    "index": [số thứ tự của bài báo được chọn, bắt đầu từ 1],
     "explanation": "[lý do chọn bài báo này làm điểm nhấn]"
 }}
 ```
 """
-    def call_llm_and_parse_json() -> int:
-        response = call_llm(
+    try:
+        selection = call_llm_structured(
             user_prompt=user_prompt,
             system_prompt=system_prompt,
+            schema=HighlightSelection,
+            task="select_highlight",
             model="gpt-oss-120b",
-            max_tokens=16384,
+            max_tokens=choose_max_tokens(HIGHLIGHT_SELECTION_WORDS),
         )
+    except StructuredOutputError as e:
+        print(f"Error parsing LLM response for highlight selection after retries: {e}")
+        return 0  # Default to the first document if parsing fails
 
-        response_json = re.search(r"```json([\s\S]*)```", response, flags=re.DOTALL).group(1)
-        
-        print(f"Highlight selection response: {response_json}")
-        response_json = json.loads(response_json)
-
-        index = int(response_json.get("index", 1)) - 1
-        explanation = response_json.get("explanation", "")
+    index = selection.index - 1
+    if not 0 <= index < len(docs):
+        print(f"Highlight selection index {selection.index} is out of range. Defaulting to the first document.")
+        return 0
 
-        print(f"Highlight selection response {docs[index].title} with reason {explanation}")
-        return index
+    print(f"Highlight selection response {docs[index].title} with reason {selection.explanation}")
+    return index
     
+def summarize_chunk(chunk: str, system_prompt: str, index: int, total: int) -> str:
+    """
+    Summarise one chunk of a long document (map step of the map-reduce path).
+
+    Args:
+        chunk (str): The chunk content.
+        system_prompt (str): The system prompt to guide the LLM.
+        index (int): The index of the chunk, starting from 1.
+        total (int): The total number of chunks of the document.
+
+    Returns:
+        str: The summary of the chunk.
+    """
+    user_prompt = f"""
+Đây là phần {index}/{total} của một tài liệu dài:
+
+{chunk}
+
+Hãy tóm tắt phần này trong tối đa {CHUNK_SUMMARY_WORDS} từ.
+Giữ lại các ý chính, những điểm mới mẻ và các con số cụ thể. Không thêm nhận xét của bạn. Viết bằng tiếng Việt.
+"""
+
     def on_exception(e: Exception, attempt: int):
-        print(f"Attempt {attempt} to select highlight failed with error: {e}")
+        print(f"Attempt {attempt} to summarise chunk {index}/{total} failed with error: {e}")
 
-    try:
-        index = run_with_retry(call_llm_and_parse_json, max_retries=3, on_exception=on_exception)
-        return index
-    except (json.JSONDecodeError, KeyError) as e:
-        print(f"Error parsing LLM response for highlight selection after retries: {e}")
-        return 0  # Default to the first document if parsing fails
-    
-def generate_highlight_segment(segment: str, system_prompt: str) -> str:
+    response = LLM_RETRY_POLICY.call(call_llm, on_exception=on_exception,
+        user_prompt=user_prompt,
+        system_prompt=system_prompt,
+        model="gpt-oss-120b",
+        max_tokens=choose_max_tokens(CHUNK_SUMMARY_WORDS),
+    )
+    return (response or "").strip()
+
+def fit_content_to_budget(
+    content: str,
+    system_prompt: str,
+    budgeter: ContentBudgeter | None = None,
+    max_workers: int = 8,
+) -> str:
+    """
+    Make a document's content fit in the prompt budget before a segment is written from it.
+
+    Content within budget is returned as-is. Otherwise the content is split into chunks which are summarised
+    concurrently, and the joined chunk summaries are returned instead (truncated if still over budget).
+
+    Args:
+        content (str): The extracted content of the document.
+        system_prompt (str): The system prompt to guide the LLM.
+        budgeter (ContentBudgeter | None): The content budgeter. If None, uses the default budget.
+        max_workers (int): Maximum number of chunks summarised at the same time. Defaults to 8.
+
+    Returns:
+        str: Content that fits in the budget.
+    """
+    budgeter = budgeter or ContentBudgeter()
+
+    if budgeter.fits(content):
+        return content
+
+    chunks = budgeter.split(content)
+    print(f"Content over budget ({budgeter.count_tokens(content)} > {budgeter.max_input_tokens} tokens), summarising {len(chunks)} chunks...")
+
+    def summarize(args) -> str:
+        index, chunk = args
+        try:
+            return summarize_chunk(chunk, system_prompt, index, len(chunks))
+        except Exception as e:
+            print(f"Failed to summarise chunk {index}/{len(chunks)}, falling back to truncation: {e}")
+            return budgeter.truncate(chunk, budgeter.chunk_tokens // 8)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        summaries = list(executor.map(propagate(summarize), enumerate(chunks, 1)))
+
+    reduced = "\n\n".join(s for s in summaries if s)
+    return budgeter.truncate(reduced)
+
+def generate_highlight_segment(
+    segment: str,
+    system_prompt: str,
+    budgeter: ContentBudgeter | None = None,
+    max_workers: int = 8,
+) -> str:
     """
     Generate the highlight segment for the report using the specified LLM model.
 
     Args:
         segment (str): The content of the highlight segment to be processed.
         system_prompt (str): The system prompt to guide the LLM.
+        budgeter (ContentBudgeter | None): The content budgeter. If None, uses the default budget.
+        max_workers (int): Maximum number of chunks summarised at the same time for long content. Defaults to 8.
 
     Returns:
         str: The generated highlight segment.
     """
+    segment = fit_content_to_budget(segment, system_prompt, budgeter=budgeter, max_workers=max_workers)
     user_prompt = f"""
 Dựa trên thông tin sau:
 
@@ -113,7 +213,7 @@ Giới hạn số từ trong mục báo cáo này là 1 hoặc nhiều hơn 1 đ
             user_prompt=user_prompt,
             system_prompt=system_prompt,
             model="gpt-oss-120b",
-            max_tokens=65536,
+            max_tokens=choose_max_tokens(HIGHLIGHT_SEGMENT_WORDS),
         )
 
         print(f"Highlight segment response raw: {response}")
@@ -123,19 +223,27 @@ Giới hạn số từ trong mục báo cáo này là 1 hoặc nhiều hơn 1 đ
     def on_exception(e: Exception, attempt: int):
         print(f"Attempt {attempt} to generate highlight segment failed with error: {e}")
 
-    return run_with_retry(call_llm_and_parse_json, max_retries=3, on_exception=on_exception)
+    return LLM_RETRY_POLICY.call(call_llm_and_parse_json, on_exception=on_exception)
 
-def generate_report_segment(segment: str, system_prompt: str) -> str:
+def generate_report_segment(
+    segment: str,
+    system_prompt: str,
+    budgeter: ContentBudgeter | None = None,
+    max_workers: int = 8,
+) -> str:
     """
     Generate a report segment using the specified LLM model.
 
     Args:
         segment (str): The content of the segment to be processed.
         system_prompt (str): The system prompt to guide the LLM.
+        budgeter (ContentBudgeter | None): The content budgeter. If None, uses the default budget.
+        max_workers (int): Maximum number of chunks summarised at the same time for long content. Defaults to 8.
 
     Returns:
         str: The generated report segment.
     """
+    segment = fit_content_to_budget(segment, system_prompt, budgeter=budgeter, max_workers=max_workers)
     user_prompt = f"""
 Dựa trên thông tin sau:
 
@@ -157,11 +265,11 @@ Nếu đoạn thông tin được cung cấp không đủ để tạo thành m
     def on_exception(e: Exception, attempt: int):
         print(f"Attempt {attempt} to generate highlight segment failed with error: {e}")
 
-    return run_with_retry(call_llm, max_retries=3, on_exception=on_exception, 
+    return LLM_RETRY_POLICY.call(call_llm, on_exception=on_exception, 
         user_prompt=user_prompt,
         system_prompt=system_prompt,
         model="gpt-oss-120b",
-        max_tokens=65536,
+        max_tokens=choose_max_tokens(REPORT_SEGMENT_WORDS),
     )
 
 def generate_opening_and_conclusion(system_prompt: str, segments: List[str]) -> Tuple[str, str]:
@@ -195,28 +303,17 @@ Không nêu thêm bất cứ thông tin gì mới, không nhắc đến nguồn.
 Không trả về bất cứ phần nào khác ngoài JSON phần mở đầu và kết luận. Bạn chỉ đang phụ trách một phần của báo cáo lớn hơn.
 """
     
-    def call_llm_and_parse_json() -> Tuple[str, str]:
-        response = call_llm(
+    try:
+        result = call_llm_structured(
             user_prompt=user_prompt,
             system_prompt=system_prompt,
+            schema=OpeningAndConclusion,
+            task="generate_opening_and_conclusion",
             model="gpt-oss-120b",
-            max_tokens=16384,
+            max_tokens=choose_max_tokens(OPENING_AND_CONCLUSION_WORDS),
         )
-
-        response_json = re.search(r"```json([\s\S]*)```", response, flags=re.DOTALL).group(1)
-        response_json = json.loads(response_json)
-
-        opening = response_json.get("opening", "")
-        conclusion = response_json.get("conclusion", "")
-
-        return opening, conclusion
-    
-    def on_exception(e: Exception, attempt: int):
-        print(f"Attempt {attempt} to generate opening and conclusion failed with error: {e}")
-
-    try:
-        return run_with_retry(call_llm_and_parse_json, max_retries=3, on_exception=on_exception)
-    except (json.JSONDecodeError, KeyError) as e:
+        return result.opening, result.conclusion
+    except StructuredOutputError as e:
         print(f"Error parsing LLM response for opening and conclusion: {e}")
         return "", ""  # Return empty strings if parsing fails
     
@@ -230,7 +327,8 @@ def generate_markdown(
     highlight_segment: str,
     other_documents: List[Document],
     other_segments: List[str],
-    conclusion: str
+    conclusion: str,
+    title: str | None = None,
 ) -> str:
     """
     Generate the final markdown report.
@@ -242,6 +340,7 @@ def generate_markdown(
         other_documents (List[Document]): List of other documents.
         other_segments (List[str]): List of generated segments for other documents.
         conclusion (str): The conclusion segment of the report.
+        title (str | None): The title of the report. Defaults to the daily report title with today's date.
 
     Returns:
         str: The final markdown report.
@@ -250,7 +349,8 @@ def generate_markdown(
     parts: List[str] = []
 
     # Title
-    parts.append(f"# Bản tin công nghệ - {datetime.now().strftime('%d/%m/%Y')}\n\n")
+    title = title or f"Bản tin công nghệ - {datetime.now().strftime('%d/%m/%Y')}"
+    parts.append(f"# {title}\n\n")
 
     # Opening
     parts.append(f"## Mở đầu\n\n{opening}\n\n")
@@ -334,7 +434,7 @@ def webhook_message_generator(
 
     return "\n".join(parts)
 
-def markdown_string_to_pdf(markdown_string: str) -> MarkdownPdf:
+def markdown_string_to_pdf(markdown_string: str) -> "MarkdownPdf":
     """
     Convert a markdown string to a PDF object.
 
@@ -344,6 +444,8 @@ def markdown_string_to_pdf(markdown_string: str) -> MarkdownPdf:
     Returns:
         MarkdownPdf: The generated PDF object.
     """
+    from markdown_pdf import MarkdownPdf, Section
+
     pdf = MarkdownPdf()
     pdf.add_section(Section(markdown_string))
     
@@ -370,6 +472,14 @@ def generate_pdf(
         other_segments (List[str]): List of generated segments for other documents.
         conclusion (str): The conclusion segment of the report.
     """
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_LEFT
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
     # --------------------------------------------------
     # Font registration (Vietnamese Unicode safe)
     # --------------------------------------------------
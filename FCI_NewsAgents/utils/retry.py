@@ -0,0 +1,305 @@
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Literal, ParamSpec, TypeVar
+
+import requests
+
+from FCI_NewsAgents.utils.circuit_breaker import CIRCUIT_BREAKERS, CircuitOpenError, get_circuit_breaker
+from FCI_NewsAgents.utils.metrics import inc
+
+R = TypeVar("R")
+P = ParamSpec("P")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+"""HTTP status codes worth retrying. Any other 4xx is treated as fatal."""
+
+FATAL_EXCEPTIONS = (
+    NotImplementedError,
+    ImportError,
+    CircuitOpenError,
+)
+"""Exceptions that come from the setup or the breaker rather than the endpoint, and are never retried."""
+
+
+def _status_code_of(e: BaseException) -> int | None:
+    response = getattr(e, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_retryable(e: BaseException) -> bool:
+    """
+    Classify an exception as retryable (transient) or fatal.
+
+    - Errors carrying an HTTP response are retryable only for 408, 425, 429 and 5xx codes.
+    - Connection errors and timeouts are retryable.
+    - Missing code and open circuits (see `FATAL_EXCEPTIONS`) are fatal.
+    - Anything else (e.g. an unparsable response) is retryable.
+
+    Args:
+        e (BaseException): The exception raised by the call.
+
+    Returns:
+        bool: True if the call should be retried.
+    """
+    if isinstance(e, FATAL_EXCEPTIONS) or not isinstance(e, Exception):
+        return False
+
+    status_code = _status_code_of(e)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+
+    return True
+
+
+def is_endpoint_failure(e: BaseException) -> bool:
+    """
+    Check whether an exception means the endpoint itself is unhealthy (as opposed to, e.g., an unparsable answer).
+    Only these failures count towards opening a circuit.
+    """
+    if isinstance(e, (requests.ConnectionError, requests.Timeout)):
+        return True
+
+    status_code = _status_code_of(e)
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+def retry_after_seconds(e: BaseException) -> float | None:
+    """
+    Read the `Retry-After` header of the HTTP response attached to an exception, if any.
+
+    Returns:
+        float | None: The number of seconds to wait, or None if there is no usable header.
+    """
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None)
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryBudget:
+    """
+    Retry budget shared by every call of a run.
+
+    Retries are allowed while they stay under `ratio` of the calls made (with a floor of `min_retries`), and never
+    above `max_retries`. During a brownout this turns retries off instead of multiplying the load on the endpoint.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, max_retries: int = 500):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.max_retries = max_retries
+
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._retries = 0
+
+    def record_call(self) -> None:
+        """Record a first attempt."""
+        with self._lock:
+            self._calls += 1
+
+    def try_acquire(self) -> bool:
+        """
+        Try to spend one retry.
+
+        Returns:
+            bool: True if the retry is allowed.
+        """
+        with self._lock:
+            allowed = min(self.max_retries, max(self.min_retries, int(self._calls * self.ratio)))
+            if self._retries >= allowed:
+                return False
+            self._retries += 1
+            return True
+
+    def reset(self) -> None:
+        """Reset the budget, at the start of a run."""
+        with self._lock:
+            self._calls = 0
+            self._retries = 0
+
+    @property
+    def retries(self) -> int:
+        return self._retries
+
+
+RUN_RETRY_BUDGET = RetryBudget()
+"""The retry budget of the current run, shared by the default policies."""
+
+
+def reset_retry_budget() -> None:
+    """Reset the shared retry budget. Called at the start of each run."""
+    RUN_RETRY_BUDGET.reset()
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry policy with exponential backoff, jitter, exception classification, a retry budget and a circuit breaker.
+
+    Intended usage:
+
+    ```python
+    response = LLM_RETRY_POLICY.call(call_llm, user_prompt=..., system_prompt=...)
+    ```
+    """
+    max_attempts: int = 3
+    """Maximum number of attempts, including the first one."""
+    base_delay: float = 1.0
+    """Delay before the first retry, in seconds."""
+    max_delay: float = 30.0
+    """Upper bound of a single delay, in seconds."""
+    multiplier: float = 2.0
+    """Growth factor of the delay between retries."""
+    jitter: Literal["full", "equal", "none"] = "full"
+    """Full jitter draws the delay in [0, backoff], equal jitter in [backoff / 2, backoff]."""
+    classify: Callable[[BaseException], bool] = is_retryable
+    """Returns True if an exception is worth retrying."""
+    budget: RetryBudget | None = field(default_factory=lambda: RUN_RETRY_BUDGET)
+    """Retry budget shared across calls. None for no budget."""
+    endpoint: str | None = None
+    """Host (or endpoint name) of the circuit breaker guarding the calls. None for no circuit breaker."""
+
+    def compute_delay(self, attempt: int, e: BaseException | None = None) -> float:
+        """
+        Compute the delay before retrying after the given (1-based) failed attempt.
+
+        A `Retry-After` header on the error takes precedence over the backoff, capped by `max_delay`.
+        """
+        retry_after = retry_after_seconds(e) if e is not None else None
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+
+        backoff = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        if self.jitter == "full":
+            return random.uniform(0, backoff)
+        if self.jitter == "equal":
+            return backoff / 2 + random.uniform(0, backoff / 2)
+        return backoff
+
+    def _before_attempt(self, attempt: int) -> None:
+        if self.endpoint is not None:
+            get_circuit_breaker(self.endpoint).before_call()
+        if attempt == 1 and self.budget is not None:
+            self.budget.record_call()
+
+    def _after_success(self) -> None:
+        if self.endpoint is not None:
+            get_circuit_breaker(self.endpoint).record_success()
+
+    def _after_failure(self, e: Exception, attempt: int) -> float:
+        """Record a failure and return the delay before the next attempt, or re-raise if the call should stop."""
+        if self.endpoint is not None and not isinstance(e, CircuitOpenError):
+            if is_endpoint_failure(e):
+                get_circuit_breaker(self.endpoint).record_failure(e)
+            else:
+                get_circuit_breaker(self.endpoint).record_success()  # the endpoint answered, the answer was the problem
+
+        if attempt >= self.max_attempts:
+            print("Max retries reached. Raising exception.")
+            raise e
+        if not self.classify(e):
+            print(f"Non-retryable error ({type(e).__name__}). Raising exception.")
+            raise e
+        if self.budget is not None and not self.budget.try_acquire():
+            print("Retry budget exhausted for this run. Raising exception.")
+            inc("retry_budget_exhausted", endpoint=self.endpoint or "http")
+            raise e
+
+        inc("retries", endpoint=self.endpoint or "http", error=type(e).__name__)
+        return self.compute_delay(attempt, e)
+
+    def call(
+        self,
+        fn: Callable[P, R],
+        *args: P.args,
+        on_exception: Callable[[Exception, int], None] = lambda e, attempt: None,
+        **kwargs: P.kwargs,
+    ) -> R:
+        """
+        Run a function under this policy.
+
+        Args:
+            fn (Callable[P, R]): The function to run.
+            on_exception (Callable[[Exception, int], None]): Callback on exception with the exception and attempt number. Can be used for logging.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            R: The return value of the function if successful.
+
+        Raises:
+            Exception: The last exception if the call is fatal, out of attempts, or out of retry budget.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self._before_attempt(attempt)
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                on_exception(e, attempt)
+                delay = self._after_failure(e, attempt)
+                time.sleep(delay)
+                continue
+
+            self._after_success()
+            return result
+
+    async def acall(
+        self,
+        fn: Callable[P, Awaitable[R]],
+        *args: P.args,
+        on_exception: Callable[[Exception, int], None] = lambda e, attempt: None,
+        **kwargs: P.kwargs,
+    ) -> R:
+        """
+        Async variant of `call`, for coroutine functions. Waits with `asyncio.sleep` between attempts.
+        """
+        import asyncio
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self._before_attempt(attempt)
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                on_exception(e, attempt)
+                delay = self._after_failure(e, attempt)
+                await asyncio.sleep(delay)
+                continue
+
+            self._after_success()
+            return result
+
+
+FPT_API_HOST = "mkp-api.fptcloud.com"
+"""Host of the FPT Cloud chat completions and embeddings endpoints, which share a circuit breaker."""
+
+# Unlike scraped hosts, whose circuits stay open until the next run, the LLM backend is needed for the rest of the
+# run, so its circuit lets a trial call through after a short cool-down.
+CIRCUIT_BREAKERS.configure(FPT_API_HOST, failure_threshold=5, recovery_timeout=30.0)
+
+LLM_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=2.0, max_delay=60.0, endpoint=FPT_API_HOST)
+"""Policy for calls to the FPT Cloud chat completions endpoint."""
+
+EMBEDDING_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=30.0, endpoint=FPT_API_HOST)
+"""Policy for calls to the FPT Cloud embeddings endpoint."""
+
+HTTP_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=15.0)
+"""Policy for plain HTTP fetches (scrapers, parsers). Per-host circuit breaking is done by `http_client.http_get`."""
@@ -0,0 +1,91 @@
+import heapq
+import threading
+from typing import Dict, List, Mapping, Sequence, Set, Tuple
+
+from FCI_NewsAgents.models.document import Document
+
+
+class StreamingTopKSelector:
+    """
+    Selection of the best scored documents of each type, updated as the scores arrive.
+
+    Each capped content type keeps a min-heap of at most its cap, so adding a score costs O(log cap) and the selection
+    is known at any time, instead of sorting every score once all of them are in. Ties are broken by position in
+    `documents`, like a stable sort.
+
+    The selection is stable once no document still being scored can enter it: every capped type is full of documents
+    scored at least `max_score` (and placed before the unscored documents of their type), or has no unscored document
+    left. `stable` is then set, so that the scoring of the remaining documents can be cancelled.
+    """
+
+    def __init__(
+        self,
+        documents: Sequence[Document],
+        threshold: float,
+        max_per_type: Mapping[str, int],
+        max_score: float,
+    ):
+        """
+        Args:
+            documents (Sequence[Document]): The documents to be scored, by decreasing scoring priority.
+            threshold (float): The minimum score of a selected document.
+            max_per_type (Mapping[str, int]): Maximum number of documents of each content type, -1 for no limit.
+                Documents of other types are not selected.
+            max_score (float): The best score a document can get, e.g. 10 for the pointwise guardrails.
+        """
+        self.documents = list(documents)
+        self.threshold = threshold
+        self.max_per_type = dict(max_per_type)
+        self.max_score = max_score
+        self.stable = threading.Event()
+        """Set once the scores still missing cannot change the selection."""
+
+        self._lock = threading.Lock()
+        # Per type: the selected (score, -index) and the positions of the documents not scored yet
+        self._heaps: Dict[str, List[Tuple[float, int]]] = {content_type: [] for content_type in self.max_per_type}
+        self._pending: Dict[str, Set[int]] = {content_type: set() for content_type in self.max_per_type}
+        self._pending_order: Dict[str, List[int]] = {content_type: [] for content_type in self.max_per_type}
+        for index, doc in enumerate(self.documents):
+            if doc.content_type in self._pending:
+                self._pending[doc.content_type].add(index)
+                self._pending_order[doc.content_type].append(index)
+        self._update_stable()
+
+    def add(self, index: int, score: float | None) -> None:
+        """
+        Record the score of the document at a position, or None if it is not to be selected (e.g. scoring failed).
+        """
+        content_type = self.documents[index].content_type
+        with self._lock:
+            if content_type not in self._heaps or index not in self._pending[content_type]:
+                return
+            self._pending[content_type].discard(index)
+            if score is not None and score >= self.threshold:
+                heap, limit = self._heaps[content_type], self.max_per_type[content_type]
+                if limit == -1 or len(heap) < limit:
+                    heapq.heappush(heap, (score, -index))
+                elif limit > 0 and (score, -index) > heap[0]:
+                    heapq.heapreplace(heap, (score, -index))
+            self._update_stable()
+
+    def _type_is_stable(self, content_type: str) -> bool:
+        pending, order = self._pending[content_type], self._pending_order[content_type]
+        # The first unscored document of the type, the one that would win a tie
+        while order and order[0] not in pending:
+            heapq.heappop(order)
+        if not order or self.max_score < self.threshold:
+            return True
+        limit, heap = self.max_per_type[content_type], self._heaps[content_type]
+        if limit == -1 or len(heap) < limit:
+            return False
+        return limit == 0 or (self.max_score, -order[0]) < heap[0]
+
+    def _update_stable(self) -> None:
+        if all(self._type_is_stable(content_type) for content_type in self._heaps):
+            self.stable.set()
+
+    def selected(self) -> List[Document]:
+        """The selected documents with their scores, best first"""
+        with self._lock:
+            entries = [entry for heap in self._heaps.values() for entry in heap]
+        return [self.documents[-negative_index].with_score(score) for score, negative_index in sorted(entries, reverse=True)]
@@ -0,0 +1,303 @@
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Literal, ParamSpec, Tuple, TypeVar
+
+R = TypeVar("R")
+P = ParamSpec("P")
+
+SERVICE_NAME = "fci_newsagents"
+"""Service name reported in the exported resource."""
+
+
+@dataclass
+class Span:
+    """A timed operation of a trace, in the OpenTelemetry sense."""
+    name: str
+    trace_id: str
+    """32 hex characters, shared by every span of a run."""
+    span_id: str
+    """16 hex characters."""
+    parent_span_id: str | None
+    start_ns: int
+    end_ns: int | None = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: Literal["ok", "error"] = "ok"
+    status_message: str = ""
+    document: str | None = None
+    """URL of the document whose span tree this span belongs to, if any."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add(self, key: str, amount: float) -> None:
+        """Add to a numeric attribute, e.g. a token count accumulated over several calls."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds (up to now if the span is still open)."""
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Encode the span as an OTLP/JSON span."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns if self.end_ns is not None else self.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items() if v is not None],
+            "status": {"code": 2, "message": self.status_message} if self.status == "error" else {"code": 1},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Collects the spans of a run under a single trace ID.
+
+    Spans nest under the span active in the current context (thread). A span opened with `document=<url>` goes into
+    the span tree of that document instead: under the current span if it belongs to the same document, otherwise
+    under the document's root span. Document roots are created on first use, so every stage (fetch, canonicalise,
+    embed, score, extract, generate) adds to the same tree wherever it runs.
+    """
+
+    def __init__(self, service_name: str = SERVICE_NAME):
+        self.service_name = service_name
+
+        self._lock = threading.Lock()
+        self._trace_id = ""
+        self._root: Span | None = None
+        self._documents: Dict[str, Span] = {}
+        self._spans: List[Span] = []
+
+    @property
+    def trace_id(self) -> str:
+        """The ID of the current trace, starting one if needed."""
+        if self._root is None:
+            self.start_trace()
+        return self._trace_id
+
+    def start_trace(self, **attributes: Any) -> str:
+        """
+        Start a new trace, dropping the spans of the previous one.
+
+        Args:
+            **attributes: Attributes of the root "run" span.
+
+        Returns:
+            str: The new trace ID.
+        """
+        with self._lock:
+            self._trace_id = secrets.token_hex(16)
+            self._root = Span("run", self._trace_id, secrets.token_hex(8), None, time.time_ns(), attributes=attributes)
+            self._documents = {}
+            self._spans = [self._root]
+            return self._trace_id
+
+    def _new_span(self, name: str, parent: Span | None, document: str | None, start_ns: int, **attributes: Any) -> Span:
+        span = Span(
+            name=name,
+            trace_id=self._trace_id,
+            span_id=secrets.token_hex(8),
+            parent_span_id=parent.span_id if parent else None,
+            start_ns=start_ns,
+            attributes=attributes,
+            document=document,
+        )
+        self._spans.append(span)
+        return span
+
+    def document_root(self, url: str) -> Span:
+        """Get the root span of a document tree, creating it on first use."""
+        self.trace_id  # make sure a trace exists
+        with self._lock:
+            root = self._documents.get(url)
+            if root is None:
+                root = self._new_span("document", self._root, url, time.time_ns(), url=url)
+                self._documents[url] = root
+            return root
+
+    def annotate_document(self, url: str, **attributes: Any) -> None:
+        """Set attributes (source, title, content type, ...) on the root span of a document."""
+        root = self.document_root(url)
+        with self._lock:
+            root.attributes.update(attributes)
+
+    def _parent_for(self, document: str | None) -> Span:
+        current = _current_span.get()
+        if document is None:
+            return current or self._root
+        if current is not None and current.document == document:
+            return current
+        return self.document_root(document)
+
+    @contextmanager
+    def span(self, name: str, document: str | None = None, **attributes: Any) -> Iterator[Span]:
+        """
+        Open a span for the duration of a block. Exceptions mark the span as failed and are re-raised.
+
+        Args:
+            name (str): The name of the operation.
+            document (str | None): URL of the document the operation works on, if any.
+            **attributes: Attributes of the span.
+
+        Yields:
+            Span: The open span, to add attributes to.
+        """
+        self.trace_id  # make sure a trace exists
+        parent = self._parent_for(document)
+        with self._lock:
+            span = self._new_span(name, parent, document or parent.document, time.time_ns(), **attributes)
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.status_message = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+
+    def record_span(self, name: str, start_ns: int, end_ns: int, document: str | None = None, **attributes: Any) -> Span:
+        """
+        Record an already finished span, e.g. the share of a batched call attributed to one document.
+        """
+        self.trace_id  # make sure a trace exists
+        parent = self._parent_for(document)
+        with self._lock:
+            span = self._new_span(name, parent, document or parent.document, start_ns, **attributes)
+            span.end_ns = end_ns
+        return span
+
+    def end_trace(self) -> List[Span]:
+        """
+        Close the root span and the document roots, which last from their first to their last child.
+
+        Returns:
+            List[Span]: Every span of the trace.
+        """
+        with self._lock:
+            now = time.time_ns()
+            children: Dict[str, List[Span]] = {}
+            for span in self._spans:
+                if span.parent_span_id:
+                    children.setdefault(span.parent_span_id, []).append(span)
+
+            for root in self._documents.values():
+                spans = children.get(root.span_id, [])
+                root.start_ns = min((s.start_ns for s in spans), default=root.start_ns)
+                root.end_ns = max((s.end_ns or now for s in spans), default=now)
+                root.attributes["busy_seconds"] = round(sum(s.duration for s in spans), 6)
+
+            if self._root is not None and self._root.end_ns is None:
+                self._root.end_ns = now
+            return list(self._spans)
+
+    def slowest_documents(self, n: int = 5) -> List[Tuple[str, float]]:
+        """
+        Get the documents that spent the most time across all stages (sum of their top-level spans).
+
+        Returns:
+            List[Tuple[str, float]]: (URL, seconds) pairs, slowest first.
+        """
+        with self._lock:
+            busy: Dict[str, float] = {}
+            roots = {root.span_id: url for url, root in self._documents.items()}
+            for span in self._spans:
+                url = roots.get(span.parent_span_id)
+                if url is not None:
+                    busy[url] = busy.get(url, 0.0) + span.duration
+        return sorted(busy.items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Encode the trace as an OTLP/JSON `ExportTraceServiceRequest`."""
+        spans = self.end_trace()
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": f"{self.service_name}.tracing"},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def export_otlp_json(self, path: str) -> None:
+        """
+        Write the trace to a file as one line of OTLP/JSON, the format of the OpenTelemetry Collector file exporter.
+        The file can be loaded by the collector's `otlpjsonfile` receiver or inspected directly.
+
+        Args:
+            path (str): The path of the file. Existing content is kept, so several runs can share a file.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_otlp(), ensure_ascii=False) + "\n")
+
+
+TRACER = Tracer()
+"""The process-wide tracer."""
+
+
+def start_trace(**attributes: Any) -> str:
+    """Start the trace of a new run. Called at the start of each run."""
+    return TRACER.start_trace(**attributes)
+
+
+def span(name: str, document: str | None = None, **attributes: Any):
+    """Open a span with the process-wide tracer. Usable as a context manager or a decorator."""
+    return TRACER.span(name, document=document, **attributes)
+
+
+def current_span() -> Span | None:
+    """Get the span active in the current context, if any."""
+    return _current_span.get()
+
+
+def propagate(fn: Callable[P, R]) -> Callable[P, R]:
+    """
+    Wrap a function so it runs in the tracing context of the caller, for work handed to a thread pool.
+
+    ```python
+    executor.map(propagate(summarize), chunks)
+    ```
+    """
+    context = contextvars.copy_context()
+
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        # Each call gets its own copy, since a context cannot be entered by several threads at once
+        return context.copy().run(fn, *args, **kwargs)
+
+    return wrapper
@@ -11,6 +11,9 @@ from w3lib.url import canonicalize_url
 from FCI_NewsAgents.models.article import Article
 from FCI_NewsAgents.models.document import Document
 from FCI_NewsAgents.models.paper import Paper
+from FCI_NewsAgents.utils.circuit_breaker import CircuitOpenError
+from FCI_NewsAgents.utils.http_client import http_get
+from FCI_NewsAgents.utils.retry import RetryPolicy
 
 
 def get_time():
@@ -228,7 +231,7 @@ def get_canonical_url(url: str) -> str:
         }
 
         # Final URL after redirects
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, headers=headers, timeout=10)
         response.raise_for_status()
         final_url = response.url
 
@@ -252,7 +255,7 @@ def get_canonical_url(url: str) -> str:
         return canonicalize_url(canonical_url)
 
     except Exception as e:
-        if isinstance(e, requests.RequestException):
+        if isinstance(e, (requests.RequestException, CircuitOpenError)):
             print(f"==> Error fetching canonical URL for {url}: {e}")
             return canonicalize_url(url)
         else:
@@ -272,9 +275,13 @@ def run_with_retry(
     """
     Run a function with retries on exception.
 
+    Kept for backward compatibility: this runs `fn` under a `RetryPolicy` (see `utils/retry.py`) with `max_retries`
+    attempts, so retries back off with jitter, skip fatal errors and count against the run's retry budget.
+    Prefer using one of the policies of `utils/retry.py` directly.
+
     Args:
         fn (Callable[P, R]): The function to run.
-        max_retries (int): Maximum number of retries. Defaults to 3.
+        max_retries (int): Maximum number of attempts. Defaults to 3.
         on_exception (Callable[[Exception, int], None]): Callback on exception with the exception and attempt number. Can be used for logging.
         *args: Positional arguments for the function.
         **kwargs: Keyword arguments for the function.
@@ -285,13 +292,4 @@ def run_with_retry(
     Raises:
         Exception: The last exception raised if all retries fail.
     """
-    attempt = 0
-    while attempt < max_retries:
-        try:
-            return fn(*args, **kwargs)
-        except Exception as e:
-            attempt += 1
-            on_exception(e, attempt)
-            if attempt == max_retries:
-                print("Max retries reached. Raising exception.")
-                raise e
\ No newline at end of file
+    return RetryPolicy(max_attempts=max_retries).call(fn, *args, on_exception=on_exception, **kwargs)
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import secrets
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, Literal
+
+from FCI_NewsAgents.models.document import Document
+
+DEFAULT_RUNS_DIR = os.path.join("FCI_NewsAgents", "workflow_output", "runs")
+"""Folder of the persisted runs: one sub-folder per run and the shared LangGraph checkpoint database."""
+
+CHECKPOINT_DB_NAME = "checkpoints.sqlite"
+
+CHECKPOINT_MSGPACK_TYPES = [
+    ("FCI_NewsAgents.models.document", "Document"),
+    ("FCI_NewsAgents.core.config", "GuardrailsConfig"),
+    ("FCI_NewsAgents.models.workflow_state", "DocumentTask"),
+]
+"""Types of the workflow state the checkpointer is allowed to deserialize."""
+
+RunStatus = Literal["running", "failed", "completed"]
+TextKind = Literal["scores", "extracted", "segments"]
+
+
+def new_run_id() -> str:
+    """A sortable, unique run ID, e.g. `20251218_063000_1a2b3c`."""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(3)}"
+
+
+def document_to_dict(doc: Document) -> Dict[str, Any]:
+    return {
+        "url": doc.url,
+        "title": doc.title,
+        "summary": doc.summary,
+        "source": doc.source,
+        "authors": list(doc.authors),
+        "published_date": doc.published_date.isoformat() if doc.published_date else None,
+        "content_type": doc.content_type,
+        "score": doc.score,
+    }
+
+
+def document_from_dict(data: Dict[str, Any]) -> Document:
+    published_date = data.get("published_date")
+    return Document(
+        url=data["url"],
+        title=data["title"],
+        summary=data["summary"],
+        source=data["source"],
+        authors=data.get("authors", []),
+        published_date=datetime.fromisoformat(published_date) if published_date else None,
+        content_type=data.get("content_type", "paper"),
+        score=data.get("score"),
+    )
+
+
+class RunStore:
+    """
+    Persisted outputs of the stages of one workflow run, so that a failed run can be resumed without paying
+    for the stages that already succeeded (scraping, deduplication, LLM scoring, text extraction, segments).
+
+    Layout of `<root>/<run_id>/`:
+    - `run.json`: status of the run (`running`, `failed` or `completed`), failed node and error.
+    - `<stage>.json`: documents kept by a stage (`raw`, `deduped`, `aligned`, `scored`).
+    - `scores/<key>.txt`, `extracted/<key>.txt` and `segments/<key>.md`: guardrails score, full text and report
+      segment of each document, keyed by URL.
+    - `values.json`: small values such as the highlight URL and the opening and conclusion.
+
+    Every file is written to a temporary file first and then renamed, so a crash never leaves a half-written output.
+    """
+
+    def __init__(self, run_id: str, root: str = DEFAULT_RUNS_DIR):
+        self.run_id = run_id
+        self.root = root
+        # Created by the first write, so that looking a run up does not create its folder
+        self.path = os.path.join(root, run_id)
+
+    def exists(self) -> bool:
+        return os.path.exists(os.path.join(self.path, "run.json"))
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _write(self, relative_path: str, content: str) -> None:
+        path = os.path.join(self.path, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def _read(self, relative_path: str) -> str | None:
+        path = os.path.join(self.path, relative_path)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def status(self) -> Dict[str, Any]:
+        content = self._read("run.json")
+        return json.loads(content) if content else {}
+
+    def set_status(self, status: RunStatus, failed_node: str | None = None, error: str | None = None) -> None:
+        run = self.status() or {"run_id": self.run_id, "created_at": datetime.now().isoformat()}
+        run.update(status=status, failed_node=failed_node, error=error, updated_at=datetime.now().isoformat())
+        self._write("run.json", json.dumps(run, indent=2))
+
+    def save_documents(self, stage: str, documents: List[Document]) -> None:
+        self._write(f"{stage}.json", json.dumps([document_to_dict(doc) for doc in documents], ensure_ascii=False))
+
+    def load_documents(self, stage: str) -> List[Document] | None:
+        """The documents kept by a stage, or None if the stage has not completed in this run."""
+        content = self._read(f"{stage}.json")
+        return None if content is None else [document_from_dict(data) for data in json.loads(content)]
+
+    def save_text(self, kind: TextKind, url: str, text: str) -> None:
+        extension = "md" if kind == "segments" else "txt"
+        self._write(os.path.join(kind, f"{self._key(url)}.{extension}"), text)
+
+    def load_text(self, kind: TextKind, url: str) -> str | None:
+        extension = "md" if kind == "segments" else "txt"
+        return self._read(os.path.join(kind, f"{self._key(url)}.{extension}"))
+
+    def save_value(self, name: str, value: Any) -> None:
+        content = self._read("values.json")
+        values = json.loads(content) if content else {}
+        values[name] = value
+        self._write("values.json", json.dumps(values, ensure_ascii=False, indent=2))
+
+    def load_value(self, name: str) -> Any | None:
+        content = self._read("values.json")
+        return json.loads(content).get(name) if content else None
+
+
+def get_checkpointer(root: str = DEFAULT_RUNS_DIR):
+    """
+    LangGraph SQLite checkpointer of the workflow, shared by every run (the run ID is the thread ID).
+
+    Returns None if `langgraph-checkpoint-sqlite` is not installed: runs can still be resumed from the
+    outputs of the `RunStore`, the graph is just replayed from its entry node.
+    """
+    try:
+        from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:
+        print("langgraph-checkpoint-sqlite is not installed, the workflow runs without a LangGraph checkpointer")
+        return None
+
+    os.makedirs(root, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(root, CHECKPOINT_DB_NAME), check_same_thread=False)
+    return SqliteSaver(conn, serde=JsonPlusSerializer(allowed_msgpack_modules=CHECKPOINT_MSGPACK_TYPES))
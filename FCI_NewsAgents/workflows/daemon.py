@@ -0,0 +1,364 @@
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from datetime import time as day_time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
+import requests
+
+from FCI_NewsAgents.core.config import DEFAULT_DAEMON_HOST, DEFAULT_DAEMON_PORT, GuardrailsConfig
+from FCI_NewsAgents.services.document_repository.repository import DOCUMENTS_DB_NAME, DocumentRepository
+from FCI_NewsAgents.services.scrapers.sources import resolve_sources
+from FCI_NewsAgents.utils.alignment_checker import build_query_strings, get_query_embeddings
+from FCI_NewsAgents.utils.alignment_keywords import NEGATIVE_KEYWORDS, POSITIVE_KEYWORDS
+from FCI_NewsAgents.utils.http_client import get_session
+from FCI_NewsAgents.workflows.checkpointing import DEFAULT_RUNS_DIR, RunStore, get_checkpointer, new_run_id
+from FCI_NewsAgents.workflows.pipeline import run_pipeline
+from FCI_NewsAgents.workflows.workflow_builder import GuardRails_Rerank_Workflow
+
+_RUN_ID = r"[\w-]+"
+_RUN_PATH = re.compile(rf"^/runs/({_RUN_ID})$")
+
+
+class Schedule:
+    """When the daemon runs the pipeline: at fixed times of the day and/or every `interval_minutes`."""
+
+    def __init__(self, daily_times: List[str] | None = None, interval_minutes: float | None = None):
+        """
+        Args:
+            daily_times (List[str] | None): Local times of the day, as `HH:MM` (e.g. `["06:30", "18:00"]`).
+            interval_minutes (float | None): Interval between two runs, counted from the previous scheduled run.
+
+        Raises:
+            ValueError: If a time is not `HH:MM` or the interval is not positive.
+        """
+        self.daily_times: List[day_time] = sorted(self._parse_time(value) for value in daily_times or [])
+        if interval_minutes is not None and interval_minutes <= 0:
+            raise ValueError(f"The interval must be positive, got {interval_minutes} minutes")
+        self.interval = timedelta(minutes=interval_minutes) if interval_minutes else None
+
+    @staticmethod
+    def _parse_time(value: str) -> day_time:
+        try:
+            return datetime.strptime(value, "%H:%M").time()
+        except ValueError:
+            raise ValueError(f"Invalid schedule time {value!r}, expected HH:MM") from None
+
+    def is_empty(self) -> bool:
+        return not self.daily_times and self.interval is None
+
+    def next_run(self, after: datetime, last_run: datetime | None = None) -> datetime | None:
+        """
+        The next scheduled run strictly after `after`, or None if nothing is scheduled.
+
+        Args:
+            after (datetime): The current time.
+            last_run (datetime | None): The previous scheduled run, from which the interval is counted.
+        """
+        candidates: List[datetime] = []
+        for at in self.daily_times:
+            candidate = datetime.combine(after.date(), at)
+            candidates.append(candidate if candidate > after else candidate + timedelta(days=1))
+        if self.interval is not None:
+            candidates.append(max(after, (last_run or after) + self.interval))
+        return min(candidates, default=None)
+
+    def describe(self) -> str:
+        parts = [f"daily at {', '.join(at.strftime('%H:%M') for at in self.daily_times)}"] if self.daily_times else []
+        if self.interval is not None:
+            parts.append(f"every {self.interval.total_seconds() / 60:g} minutes")
+        return " and ".join(parts) or "on demand only"
+
+
+class NewsAgentsDaemon:
+    """
+    Long-running service mode of the pipeline.
+
+    The costs every `python main.py` invocation pays once per run are paid once per process instead: module
+    imports, prompt loading, the compiled LangGraph workflow and its checkpointer, the query embeddings of the
+    alignment, the kept-alive connections to the FPT Cloud API and the browser of the TechRepublic scraper.
+
+    Runs are started by the schedule or on demand through a small local HTTP API:
+    - `GET /health`: liveness.
+    - `GET /status`: the current and last run, and the next scheduled run.
+    - `POST /runs`: start a run (JSON body, optional: `{"streaming": true}` or `{"resume": "<run_id>"}`,
+      `{"sources": ["arXiv", ...]}`, `{"force_refresh": true}`).
+      Answers 202 with the run ID, or 409 if a run is in progress (runs never overlap).
+    - `GET /runs/<run_id>`: status of a run, as persisted in its `RunStore`.
+    """
+
+    def __init__(
+        self,
+        output_folder_md: str,
+        output_folder_pdf: str,
+        metrics_path: str,
+        trace_path: str,
+        runs_dir: str = DEFAULT_RUNS_DIR,
+        schedule: Schedule | None = None,
+        streaming: bool = False,
+        host: str = DEFAULT_DAEMON_HOST,
+        port: int = DEFAULT_DAEMON_PORT,
+        sources: List[str] | None = None,
+    ):
+        self.run_kwargs: Dict[str, Any] = dict(
+            output_folder_md=output_folder_md,
+            output_folder_pdf=output_folder_pdf,
+            metrics_path=metrics_path,
+            trace_path=trace_path,
+            runs_dir=runs_dir,
+        )
+        self.runs_dir = runs_dir
+        self.schedule = schedule or Schedule()
+        self.streaming = streaming
+        self.sources = resolve_sources(sources) if sources is not None else None
+        self.host = host
+        self.port = port
+
+        self.workflow_manager: GuardRails_Rerank_Workflow | None = None
+        self.server: ThreadingHTTPServer | None = None
+        self.next_scheduled: datetime | None = None
+
+        self._lock = threading.Lock()
+        self._current: Dict[str, Any] | None = None
+        self._last: Dict[str, Any] | None = None
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def warm_up(self) -> None:
+        """Build the resources kept between runs"""
+        start = time.time()
+        self.workflow_manager = GuardRails_Rerank_Workflow(
+            GuardrailsConfig(),
+            papers=[],
+            articles=[],
+            checkpointer=get_checkpointer(self.runs_dir),
+            repository=DocumentRepository(os.path.join(self.runs_dir, DOCUMENTS_DB_NAME)),
+        )
+        get_session()
+        # Best effort: the embeddings are requested again by the first run if the API is unavailable now
+        try:
+            warmed = get_query_embeddings(build_query_strings(POSITIVE_KEYWORDS, NEGATIVE_KEYWORDS)) is not None
+        except Exception as e:
+            print(f"Error getting the query embeddings: {e}")
+            warmed = False
+        if not warmed:
+            print("Could not warm up the query embeddings, they will be requested by the first run")
+        print(f"Daemon warmed up in {time.time() - start:.2f}s")
+
+    def trigger(
+        self,
+        streaming: bool | None = None,
+        resume: str | None = None,
+        reason: str = "api",
+        sources: List[str] | None = None,
+        force_refresh: bool = False,
+    ) -> str | None:
+        """
+        Start a run in the background.
+
+        Args:
+            streaming (bool | None): Use the streaming mode. Defaults to the mode of the daemon.
+            resume (str | None): ID of a failed run to resume instead of starting a new one.
+            reason (str): What started the run (`api`, `schedule`), reported by the status.
+            sources (List[str] | None): Sources to use. Defaults to the sources of the daemon.
+            force_refresh (bool): Scrape the sources even if their refresh interval has not elapsed.
+
+        Returns:
+            str | None: The run ID, or None if a run is already in progress.
+        """
+        with self._lock:
+            if self._current is not None:
+                return None
+            run_id = resume or new_run_id()
+            self._current = {"run_id": run_id, "reason": reason, "started_at": datetime.now().isoformat()}
+
+        thread = threading.Thread(
+            target=self._run,
+            args=(run_id, self.streaming if streaming is None else streaming, resume is not None, sources or self.sources, force_refresh),
+            name=f"Run-{run_id}",
+            daemon=True,
+        )
+        thread.start()
+        return run_id
+
+    def _run(self, run_id: str, streaming: bool, resume: bool, sources: List[str] | None, force_refresh: bool) -> None:
+        outcome: Dict[str, Any] = {}
+        try:
+            result = run_pipeline(
+                run_id=run_id,
+                resume=resume,
+                streaming=streaming,
+                workflow_manager=self.workflow_manager,
+                sources=sources,
+                force_refresh=force_refresh,
+                **self.run_kwargs,
+            )
+            outcome = {"status": "completed", **asdict(result)}
+        except Exception as e:
+            # The run store records the failed node, the run can be resumed with POST /runs {"resume": run_id}
+            print(f"Run {run_id} failed: {type(e).__name__}: {e}")
+            outcome = {"status": "failed", "error": str(e)}
+        finally:
+            with self._lock:
+                self._last = {**self._current, **outcome, "finished_at": datetime.now().isoformat()}
+                self._current = None
+
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._current is not None
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "current_run": self._current,
+                "last_run": self._last,
+                "schedule": self.schedule.describe(),
+                "next_scheduled_run": self.next_scheduled.isoformat() if self.next_scheduled else None,
+            }
+
+    def run_status(self, run_id: str) -> Dict[str, Any] | None:
+        store = RunStore(run_id, root=self.runs_dir)
+        return store.status() if store.exists() else None
+
+    def _scheduler_loop(self) -> None:
+        last_run: datetime | None = None
+        while not self._stop.is_set():
+            self.next_scheduled = self.schedule.next_run(datetime.now(), last_run)
+            if self.next_scheduled is None:
+                return
+            # Waiting on the stop event instead of sleeping lets `stop()` interrupt the wait
+            if self._stop.wait(max(0.0, (self.next_scheduled - datetime.now()).total_seconds())):
+                return
+            last_run = self.next_scheduled
+            if self.trigger(reason="schedule") is None:
+                print(f"Skipping the run scheduled at {self.next_scheduled:%Y-%m-%d %H:%M}, a run is in progress")
+
+    def start(self) -> None:
+        """Warm up, then serve the HTTP API and run the scheduler from background threads"""
+        self.warm_up()
+        self.server = ThreadingHTTPServer((self.host, self.port), _make_handler(self))
+        self.port = self.server.server_address[1]
+        self._threads = [
+            threading.Thread(target=self.server.serve_forever, name="DaemonAPI", daemon=True),
+            threading.Thread(target=self._scheduler_loop, name="DaemonScheduler", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        print(f"Daemon listening on http://{self.host}:{self.port}, runs scheduled {self.schedule.describe()}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def serve_forever(self) -> None:
+        """Start the daemon and block until interrupted (Ctrl+C)"""
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            print("Stopping the daemon")
+        finally:
+            self.stop()
+
+
+def _make_handler(daemon: NewsAgentsDaemon):
+    class DaemonHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+            payload = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path == "/health":
+                self._send_json(200, {"status": "ok"})
+            elif path == "/status":
+                self._send_json(200, daemon.status())
+            elif match := _RUN_PATH.match(path):
+                run = daemon.run_status(match.group(1))
+                if run is None:
+                    self._send_json(404, {"error": f"No run {match.group(1)}"})
+                else:
+                    self._send_json(200, run)
+            else:
+                self._send_json(404, {"error": f"Unknown path {path}"})
+
+        def do_POST(self):
+            if self.path.split("?")[0] != "/runs":
+                self._send_json(404, {"error": f"Unknown path {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+            except ValueError:
+                self._send_json(400, {"error": "The body must be a JSON object"})
+                return
+            if not isinstance(body, dict):
+                self._send_json(400, {"error": "The body must be a JSON object"})
+                return
+            resume = body.get("resume")
+            if resume is not None and not (isinstance(resume, str) and re.fullmatch(_RUN_ID, resume)):
+                self._send_json(400, {"error": "resume must be a run ID"})
+                return
+            if resume and daemon.run_status(resume) is None:
+                self._send_json(404, {"error": f"No run {resume} to resume"})
+                return
+            try:
+                sources = resolve_sources(body["sources"]) if body.get("sources") else None
+            except (TypeError, ValueError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+
+            run_id = daemon.trigger(
+                streaming=body.get("streaming"),
+                resume=resume,
+                sources=sources,
+                force_refresh=bool(body.get("force_refresh")),
+            )
+            if run_id is None:
+                self._send_json(409, {"error": "A run is in progress", **daemon.status()})
+            else:
+                self._send_json(202, {"run_id": run_id})
+
+        def log_message(self, format, *args):
+            pass
+
+    return DaemonHandler
+
+
+def trigger_run(
+    host: str = DEFAULT_DAEMON_HOST,
+    port: int = DEFAULT_DAEMON_PORT,
+    streaming: bool | None = None,
+    resume: str | None = None,
+    sources: List[str] | None = None,
+    force_refresh: bool = False,
+) -> Tuple[int, Dict[str, Any]]:
+    """
+    Ask a running daemon to start a run.
+
+    Returns:
+        Tuple[int, Dict[str, Any]]: The HTTP status (202 started, 400 unknown source, 409 a run is in progress) and the JSON answer.
+    """
+    body: Dict[str, Any] = {}
+    if streaming is not None:
+        body["streaming"] = streaming
+    if resume is not None:
+        body["resume"] = resume
+    if sources is not None:
+        body["sources"] = sources
+    if force_refresh:
+        body["force_refresh"] = True
+    response = requests.post(f"http://{host}:{port}/runs", json=body, timeout=10)
+    return response.status_code, response.json()
@@ -0,0 +1,167 @@
+import os
+import time
+from datetime import date, timedelta
+from typing import Tuple
+
+from FCI_NewsAgents.core.config import DigestConfig
+from FCI_NewsAgents.prompts.get_prompts import (
+    get_generation_prompt,
+    get_pointwise_guardrails_prompt,
+)
+from FCI_NewsAgents.services.document_repository.repository import (
+    DOCUMENTS_DB_NAME,
+    DocumentRepository,
+)
+from FCI_NewsAgents.utils.pointwise_llm_guardrail_checker import select_top_documents
+from FCI_NewsAgents.utils.report_generator_utils import (
+    generate_markdown,
+    generate_opening_and_conclusion,
+    markdown_string_to_pdf,
+    select_highlight,
+)
+from FCI_NewsAgents.utils.utils import save_report
+from FCI_NewsAgents.workflows.checkpointing import DEFAULT_RUNS_DIR
+
+
+def digest_period(period: str, end: date, config: DigestConfig | None = None) -> Tuple[date, date]:
+    """
+    First and last day covered by a digest.
+
+    Args:
+        period (str): A period of `DigestConfig.PERIOD_DAYS`, e.g. 'weekly'.
+        end (date): Last day of the digest.
+        config (DigestConfig | None): The digest configuration.
+
+    Returns:
+        Tuple[date, date]: The first and last day, both included.
+    """
+    config = config or DigestConfig()
+    if period not in config.PERIOD_DAYS:
+        raise ValueError(f"Unknown digest period '{period}', expected one of: {', '.join(config.PERIOD_DAYS)}")
+    return end - timedelta(days=config.PERIOD_DAYS[period] - 1), end
+
+
+def build_digest(
+    repository: DocumentRepository,
+    start: date,
+    end: date,
+    config: DigestConfig | None = None,
+) -> str | None:
+    """
+    Build a digest report from the documents scored and summarised by the daily runs between two dates.
+
+    Nothing is scraped, scored or summarised again: the documents, their guardrails scores and their report segments
+    are read from the repository. Only the documents that have a segment (the ones of a daily report) are candidates,
+    and the best of them are kept like in a daily run. The highlight selection and the opening and conclusion are the
+    only LLM calls.
+
+    Args:
+        repository (DocumentRepository): The documents stored by the daily runs.
+        start (date): First scrape day of the documents.
+        end (date): Last scrape day of the documents.
+        config (DigestConfig | None): The digest configuration.
+
+    Returns:
+        str | None: The markdown report, or None if there is nothing to report or the LLM calls failed.
+    """
+    config = config or DigestConfig()
+    scoring_prompt = get_pointwise_guardrails_prompt()
+    generation_prompt = get_generation_prompt()
+
+    stored_documents = repository.find_documents(
+        scoring_prompt, seen_from=start, seen_to=end, min_score=config.SCORE_THRESHOLD
+    )
+    urls = [doc.url for doc in stored_documents]
+    report_segments = repository.load_segments(urls, "report", generation_prompt)
+    highlight_segments = repository.load_segments(urls, "highlight", generation_prompt)
+    # The highlight of a daily report only has a highlight segment
+    segments = {**highlight_segments, **report_segments}
+    print(
+        f"Digest {start.isoformat()} - {end.isoformat()}: {len(stored_documents)} scored documents, "
+        f"{len(segments)} with a report segment"
+    )
+
+    selected_documents = select_top_documents(
+        docs_with_scores=[(doc, doc.score) for doc in stored_documents if doc.url in segments],
+        threshold=config.SCORE_THRESHOLD,
+        max_papers=config.MAX_PAPERS,
+        max_articles=config.MAX_ARTICLES,
+    )
+    if not selected_documents:
+        print("No segmented documents in the digest period. Skipping digest generation.")
+        return None
+
+    highlight_document = selected_documents[
+        select_highlight(docs=selected_documents, system_prompt=generation_prompt)
+    ]
+    highlight_segment = highlight_segments.get(highlight_document.url) or segments[highlight_document.url]
+    other_documents = [doc for doc in selected_documents if doc.url != highlight_document.url]
+    other_segments = [report_segments.get(doc.url) or segments[doc.url] for doc in other_documents]
+
+    opening, conclusion = generate_opening_and_conclusion(
+        system_prompt=generation_prompt,
+        segments=[highlight_segment] + other_segments,
+    )
+    if not opening and not conclusion:
+        print("Failed to generate opening and conclusion. Skipping digest generation.")
+        return None
+
+    return generate_markdown(
+        opening=opening,
+        highlight_document=highlight_document,
+        highlight_segment=highlight_segment,
+        other_documents=other_documents,
+        other_segments=other_segments,
+        conclusion=conclusion,
+        title=f"Bản tin công nghệ tổng hợp - {start.strftime('%d/%m/%Y')} - {end.strftime('%d/%m/%Y')}",
+    )
+
+
+def run_digest(
+    period: str,
+    output_folder_md: str,
+    output_folder_pdf: str,
+    end: date | None = None,
+    runs_dir: str = DEFAULT_RUNS_DIR,
+    config: DigestConfig | None = None,
+) -> str | None:
+    """
+    Generate the weekly or monthly digest ending on a day, and save it as markdown and PDF.
+
+    Args:
+        period (str): A period of `DigestConfig.PERIOD_DAYS`, e.g. 'weekly'.
+        output_folder_md (str): Folder path to save the markdown digest.
+        output_folder_pdf (str): Folder path to save the PDF digest.
+        end (date | None): Last day of the digest. Defaults to today.
+        runs_dir (str): Folder of the persisted runs, holding the document repository.
+        config (DigestConfig | None): The digest configuration.
+
+    Returns:
+        str | None: The markdown digest, or None if none was generated.
+    """
+    start_time = time.time()
+    start, end = digest_period(period, end or date.today(), config)
+    repository = DocumentRepository(os.path.join(runs_dir, DOCUMENTS_DB_NAME))
+    try:
+        digest = build_digest(repository, start, end, config)
+    finally:
+        repository.close()
+    if digest is None:
+        return None
+
+    file_name = f"ai_news_digest_{period}_{end.strftime('%Y%m%d')}"
+    os.makedirs(output_folder_md, exist_ok=True)
+    md_output_path = os.path.join(output_folder_md, f"{file_name}.md")
+    save_report(digest, md_output_path)
+    print(f"Markdown digest saved to: {md_output_path}")
+    try:
+        pdf_object = markdown_string_to_pdf(markdown_string=digest)
+        os.makedirs(output_folder_pdf, exist_ok=True)
+        pdf_output_path = os.path.join(output_folder_pdf, f"{file_name}.pdf")
+        pdf_object.save(pdf_output_path)
+        print(f"PDF digest saved to: {pdf_output_path}")
+    except Exception as e:
+        print(f"Error generating PDF: {e}")
+
+    print(f"Digest generated in {time.time() - start_time:.2f} seconds")
+    return digest
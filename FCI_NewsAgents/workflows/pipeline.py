@@ -0,0 +1,182 @@
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List
+
+from FCI_NewsAgents.core.config import GuardrailsConfig, SourcesConfig
+from FCI_NewsAgents.services.document_repository.repository import (
+    DOCUMENTS_DB_NAME,
+    DocumentRepository,
+)
+from FCI_NewsAgents.services.scrapers.csai_scraper import scrape_papers
+from FCI_NewsAgents.services.scrapers.run_article_scrapers import scrape_articles
+from FCI_NewsAgents.services.scrapers.sources import SourcePlan, plan_sources
+from FCI_NewsAgents.utils.circuit_breaker import start_new_run
+from FCI_NewsAgents.utils.metrics import (
+    reset_metrics,
+    set_gauge,
+    timer,
+    write_prometheus_textfile,
+    write_run_summary,
+)
+from FCI_NewsAgents.utils.retry import reset_retry_budget
+from FCI_NewsAgents.utils.tracing import TRACER, start_trace
+from FCI_NewsAgents.utils.utils import (
+    convert_article_to_document,
+    convert_paper_to_document,
+)
+from FCI_NewsAgents.workflows.checkpointing import DEFAULT_RUNS_DIR, RunStore, new_run_id
+from FCI_NewsAgents.workflows.streaming import StreamingPipeline, scraper_sources
+from FCI_NewsAgents.workflows.workflow_builder import GuardRails_Rerank_Workflow, workflow_execution
+
+
+@dataclass
+class PipelineResult:
+    """Summary of one run of the pipeline"""
+    run_id: str
+    trace_id: str
+    articles: int
+    papers: int
+    total_seconds: float
+
+
+def print_source_plan(plan: SourcePlan) -> None:
+    """Print which sources a run scrapes and which ones it reuses from the cache"""
+    print(f"Sources to scrape: {', '.join(plan.due) or 'none'}")
+    for source in plan.cached:
+        print(f"Reusing {source}, last scraped at {plan.last_scraped[source]:%Y-%m-%d %H:%M}")
+
+
+def run_pipeline(
+    output_folder_md: str,
+    output_folder_pdf: str,
+    metrics_path: str,
+    trace_path: str,
+    runs_dir: str = DEFAULT_RUNS_DIR,
+    run_id: str | None = None,
+    resume: bool = False,
+    streaming: bool = False,
+    max_papers: int = 50,
+    workflow_manager: GuardRails_Rerank_Workflow | None = None,
+    sources: List[str] | None = None,
+    force_refresh: bool = False,
+) -> PipelineResult:
+    """
+    Run the whole pipeline once: scraping, the guardrails and report workflow, then the metrics and trace exports.
+
+    Args:
+        output_folder_md (str): Folder path to save the markdown report.
+        output_folder_pdf (str): Folder path to save the PDF report.
+        metrics_path (str): Folder to save the Prometheus textfile and the JSON run summary.
+        trace_path (str): Folder to save the OTLP/JSON trace of the run.
+        runs_dir (str): Folder of the persisted runs and checkpoints.
+        run_id (str | None): ID of the run. A new one is generated if None.
+        resume (bool): Resume the failed run `run_id` at the node that failed, without scraping again.
+        streaming (bool): Deduplicate, align and score documents while the scrapers are still running.
+        max_papers (int): Number of papers to scrape from arXiv. Defaults to 50.
+        workflow_manager (GuardRails_Rerank_Workflow | None): An already compiled workflow to reuse.
+        sources (List[str] | None): Sources to use, defaults to `SourcesConfig.ENABLED_SOURCES` (every source if None).
+        force_refresh (bool): Scrape the selected sources even if their refresh interval has not elapsed.
+
+    Returns:
+        PipelineResult: Summary of the run.
+
+    Raises:
+        ValueError: If a source is unknown.
+        Exception: The error of the workflow if the run failed (the run can then be resumed).
+    """
+    if resume and run_id is None:
+        raise ValueError("A run ID is required to resume a run")
+    plan = None if resume else plan_sources(SourcesConfig(), sources, force_refresh)
+    run_id = run_id or new_run_id()
+
+    overall_start = time.time()
+    reset_retry_budget()
+    start_new_run()
+    reset_metrics()
+    trace_id = start_trace()
+    print(f"Trace ID: {trace_id}")
+
+    # Opened for the streaming stage when there is no warm workflow, and shared with the workflow run
+    owned_repository = None
+    try:
+        if resume:
+            # The documents scraped by the failed run are loaded from its stage outputs
+            print(f"Resuming run {run_id}, skipping scraping")
+            articles, papers = [], []
+        elif streaming:
+            print_source_plan(plan)
+            # Scraping, deduplication, alignment and scoring overlap, the workflow then reuses their outputs
+            print("=" * 50)
+            print("STREAMING SCRAPING AND GUARDRAILS")
+            print("=" * 50)
+            with timer("phase", phase="streaming_guardrails"):
+                if workflow_manager is not None and workflow_manager.repository is not None:
+                    repository = workflow_manager.repository
+                else:
+                    repository = owned_repository = DocumentRepository(os.path.join(runs_dir, DOCUMENTS_DB_NAME))
+                result = StreamingPipeline(GuardrailsConfig(), RunStore(run_id, root=runs_dir), repository).run(
+                    scraper_sources(max_papers=max_papers, plan=plan)
+                )
+            papers = [doc for doc in result.raw_documents if doc.content_type == "paper"]
+            articles = [doc for doc in result.raw_documents if doc.content_type != "paper"]
+
+            print(f"\nTotal articles scraped: {len(articles)}")
+            print(f"Total papers scraped: {len(papers)}")
+        else:
+            print_source_plan(plan)
+            # Scrape articles (now parallel internally)
+            print("=" * 50)
+            print("SCRAPING ARTICLES")
+            print("=" * 50)
+            with timer("phase", phase="scrape_articles"):
+                article_dicts = scrape_articles(parallel=True, plan=plan)
+            articles = [convert_article_to_document(a) for a in article_dicts]
+
+            # Scrape papers
+            print("\n" + "=" * 50)
+            print("SCRAPING PAPERS")
+            print("=" * 50)
+            with timer("phase", phase="scrape_papers"):
+                paper_dicts = scrape_papers(max_results=max_papers, plan=plan)
+            papers = [convert_paper_to_document(p) for p in paper_dicts]
+
+            print(f"\nTotal articles scraped: {len(articles)}")
+            print(f"Total papers scraped: {len(papers)}")
+
+        # Run workflow
+        print("\n" + "=" * 50)
+        print("RUNNING WORKFLOW")
+        print("=" * 50)
+        workflow_execution(
+            papers=papers,
+            articles=articles,
+            output_folder_md=output_folder_md,
+            output_folder_pdf=output_folder_pdf,
+            run_id=run_id,
+            resume=resume,
+            runs_dir=runs_dir,
+            workflow_manager=workflow_manager,
+            repository=owned_repository,
+        )
+    finally:
+        if owned_repository is not None:
+            owned_repository.close()
+
+    total_time = time.time() - overall_start
+    print(f"\nTotal execution time of the workflow: {total_time:.2f}s")
+
+    # Export metrics
+    set_gauge("run_duration_seconds", total_time)
+    write_prometheus_textfile(os.path.join(metrics_path, "fci_newsagents.prom"))
+    summary_path = os.path.join(metrics_path, f"run_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    write_run_summary(summary_path, trace_id=trace_id, total_seconds=total_time, articles=len(articles), papers=len(papers))
+    print(f"Metrics saved to: {summary_path}")
+
+    # Export trace
+    trace_file = os.path.join(trace_path, f"trace_{trace_id}.json")
+    TRACER.export_otlp_json(trace_file)
+    print(f"Trace saved to: {trace_file}")
+
+    return PipelineResult(run_id=run_id, trace_id=trace_id, articles=len(articles), papers=len(papers), total_seconds=total_time)
@@ -0,0 +1,252 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from queue import Empty, Full, Queue
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List
+
+from FCI_NewsAgents.core.config import GuardrailsConfig
+from FCI_NewsAgents.models.document import Document
+from FCI_NewsAgents.prompts.get_prompts import get_pointwise_guardrails_prompt
+from FCI_NewsAgents.services.document_repository.repository import DocumentRepository
+from FCI_NewsAgents.utils.alignment_checker import get_most_aligned_documents
+from FCI_NewsAgents.utils.alignment_keywords import NEGATIVE_KEYWORDS, POSITIVE_KEYWORDS
+from FCI_NewsAgents.utils.duplication_checker import remove_duplicate_documents
+from FCI_NewsAgents.utils.metrics import inc, set_gauge
+from FCI_NewsAgents.utils.pointwise_llm_guardrail_checker import get_score
+from FCI_NewsAgents.workflows.checkpointing import RunStore
+
+if TYPE_CHECKING:
+    from FCI_NewsAgents.services.scrapers.sources import SourcePlan
+
+DocumentSource = Callable[[], Iterable[Document]]
+"""A producer of the streaming mode, e.g. the articles of the scrapers as each one completes."""
+
+_END = object()
+"""Sentinel closing a stream."""
+
+
+class StreamAborted(Exception):
+    """Raised in the producers and stages when another stage of the pipeline failed."""
+
+
+@dataclass
+class StreamingResult:
+    """Documents seen by each stage of the streaming pipeline, in arrival order."""
+    raw_documents: List[Document] = field(default_factory=list)
+    deduped_documents: List[Document] = field(default_factory=list)
+    aligned_documents: List[Document] = field(default_factory=list)
+    scores: Dict[str, float] = field(default_factory=dict)
+    """Guardrails score of each aligned document, keyed by URL."""
+
+
+class StreamingPipeline:
+    """
+    Streaming mode of the guardrails stages: scrapers -> deduplication -> alignment -> LLM scoring.
+
+    Each source runs in its own thread and puts its documents into a bounded queue as they are scraped.
+    Deduplication and alignment consume micro-batches (up to `STREAM_BATCH_SIZE` documents, or whatever
+    arrived within `STREAM_BATCH_WAIT_SECONDS`), and `MAX_PARALLEL_BRANCHES` workers score the aligned
+    documents one by one, so scraping, embedding and LLM time overlap instead of adding up. The bounded
+    queues apply backpressure: fast scrapers wait when scoring falls behind.
+
+    The top-k selection needs every score, so it is left to the workflow once the streams are closed:
+    the results are persisted in the `RunStore` of the run, from which the workflow reuses them.
+    """
+
+    def __init__(
+        self, config: GuardrailsConfig, run_store: RunStore | None = None, repository: DocumentRepository | None = None
+    ):
+        self.config = config
+        self.run_store = run_store
+        self.repository = repository
+        self.system_prompt = get_pointwise_guardrails_prompt()
+
+        self._scraped: Queue = Queue(maxsize=config.STREAM_QUEUE_SIZE)
+        self._deduped: Queue = Queue(maxsize=config.STREAM_QUEUE_SIZE)
+        self._aligned: Queue = Queue(maxsize=config.STREAM_QUEUE_SIZE)
+
+        self._result = StreamingResult()
+        self._lock = threading.Lock()
+        self._error: BaseException | None = None
+        self._failed = threading.Event()
+        self._scraping_done = False
+
+    def _fail(self, e: BaseException) -> None:
+        with self._lock:
+            if self._error is None:
+                self._error = e
+        self._failed.set()
+
+    def _put(self, queue: Queue, item) -> None:
+        """Put an item into a bounded queue, giving up if another stage failed meanwhile"""
+        while True:
+            if self._failed.is_set():
+                raise StreamAborted()
+            try:
+                queue.put(item, timeout=0.1)
+                return
+            except Full:
+                continue
+
+    def _get(self, queue: Queue, timeout: float | None = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._failed.is_set():
+                raise StreamAborted()
+            wait = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+            if wait <= 0:
+                raise Empty()
+            try:
+                return queue.get(timeout=wait)
+            except Empty:
+                continue
+
+    def _micro_batches(self, queue: Queue) -> Iterator[List[Document]]:
+        """Group the documents of a stream into batches, flushed when full or `STREAM_BATCH_WAIT_SECONDS` after their first document"""
+        batch: List[Document] = []
+        deadline = 0.0
+        while True:
+            try:
+                item = self._get(queue, timeout=max(1e-3, deadline - time.monotonic()) if batch else None)
+            except Empty:
+                yield batch
+                batch = []
+                continue
+
+            if item is _END:
+                if batch:
+                    yield batch
+                return
+
+            batch.append(item)
+            if len(batch) == 1:
+                deadline = time.monotonic() + self.config.STREAM_BATCH_WAIT_SECONDS
+            if len(batch) >= self.config.STREAM_BATCH_SIZE:
+                yield batch
+                batch = []
+
+    def _run_stage(self, name: str, stage: Callable[[], None]) -> threading.Thread:
+        def run():
+            try:
+                stage()
+            except StreamAborted:
+                pass
+            except BaseException as e:
+                print(f"Streaming stage {name} failed: {type(e).__name__}: {e}")
+                self._fail(e)
+
+        thread = threading.Thread(target=run, name=f"Stream-{name}", daemon=True)
+        thread.start()
+        return thread
+
+    def _produce(self, source: DocumentSource) -> None:
+        for doc in source():
+            with self._lock:
+                self._result.raw_documents.append(doc)
+            inc("stream_documents", stage="scraped")
+            self._put(self._scraped, doc)
+
+    def _deduplicate(self) -> None:
+        for batch in self._micro_batches(self._scraped):
+            kept = remove_duplicate_documents(batch, parallel=True, max_workers=16)
+            self._result.deduped_documents.extend(kept)
+            inc("stream_documents", len(kept), stage="deduped")
+            for doc in kept:
+                self._put(self._deduped, doc)
+        self._put(self._deduped, _END)
+
+    def _align(self) -> None:
+        for batch in self._micro_batches(self._deduped):
+            aligned = get_most_aligned_documents(
+                positive_query_strings=POSITIVE_KEYWORDS,
+                negative_query_strings=NEGATIVE_KEYWORDS,
+                documents=batch,
+                threshold=0.0,
+                repository=self.repository,
+            )
+            self._result.aligned_documents.extend(aligned)
+            inc("stream_documents", len(aligned), stage="aligned")
+            for doc in aligned:
+                self._put(self._aligned, doc)
+        for _ in range(self.config.MAX_PARALLEL_BRANCHES):
+            self._put(self._aligned, _END)
+
+    def _score(self) -> None:
+        while (doc := self._get(self._aligned)) is not _END:
+            score = (
+                self.repository.load_score(doc.url, self.system_prompt)
+                if self.repository is not None
+                else None
+            )
+            if score is None:
+                score = get_score(doc, self.system_prompt)
+                if self.repository is not None:
+                    self.repository.save_score(doc.url, self.system_prompt, score)
+            with self._lock:
+                self._result.scores[doc.url] = score
+            if self.run_store is not None:
+                self.run_store.save_text("scores", doc.url, str(score))
+            inc("stream_documents", stage="scored")
+            set_gauge("stream_queue_depth", self._aligned.qsize(), queue="aligned")
+
+    def run(self, sources: List[DocumentSource]) -> StreamingResult:
+        """
+        Stream the documents of the sources through deduplication, alignment and scoring.
+
+        Raises the first error of a stage, as the batch guardrails would.
+        """
+        start = time.time()
+        producers = [self._run_stage(f"source-{i}", lambda source=source: self._produce(source)) for i, source in enumerate(sources)]
+        stages = [
+            self._run_stage("dedup", self._deduplicate),
+            self._run_stage("align", self._align),
+        ] + [self._run_stage(f"score-{i}", self._score) for i in range(self.config.MAX_PARALLEL_BRANCHES)]
+
+        for producer in producers:
+            producer.join()
+        # The streams are closed once every source is exhausted
+        if not self._failed.is_set():
+            self._scraping_done = True
+            self._run_stage("close", lambda: self._put(self._scraped, _END)).join()
+        for stage in stages:
+            stage.join()
+
+        result = self._result
+        if self._error is not None:
+            if self.run_store is not None and self._scraping_done:
+                # The run can be resumed with the batch workflow, reusing the scraped documents and the scores
+                self.run_store.save_documents("raw", result.raw_documents)
+                self.run_store.set_status("failed", failed_node="streaming", error=str(self._error))
+            raise self._error
+
+        if self.run_store is not None:
+            self.run_store.save_documents("raw", result.raw_documents)
+            self.run_store.save_documents("deduped", result.deduped_documents)
+            self.run_store.save_documents("aligned", result.aligned_documents)
+        print(
+            f"Streaming guardrails completed in {time.time() - start:.2f}s: {len(result.raw_documents)} scraped, "
+            f"{len(result.deduped_documents)} after deduplication, {len(result.aligned_documents)} after alignment, "
+            f"{len(result.scores)} scored"
+        )
+        return result
+
+
+def scraper_sources(max_papers: int = 50, plan: "SourcePlan | None" = None) -> List[DocumentSource]:
+    """
+    The sources of the streaming mode: the article scrapers (as each one completes) and the arXiv pages (as each one is fetched).
+    Sources scraped within their refresh interval are replayed from the cache.
+    """
+    from FCI_NewsAgents.services.scrapers.csai_scraper import iter_papers
+    from FCI_NewsAgents.services.scrapers.run_article_scrapers import iter_scraped_articles
+    from FCI_NewsAgents.utils.utils import convert_article_to_document, convert_paper_to_document
+
+    def articles() -> Iterator[Document]:
+        for article in iter_scraped_articles(parallel=True, plan=plan):
+            yield convert_article_to_document(article)
+
+    def papers() -> Iterator[Document]:
+        for batch_papers in iter_papers(max_results=max_papers, plan=plan):
+            for paper in batch_papers:
+                yield convert_paper_to_document(paper)
+
+    return [articles, papers]
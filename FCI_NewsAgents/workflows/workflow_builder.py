@@ -3,41 +3,42 @@ import logging
 import os
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List
+from typing import Any, Callable, List
 
 import dotenv
-from markdown_pdf import MarkdownPdf
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
 
 # LangGraph and LangChain dependencies
 from langgraph.graph import END, StateGraph
+from langgraph.types import Send
 
 dotenv.load_dotenv()
 
 from FCI_NewsAgents.core.config import GuardrailsConfig
 from FCI_NewsAgents.models.document import Document
-from FCI_NewsAgents.models.workflow_state import WorkflowState
+from FCI_NewsAgents.models.document_batch import DocumentBatch
+from FCI_NewsAgents.models.workflow_state import DocumentTask, WorkflowState
 from FCI_NewsAgents.prompts.get_prompts import (
     get_generation_prompt,
-    get_guardrails_prompt,
     get_pointwise_guardrails_prompt,
 )
+from FCI_NewsAgents.services.document_repository.repository import (
+    DOCUMENTS_DB_NAME,
+    DocumentRepository,
+)
+from FCI_NewsAgents.services.llm.structured_output import get_parse_stats
 from FCI_NewsAgents.services.parsers.cs_ai_parser import extract_text_from_paper
 from FCI_NewsAgents.services.parsers.web_article_parser import (
     extract_text_from_web_article,
 )
 from FCI_NewsAgents.utils.alignment_checker import get_most_aligned_documents
 from FCI_NewsAgents.utils.alignment_keywords import NEGATIVE_KEYWORDS, POSITIVE_KEYWORDS
+from FCI_NewsAgents.utils.content_budgeter import ContentBudgeter, count_tokens
 from FCI_NewsAgents.utils.duplication_checker import remove_duplicate_documents
-from FCI_NewsAgents.utils.llm_guardrail_checker import (
-    filter_documents_by_guardrail_score,
-)
-from FCI_NewsAgents.utils.pointwise_llm_guardrail_checker import (
-    filter_documents_by_score,
-)
+from FCI_NewsAgents.utils.metrics import inc, record_stage, timer
+from FCI_NewsAgents.utils.pointwise_llm_guardrail_checker import get_score
 from FCI_NewsAgents.utils.report_generator_utils import (
     generate_highlight_segment,
     generate_markdown,
@@ -46,112 +47,223 @@ from FCI_NewsAgents.utils.report_generator_utils import (
     markdown_string_to_pdf,
     select_highlight,
 )
-
-print("No error happen at import stage")
-
+from FCI_NewsAgents.utils.tracing import TRACER, span
+from FCI_NewsAgents.workflows.checkpointing import (
+    DEFAULT_RUNS_DIR,
+    RunStore,
+    get_checkpointer,
+    new_run_id,
+)
 
 class GuardRails_Rerank_Workflow:
     """Langgraph workflow for the guardrails and rerank stage"""
 
     def __init__(
-        self, config: GuardrailsConfig, papers: List[Document], articles: List[Document]
+        self,
+        config: GuardrailsConfig,
+        papers: List[Document],
+        articles: List[Document],
+        run_store: RunStore | None = None,
+        checkpointer=None,
+        repository: DocumentRepository | None = None,
     ):
 
         self.config: GuardrailsConfig = config
-        self.guardrails_system_prompt: str = get_guardrails_prompt()
+        self.pointwise_guardrails_system_prompt: str = get_pointwise_guardrails_prompt()
         self.report_generation_system_prompt: str = get_generation_prompt()
+        self.content_budgeter: ContentBudgeter = ContentBudgeter(
+            max_input_tokens=config.MAX_INPUT_TOKENS,
+            chunk_tokens=config.CHUNK_TOKENS,
+        )
 
         # Store the documents directly instead of file paths
         self.papers: List[Document] = papers
         self.articles: List[Document] = articles
 
+        # Stage outputs of the run, reused when a failed run is resumed
+        self.run_store: RunStore | None = run_store
+        self.checkpointer = checkpointer
+        self.current_node: str | None = None
+
+        # What is known about each document across runs (scores, texts, embeddings, segments), looked up before paying for it
+        self.repository: DocumentRepository | None = repository
+
         # Build workflow graph
         self.workflow = self._build_workflow()
 
+    def start_run(self, papers: List[Document], articles: List[Document], run_store: RunStore | None) -> None:
+        """
+        Point the compiled workflow at the documents and the run store of a new run.
+
+        The graph, the prompts and the checkpointer are kept, so a long-running process (see `workflows/daemon.py`)
+        compiles the workflow once and reuses it for every run. Runs must not overlap.
+        """
+        self.papers = papers
+        self.articles = articles
+        self.run_store = run_store
+        self.current_node = None
+
     def _build_workflow(self) -> StateGraph:
         """Build the LangGraph workflow"""
 
         workflow = StateGraph(WorkflowState)
 
         # Add nodes (agent component)
-        workflow.add_node("data_loader", self.load_data_node)
-        workflow.add_node("guardrails", self.guardrails_node)
-        workflow.add_node("generate_article", self.generate_node)
+        # `score_document` and `write_segment` run once per document (map), in parallel branches
+        # joined by the reducers of `WorkflowState` before `select_documents` and `assemble_report` (reduce)
+        workflow.add_node("data_loader", self._track_node("data_loader", self.load_data_node))
+        workflow.add_node("prefilter", self._track_node("prefilter", self.prefilter_node))
+        workflow.add_node("score_document", self._track_node("score_document", self.score_document_node), input_schema=DocumentTask)
+        workflow.add_node("select_documents", self._track_node("select_documents", self.select_documents_node))
+        workflow.add_node("write_segment", self._track_node("write_segment", self.write_segment_node), input_schema=DocumentTask)
+        workflow.add_node("assemble_report", self._track_node("assemble_report", self.assemble_report_node))
 
         # Add edges (data flow)
-        workflow.add_edge("data_loader", "guardrails")
-        # workflow.add_edge("guardrails", END)
-        workflow.add_edge("guardrails", "generate_article")
-        workflow.add_edge("generate_article", END)
+        workflow.add_edge("data_loader", "prefilter")
+        workflow.add_conditional_edges("prefilter", self.route_to_scoring, ["score_document", "select_documents"])
+        workflow.add_edge("score_document", "select_documents")
+        workflow.add_conditional_edges("select_documents", self.route_to_segments, ["write_segment", "assemble_report"])
+        workflow.add_edge("write_segment", "assemble_report")
+        workflow.add_edge("assemble_report", END)
 
         # entry point
         workflow.set_entry_point("data_loader")
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
 
+    def _track_node(self, name: str, node: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """Remember which node is running, to report where a failed run should be resumed"""
+
+        def tracked_node(state):
+            self.current_node = name
+            return node(state)
+
+        return tracked_node
+
+    def _stage_documents(
+        self, stage: str, compute: Callable[[], List[Document]]
+    ) -> List[Document]:
+        """Documents of a stage, loaded from the run store if a previous attempt of the run completed it"""
+        if self.run_store is not None:
+            documents = self.run_store.load_documents(stage)
+            if documents is not None:
+                print(f"Reusing {len(documents)} {stage} documents of run {self.run_store.run_id}")
+                return documents
+
+        documents = compute()
+        if self.run_store is not None:
+            self.run_store.save_documents(stage, documents)
+        return documents
+
+    @timer("node", node="data_loader")
     def load_data_node(self, state: WorkflowState) -> WorkflowState:
         """Entry node to process data scraped from papers and articles"""
 
-        # Use the documents passed during initialization
-        papers = self.papers
-        articles = self.articles
-
-        # Combine all documents
-        state.raw_documents = papers + articles
+        # Use the documents passed during initialization (or scraped by the run being resumed)
+        state.raw_documents = self._stage_documents("raw", lambda: self.papers + self.articles)
+        papers = [doc for doc in state.raw_documents if doc.content_type == "paper"]
+        articles = [doc for doc in state.raw_documents if doc.content_type != "paper"]
+        if self.repository is not None:
+            self.repository.save_documents(state.raw_documents)
+
+        for doc in state.raw_documents:
+            TRACER.annotate_document(doc.url, source=doc.source, title=doc.title, content_type=doc.content_type)
+        inc("documents_loaded", len(papers), content_type="paper")
+        inc("documents_loaded", len(articles), content_type="article")
         print(
             f"Total documents loaded: {len(state.raw_documents)} (Papers: {len(papers)}, Articles: {len(articles)})"
         )
 
         return state
 
-    def guardrails_node(self, state: WorkflowState) -> WorkflowState:
-        paper_count = sum(
-            1 for doc in state.raw_documents if doc.content_type == "paper"
-        )
-        article_count = sum(
-            1 for doc in state.raw_documents if doc.content_type == "article"
-        )
+    @timer("node", node="prefilter")
+    def prefilter_node(self, state: WorkflowState) -> WorkflowState:
+        """Cheap batch filters run before the per-document branches: URL deduplication and embedding alignment"""
 
         # Minimum score threshold to include a document
         MIN_ALIGNMENT_SCORE_THRESHOLD = 0.0
-        MIN_RELEVANCE_SCORE_THRESHOLD = 0.8
 
         # 1. Remove duplicate URLs
-        dedupped_documents = remove_duplicate_documents(
-            state.raw_documents, parallel=True, max_workers=16
-        )
+        # The URLs are recorded by the deduplication, so its output must be reused on resume
+        with span("dedup", documents=len(state.raw_documents)):
+            dedupped_documents = self._stage_documents(
+                "deduped",
+                lambda: remove_duplicate_documents(
+                    state.raw_documents, parallel=True, max_workers=16
+                ),
+            )
+        record_stage("dedup", len(state.raw_documents), len(dedupped_documents))
         print(f"Number of documents after deduplication: {len(dedupped_documents)}")
 
-        # 2. Soft filtering based on embedding alignment
-        aligned_documents = get_most_aligned_documents(
-            positive_query_strings=POSITIVE_KEYWORDS,
-            negative_query_strings=NEGATIVE_KEYWORDS,
-            documents=dedupped_documents,
-            threshold=MIN_ALIGNMENT_SCORE_THRESHOLD,
-        )
+        # 2. Soft filtering based on embedding alignment (embeddings are requested in batches)
+        with span("align", documents=len(dedupped_documents)):
+            aligned_documents = self._stage_documents(
+                "aligned",
+                lambda: get_most_aligned_documents(
+                    positive_query_strings=POSITIVE_KEYWORDS,
+                    negative_query_strings=NEGATIVE_KEYWORDS,
+                    documents=dedupped_documents,
+                    threshold=MIN_ALIGNMENT_SCORE_THRESHOLD,
+                    repository=self.repository,
+                ),
+            )
 
+        record_stage("alignment", len(dedupped_documents), len(aligned_documents))
         print(
             f"Number of documents after alignment filtering: {len(aligned_documents)}"
         )
 
-        # 3. Evaluate each document with LLM guardrails
-        # scored_documents = filter_documents_by_guardrail_score(
-        #     documents=aligned_documents_with_domains,
-        #     min_score=MIN_RELEVANCE_SCORE_THRESHOLD,
-        #     max_papers=self.config.MAX_PAPERS_READ,
-        #     max_articles=self.config.MAX_ARTICLES_READ,
-        #     parallel=True,
-        #     max_workers=16
-        # )
-
-        scored_documents = filter_documents_by_score(
-            docs=aligned_documents,
-            threshold=4,
-            system_prompt=get_pointwise_guardrails_prompt(),
-            max_papers=self.config.MAX_PAPERS_READ,
-            max_articles=self.config.MAX_ARTICLES_READ,
-            parallel=True,
-            max_workers=16,
+        state.candidate_documents = aligned_documents
+        return state
+
+    def route_to_scoring(self, state: WorkflowState) -> List[Send] | str:
+        """Fan out: one `score_document` branch per candidate document"""
+        if not state.candidate_documents:
+            return "select_documents"
+        return [
+            Send("score_document", DocumentTask(document=doc))
+            for doc in state.candidate_documents
+        ]
+
+    @timer("node", node="score_document")
+    def score_document_node(self, task: DocumentTask) -> dict:
+        """Branch node: score one document with the pointwise LLM guardrails"""
+        doc = task.document
+        if self.run_store is not None:
+            cached_score = self.run_store.load_text("scores", doc.url)
+            if cached_score is not None:
+                return {"document_scores": {doc.url: float(cached_score)}}
+
+        score = (
+            self.repository.load_score(doc.url, self.pointwise_guardrails_system_prompt)
+            if self.repository is not None
+            else None
+        )
+        if score is None:
+            score = get_score(doc, self.pointwise_guardrails_system_prompt)
+            if self.repository is not None:
+                self.repository.save_score(doc.url, self.pointwise_guardrails_system_prompt, score)
+        if self.run_store is not None:
+            self.run_store.save_text("scores", doc.url, str(score))
+        return {"document_scores": {doc.url: score}}
+
+    @timer("node", node="select_documents")
+    def select_documents_node(self, state: WorkflowState) -> WorkflowState:
+        """Join the scoring branches: keep the top scored documents and select the highlight"""
+        type_counts = DocumentBatch(state.raw_documents).count_by_type()
+        paper_count = type_counts.get("paper", 0)
+        article_count = type_counts.get("article", 0)
+
+        # 3. Keep the best documents of each type according to the LLM guardrails
+        candidates = DocumentBatch(state.candidate_documents, scores=state.document_scores)
+        scored_documents = candidates.to_documents(
+            candidates.top_k(
+                threshold=4,
+                max_per_type={"paper": self.config.MAX_PAPERS_READ, "article": self.config.MAX_ARTICLES_READ},
+            )
         )
+        record_stage("guardrails", len(state.candidate_documents), len(scored_documents))
+        if self.run_store is not None:
+            self.run_store.save_documents("scored", scored_documents)
 
         # Print summary
         print(f"\n{'='*50}")
@@ -164,19 +276,120 @@ class GuardRails_Rerank_Workflow:
 
         state.filtered_documents = scored_documents
         print(f"Number of documents after guardrails node: {len(scored_documents)}")
-        return state
-
-    def generate_node(self, state: WorkflowState) -> WorkflowState:
-        """Node to generate final markdown report using LLM"""
 
-        all_documents = state.filtered_documents
+        if not scored_documents:
+            return state
 
-        for doc in all_documents:
+        for doc in scored_documents:
             print(
                 f"Document to be included in report: {doc.title} (Type: {doc.content_type}, Score: {doc.score})"
             )
             print(f"Summary: {doc.summary[:200]}...\n")
 
+        # Select the highlight document
+        highlight_url = (
+            self.run_store.load_value("highlight_url")
+            if self.run_store is not None
+            else None
+        )
+        if highlight_url is not None and all(doc.url != highlight_url for doc in scored_documents):
+            # Stored by a run whose selection differs (e.g. the scores changed since): select it again
+            print(f"Stored highlight {highlight_url} is not among the selected documents. Selecting the highlight again.")
+            highlight_url = None
+        if highlight_url is None:
+            highlight_index = select_highlight(
+                docs=scored_documents, system_prompt=self.report_generation_system_prompt
+            )
+            highlight_url = scored_documents[highlight_index].url
+            if self.run_store is not None:
+                self.run_store.save_value("highlight_url", highlight_url)
+
+        state.highlight_url = highlight_url
+        return state
+
+    def route_to_segments(self, state: WorkflowState) -> List[Send] | str:
+        """Fan out: one `write_segment` branch per selected document"""
+        if not state.filtered_documents:
+            return "assemble_report"
+        return [
+            Send(
+                "write_segment",
+                DocumentTask(
+                    document=doc,
+                    segment="highlight" if doc.url == state.highlight_url else "report",
+                ),
+            )
+            for doc in state.filtered_documents
+        ]
+
+    def _extract_content(self, doc: Document) -> str:
+        """Extract the full text of a document, traced in the document's span tree"""
+        if self.run_store is not None:
+            content = self.run_store.load_text("extracted", doc.url)
+            if content is not None:
+                return content
+        if self.repository is not None:
+            content = self.repository.load_text(doc.url)
+            if content is not None:
+                return content
+
+        with span("extract", document=doc.url, content_type=doc.content_type) as extract_span:
+            content = (
+                extract_text_from_paper(doc)
+                if doc.content_type == "paper"
+                else extract_text_from_web_article(doc)
+            )
+            extract_span.set_attribute("tokens", count_tokens(content or ""))
+
+        if self.run_store is not None and content:
+            self.run_store.save_text("extracted", doc.url, content)
+        if self.repository is not None and content:
+            self.repository.save_text(doc.url, content)
+        return content
+
+    @timer("node", node="write_segment")
+    def write_segment_node(self, task: DocumentTask) -> dict:
+        """Branch node: extract the full text of one document and generate its report segment"""
+        doc = task.document
+        if self.run_store is not None:
+            cached_segment = self.run_store.load_text("segments", doc.url)
+            if cached_segment is not None:
+                print(f"Reusing the generated segment of {doc.url}")
+                return {"segments": {doc.url: cached_segment}}
+        if self.repository is not None:
+            stored_segment = self.repository.load_segment(doc.url, task.segment, self.report_generation_system_prompt)
+            if stored_segment is not None:
+                print(f"Reusing the stored {task.segment} segment of {doc.url}")
+                if self.run_store is not None:
+                    self.run_store.save_text("segments", doc.url, stored_segment)
+                return {"segments": {doc.url: stored_segment}}
+
+        generate = (
+            generate_highlight_segment
+            if task.segment == "highlight"
+            else generate_report_segment
+        )
+        content = self._extract_content(doc)
+        with span("generate", document=doc.url, segment=task.segment):
+            segment = generate(
+                segment=content,
+                system_prompt=self.report_generation_system_prompt,
+                budgeter=self.content_budgeter,
+                max_workers=self.config.MAX_CHUNK_SUMMARY_WORKERS,
+            )
+
+        if self.run_store is not None and segment:
+            self.run_store.save_text("segments", doc.url, segment)
+        if self.repository is not None and segment:
+            self.repository.save_segment(doc.url, task.segment, self.report_generation_system_prompt, segment)
+        return {"segments": {doc.url: segment or ""}}
+
+    @timer("node", node="assemble_report")
+    def assemble_report_node(self, state: WorkflowState) -> WorkflowState:
+        """Join the segment branches: generate the opening and conclusion and assemble the markdown report"""
+
+        all_documents = state.filtered_documents
+
         if not all_documents:
             print(
                 "No documents available after guardrails filtering. Skipping report generation."
@@ -184,47 +397,24 @@ class GuardRails_Rerank_Workflow:
             state.final_report = None
             return state
 
-        # Select the highlight document
-        highlight_index = select_highlight(
-            docs=all_documents, system_prompt=self.report_generation_system_prompt
+        highlight_document = next(
+            (doc for doc in all_documents if doc.url == state.highlight_url), None
         )
-
-        highlight_document = all_documents[highlight_index]
+        if highlight_document is None:
+            print(f"Highlight document {state.highlight_url} is not among the selected documents. Skipping report generation.")
+            state.final_report = "Error: Failed to generate report with LLM"
+            return state
         other_documents = [
-            doc for i, doc in enumerate(all_documents) if i != highlight_index
+            doc for doc in all_documents if doc.url != state.highlight_url
         ]
-
-        # Generate highlight segment
-        highlight_content = (
-            extract_text_from_paper(highlight_document)
-            if highlight_document.content_type == "paper"
-            else extract_text_from_web_article(highlight_document)
-        )
-        highlight_segment = generate_highlight_segment(
-            segment=highlight_content,
-            system_prompt=self.report_generation_system_prompt,
-        )
+        highlight_segment = state.segments.get(highlight_document.url)
 
         if not highlight_segment:
             print("Failed to generate highlight segment. Skipping report generation.")
             state.final_report = "Error: Failed to generate report with LLM"
             return state
 
-        # Generate segments for other documents (in parallel)
-        def get_other_segment(doc: Document) -> str:
-            content = (
-                extract_text_from_paper(doc)
-                if doc.content_type == "paper"
-                else extract_text_from_web_article(doc)
-            )
-            return generate_report_segment(
-                segment=content, system_prompt=self.report_generation_system_prompt
-            )
-
-        # with ThreadPoolExecutor(max_workers=min(16, len(other_documents))) as executor:
-        #     other_segments = list(executor.map(get_other_segment, other_documents))
-
-        other_segments = [get_other_segment(doc) for doc in other_documents]
+        other_segments = [state.segments.get(doc.url) for doc in other_documents]
 
         if not all(other_segments):
             print(
@@ -234,10 +424,20 @@ class GuardRails_Rerank_Workflow:
             return state
 
         # Generate opening and conclusion
-        opening, conclusion = generate_opening_and_conclusion(
-            system_prompt=self.report_generation_system_prompt,
-            segments=[highlight_segment] + other_segments,
+        opening_and_conclusion = (
+            self.run_store.load_value("opening_and_conclusion")
+            if self.run_store is not None
+            else None
         )
+        if opening_and_conclusion is not None:
+            opening, conclusion = opening_and_conclusion
+        else:
+            opening, conclusion = generate_opening_and_conclusion(
+                system_prompt=self.report_generation_system_prompt,
+                segments=[highlight_segment] + other_segments,
+            )
+            if self.run_store is not None and (opening or conclusion):
+                self.run_store.save_value("opening_and_conclusion", [opening, conclusion])
 
         if not opening and not conclusion:
             print(
@@ -256,13 +456,6 @@ class GuardRails_Rerank_Workflow:
             conclusion=conclusion,
         )
 
-        try:
-            state.pdf_object = markdown_string_to_pdf(
-                markdown_string=final_report,
-            )
-        except Exception as e:
-            print(f"Error generating PDF: {e}")
-
         state.final_report = final_report
         return state
 
@@ -271,50 +464,130 @@ def workflow_execution(
     papers: List[Document], 
     articles: List[Document], 
     output_folder_md: str,
-    output_folder_pdf: str
+    output_folder_pdf: str,
+    run_id: str | None = None,
+    resume: bool = False,
+    runs_dir: str = DEFAULT_RUNS_DIR,
+    workflow_manager: GuardRails_Rerank_Workflow | None = None,
+    repository: DocumentRepository | None = None,
 ):
     """
     Execute the workflow with the given papers and articles.
 
+    The outputs of each stage are persisted under `runs_dir/<run_id>/` and the graph is checkpointed in
+    `runs_dir/checkpoints.sqlite`, so a failed run can be resumed with `resume=True`: the graph restarts at
+    the node that failed, and the stages (and report segments) that already succeeded are not paid for again.
+    Scores, extracted texts, embeddings and segments are also kept across runs in `runs_dir/documents.sqlite`
+    (see `DocumentRepository`), so a document seen by an earlier run is not scored or summarised again.
+
     Args:
-        papers (List[Document]): List of paper documents.
-        articles (List[Document]): List of article documents.
+        papers (List[Document]): List of paper documents (ignored when resuming).
+        articles (List[Document]): List of article documents (ignored when resuming).
         output_folder_md (str): Folder path to save markdown report.
         output_folder_pdf (str): Folder path to save PDF report.
+        run_id (str | None): ID of the run. A new one is generated if None.
+        resume (bool): Resume the run `run_id` instead of starting it.
+        runs_dir (str): Folder of the persisted runs and checkpoints.
+        workflow_manager (GuardRails_Rerank_Workflow | None): An already compiled workflow to reuse, e.g. kept warm
+            by the daemon. Its checkpointer must save to `runs_dir`. A new one is built if None.
+        repository (DocumentRepository | None): The document repository of the new workflow, e.g. the one already
+            used by the streaming stage. If None, one is opened in `runs_dir` and closed at the end of the run.
 
     Returns:
         final_state_dict (dict): The final state of the workflow as a dictionary.
     """
-    config = GuardrailsConfig()
-
-    workflow_manager = GuardRails_Rerank_Workflow(
-        config, papers=papers, articles=articles
-    )
+    if resume and run_id is None:
+        raise ValueError("A run ID is required to resume a run")
+
+    run_store = RunStore(run_id or new_run_id(), root=runs_dir)
+    if resume and not run_store.exists():
+        raise ValueError(f"No run {run_store.run_id} to resume in {runs_dir}")
+
+    owned_repository = None
+    if workflow_manager is None:
+        if repository is None:
+            repository = owned_repository = DocumentRepository(os.path.join(runs_dir, DOCUMENTS_DB_NAME))
+        workflow_manager = GuardRails_Rerank_Workflow(
+            GuardrailsConfig(),
+            papers=papers,
+            articles=articles,
+            run_store=run_store,
+            checkpointer=get_checkpointer(runs_dir),
+            repository=repository,
+        )
+    else:
+        workflow_manager.start_run(papers, articles, run_store)
+    config = workflow_manager.config
+    run_config = {
+        "configurable": {"thread_id": run_store.run_id},
+        "max_concurrency": config.MAX_PARALLEL_BRANCHES,
+    }
     initial_state = WorkflowState(config=config)
+    print(f"Run ID: {run_store.run_id}")
+    run_store.set_status("running")
     start_time = time.time()
     try:
-        final_state_dict = workflow_manager.workflow.invoke(initial_state)
+        with timer("workflow"):
+            pending_nodes = (
+                workflow_manager.workflow.get_state(run_config).next
+                if resume and workflow_manager.checkpointer is not None
+                else ()
+            )
+            if pending_nodes:
+                print(f"Resuming run {run_store.run_id} at node(s): {', '.join(pending_nodes)}")
+                final_state_dict = workflow_manager.workflow.invoke(None, run_config)
+            else:
+                # Stages completed by a previous attempt of the run are loaded from the run store
+                final_state_dict = workflow_manager.workflow.invoke(initial_state, run_config)
         # Extract the final_report from the dictionary
         final_report = final_state_dict.get("final_report", "No report generated")
         output_path = f"ai_news_report_{datetime.now().strftime('%Y%m%d')}.md"
 
+        if final_report and final_report.startswith("Error"):
+            run_store.set_status("failed", failed_node="assemble_report", error=final_report)
+            print(f"Resume this run with: python FCI_NewsAgents/main.py --resume {run_store.run_id}")
+        else:
+            run_store.set_status("completed")
+
         # save_report(final_report, os.path.join(output_folder_md, output_path))
-        pdf_object: MarkdownPdf = final_state_dict.get("pdf_object", None)
+        # The PDF is rendered out of the graph, as it cannot be checkpointed
+        pdf_object = None
+        if final_report and not final_report.startswith("Error"):
+            try:
+                pdf_object = markdown_string_to_pdf(markdown_string=final_report)
+            except Exception as e:
+                print(f"Error generating PDF: {e}")
         if pdf_object:
             pdf_output_path = f"ai_news_report_{datetime.now().strftime('%Y-%m-%d')}.pdf"
             pdf_object.save(os.path.join(output_folder_pdf, pdf_output_path))
+        final_state_dict["pdf_object"] = pdf_object
 
         processing_time = time.time() - start_time
         print(f"Processing completed in {processing_time:.2f} seconds")
+        print(f"Trace ID: {TRACER.trace_id}")
+        for url, seconds in TRACER.slowest_documents(5):
+            print(f"Slow document: {seconds:.2f}s across stages - {url}")
+        for task, stats in get_parse_stats().items():
+            print(
+                f"Structured output [{task}]: {stats.first_try_successes}/{stats.calls} parsed on first try, "
+                f"{stats.retries} retries, {stats.failures} failures"
+            )
         print(f"Markdown report saved to: {output_path}")
         if pdf_object:
             print(f"PDF report saved to: {pdf_output_path}")
         return final_state_dict
 
     except Exception as e:
+        run_store.set_status("failed", failed_node=workflow_manager.current_node, error=str(e))
         print(f"Error: {e}")
+        print(
+            f"Run {run_store.run_id} failed at node {workflow_manager.current_node}. "
+            f"Resume it with: python FCI_NewsAgents/main.py --resume {run_store.run_id}"
+        )
         raise
-
+    finally:
+        if owned_repository is not None:
+            owned_repository.close()
 
 if __name__ == "__main__":
     pass
@@ -0,0 +1,131 @@
+"""
+Startup-time regression check of the entry points, with `python -X importtime`.
+
+    python -m benchmarks.import_time
+
+Each check starts a fresh interpreter and fails if it imports one of the heavy modules that are only needed by other
+modes (LangGraph, the PDF backends, Selenium, ...) or if its imports take longer than its budget. The interpreter's own
+startup (`site`) is not counted. Use `--budget-scale` on a slower machine.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+HEAVY_MODULES = [
+    "langgraph",
+    "langchain_core",
+    "markdown_pdf",
+    "reportlab",
+    "pymupdf4llm",
+    "pymupdf",
+    "selenium",
+    "selenium_stealth",
+]
+"""Top-level packages that take hundreds of milliseconds to import and must be imported on first use."""
+
+_SINGLE_SCRAPER = (
+    "from FCI_NewsAgents.services.scrapers.registry import SCRAPERS; "
+    "from FCI_NewsAgents.services.scrapers.run_article_scrapers import scrape_articles; "
+    "SCRAPERS['MITNews']"
+)
+
+
+@dataclass
+class ImportCheck:
+    name: str
+    args: List[str]
+    """Arguments of the interpreter after `-X importtime`."""
+    budget: float | None = None
+    """Maximum import time, in seconds."""
+    forbidden: List[str] = field(default_factory=lambda: list(HEAVY_MODULES))
+
+
+CHECKS = [
+    ImportCheck("main.py --help", ["FCI_NewsAgents/main.py", "--help"], budget=0.3),
+    ImportCheck("main.py --dry-run", ["FCI_NewsAgents/main.py", "--dry-run"], budget=0.3),
+    ImportCheck("single scraper", ["-c", _SINGLE_SCRAPER], budget=1.0),
+    # The workflow needs LangGraph, but not the PDF backends or Selenium
+    ImportCheck(
+        "workflow",
+        ["-c", "import FCI_NewsAgents.workflows.workflow_builder"],
+        forbidden=["markdown_pdf", "reportlab", "pymupdf4llm", "pymupdf", "selenium", "selenium_stealth"],
+    ),
+]
+
+
+@dataclass
+class ImportProfile:
+    name: str
+    import_seconds: float
+    """Cumulative import time of the top-level imports, except the interpreter's startup."""
+    modules: Dict[str, float]
+    """Cumulative import time of every imported module, in seconds."""
+    forbidden_imported: List[str]
+    returncode: int
+
+
+def profile_imports(check: ImportCheck) -> ImportProfile:
+    """Run a check in a fresh interpreter and parse its `-X importtime` report."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")]))}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *check.args],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+
+    # Lines look like `import time:       282 |     140763 |   dateparser`: self and cumulative microseconds, then
+    # the module indented by its depth in the import tree
+    modules: Dict[str, float] = {}
+    top_level_us = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        modules[name.strip()] = int(cumulative) / 1e6
+        if not name.startswith("  ") and name.strip() != "site":
+            top_level_us += int(cumulative)
+
+    forbidden_imported = sorted(
+        module for module in check.forbidden if any(name == module or name.startswith(f"{module}.") for name in modules)
+    )
+    return ImportProfile(check.name, top_level_us / 1e6, modules, forbidden_imported, completed.returncode)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check that the entry points do not import heavy modules they do not use.")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply the import time budgets, e.g. 2 on a slow machine.")
+    parser.add_argument("--top", type=int, default=5, help="Number of slowest modules to print per check.")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for check in CHECKS:
+        profile = profile_imports(check)
+        problems = []
+        if profile.returncode != 0:
+            problems.append(f"exited with {profile.returncode}")
+        if profile.forbidden_imported:
+            problems.append(f"imports {', '.join(profile.forbidden_imported)}")
+        budget = check.budget * args.budget_scale if check.budget is not None else None
+        if budget is not None and profile.import_seconds > budget:
+            problems.append(f"over the {budget:.2f}s budget")
+        failures += bool(problems)
+
+        print(f"{check.name:<20} {profile.import_seconds:6.3f}s  {'FAIL: ' + '; '.join(problems) if problems else 'ok'}")
+        slowest = sorted(profile.modules.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        for module, seconds in slowest:
+            print(f"    {seconds:6.3f}s  {module}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
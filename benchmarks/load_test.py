@@ -0,0 +1,247 @@
+"""
+Load test of the LLM-bound stages against the mock FPT server, sweeping their `max_workers`.
+
+    python -m benchmarks.load_test --workers 1 2 4 8 16 32 --documents 200 --max-concurrency 16 --rate-429 0.02
+
+- guardrails: pointwise scoring of `--documents` documents (`filter_documents_by_score`).
+- generation: report segments of `--generation-documents` long documents, whose `--chunks` chunks are summarised
+  concurrently (`fit_content_to_budget`).
+
+For each stage, the recommended `max_workers` is the smallest one reaching 95% of the best throughput without
+failed items. Use `--base-url` to load test another deployment instead of the built-in mock server.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.mock_fpt_server import MockFPTServer, add_server_arguments, server_from_arguments
+from benchmarks.synthetic_site import synthetic_documents
+from FCI_NewsAgents.core.config import GuardrailsConfig
+from FCI_NewsAgents.utils.circuit_breaker import start_new_run
+from FCI_NewsAgents.utils.content_budgeter import ContentBudgeter
+from FCI_NewsAgents.utils.metrics import METRICS, reset_metrics
+from FCI_NewsAgents.utils.retry import reset_retry_budget
+from FCI_NewsAgents.utils.tracing import TRACER, start_trace
+
+DEFAULT_WORKERS = [1, 2, 4, 8, 16, 32]
+
+ACCEPTABLE_THROUGHPUT = 0.95
+"""Share of the best throughput the recommended `max_workers` must reach."""
+
+
+@dataclass
+class LoadTestResult:
+    stage: str
+    max_workers: int
+    items: int
+    failed_items: int
+    wall_seconds: float
+    throughput_per_s: float
+    llm_p50_ms: float | None
+    llm_p95_ms: float | None
+    retries: float
+    responses: Dict[str, int]
+    """Responses of the server, keyed by "<path> <status>" (empty if the server has no /stats endpoint)."""
+    peak_in_flight: int | None
+
+
+def _percentile(sorted_values: List[float], q: float) -> float | None:
+    if not sorted_values:
+        return None
+    return round(sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))] * 1000, 3)
+
+
+def _long_content(budgeter: ContentBudgeter, chunks: int, index: int) -> str:
+    """Content of about `chunks` chunks for the budgeter."""
+    paragraph = (
+        f"Document {index}. The serving stack batches requests across GPUs and reports a 35% lower latency. "
+        "Engineers measured throughput, cost and quality on public benchmarks and internal workloads. "
+    )
+    paragraphs = [paragraph] * max(1, budgeter.chunk_tokens // max(1, budgeter.count_tokens(paragraph)))
+    chunk = "\n\n".join(paragraphs)
+    return "\n\n".join([chunk] * chunks)
+
+
+def run_guardrails(documents: int, max_workers: int) -> Tuple[int, int]:
+    from FCI_NewsAgents.prompts.get_prompts import get_pointwise_guardrails_prompt
+    from FCI_NewsAgents.utils.pointwise_llm_guardrail_checker import filter_documents_by_score
+
+    try:
+        filter_documents_by_score(
+            docs=synthetic_documents(documents),
+            threshold=4,
+            system_prompt=get_pointwise_guardrails_prompt(),
+            parallel=True,
+            max_workers=max_workers,
+        )
+    except Exception as e:
+        # A single failed document aborts the stage, as in the pipeline
+        print(f"Guardrails stage failed: {e}", file=sys.stderr)
+    scored = [span for span in TRACER.end_trace() if span.name == "score"]
+    return documents, documents - sum(1 for span in scored if span.status == "ok")
+
+
+def run_generation(documents: int, chunks: int, max_workers: int) -> Tuple[int, int]:
+    from FCI_NewsAgents.prompts.get_prompts import get_generation_prompt
+    from FCI_NewsAgents.utils.report_generator_utils import generate_report_segment
+
+    config = GuardrailsConfig()
+    budgeter = ContentBudgeter(max_input_tokens=config.MAX_INPUT_TOKENS, chunk_tokens=config.CHUNK_TOKENS)
+    system_prompt = get_generation_prompt()
+
+    failed_segments = 0
+    for index in range(documents):
+        try:
+            generate_report_segment(_long_content(budgeter, chunks, index), system_prompt, budgeter=budgeter, max_workers=max_workers)
+        except Exception as e:
+            print(f"Generation of segment {index} failed: {e}", file=sys.stderr)
+            failed_segments += 1
+
+    # Failed chunk summaries fall back to truncation, count them through their LLM calls
+    llm_calls = [span for span in TRACER.end_trace() if span.name == "llm_call"]
+    failed_calls = sum(1 for span in llm_calls if span.status == "error")
+    return documents * chunks, failed_segments + failed_calls
+
+
+def _server_stats(base_url: str) -> Dict | None:
+    try:
+        response = requests.get(f"{base_url}/stats", timeout=5)
+        return response.json() if response.ok else None
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def _reset_server_stats(base_url: str) -> None:
+    with contextlib.suppress(requests.RequestException):
+        requests.post(f"{base_url}/stats/reset", timeout=5)
+
+
+def run_stage(stage: str, run: Callable[[int], Tuple[int, int]], max_workers: int, base_url: str, verbose: bool) -> LoadTestResult:
+    """Run one stage with the given `max_workers`, from a clean retry budget, circuit state and metrics."""
+    reset_retry_budget()
+    start_new_run()
+    reset_metrics()
+    start_trace(load_test=stage, max_workers=max_workers)
+    _reset_server_stats(base_url)
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.nullcontext() if verbose else contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        items, failed_items = run(max_workers)
+        wall_seconds = time.perf_counter() - start
+
+    llm_latencies = sorted(span.duration for span in TRACER.end_trace() if span.name == "llm_call" and span.status == "ok")
+    retries = sum(counter["value"] for counter in METRICS.snapshot()["counters"] if counter["name"] == "retries")
+    stats = _server_stats(base_url) or {}
+
+    return LoadTestResult(
+        stage=stage,
+        max_workers=max_workers,
+        items=items,
+        failed_items=failed_items,
+        wall_seconds=round(wall_seconds, 3),
+        throughput_per_s=round(items / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+        llm_p50_ms=_percentile(llm_latencies, 0.5),
+        llm_p95_ms=_percentile(llm_latencies, 0.95),
+        retries=retries,
+        responses=stats.get("responses", {}),
+        peak_in_flight=stats.get("peak_in_flight"),
+    )
+
+
+def recommend(results: List[LoadTestResult]) -> int | None:
+    """
+    The smallest `max_workers` reaching `ACCEPTABLE_THROUGHPUT` of the best throughput without failed items.
+
+    Fewer workers for the same throughput means fewer requests in flight against the shared quota.
+    """
+    clean = [result for result in results if result.failed_items == 0]
+    if not clean:
+        return None
+    best = max(result.throughput_per_s for result in clean)
+    return min(result.max_workers for result in clean if result.throughput_per_s >= ACCEPTABLE_THROUGHPUT * best)
+
+
+def main(argv: List[str] | None = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Sweep max_workers of the guardrails and generation stages against a mock FPT server.")
+    parser.add_argument("--workers", type=int, nargs="+", default=DEFAULT_WORKERS, help="Values of max_workers to try.")
+    parser.add_argument("--stages", type=str, nargs="+", choices=["guardrails", "generation"], default=["guardrails", "generation"], help="Stages to load test.")
+    parser.add_argument("--documents", type=int, default=200, help="Number of documents scored by the guardrails stage.")
+    parser.add_argument("--generation-documents", type=int, default=2, help="Number of long documents of the generation stage.")
+    parser.add_argument("--chunks", type=int, default=16, help="Number of chunks of each long document of the generation stage.")
+    parser.add_argument("--base-url", type=str, default=None, help="Load test this FPT API deployment instead of starting the mock server.")
+    parser.add_argument("--output", type=str, default=os.path.join("FCI_NewsAgents", "workflow_output", "benchmarks", f"load_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"), help="Path of the JSON results.")
+    parser.add_argument("--verbose", action="store_true", help="Show the output of the pipeline.")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server: MockFPTServer | None = None
+    if args.base_url is None:
+        server = server_from_arguments(args)
+        server.start()
+    base_url = (args.base_url or server.base_url).rstrip("/")
+    os.environ["FPT_API_BASE_URL"] = base_url
+    os.environ.setdefault("FPT_120B", "load-test")
+    os.environ.setdefault("FPT_API_KEY", "load-test")
+    print(f"Load testing {base_url}")
+
+    stages = {
+        "guardrails": lambda workers: run_guardrails(args.documents, workers),
+        "generation": lambda workers: run_generation(args.generation_documents, args.chunks, workers),
+    }
+
+    results: Dict[str, List[LoadTestResult]] = {}
+    try:
+        print(f"{'stage':<12}{'workers':>8}{'items':>7}{'failed':>7}{'wall s':>9}{'items/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'retries':>8}{'peak':>6}")
+        for stage in args.stages:
+            results[stage] = []
+            for workers in args.workers:
+                result = run_stage(stage, stages[stage], workers, base_url, args.verbose)
+                results[stage].append(result)
+                print(
+                    f"{stage:<12}{workers:>8}{result.items:>7}{result.failed_items:>7}{result.wall_seconds:>9.2f}"
+                    f"{result.throughput_per_s:>9.2f}{result.llm_p50_ms if result.llm_p50_ms is not None else '-':>10}"
+                    f"{result.llm_p95_ms if result.llm_p95_ms is not None else '-':>10}{result.retries:>8g}"
+                    f"{result.peak_in_flight if result.peak_in_flight is not None else '-':>6}"
+                )
+    finally:
+        if server is not None:
+            server.stop()
+
+    recommendations = {stage: recommend(stage_results) for stage, stage_results in results.items()}
+    for stage, workers in recommendations.items():
+        print(f"Recommended max_workers for {stage}: {workers if workers is not None else 'none (every run had failures)'}")
+
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "base_url": base_url,
+        "mock_server": None if server is None else {
+            "chat_latency": str(args.chat_latency),
+            "embedding_latency": str(args.embedding_latency),
+            "rate_429": args.rate_429,
+            "rate_5xx": args.rate_5xx,
+            "max_concurrency": args.max_concurrency,
+            "seed": args.seed,
+        },
+        "results": {stage: [asdict(result) for result in stage_results] for stage, stage_results in results.items()},
+        "recommended_max_workers": recommendations,
+    }
+    output_path = os.path.abspath(args.output)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Load test results saved to: {output_path}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Local stand-in for the FPT Cloud chat completions and embeddings endpoints, for load and concurrency tests.
+
+    python -m benchmarks.mock_fpt_server --port 8765 --chat-latency lognormal:0.8:0.4 --rate-429 0.05
+
+Then point the pipeline at it with `FPT_API_BASE_URL=http://127.0.0.1:8765`. Replies are the deterministic ones of
+`StubLLMBackend`; latency, rate limiting (429), server errors (5xx) and server capacity are configurable.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Dict, Literal, Set, Tuple
+
+from benchmarks.stub_backend import StubLLMBackend
+
+
+@dataclass
+class LatencyDistribution:
+    """
+    Distribution of the latency of a response, in seconds.
+
+    Written on the command line as `constant:<s>`, `uniform:<low>:<high>`, `lognormal:<median>:<sigma>` or
+    `exponential:<mean>`.
+    """
+    kind: Literal["constant", "uniform", "lognormal", "exponential"] = "constant"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, *params = spec.split(":")
+        expected = {"constant": 1, "uniform": 2, "lognormal": 2, "exponential": 1}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Invalid latency distribution '{spec}', expected one of constant:<s>, uniform:<low>:<high>, lognormal:<median>:<sigma>, exponential:<mean>")
+        values = [float(p) for p in params]
+        return cls(kind, *values)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            # Parametrised by the median, so `lognormal:0.8:0` is a constant 0.8 s
+            return self.a * rng.lognormvariate(0.0, self.b)
+        if self.kind == "exponential":
+            return rng.expovariate(1 / self.a) if self.a > 0 else 0.0
+        return self.a
+
+    def __str__(self) -> str:
+        params = [self.a] if self.kind in ("constant", "exponential") else [self.a, self.b]
+        return ":".join([self.kind] + [f"{p:g}" for p in params])
+
+
+@dataclass
+class ServerStats:
+    """Counters of the mock server since its start or its last reset."""
+    responses: Dict[str, int] = field(default_factory=dict)
+    """Number of responses, keyed by "<path> <status>"."""
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    """Highest number of requests processed at the same time."""
+    queued_seconds: float = 0.0
+    """Total time requests waited for a free slot (see `max_concurrency`)."""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "responses": dict(self.responses),
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "queued_seconds": round(self.queued_seconds, 6),
+        }
+
+
+class MockFPTServer:
+    """
+    Asyncio HTTP/1.1 server implementing `/v1/chat/completions` and `/v1/embeddings` of the FPT Cloud API.
+
+    - Each request waits for a latency drawn from the distribution of its endpoint (embedding latency is per call,
+      plus `embedding_latency_per_input` for each input text).
+    - A share of the requests is rejected with 429 (with a `Retry-After` header) or fails with 503 after its latency.
+    - With `max_concurrency`, requests beyond the capacity of the server queue up, as on a saturated deployment.
+    - `GET /stats` returns the counters of `ServerStats`, `POST /stats/reset` resets them.
+
+    The server runs in its own thread, so it can be started from synchronous code:
+
+    ```python
+    with MockFPTServer(chat_latency=LatencyDistribution.parse("lognormal:0.8:0.4"), rate_429=0.05) as server:
+        os.environ["FPT_API_BASE_URL"] = server.base_url
+        ...
+    ```
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        chat_latency: LatencyDistribution | None = None,
+        embedding_latency: LatencyDistribution | None = None,
+        embedding_latency_per_input: float = 0.0,
+        rate_429: float = 0.0,
+        rate_5xx: float = 0.0,
+        retry_after: float = 1.0,
+        max_concurrency: int | None = None,
+        seed: int = 0,
+        dimensions: int = 1024,
+    ):
+        self.host = host
+        self.port = port
+        """The port to listen on. 0 picks a free port, available in `port` once started."""
+        self.chat_latency = chat_latency or LatencyDistribution("constant", 0.05)
+        self.embedding_latency = embedding_latency or LatencyDistribution("constant", 0.05)
+        self.embedding_latency_per_input = embedding_latency_per_input
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self.max_concurrency = max_concurrency
+
+        self.backend = StubLLMBackend(latency=0, embedding_latency=0, dimensions=dimensions)
+        self.stats = ServerStats()
+        self._rng = random.Random(seed)
+        self._stats_lock = threading.Lock()
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop: asyncio.Event | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._thread: threading.Thread | None = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+
+    @property
+    def base_url(self) -> str:
+        """The value of FPT_API_BASE_URL to reach the server."""
+        return f"http://{self.host}:{self.port}"
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self.stats = ServerStats(in_flight=self.stats.in_flight)
+
+    def _count(self, path: str, status: int) -> None:
+        with self._stats_lock:
+            key = f"{path} {status}"
+            self.stats.responses[key] = self.stats.responses.get(key, 0) + 1
+
+    async def _call_endpoint(self, path: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, str], Any]:
+        if self._rng.random() < self.rate_429:
+            # Rate limiting rejects the request before any work is done
+            error = {"error": {"message": "Rate limit exceeded (mock)", "type": "rate_limit_error", "code": 429}}
+            return 429, {"Retry-After": f"{self.retry_after:g}"}, error
+
+        if path == "/v1/chat/completions":
+            latency = self.chat_latency.sample(self._rng)
+        else:
+            latency = self.embedding_latency.sample(self._rng)
+            latency += self.embedding_latency_per_input * len(payload.get("input", []))
+        fails = self._rng.random() < self.rate_5xx
+
+        queued_at = time.perf_counter()
+        async with self._slots or contextlib.nullcontext():
+            with self._stats_lock:
+                self.stats.queued_seconds += time.perf_counter() - queued_at
+                self.stats.in_flight += 1
+                self.stats.peak_in_flight = max(self.stats.peak_in_flight, self.stats.in_flight)
+            try:
+                await asyncio.sleep(max(0.0, latency))
+                if fails:
+                    return 503, {}, {"error": {"message": "Service unavailable (mock)", "type": "server_error", "code": 503}}
+                if path == "/v1/chat/completions":
+                    return 200, {}, self.backend.chat_completion_body(payload)
+                # Embedding large batches is CPU work, keep the event loop free for other requests
+                return 200, {}, await asyncio.to_thread(self.backend.embeddings_body, payload)
+            finally:
+                with self._stats_lock:
+                    self.stats.in_flight -= 1
+
+    async def _dispatch(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, str], Any]:
+        if path == "/stats" and method == "GET":
+            with self._stats_lock:
+                return 200, {}, self.stats.to_dict()
+        if path == "/stats/reset" and method == "POST":
+            self.reset_stats()
+            return 200, {}, {"reset": True}
+
+        if path not in ("/v1/chat/completions", "/v1/embeddings"):
+            return 404, {}, {"error": {"message": f"No route for {method} {path}", "code": 404}}
+        if method != "POST":
+            return 405, {}, {"error": {"message": f"Method {method} not allowed", "code": 405}}
+        if not headers.get("authorization", "").startswith("Bearer "):
+            return 401, {}, {"error": {"message": "Missing API key", "code": 401}}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            return 400, {}, {"error": {"message": f"Invalid JSON body: {e}", "code": 400}}
+        return await self._call_endpoint(path, payload)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+                path = target.split("?", 1)[0]
+                status, response_headers, response = await self._dispatch(method, path, headers, body)
+                self._count(path, status)
+
+                content = json.dumps(response, ensure_ascii=False).encode("utf-8")
+                keep_alive = headers.get("connection", "keep-alive").lower() != "close"
+                head = [
+                    f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+                    "Content-Type: application/json; charset=utf-8",
+                    f"Content-Length: {len(content)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                ] + [f"{name}: {value}" for name, value in response_headers.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + content)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def serve(self, ready: threading.Event | None = None) -> None:
+        """Serve until `stop` is called."""
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port, backlog=1024)
+        self.port = server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready.set()
+
+        async with server:
+            await self._stop.wait()
+            # Idle kept-alive connections of the clients would otherwise hold the server open
+            for writer in list(self._writers):
+                writer.close()
+
+    def start(self) -> str:
+        """
+        Start the server in a background thread.
+
+        Returns:
+            str: The base URL of the server.
+        """
+        ready = threading.Event()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.serve(ready)), name="MockFPTServer", daemon=True)
+        self._thread.start()
+        if not ready.wait(timeout=10):
+            raise RuntimeError("Mock FPT server did not start")
+        return self.base_url
+
+    def stop(self) -> None:
+        """Stop the server started with `start`."""
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def __enter__(self) -> "MockFPTServer":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.stop()
+        return False
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the mock server to a command line parser."""
+    parser.add_argument("--chat-latency", type=LatencyDistribution.parse, default=LatencyDistribution("lognormal", 0.8, 0.4), help="Latency distribution of chat completions (default: lognormal:0.8:0.4).")
+    parser.add_argument("--embedding-latency", type=LatencyDistribution.parse, default=LatencyDistribution("constant", 0.1), help="Latency distribution of embedding calls (default: constant:0.1).")
+    parser.add_argument("--embedding-latency-per-input", type=float, default=0.002, help="Extra embedding latency per input text, in seconds.")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Share of requests rejected with 429.")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="Share of requests failing with 503.")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After of the 429 responses, in seconds.")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Number of requests the server processes at the same time (default: unlimited).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the latency and fault injection draws.")
+
+
+def server_from_arguments(args: argparse.Namespace, host: str = "127.0.0.1", port: int = 0) -> MockFPTServer:
+    return MockFPTServer(
+        host=host,
+        port=port,
+        chat_latency=args.chat_latency,
+        embedding_latency=args.embedding_latency,
+        embedding_latency_per_input=args.embedding_latency_per_input,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        retry_after=args.retry_after,
+        max_concurrency=args.max_concurrency,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local mock of the FPT Cloud chat completions and embeddings API.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = server_from_arguments(args, host=args.host, port=args.port)
+    print(f"Mock FPT server listening on http://{args.host}:{args.port} (chat latency {args.chat_latency}, 429 rate {args.rate_429}, 5xx rate {args.rate_5xx})")
+    print(f"Use it with FPT_API_BASE_URL=http://{args.host}:{args.port}")
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.serve())
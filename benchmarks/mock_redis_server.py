@@ -0,0 +1,232 @@
+"""
+Local stand-in for a Redis server, for tests and multi-node runs of the deduplication store without a Redis install.
+
+    python -m benchmarks.mock_redis_server --port 6390
+
+Then point the pipelines at it with `DEDUPLICATION_BACKEND=redis DEDUPLICATION_REDIS_URL=redis://127.0.0.1:6390/0`.
+It speaks RESP2 and implements the commands of `RedisBackend` (SET with NX/EX/PX/EXAT, GET, DEL, EXISTS, SCAN, DBSIZE,
+TTL, FLUSHDB, SELECT, AUTH, PING), in memory. Pipelined commands are answered in one write, and counted.
+"""
+import argparse
+import contextlib
+import fnmatch
+import socketserver
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+
+@dataclass
+class RedisServerStats:
+    commands: Dict[str, int] = field(default_factory=dict)
+    writes: int = 0
+    """Number of writes of replies: a pipeline of commands received at once is answered in one write."""
+
+
+def _encode(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, Exception):
+        return b"-ERR %s\r\n" % str(value).encode("utf-8")
+    if isinstance(value, bool):
+        return b"+OK\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(item) for item in value)
+    data = value if isinstance(value, bytes) else str(value).encode("utf-8")
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+
+def _parse_commands(buffer: bytes) -> Tuple[List[List[bytes]], bytes]:
+    """The complete commands at the start of a buffer, and the rest of the buffer"""
+    commands = []
+    while buffer:
+        end = buffer.find(b"\r\n")
+        if end < 0:
+            break
+        if not buffer.startswith(b"*"):
+            # Inline command, e.g. from telnet
+            commands.append(buffer[:end].split())
+            buffer = buffer[end + 2:]
+            continue
+
+        args, position = [], end + 2
+        for _ in range(int(buffer[1:end])):
+            length_end = buffer.find(b"\r\n", position)
+            if length_end < 0:
+                return commands, buffer
+            length = int(buffer[position + 1:length_end])
+            if len(buffer) < length_end + 2 + length + 2:
+                return commands, buffer
+            args.append(buffer[length_end + 2:length_end + 2 + length])
+            position = length_end + 2 + length + 2
+        if args:
+            commands.append(args)
+        buffer = buffer[position:]
+    return commands, buffer
+
+
+class MockRedisServer:
+    """In-memory server speaking enough of the Redis protocol for the deduplication store"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.stats = RedisServerStats()
+        # Key -> (value, expiry as a Unix time or None), per database
+        self._data: Dict[int, Dict[bytes, Tuple[bytes, float | None]]] = {}
+        self._lock = threading.Lock()
+        self._server: socketserver.ThreadingTCPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    @staticmethod
+    def _expire(data: Dict[bytes, Tuple[bytes, float | None]], keys) -> None:
+        """Drop the expired keys among `keys`, on access like Redis"""
+        now = time.time()
+        for key in [key for key in keys if key in data and data[key][1] is not None and data[key][1] <= now]:
+            del data[key]
+
+    def _set(self, data: Dict, args: List[bytes]) -> Any:
+        key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+        expires_at = None
+        for i, option in enumerate(options):
+            if option == b"EX":
+                expires_at = time.time() + int(options[i + 1])
+            elif option == b"PX":
+                expires_at = time.time() + int(options[i + 1]) / 1000
+            elif option == b"EXAT":
+                expires_at = float(int(options[i + 1]))
+        if b"NX" in options and key in data:
+            return None
+        if b"XX" in options and key not in data:
+            return None
+        data[key] = (value, expires_at)
+        return True
+
+    def _scan(self, data: Dict, args: List[bytes]) -> Any:
+        # Every key in one page: the cursor is always 0 again
+        pattern = b"*"
+        for i in range(1, len(args) - 1):
+            if args[i].upper() == b"MATCH":
+                pattern = args[i + 1]
+        keys = [key for key in data if fnmatch.fnmatchcase(key.decode("utf-8"), pattern.decode("utf-8"))]
+        return [b"0", keys]
+
+    def execute(self, db: int, command: List[bytes]) -> Tuple[Any, int]:
+        """Run a command on a database, and return its reply and the database of the connection after it"""
+        name, args = command[0].upper().decode("ascii"), command[1:]
+        with self._lock:
+            self.stats.commands[name] = self.stats.commands.get(name, 0) + 1
+            data = self._data.setdefault(db, {})
+            keys = list(data) if name in ("SCAN", "DBSIZE") else args[:1] if name in ("SET", "GET", "TTL") else args
+            self._expire(data, keys)
+            if name == "PING":
+                return "PONG", db
+            if name in ("AUTH", "CLIENT"):
+                return True, db
+            if name == "SELECT":
+                return True, int(args[0])
+            if name == "SET":
+                return self._set(data, args), db
+            if name == "GET":
+                return data.get(args[0], (None, None))[0], db
+            if name in ("DEL", "EXISTS"):
+                found = [key for key in args if key in data]
+                if name == "DEL":
+                    for key in found:
+                        del data[key]
+                return len(found), db
+            if name == "TTL":
+                if args[0] not in data:
+                    return -2, db
+                expires_at = data[args[0]][1]
+                return -1 if expires_at is None else max(0, round(expires_at - time.time())), db
+            if name == "SCAN":
+                return self._scan(data, args), db
+            if name == "DBSIZE":
+                return len(data), db
+            if name == "FLUSHDB":
+                data.clear()
+                return True, db
+            return ValueError(f"unknown command '{name}'"), db
+
+    def _handler(self):
+        server = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                db = 0
+                buffer = b""
+                with contextlib.suppress(ConnectionError):
+                    while True:
+                        data = self.request.recv(65536)
+                        if not data:
+                            return
+                        buffer += data
+                        commands, buffer = _parse_commands(buffer)
+                        if not commands:
+                            continue
+                        # The commands received at once (a pipeline) are answered in one write
+                        replies = []
+                        for command in commands:
+                            reply, db = server.execute(db, command)
+                            replies.append(_encode(reply))
+                        self.request.sendall(b"".join(replies))
+                        with server._lock:
+                            server.stats.writes += 1
+
+        return Handler
+
+    def start(self) -> str:
+        """
+        Start the server in a background thread.
+
+        Returns:
+            str: The URL of the server.
+        """
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self._server = socketserver.ThreadingTCPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MockRedisServer", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        """Stop the server started with `start`."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def __enter__(self) -> "MockRedisServer":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.stop()
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local in-memory stand-in for a Redis server.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=6390, help="Port to listen on.")
+    args = parser.parse_args()
+
+    server = MockRedisServer(args.host, args.port)
+    server.start()
+    print(f"Mock Redis server listening on {server.url}")
+    print(f"Use it with DEDUPLICATION_BACKEND=redis DEDUPLICATION_REDIS_URL={server.url}")
+    with contextlib.suppress(KeyboardInterrupt):
+        threading.Event().wait()
+    server.stop()
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Literal
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+@dataclass
+class StubResponse:
+    """An HTTP response served by the replay layer."""
+    status: int = 200
+    body: bytes | str = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    latency: float = 0.0
+    """Seconds to wait before answering, to simulate the network and the server."""
+
+
+Handler = Callable[[requests.PreparedRequest], StubResponse]
+
+
+@dataclass
+class Route:
+    """Serves every request whose host matches `host` and whose path starts with `path_prefix`."""
+    host: str
+    handler: Handler
+    path_prefix: str = ""
+
+    def matches(self, request: requests.PreparedRequest) -> bool:
+        parts = urlsplit(request.url)
+        return parts.netloc.lower() == self.host and parts.path.startswith(self.path_prefix)
+
+
+class Cassette:
+    """
+    Recorded HTTP exchanges, stored as one JSON file per request in a directory.
+
+    A request is identified by its method, URL and body, so the same cassette serves the same responses on replay.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    @staticmethod
+    def key(request: requests.PreparedRequest) -> str:
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        digest = hashlib.sha256(f"{request.method} {request.url}\n".encode("utf-8") + body).hexdigest()
+        return digest[:32]
+
+    def load(self, request: requests.PreparedRequest) -> StubResponse | None:
+        """Get the recorded response of a request, if any."""
+        entry_path = self.path / f"{self.key(request)}.json"
+        if not entry_path.exists():
+            return None
+        entry = json.loads(entry_path.read_text(encoding="utf-8"))
+        return StubResponse(
+            status=entry["status"],
+            body=bytes.fromhex(entry["body_hex"]),
+            headers=entry["headers"],
+            latency=entry.get("elapsed", 0.0),
+        )
+
+    def save(self, request: requests.PreparedRequest, response: requests.Response) -> None:
+        """Record the response of a request."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "method": request.method,
+            "url": request.url,
+            "status": response.status_code,
+            "headers": {name: value for name, value in response.headers.items() if name.lower() != "content-encoding"},
+            "body_hex": response.content.hex(),
+            "elapsed": response.elapsed.total_seconds(),
+        }
+        (self.path / f"{self.key(request)}.json").write_text(json.dumps(entry, indent=1), encoding="utf-8")
+
+
+class ReplayTransport:
+    """
+    Record/replay layer for every `requests` call of the process (scrapers, parsers, LLM and embedding clients).
+
+    It patches `HTTPAdapter.send`, so the code under test runs unchanged:
+
+    - In "replay" mode, requests are answered by the routes (stub servers), then by the cassette. Anything else
+      fails with a `ConnectionError`, so a benchmark never reaches the network by accident.
+    - In "record" mode, requests go to the network and their responses are saved to the cassette.
+
+    Intended usage:
+
+    ```python
+    with ReplayTransport(routes=site.routes() + backend.routes()):
+        articles = scrape_articles()
+    ```
+    """
+
+    def __init__(
+        self,
+        routes: List[Route] | None = None,
+        cassette: Cassette | None = None,
+        mode: Literal["replay", "record"] = "replay",
+        latency_scale: float = 1.0,
+    ):
+        if mode == "record" and cassette is None:
+            raise ValueError("Record mode needs a cassette.")
+
+        self.routes = list(routes or [])
+        self.cassette = cassette
+        self.mode = mode
+        self.latency_scale = latency_scale
+        """Multiplier of the latency of every response (0 to serve as fast as possible)."""
+
+        self._lock = threading.Lock()
+        self._original_send = None
+        self.served: Dict[str, int] = {}
+        """Number of responses served, keyed by host."""
+
+    def __enter__(self) -> "ReplayTransport":
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.uninstall()
+        return False
+
+    def install(self) -> None:
+        """Patch `HTTPAdapter.send`."""
+        if self._original_send is not None:
+            return
+        self._original_send = HTTPAdapter.send
+        transport = self
+
+        def send(adapter: HTTPAdapter, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+            return transport._send(adapter, request, **kwargs)
+
+        HTTPAdapter.send = send
+
+    def uninstall(self) -> None:
+        """Restore `HTTPAdapter.send`."""
+        if self._original_send is not None:
+            HTTPAdapter.send = self._original_send
+            self._original_send = None
+
+    def _send(self, adapter: HTTPAdapter, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        host = urlsplit(request.url).netloc.lower()
+        with self._lock:
+            self.served[host] = self.served.get(host, 0) + 1
+
+        if self.mode == "record":
+            response = self._original_send(adapter, request, **kwargs)
+            self.cassette.save(request, response)
+            return response
+
+        stub = next((route.handler(request) for route in self.routes if route.matches(request)), None)
+        if stub is None and self.cassette is not None:
+            stub = self.cassette.load(request)
+        if stub is None:
+            raise requests.ConnectionError(f"No recorded response for {request.method} {request.url}", request=request)
+
+        if stub.latency > 0 and self.latency_scale > 0:
+            time.sleep(stub.latency * self.latency_scale)
+        return self._build_response(request, stub)
+
+    @staticmethod
+    def _build_response(request: requests.PreparedRequest, stub: StubResponse) -> requests.Response:
+        response = requests.Response()
+        response.status_code = stub.status
+        response.headers = CaseInsensitiveDict(stub.headers)
+        response._content = stub.body.encode("utf-8") if isinstance(stub.body, str) else stub.body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = "OK" if stub.status < 400 else "Error"
+        return response
+
+
+def cassette_from_env() -> Cassette | None:
+    """The cassette named by the `BENCHMARK_CASSETTE` environment variable, if set."""
+    path = os.getenv("BENCHMARK_CASSETTE")
+    return Cassette(path) if path else None
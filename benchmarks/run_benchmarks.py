@@ -0,0 +1,342 @@
+"""
+Offline benchmarks of the pipeline stages, run against a synthetic copy of the scraped websites and a stub of the
+FPT LLM and embedding endpoints (or against a recorded cassette).
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --sizes 50 500 5000
+    python -m benchmarks.run_benchmarks --cases dedup scoring --sizes 500 --llm-latency-ms 200
+
+Every (case, size) pair runs in a fresh process, so the peak RSS is the one of that case alone.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Callable, Dict, List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.replay import Cassette, ReplayTransport
+from benchmarks.stub_backend import StubLLMBackend
+from benchmarks.synthetic_site import SyntheticSite, synthetic_documents
+from FCI_NewsAgents.core.config import GuardrailsConfig
+from FCI_NewsAgents.services.scrapers.registry import SCRAPERS
+# Registers the same scrapers as the pipeline
+import FCI_NewsAgents.services.scrapers
+import FCI_NewsAgents.services.scrapers.run_article_scrapers
+
+DEFAULT_SIZES = [50, 500, 5000]
+
+SELENIUM_SCRAPERS = {"TechRepublic"}
+"""Scrapers that drive a real browser, which the replay layer cannot serve."""
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    run: Callable[[int], int]
+    """Runs the case on `size` items and returns the number of items processed."""
+    sample_spans: Tuple[str, ...]
+    """Names of the spans whose durations are the latency samples of the case."""
+
+
+BENCHMARKS: Dict[str, BenchmarkCase] = {}
+
+
+def benchmark(name: str, sample_spans: Tuple[str, ...]):
+    """Register a benchmark case."""
+    def decorator(fn: Callable[[int], int]):
+        BENCHMARKS[name] = BenchmarkCase(name, fn, sample_spans)
+        return fn
+    return decorator
+
+
+@dataclass
+class BenchmarkResult:
+    case: str
+    size: int
+    items: int
+    """Number of items processed (articles scraped, documents kept or scored, ...)."""
+    wall_seconds: float
+    throughput_per_s: float
+    """Input items per second of wall time."""
+    p50_ms: float | None
+    p95_ms: float | None
+    samples: int
+    """Number of latency samples (spans) behind the percentiles."""
+    peak_rss_mb: float | None
+    http_requests: int
+    errors: int
+    """Number of spans that ended with an error."""
+    counters: Dict[str, float] = field(default_factory=dict)
+
+
+def _register_scraper_case(scraper_name: str) -> None:
+    @benchmark(f"scraper:{scraper_name}", sample_spans=("fetch",))
+    def run(size: int) -> int:
+        return len(SCRAPERS[scraper_name]().scrape())
+
+
+for _scraper_name in SCRAPERS:
+    if _scraper_name not in SELENIUM_SCRAPERS:
+        _register_scraper_case(_scraper_name)
+
+
+@benchmark("scraper:arXiv", sample_spans=("fetch",))
+def bench_arxiv(size: int) -> int:
+    from FCI_NewsAgents.services.scrapers import csai_scraper
+
+    # The pause between batches respects arXiv's rate limit, which the replayed API does not have
+    csai_scraper.time.sleep = lambda seconds: None
+    return len(csai_scraper.scrape_arxiv_cs_ai(max_results=size))
+
+
+@benchmark("dedup", sample_spans=("canonicalise",))
+def bench_dedup(size: int) -> int:
+    from FCI_NewsAgents.utils.duplication_checker import remove_duplicate_documents
+
+    return len(remove_duplicate_documents(synthetic_documents(size), parallel=True, max_workers=16))
+
+
+@benchmark("dedup_store", sample_spans=("url_batch",))
+def bench_dedup_store(size: int) -> int:
+    from FCI_NewsAgents.services.article_url_cache.store import ArticleURLStore
+    from FCI_NewsAgents.utils.tracing import span
+
+    today = datetime.now().date().isoformat()
+    batch = [(f"https://bench.local/articles/{i}", today) for i in range(size)]
+    with ArticleURLStore() as store:
+        # A batch of new URLs, then the same batch again (every URL already stored)
+        for attempt in ("new", "stored"):
+            with span("url_batch", urls=size, attempt=attempt):
+                kept = sum(store.insert_many_if_new(batch))
+    return kept
+
+
+@benchmark("alignment", sample_spans=("embedding_call",))
+def bench_alignment(size: int) -> int:
+    from FCI_NewsAgents.utils.alignment_checker import get_most_aligned_documents
+    from FCI_NewsAgents.utils.alignment_keywords import NEGATIVE_KEYWORDS, POSITIVE_KEYWORDS
+
+    return len(get_most_aligned_documents(
+        positive_query_strings=POSITIVE_KEYWORDS,
+        negative_query_strings=NEGATIVE_KEYWORDS,
+        documents=synthetic_documents(size),
+        threshold=0.0,
+    ))
+
+
+@benchmark("scoring", sample_spans=("score",))
+def bench_scoring(size: int) -> int:
+    from FCI_NewsAgents.prompts.get_prompts import get_pointwise_guardrails_prompt
+    from FCI_NewsAgents.utils.pointwise_llm_guardrail_checker import filter_documents_by_score
+
+    filter_documents_by_score(
+        docs=synthetic_documents(size),
+        threshold=4,
+        system_prompt=get_pointwise_guardrails_prompt(),
+        parallel=True,
+        max_workers=16,
+    )
+    return size
+
+
+@benchmark("report", sample_spans=("generate",))
+def bench_report(size: int) -> int:
+    from FCI_NewsAgents.models.workflow_state import WorkflowState
+    from FCI_NewsAgents.workflows.workflow_builder import GuardRails_Rerank_Workflow
+
+    # The report is written from the documents kept by the guardrails, which caps them whatever the input size
+    config = GuardrailsConfig()
+    documents = synthetic_documents(size)
+    papers = [doc for doc in documents if doc.content_type == "paper"][:config.MAX_PAPERS_READ]
+    articles = [doc for doc in documents if doc.content_type == "article"][:config.MAX_ARTICLES_READ]
+
+    # Enter the graph at the join of the scoring branches, every document scored 10
+    workflow = GuardRails_Rerank_Workflow(config, papers=[], articles=[])
+    state = workflow.select_documents_node(WorkflowState(
+        config=config,
+        candidate_documents=papers + articles,
+        document_scores={doc.url: 10.0 for doc in papers + articles},
+    ))
+    with ThreadPoolExecutor(max_workers=config.MAX_PARALLEL_BRANCHES) as executor:
+        for output in executor.map(lambda send: workflow.write_segment_node(send.arg), workflow.route_to_segments(state)):
+            state.segments.update(output["segments"])
+    state = workflow.assemble_report_node(state)
+    if not state.final_report or state.final_report.startswith("Error"):
+        raise RuntimeError("Report generation failed")
+    return len(papers) + len(articles)
+
+
+def _percentile(sorted_values: List[float], q: float) -> float | None:
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        resource = None
+
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+
+
+def run_case(name: str, size: int, options: Dict) -> BenchmarkResult:
+    """
+    Run one benchmark case in the current process, with every HTTP call served by the replay layer.
+
+    Args:
+        name (str): The name of the case.
+        size (int): The number of input items.
+        options (Dict): The latencies, the cassette and the verbosity (see the command line arguments).
+
+    Returns:
+        BenchmarkResult: The result of the case.
+    """
+    from FCI_NewsAgents.utils.circuit_breaker import start_new_run
+    from FCI_NewsAgents.utils.metrics import METRICS, reset_metrics
+    from FCI_NewsAgents.utils.retry import reset_retry_budget
+    from FCI_NewsAgents.utils.tracing import TRACER, start_trace
+
+    case = BENCHMARKS[name]
+    work_dir = tempfile.mkdtemp(prefix=f"bench_{name.replace(':', '_')}_")
+    os.chdir(work_dir)  # the stages write their logs and CSV files to the working directory
+    os.environ["DEDUPLICATION_DB_PATH"] = os.path.join(work_dir, "article_urls.db")
+    os.environ.setdefault("FPT_120B", "benchmark")
+    os.environ.setdefault("FPT_API_KEY", "benchmark")
+
+    reset_retry_budget()
+    start_new_run()
+    reset_metrics()
+    start_trace(benchmark=name, size=size)
+
+    backend = StubLLMBackend(latency=options["llm_latency"], embedding_latency=options["llm_latency"])
+    if options.get("record"):
+        transport = ReplayTransport(cassette=Cassette(options["record"]), mode="record")
+    elif options.get("cassette"):
+        transport = ReplayTransport(routes=backend.routes(), cassette=Cassette(options["cassette"]))
+    else:
+        site = SyntheticSite(size, latency=options["http_latency"])
+        transport = ReplayTransport(routes=site.routes() + backend.routes())
+
+    log = open(os.path.join(work_dir, "benchmark.log"), "w", encoding="utf-8")
+    output = contextlib.nullcontext() if options.get("verbose") else contextlib.redirect_stdout(log)
+    with log, output, transport:
+        start = time.perf_counter()
+        items = case.run(size)
+        wall_seconds = time.perf_counter() - start
+
+    spans = TRACER.end_trace()
+    samples = sorted(span.duration for span in spans if span.name in case.sample_spans)
+    snapshot = METRICS.snapshot()
+    counters: Dict[str, float] = {}
+    for counter in snapshot["counters"]:
+        counters[counter["name"]] = counters.get(counter["name"], 0) + counter["value"]
+
+    return BenchmarkResult(
+        case=name,
+        size=size,
+        items=items,
+        wall_seconds=round(wall_seconds, 4),
+        throughput_per_s=round(size / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        p50_ms=round(_percentile(samples, 0.5) * 1000, 3) if samples else None,
+        p95_ms=round(_percentile(samples, 0.95) * 1000, 3) if samples else None,
+        samples=len(samples),
+        peak_rss_mb=_peak_rss_mb(),
+        http_requests=sum(transport.served.values()),
+        errors=sum(1 for span in spans if span.status == "error"),
+        counters=counters,
+    )
+
+
+def run_isolated(name: str, size: int, options: Dict) -> BenchmarkResult:
+    """Run a benchmark case in a fresh process."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(run_case, name, size, options).result()
+
+
+def main(argv: List[str] | None = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Run the offline benchmarks of the FCI News Agents pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Numbers of input items to benchmark each case with.")
+    parser.add_argument("--cases", type=str, nargs="+", default=None, help=f"Cases to run (default: all). Available: {', '.join(BENCHMARKS)}.")
+    parser.add_argument("--llm-latency-ms", type=float, default=20.0, help="Latency of each stub LLM and embedding call, in milliseconds.")
+    parser.add_argument("--http-latency-ms", type=float, default=5.0, help="Latency of each synthetic website response, in milliseconds.")
+    parser.add_argument("--cassette", type=str, default=None, help="Replay the websites from this recorded cassette instead of the synthetic site.")
+    parser.add_argument("--record", type=str, default=None, help="Record every HTTP exchange of the cases to this cassette (needs network access and API keys).")
+    parser.add_argument("--output", type=str, default=os.path.join("FCI_NewsAgents", "workflow_output", "benchmarks", f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"), help="Path of the JSON results.")
+    parser.add_argument("--in-process", action="store_true", help="Run the cases in this process (faster, but peak RSS is cumulative).")
+    parser.add_argument("--verbose", action="store_true", help="Show the output of the pipeline.")
+    args = parser.parse_args(argv)
+
+    cases = args.cases or list(BENCHMARKS)
+    unknown = [name for name in cases if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(unknown)}")
+
+    options = {
+        "llm_latency": args.llm_latency_ms / 1000,
+        "http_latency": args.http_latency_ms / 1000,
+        "cassette": os.path.abspath(args.cassette) if args.cassette else None,
+        "record": os.path.abspath(args.record) if args.record else None,
+        "verbose": args.verbose,
+    }
+    output_path = os.path.abspath(args.output)
+    cwd = os.getcwd()
+
+    results: List[Dict] = []
+    print(f"{'case':<28}{'size':>7}{'items':>7}{'wall s':>10}{'items/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'RSS MB':>9}")
+    for name in cases:
+        for size in args.sizes:
+            try:
+                result = run_case(name, size, options) if args.in_process else run_isolated(name, size, options)
+            except Exception as e:
+                print(f"{name:<28}{size:>7}  failed: {type(e).__name__}: {e}")
+                results.append({"case": name, "size": size, "error": f"{type(e).__name__}: {e}"})
+                continue
+            finally:
+                os.chdir(cwd)
+
+            results.append(asdict(result))
+            print(
+                f"{result.case:<28}{result.size:>7}{result.items:>7}{result.wall_seconds:>10.2f}"
+                f"{result.throughput_per_s:>10.1f}{result.p50_ms if result.p50_ms is not None else '-':>10}"
+                f"{result.p95_ms if result.p95_ms is not None else '-':>10}"
+                f"{result.peak_rss_mb if result.peak_rss_mb is not None else '-':>9}"
+            )
+
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {**options, "sizes": args.sizes, "cases": cases},
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results saved to: {output_path}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import hashlib
+import json
+from typing import Any, Dict, List
+
+import numpy as np
+import requests
+
+from benchmarks.replay import Route, StubResponse
+from FCI_NewsAgents.core.config import get_fpt_api_base_url
+from FCI_NewsAgents.utils.circuit_breaker import host_of
+
+_STRUCTURED_REPLIES = {
+    "HighlightSelection": lambda seed: {"index": 1, "explanation": "Benchmark reply: the first document is the most novel."},
+    "OpeningAndConclusion": lambda seed: {
+        "opening": "Bản tin công nghệ tuần này tổng hợp các tin tức nổi bật về AI.",
+        "conclusion": "Các xu hướng trên sẽ tiếp tục ảnh hưởng đến hoạt động của FPT.",
+    },
+    "DocumentScore": lambda seed: {"score": seed % 11},
+}
+
+_FREE_TEXT_REPLY = (
+    "Bài viết giới thiệu một cải tiến mới trong lĩnh vực trí tuệ nhân tạo, giúp giảm chi phí suy luận và tăng độ "
+    "chính xác trên các tác vụ thực tế. Đây là thông tin quan trọng đối với FPT vì có thể áp dụng ngay vào các sản "
+    "phẩm AI của công ty."
+)
+
+
+def _seed(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+
+
+def _count_tokens(text: str) -> int:
+    # A rough estimate is enough for the usage block, the pipeline only records it
+    return max(1, len(text) // 4)
+
+
+class StubLLMBackend:
+    """
+    Deterministic stand-in for the FPT chat completion and embedding endpoints, served through `ReplayTransport`.
+
+    - Structured calls are answered according to the name of the JSON schema in `response_format`
+      (highlight selection, opening and conclusion, document score), other calls with a fixed paragraph.
+    - Embeddings are unit vectors seeded by the input text, so the same text always gets the same vector.
+    - Every response carries a `usage` block and waits for the configured latency.
+    """
+
+    def __init__(self, latency: float = 0.02, embedding_latency: float = 0.02, dimensions: int = 1024):
+        self.latency = latency
+        """Seconds per chat completion call."""
+        self.embedding_latency = embedding_latency
+        """Seconds per embedding call (whatever the batch size)."""
+        self.dimensions = dimensions
+
+    def routes(self) -> List[Route]:
+        host = host_of(get_fpt_api_base_url())
+        return [
+            Route(host, self.chat_completions, "/v1/chat/completions"),
+            Route(host, self.embeddings, "/v1/embeddings"),
+        ]
+
+    @staticmethod
+    def _json_body(request: requests.PreparedRequest) -> Dict[str, Any]:
+        body = request.body or b"{}"
+        return json.loads(body.decode("utf-8") if isinstance(body, bytes) else body)
+
+    def chat_completion_content(self, payload: Dict[str, Any]) -> str:
+        """The content of the reply to a chat completion request."""
+        prompt = "\n".join(message.get("content", "") for message in payload.get("messages", []))
+        schema_name = ((payload.get("response_format") or {}).get("json_schema") or {}).get("name")
+
+        reply = _STRUCTURED_REPLIES.get(schema_name)
+        if reply is None and "score" in prompt.lower() and "0 to 10" in prompt:
+            reply = _STRUCTURED_REPLIES["DocumentScore"]
+        if reply is not None:
+            return json.dumps(reply(_seed(prompt)), ensure_ascii=False)
+        return _FREE_TEXT_REPLY
+
+    def chat_completion_body(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """The JSON body of the reply to a chat completion request."""
+        content = self.chat_completion_content(payload)
+        prompt_tokens = sum(_count_tokens(message.get("content", "")) for message in payload.get("messages", []))
+        return {
+            "id": f"chatcmpl-{_seed(content) % 10**12}",
+            "object": "chat.completion",
+            "model": payload.get("model", ""),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": _count_tokens(content),
+                "total_tokens": prompt_tokens + _count_tokens(content),
+            },
+        }
+
+    def chat_completions(self, request: requests.PreparedRequest) -> StubResponse:
+        return StubResponse(
+            body=json.dumps(self.chat_completion_body(self._json_body(request)), ensure_ascii=False),
+            headers={"Content-Type": "application/json; charset=utf-8"},
+            latency=self.latency,
+        )
+
+    def embed(self, text: str) -> List[float]:
+        """The embedding of a text: a unit vector seeded by the text."""
+        vector = np.random.default_rng(_seed(text)).standard_normal(self.dimensions)
+        return np.round(vector / np.linalg.norm(vector), 6).tolist()
+
+    def embeddings_body(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """The JSON body of the reply to an embeddings request."""
+        texts: List[str] = payload.get("input", [])
+        prompt_tokens = sum(_count_tokens(text) for text in texts)
+        return {
+            "object": "list",
+            "model": payload.get("model", ""),
+            "data": [{"object": "embedding", "index": i, "embedding": self.embed(text)} for i, text in enumerate(texts)],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "prompt_tokens_details": None,
+                "completion_tokens": 0,
+                "completion_tokens_details": None,
+                "total_tokens": prompt_tokens,
+            },
+        }
+
+    def embeddings(self, request: requests.PreparedRequest) -> StubResponse:
+        return StubResponse(
+            body=json.dumps(self.embeddings_body(self._json_body(request))),
+            headers={"Content-Type": "application/json"},
+            latency=self.embedding_latency,
+        )
@@ -0,0 +1,291 @@
+import html
+from datetime import date, datetime, timezone
+from email.utils import format_datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from benchmarks.replay import Route, StubResponse
+from FCI_NewsAgents.models.document import Document
+
+HTML = {"Content-Type": "text/html; charset=utf-8"}
+RSS = {"Content-Type": "application/rss+xml; charset=utf-8"}
+ATOM = {"Content-Type": "application/atom+xml; charset=utf-8"}
+PDF = {"Content-Type": "application/pdf"}
+
+ARTICLE_HOST = "news.bench.local"
+"""Host of the generic web articles used by the dedup, alignment, scoring and report benchmarks."""
+
+DUPLICATE_EVERY = 5
+"""Period of the article pages whose canonical URL is the previous article."""
+
+NVIDIA_FEEDS = [
+    "/blog/category/generative-ai/feed/",
+    "/blog/tag/inference-performance/feed/",
+    "/blog/tag/build-ai-agent/feed/",
+    "/blog/category/computer-vision/feed/",
+    "/blog/category/data-center-cloud/feed/",
+    "/blog/category/networking-communications/feed/",
+]
+
+_TOPICS = [
+    ("Efficient inference for large language models", "A new serving stack cuts the latency of LLM inference by batching requests across GPUs."),
+    ("Agents that plan with retrieval", "Researchers combine retrieval with planning so agents can solve multi-step enterprise tasks."),
+    ("Open weights model tops coding benchmark", "An open weights model reaches state-of-the-art results on code generation benchmarks."),
+    ("Vision transformers for document understanding", "A document AI model reads scanned forms and tables with higher accuracy."),
+    ("Data center networking for AI clusters", "New interconnects reduce the communication overhead of distributed training."),
+    ("Quarterly earnings of a retail chain", "A retail chain reports its quarterly earnings and store openings."),
+    ("Speech recognition for low-resource languages", "A multilingual speech model improves recognition of Vietnamese and other languages."),
+    ("Securing machine learning pipelines", "Supply chain attacks on model weights prompt new signing tools for ML artifacts."),
+]
+
+_PARAGRAPH = (
+    "The team evaluated the approach on public benchmarks and internal workloads. Results show consistent gains in "
+    "throughput and cost, while keeping quality within one point of the baseline. The authors release code and "
+    "discuss limitations, including the need for careful tuning on smaller datasets."
+)
+
+
+def topic(i: int) -> Tuple[str, str]:
+    """The (title, summary) of the i-th synthetic item."""
+    title, summary = _TOPICS[i % len(_TOPICS)]
+    return f"{title} #{i}", f"{summary} (item {i})"
+
+
+def synthetic_documents(size: int, paper_ratio: float = 0.3) -> List[Document]:
+    """
+    Generate documents with unique URLs on the synthetic article host and arXiv.
+
+    Every `DUPLICATE_EVERY`-th article page declares the previous article as its canonical URL, so the dedup
+    benchmark sees a known share of duplicates.
+
+    Args:
+        size (int): The number of documents.
+        paper_ratio (float): The share of papers. Defaults to 0.3.
+
+    Returns:
+        List[Document]: The documents.
+    """
+    today = datetime.combine(date.today(), datetime.min.time())
+    papers = int(size * paper_ratio)
+    documents: List[Document] = []
+
+    for i in range(size):
+        title, summary = topic(i)
+        if i < papers:
+            documents.append(Document(
+                url=f"https://arxiv.org/pdf/2610.{i:05d}v1",
+                title=title,
+                summary=summary,
+                source="arXiv cs.AI",
+                authors=[f"Author {i}", f"Author {i + 1}"],
+                published_date=today,
+                content_type="paper",
+            ))
+        else:
+            documents.append(Document(
+                url=f"https://{ARTICLE_HOST}/articles/{i}?utm_source=benchmark",
+                title=title,
+                summary=summary,
+                source="Bench News",
+                authors=[f"Reporter {i % 17}"],
+                published_date=today,
+                content_type="article",
+            ))
+    return documents
+
+
+def _page(title: str, body: str, head: str = "") -> str:
+    return f"<!DOCTYPE html><html><head><title>{html.escape(title)}</title>{head}</head><body>{body}</body></html>"
+
+
+def _rss(title: str, items: List[str]) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>{html.escape(title)}</title><link>https://bench.local/</link>{''.join(items)}</channel></rss>"
+    )
+
+
+def _atom(title: str, entries: List[str], summary_html: str = "") -> str:
+    summary = f'<summary type="html">{html.escape(summary_html)}</summary>' if summary_html else ""
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+        f"<title>{html.escape(title)}</title><id>urn:bench:{html.escape(title)}</id>{summary}{''.join(entries)}</feed>"
+    )
+
+
+@lru_cache(maxsize=1)
+def _pdf_bytes() -> bytes:
+    """A small paper-like PDF, shared by every arXiv paper."""
+    import pymupdf
+
+    pdf = pymupdf.open()
+    for page_number in range(2):
+        page = pdf.new_page()
+        text = "\n\n".join([f"Section {page_number + 1}.{k}" + "\n" + _PARAGRAPH for k in range(4)])
+        page.insert_textbox(pymupdf.Rect(50, 50, 550, 800), text, fontsize=10)
+    return pdf.tobytes()
+
+
+class SyntheticSite:
+    """
+    Synthetic copies of the scraped websites and of the article pages read by the pipeline, served through
+    `ReplayTransport`.
+
+    Each listing (RSS feed, blog index, arXiv API) has `size` items dated today, so every scraper keeps all of them
+    and follows every article link, as it would on a busy day.
+    """
+
+    def __init__(self, size: int, latency: float = 0.005):
+        self.size = size
+        self.latency = latency
+        """Seconds per response."""
+
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.today = date.today()
+
+    def routes(self) -> List[Route]:
+        # Checked in order, so feeds come before the pages sharing their prefix
+        handlers = [
+            ("news.mit.edu", "/topic/mitartificial-intelligence2-rss.xml", lambda r: self.mit_feed(), RSS),
+            ("openai.com", "/news/rss.xml", lambda r: self.openai_feed(), RSS),
+            ("huggingface.co", "/blog/feed.xml", lambda r: self.huggingface_feed(), RSS),
+            ("huggingface.co", "/blog/", self.huggingface_article, HTML),
+            ("developer.nvidia.com", "/blog/", self.nvidia_feed, ATOM),
+            ("tldr.tech", "/ai/", lambda r: self.tldr_page(), ATOM),
+            ("research.google", "/blog/", self.google_research, HTML),
+            ("www.theneurondaily.com", "", self.neuron, HTML),
+            ("export.arxiv.org", "/api/query", self.arxiv_query, ATOM),
+            ("arxiv.org", "/pdf/", lambda r: _pdf_bytes(), PDF),
+            (ARTICLE_HOST, "/articles/", self.web_article, HTML),
+        ]
+        return [Route(host, self._serve(handler, headers), prefix) for host, prefix, handler, headers in handlers]
+
+    def _serve(self, handler: Callable[[requests.PreparedRequest], str | bytes], headers: Dict[str, str]):
+        def serve(request: requests.PreparedRequest) -> StubResponse:
+            body = handler(request)
+            if body is None:
+                return StubResponse(status=404, body="Not found", headers=HTML, latency=self.latency)
+            return StubResponse(body=body, headers=headers, latency=self.latency)
+        return serve
+
+    def _rss_items(self, base_url: str, author: bool = True) -> List[str]:
+        pub_date = format_datetime(self.now)
+        items = []
+        for i in range(self.size):
+            title, summary = topic(i)
+            items.append(
+                f"<item><title>{html.escape(title)}</title><link>{base_url}{i}</link><guid>{base_url}{i}</guid>"
+                f"<pubDate>{pub_date}</pubDate>"
+                + (f"<author>reporter{i % 17}@bench.local (Reporter {i % 17})</author>" if author else "")
+                + f"<description>{html.escape(f'<p>{summary}</p><p>{_PARAGRAPH}</p>')}</description></item>"
+            )
+        return items
+
+    def mit_feed(self) -> str:
+        return _rss("MIT News - Artificial intelligence", self._rss_items("https://news.mit.edu/2026/article-"))
+
+    def openai_feed(self) -> str:
+        return _rss("OpenAI News", self._rss_items("https://openai.com/index/post-", author=False))
+
+    def huggingface_feed(self) -> str:
+        return _rss("Hugging Face - Blog", self._rss_items("https://huggingface.co/blog/post-", author=False))
+
+    def huggingface_article(self, request: requests.PreparedRequest) -> str:
+        i = urlsplit(request.url).path.rsplit("-", 1)[-1]
+        title, summary = topic(int(i)) if i.isdigit() else ("Blog", "")
+        authors = "".join(f'<span class="fullname">Hugging Face Author {k}</span>' for k in range(2))
+        return _page(title, f"<h1>{title}</h1>{authors}<p>{summary}</p><p>{_PARAGRAPH}</p>")
+
+    def nvidia_feed(self, request: requests.PreparedRequest) -> str | None:
+        path = urlsplit(request.url).path
+        if path not in NVIDIA_FEEDS:
+            return None
+        feed_index = NVIDIA_FEEDS.index(path)
+        entries = []
+        # The items are spread over the feeds, `size` in total
+        for i in range(feed_index, self.size, len(NVIDIA_FEEDS)):
+            title, summary = topic(i)
+            summary_html = f'<img src="/x.png"/><p>{summary}</p>'
+            entries.append(
+                f'<entry><title>{html.escape(title)}</title><link href="https://developer.nvidia.com/blog/post-{i}/"/>'
+                f"<id>https://developer.nvidia.com/blog/post-{i}/</id><published>{self.now.isoformat()}</published>"
+                f"<author><name>NVIDIA Author {i % 9}</name></author>"
+                f'<summary type="html">{html.escape(summary_html)}</summary></entry>'
+            )
+        return _atom(f"NVIDIA Technical Blog {path}", entries)
+
+    def tldr_page(self) -> str:
+        articles = "".join(
+            f'<article><a href="https://{ARTICLE_HOST}/articles/tldr-{i}">{html.escape(topic(i)[0])} (3 minute read)</a>'
+            f'<div class="newsletter-html">{html.escape(topic(i)[1])}</div></article>'
+            for i in range(self.size)
+        )
+        # The scraper reads the newsletter from the feed-level summary
+        return _atom("TLDR AI", [], summary_html=articles)
+
+    def google_research(self, request: requests.PreparedRequest) -> str:
+        path = urlsplit(request.url).path
+        if path == "/blog/":
+            cards = "".join(
+                f'<a class="glue-card not-glue" href="/blog/post-{i}/">'
+                f'<p class="glue-label">{self.today.strftime("%B %d, %Y")}</p>'
+                f'<span class="headline-5 js-gt-item-id">{html.escape(topic(i)[0])}</span></a>'
+                for i in range(self.size)
+            )
+            return _page("Google Research Blog", cards)
+
+        i = path.strip("/").rsplit("-", 1)[-1]
+        title, summary = topic(int(i)) if i.isdigit() else ("Post", "")
+        details = (
+            '<div class="basic-hero--blog-detail__description">'
+            f"<p>{self.today.strftime('%B %d, %Y')}</p><p>Research Scientist {i}, Google Research</p></div>"
+        )
+        return _page(title, f"{details}<p>{summary}</p><p>{_PARAGRAPH}</p>")
+
+    def neuron(self, request: requests.PreparedRequest) -> str:
+        path = urlsplit(request.url).path
+        if path in ("", "/"):
+            links = "".join(
+                f'<a data-discover="true" href="/p/post-{i}"><h2>{html.escape(topic(i)[0])}</h2>'
+                f'<span>{self.today.strftime("%b %d, %Y")}</span></a>'
+                for i in range(self.size)
+            )
+            return _page("The Neuron", links)
+
+        i = path.rsplit("-", 1)[-1]
+        title, summary = topic(int(i)) if i.isdigit() else ("Post", "")
+        byline = (
+            f'<div class="bh__byline_wrapper"><span>Neuron Writer</span><span>{self.today.strftime("%B %d, %Y")}</span></div>'
+        )
+        return _page(title, f'{byline}<div id="content-blocks"><p>{summary}</p><p>{_PARAGRAPH}</p></div>')
+
+    def arxiv_query(self, request: requests.PreparedRequest) -> str:
+        query = parse_qs(urlsplit(request.url).query)
+        start = int(query.get("start", ["0"])[0])
+        max_results = int(query.get("max_results", ["10"])[0])
+
+        entries = []
+        for i in range(start, min(start + max_results, self.size)):
+            title, summary = topic(i)
+            entries.append(
+                f"<entry><id>http://arxiv.org/abs/2610.{i:05d}v1</id><title>{html.escape(title)}</title>"
+                f"<summary>{html.escape(summary)} {_PARAGRAPH}</summary><published>{self.now.isoformat()}</published>"
+                f"<author><name>Author {i}</name></author><author><name>Author {i + 1}</name></author>"
+                f'<link href="http://arxiv.org/abs/2610.{i:05d}v1" rel="alternate" type="text/html"/>'
+                f'<link title="pdf" href="http://arxiv.org/pdf/2610.{i:05d}v1" rel="related" type="application/pdf"/>'
+                "</entry>"
+            )
+        return _atom("arXiv Query: cat:cs.AI", entries)
+
+    def web_article(self, request: requests.PreparedRequest) -> str:
+        slug = urlsplit(request.url).path.rsplit("/", 1)[-1]
+        canonical = slug
+        if slug.isdigit() and int(slug) % DUPLICATE_EVERY == DUPLICATE_EVERY - 1:
+            # Syndicated copy of the previous article
+            canonical = str(int(slug) - 1)
+        title, summary = topic(int(slug)) if slug.isdigit() else (slug, "")
+        head = f'<link rel="canonical" href="https://{ARTICLE_HOST}/articles/{canonical}"/>'
+        return _page(title, f"<h1>{html.escape(title)}</h1><p>{html.escape(summary)}</p><p>{_PARAGRAPH}</p>", head)
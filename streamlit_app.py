@@ -13,13 +13,10 @@ import streamlit as st
 sys.path.append(os.path.dirname(__file__))
 
 from FCI_NewsAgents.core.config import GuardrailsConfig
-from FCI_NewsAgents.services.scrapers.csai_scraper import scrape_papers
-from FCI_NewsAgents.services.scrapers.run_article_scrapers import scrape_articles
-from FCI_NewsAgents.utils.utils import (
-    convert_article_to_document,
-    convert_paper_to_document,
-)
-from FCI_NewsAgents.workflows.workflow_builder import workflow_execution
+from FCI_NewsAgents.utils.circuit_breaker import start_new_run
+from FCI_NewsAgents.utils.metrics import reset_metrics
+from FCI_NewsAgents.utils.retry import reset_retry_budget
+from FCI_NewsAgents.utils.tracing import start_trace
 
 
 def filter_logs(logs: str) -> str:
@@ -212,7 +209,20 @@ with tab1:
         log_placeholder = log_container.empty()
 
         try:
+            # The scrapers and the workflow (LangGraph) are imported on the first run, not on every page load
+            from FCI_NewsAgents.services.scrapers.csai_scraper import scrape_papers
+            from FCI_NewsAgents.services.scrapers.run_article_scrapers import scrape_articles
+            from FCI_NewsAgents.utils.utils import (
+                convert_article_to_document,
+                convert_paper_to_document,
+            )
+            from FCI_NewsAgents.workflows.workflow_builder import workflow_execution
+
             overall_start = time.time()
+            reset_retry_budget()
+            start_new_run()
+            reset_metrics()
+            start_trace()
 
             # Step 1: Scrape articles
             status_text.text("Step 1/3: Scraping articles from news sources...")
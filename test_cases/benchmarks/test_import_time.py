@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from benchmarks.import_time import CHECKS, profile_imports
+
+
+@pytest.mark.parametrize("check", [check for check in CHECKS if check.name != "workflow"], ids=lambda check: check.name)
+def test_entry_points_do_not_import_heavy_modules(check):
+    profile = profile_imports(check)
+
+    assert profile.returncode == 0
+    assert profile.forbidden_imported == []
+    assert "FCI_NewsAgents.services.scrapers.tech_republic_scraper" not in profile.modules
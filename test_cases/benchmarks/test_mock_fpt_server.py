@@ -0,0 +1,56 @@
+import os
+import random
+import sys
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from benchmarks.mock_fpt_server import LatencyDistribution, MockFPTServer
+from FCI_NewsAgents.services.llm.gpt_client import call_gpt
+from FCI_NewsAgents.utils.alignment_checker import get_embedding
+
+HEADERS = {"Authorization": "Bearer test"}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with MockFPTServer(chat_latency=LatencyDistribution("constant", 0.0), embedding_latency=LatencyDistribution("constant", 0.0)) as server:
+        monkeypatch.setenv("FPT_API_BASE_URL", server.base_url)
+        monkeypatch.setenv("FPT_120B", "test")
+        monkeypatch.setenv("FPT_API_KEY", "test")
+        yield server
+
+
+def test_clients_use_configured_base_url(server):
+    embeddings = get_embedding(["query: ai", "passage: ai", "query: ai"])
+    reply = call_gpt("Hello", "You are a test.")
+
+    assert embeddings.shape == (3, 1024)
+    assert (embeddings[0] == embeddings[2]).all()
+    assert reply
+    assert server.stats.responses == {"/v1/embeddings 200": 1, "/v1/chat/completions 200": 1}
+
+
+def test_fault_injection(server):
+    server.rate_429 = 1.0
+    response = requests.post(f"{server.base_url}/v1/chat/completions", json={"messages": []}, headers=HEADERS)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+    server.rate_429, server.rate_5xx = 0.0, 1.0
+    response = requests.post(f"{server.base_url}/v1/embeddings", json={"input": ["a"]}, headers=HEADERS)
+    assert response.status_code == 503
+
+    assert requests.post(f"{server.base_url}/v1/embeddings", json={"input": ["a"]}).status_code == 401
+    assert requests.get(f"{server.base_url}/stats").json()["responses"]["/v1/chat/completions 429"] == 1
+
+
+def test_latency_distributions():
+    rng = random.Random(0)
+    assert LatencyDistribution.parse("constant:0.2").sample(rng) == 0.2
+    assert 0.1 <= LatencyDistribution.parse("uniform:0.1:0.3").sample(rng) <= 0.3
+    assert LatencyDistribution.parse("lognormal:0.8:0").sample(rng) == pytest.approx(0.8)
+    with pytest.raises(ValueError):
+        LatencyDistribution.parse("normal:1")
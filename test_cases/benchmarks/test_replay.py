@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from benchmarks.replay import Cassette, ReplayTransport, Route, StubResponse
+from benchmarks.stub_backend import StubLLMBackend
+from benchmarks.synthetic_site import SyntheticSite
+from FCI_NewsAgents.services.scrapers.mit_news_scraper import MITNewsScraper
+from FCI_NewsAgents.utils.circuit_breaker import start_new_run
+from FCI_NewsAgents.utils.http_client import parse_feed
+
+
+@pytest.fixture(autouse=True)
+def fresh_circuits():
+    start_new_run()
+    yield
+    start_new_run()
+
+
+def test_unknown_requests_never_reach_the_network():
+    with ReplayTransport(routes=[]):
+        with pytest.raises(requests.ConnectionError):
+            requests.get("https://example.com/")
+        feed = parse_feed("https://example.com/feed.xml")
+
+    assert feed.bozo and feed.entries == []
+
+
+def test_scraper_runs_against_synthetic_site():
+    with ReplayTransport(routes=SyntheticSite(5, latency=0).routes()) as transport:
+        articles = MITNewsScraper().scrape()
+
+    assert len(articles) == 5
+    assert articles[0].url == "https://news.mit.edu/2026/article-0"
+    assert transport.served == {"news.mit.edu": 1}
+
+
+def test_stub_backend_is_deterministic():
+    backend = StubLLMBackend(latency=0, embedding_latency=0, dimensions=8)
+    payload = {"model": "multilingual-e5-large", "input": ["a", "b", "a"]}
+
+    with ReplayTransport(routes=backend.routes()):
+        response = requests.post("https://mkp-api.fptcloud.com/v1/embeddings", json=payload)
+        completion = requests.post(
+            "https://mkp-api.fptcloud.com/v1/chat/completions",
+            json={
+                "messages": [{"role": "user", "content": "Score this"}],
+                "response_format": {"type": "json_schema", "json_schema": {"name": "DocumentScore"}},
+            },
+        ).json()
+
+    embeddings = [item["embedding"] for item in response.json()["data"]]
+    assert embeddings[0] == embeddings[2] != embeddings[1]
+    assert 0 <= json.loads(completion["choices"][0]["message"]["content"])["score"] <= 10
+    assert completion["usage"]["completion_tokens"] > 0
+
+
+def test_cassette_replays_recorded_responses(tmp_path):
+    cassette = Cassette(tmp_path)
+    live = ReplayTransport(routes=[Route("example.com", lambda r: StubResponse(body="recorded"))])
+
+    # Record what the "network" (here a route) answers, then replay it without the route
+    with live:
+        response = requests.get("https://example.com/page")
+    cassette.save(response.request, response)
+
+    with ReplayTransport(cassette=cassette):
+        assert requests.get("https://example.com/page").text == "recorded"
+        with pytest.raises(requests.ConnectionError):
+            requests.get("https://example.com/other")
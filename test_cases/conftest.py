@@ -0,0 +1,33 @@
+import os
+import sys
+from dataclasses import replace
+from datetime import datetime
+from typing import Callable
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from FCI_NewsAgents.models.document import Document
+
+
+@pytest.fixture
+def make_document() -> Callable[..., Document]:
+    """
+    Factory of test documents: `make_document(i, content_type)` is 'Document i' at https://example.com/i, and any
+    other field can be given as a keyword argument.
+    """
+
+    def make(i: int, content_type: str = "article", **fields) -> Document:
+        document = Document(
+            url=f"https://example.com/{i}",
+            title=f"Document {i}",
+            summary="Summary",
+            source="Example",
+            authors=["Author"],
+            published_date=datetime(2025, 12, 18),
+            content_type=content_type,
+        )
+        return replace(document, **fields) if fields else document
+
+    return make
@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from FCI_NewsAgents.models.document_batch import DocumentBatch
+
+
+def test_date_window_and_counts(make_document):
+    batch = DocumentBatch([
+        make_document(0, "paper", published_date=datetime(2025, 12, 10)),
+        make_document(1, "article", published_date=datetime(2025, 12, 18, 3, tzinfo=timezone.utc)),
+        make_document(2, "article", published_date=datetime(2025, 12, 20)),
+        make_document(3, "tweet", published_date=None),
+    ])
+
+    assert batch.count_by_type() == {"article": 2, "paper": 1, "tweet": 1}
+    # Documents without a date are kept
+    mask = batch.published_between(datetime(2025, 12, 15), datetime(2025, 12, 19))
+    assert mask.tolist() == [False, True, False, True]
+    assert [doc.title for doc in batch.take(mask).documents] == ["Document 1", "Document 3"]
+
+
+def test_top_k_with_caps_per_type(make_document):
+    documents = [make_document(i, "paper" if i % 2 else "article", published_date=None) for i in range(8)]
+    scores = {doc.url: score for doc, score in zip(documents, [9, 8, 3, 8, 7, 10, 9, 2])}
+    del scores[documents[5].url]
+    batch = DocumentBatch(documents, scores=scores)
+
+    selected = batch.top_k(threshold=4, max_per_type={"paper": 1, "article": -1})
+
+    # Unscored and below-threshold documents are skipped, ties keep the batch order
+    assert selected.tolist() == [0, 6, 1, 4]
+    assert [(doc.title, doc.score) for doc in batch.to_documents(selected)] == [
+        ("Document 0", 9), ("Document 6", 9), ("Document 1", 8), ("Document 4", 7),
+    ]
+    assert np.isnan(batch.scores[5])
+    assert batch.top_k(threshold=4, max_per_type={"tweet": -1}).tolist() == []
@@ -0,0 +1,106 @@
+import os
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+from benchmarks.mock_redis_server import MockRedisServer
+from FCI_NewsAgents.core.config import DedupConfig
+from FCI_NewsAgents.services.article_url_cache.store import ArticleURLStore
+
+
+@pytest.fixture
+def redis_server():
+    with MockRedisServer() as server:
+        yield server
+
+
+def _config(backend: str, tmp_path: Path, redis_server: MockRedisServer) -> DedupConfig:
+    return DedupConfig(
+        BACKEND=backend, REDIS_URL=redis_server.url, SHARDED_DIR=str(tmp_path / "shards"), SHARD_COUNT=16,
+        SOURCE_RETENTION_DAYS={"TLDR News": 2},
+    )
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "redis", "sharded"])
+def test_backends_share_the_dedup_rules(backend: str, tmp_path: Path, redis_server: MockRedisServer):
+    today = date.today().isoformat()
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    config = _config(backend, tmp_path, redis_server)
+    db_path = tmp_path / "test_article_cache__010.db" if backend == "sqlite" else None
+
+    # Two stores on the same backend, like two nodes
+    with ArticleURLStore(db_path, config) as node_a, ArticleURLStore(db_path, config) as node_b:
+        assert node_a.insert_many_if_new([
+            ("https://example.com/a", yesterday, "MIT News"),
+            ("https://example.com/b", today, "MIT News"),
+            ("https://example.com/a", today, "MIT News"),
+        ]) == [True, True, False]
+
+        assert not node_b.insert_if_new("https://example.com/a", today)
+        assert node_b.insert_if_new("https://example.com/b", today)
+        assert node_b.insert_many_if_new([("https://example.com/c", today), ("https://example.com/a", today)]) == [True, False]
+        assert node_b.exists("https://example.com/a")
+        assert not node_b.exists("https://example.com/b")
+        assert node_a.count() == 3
+
+        node_a.remove_all()
+        assert node_b.count() == 0
+
+
+def test_redis_backend_pipelines_batches(tmp_path: Path, redis_server: MockRedisServer):
+    today = date.today()
+    config = _config("redis", tmp_path, redis_server)
+
+    with ArticleURLStore(config=config) as store:
+        store.insert_many_if_new([(f"https://example.com/{i}", (today - timedelta(days=1)).isoformat()) for i in range(50)])
+        connection = store.backend.connection
+        pipelines = []
+        pipeline = connection.pipeline
+        connection.pipeline = lambda commands: pipelines.append(len(commands)) or pipeline(commands)
+        commands = dict(redis_server.stats.commands)
+        results = store.insert_many_if_new(
+            [(f"https://example.com/{i}", today.isoformat(), "TLDR News") for i in range(25, 100)]
+        )
+
+    assert results == [False] * 25 + [True] * 50
+    # One round trip for the SET NX of the batch, one for the GET of the stored URLs
+    assert pipelines == [75, 25]
+    assert redis_server.stats.commands["SET"] - commands["SET"] == 75
+    assert redis_server.stats.commands["GET"] - commands.get("GET", 0) == 25
+    # URLs expire at the end of the retention window of their source, instead of being purged
+    ttl = ArticleURLStore(config=config).backend.connection.execute("TTL", f"{config.REDIS_KEY_PREFIX}https://example.com/99")
+    assert 2 * 86400 < ttl <= 3 * 86400
+
+
+def test_sharded_backend_purge(tmp_path: Path, redis_server: MockRedisServer):
+    today = date.today()
+    config = _config("sharded", tmp_path, redis_server)
+
+    with ArticleURLStore(config=config) as store:
+        store.insert_many_if_new([
+            ("https://example.com/old", (today - timedelta(days=10)).isoformat()),
+            ("https://example.com/tldr", (today - timedelta(days=3)).isoformat(), "TLDR News"),
+            ("https://example.com/recent", (today - timedelta(days=3)).isoformat(), "MIT News"),
+        ])
+        assert store.purge_expired(config) == {None: 1, "TLDR News": 1}
+        assert store.count() == 1
+        assert store.exists("https://example.com/recent")
+
+
+def test_sharded_backend_creates_shards_on_first_write(tmp_path: Path, redis_server: MockRedisServer):
+    config = _config("sharded", tmp_path, redis_server)
+
+    def shards():
+        return sorted(path.name for path in (tmp_path / "shards").iterdir() if path.name != "tmp")
+
+    with ArticleURLStore(config=config) as store:
+        assert shards() == []
+        assert store.count() == 0 and not store.exists("https://example.com/1")
+
+        store.insert_many_if_new([("https://example.com/1", date.today().isoformat())])
+        assert len(shards()) == 1
+        assert store.count() == 1
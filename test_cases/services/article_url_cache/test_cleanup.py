@@ -1,11 +1,13 @@
 import os
+import sqlite3
 import sys
 from datetime import date, timedelta
 from pathlib import Path
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
 
-from FCI_NewsAgents.services.article_url_cache.cleanup import purge_older_than
+from FCI_NewsAgents.core.config import DedupConfig
+from FCI_NewsAgents.services.article_url_cache.cleanup import purge_expired, purge_older_than, schedule_purge
 from FCI_NewsAgents.services.article_url_cache.store import ArticleURLStore
 
 
@@ -44,3 +46,45 @@ def test_purge_older_than(tmp_path: Path) -> None:
         assert exists is False
 
     store.close()
+
+
+def test_purge_expired_by_source(tmp_path: Path) -> None:
+    db_path = tmp_path / "test_article_cache__008.db"
+    today = date.today()
+    config = DedupConfig(RETENTION_DAYS=7, SOURCE_RETENTION_DAYS={"TLDR News": 2, "arXiv cs.AI": 30}, PURGE_BATCH_SIZE=3)
+
+    with ArticleURLStore(db_path) as store:
+        store.insert_many_if_new(
+            [(f"https://example.com/tldr{i}", (today - timedelta(days=i)).isoformat(), "TLDR News") for i in range(10)]
+            + [(f"https://example.com/arxiv{i}", (today - timedelta(days=10 * i)).isoformat(), "arXiv cs.AI") for i in range(5)]
+            + [(f"https://example.com/other{i}", (today - timedelta(days=i)).isoformat()) for i in range(10)]
+        )
+
+    # Deleted by batches of 3 rows, each source with its own window
+    counts = purge_expired(db_path, config)
+    assert counts == {None: 2, "TLDR News": 7, "arXiv cs.AI": 1}
+    with ArticleURLStore(db_path) as store:
+        assert store.count() == 15
+        assert store.exists("https://example.com/arxiv3")
+        assert not store.exists("https://example.com/arxiv4")
+        assert not store.exists("https://example.com/tldr3")
+
+    # In the background, at most once per interval
+    thread = schedule_purge(db_path, config)
+    assert thread is not None
+    thread.join()
+    assert schedule_purge(db_path, config) is None
+
+
+def test_purge_adds_the_source_column(tmp_path: Path) -> None:
+    db_path = tmp_path / "test_article_cache__009.db"
+    old = (date.today() - timedelta(days=10)).isoformat()
+
+    # Database of a version without sources
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY AUTOINCREMENT, canonical_url TEXT NOT NULL UNIQUE, scrape_date TEXT NOT NULL);")
+    conn.execute("INSERT INTO articles (canonical_url, scrape_date) VALUES (?, ?);", ("https://example.com/old", old))
+    conn.commit()
+    conn.close()
+
+    assert purge_expired(db_path, DedupConfig(SOURCE_RETENTION_DAYS={"MIT News": 30})) == {None: 1}
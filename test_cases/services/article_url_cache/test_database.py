@@ -0,0 +1,67 @@
+import os
+import sqlite3
+import sys
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+from FCI_NewsAgents.core.config import DedupConfig
+from FCI_NewsAgents.services.article_url_cache.cleanup import purge_older_than
+from FCI_NewsAgents.services.article_url_cache.database import close_databases, get_database
+from FCI_NewsAgents.services.article_url_cache.store import ArticleURLStore
+
+
+def test_one_handle_per_database(tmp_path: Path):
+    db_path = tmp_path / "test_article_cache__006.db"
+    database = get_database(db_path, DedupConfig(CACHE_SIZE_KIB=4096))
+
+    assert get_database(str(db_path)) is database
+    conn = database.connection()
+    assert conn.execute("PRAGMA synchronous;").fetchone()[0] == 1, "synchronous should be NORMAL."
+    assert conn.execute("PRAGMA cache_size;").fetchone()[0] == -4096
+    assert conn.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+
+    # Each thread reuses its own connection
+    assert database.connection() is conn
+    connections = []
+    thread = threading.Thread(target=lambda: connections.append(database.connection()))
+    thread.start()
+    thread.join()
+    assert connections[0] is not conn
+
+    # The connection of a thread that ended is closed when another thread connects
+    for _ in range(5):
+        thread = threading.Thread(target=database.connection)
+        thread.start()
+        thread.join()
+    assert len(database._connections) == 2
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1;")
+    assert conn.execute("SELECT 1;").fetchone() == (1,)
+
+    close_databases()
+    assert get_database(db_path) is not database
+
+
+def test_store_and_cleanup_share_the_handle(tmp_path: Path):
+    db_path = tmp_path / "test_article_cache__007.db"
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    old = (date.today() - timedelta(days=30)).isoformat()
+
+    with ArticleURLStore(db_path) as store:
+        store.insert_many_if_new([("https://example.com/old", old), ("https://example.com/recent", yesterday)])
+
+    # The schema is not created again, and the purge uses the store's connection
+    queries = []
+    get_database(db_path).connection().set_trace_callback(queries.append)
+    with ArticleURLStore(db_path) as store:
+        assert purge_older_than(db_path, days=7) == 1
+        assert not store.exists("https://example.com/old")
+        assert store.exists("https://example.com/recent")
+    assert not any("CREATE" in query for query in queries), "The schema should only be created once per process."
+    assert any("DELETE FROM articles" in query for query in queries)
+    close_databases()
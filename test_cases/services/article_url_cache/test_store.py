@@ -177,3 +177,26 @@ def test_dedup_store_insert_many_dupe_within_second_batch(tmp_path: Path):
     assert store.count() == 3, "There should be exactly 3 unique URLs in the store."
 
     store.close()
+
+def test_dedup_store_insert_many_above_sqlite_variable_limit(tmp_path: Path):
+    db_path = tmp_path / "test_article_cache__003.db"
+
+    store = ArticleURLStore(db_path)
+    today = date.today().isoformat()
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+
+    # More URLs than the 32766 variables a single SQLite statement can bind
+    old_batch = [(f"https://example.com/old{i}", yesterday) for i in range(1000)]
+    assert all(store.insert_many_if_new(old_batch)), "Every URL of the first batch should be inserted."
+
+    batch = [(f"https://example.com/new{i}", today) for i in range(40000)] + [(url, today) for url, _ in old_batch]
+    batch.append(("https://example.com/new0", today))  # Duplicate within batch
+    results = store.insert_many_if_new(batch)
+
+    assert results == [True] * 40000 + [False] * 1000 + [False], "Insert many results do not match expected."
+    assert store.count() == 41000, "There should be exactly 41000 unique URLs in the store."
+
+    # The same batch again the same day: the URLs scraped today are not duplicates
+    assert store.insert_many_if_new(batch) == results, "Re-inserting the batch the same day should give the same results."
+
+    store.close()
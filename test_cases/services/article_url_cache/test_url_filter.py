@@ -0,0 +1,82 @@
+import os
+import sqlite3
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+from FCI_NewsAgents.core.config import DedupConfig
+from FCI_NewsAgents.services.article_url_cache.cleanup import purge_older_than
+from FCI_NewsAgents.services.article_url_cache.store import ArticleURLStore
+from FCI_NewsAgents.services.article_url_cache.url_filter import CountingBloomFilter, URLFilter, sidecar_path
+
+
+def test_counting_bloom_filter():
+    bloom = CountingBloomFilter(capacity=10_000, error_rate=0.01)
+    urls = [f"https://example.com/article{i}" for i in range(10_000)]
+    for url in urls:
+        bloom.add(url)
+
+    assert all(bloom.might_contain(url) for url in urls), "An added URL must never be reported as absent."
+    false_positives = sum(bloom.might_contain(f"https://example.com/other{i}") for i in range(10_000))
+    assert false_positives < 300, f"Too many false positives: {false_positives}"
+
+    for url in urls[:5000]:
+        bloom.remove(url)
+    assert all(bloom.might_contain(url) for url in urls[5000:]), "Removing URLs must not remove the others."
+
+
+def test_store_skips_queries_for_new_urls(tmp_path: Path):
+    db_path = tmp_path / "test_article_cache__004.db"
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+
+    store = ArticleURLStore(db_path)
+    store.insert_many_if_new([(f"https://example.com/article{i}", yesterday) for i in range(100)])
+
+    queries = []
+    store.backend._conn.set_trace_callback(queries.append)
+    assert not store.exists("https://example.com/new")
+    assert queries == [], "A URL that is definitely new should not be looked up in the database."
+    assert store.exists("https://example.com/article1")
+    store.close()
+
+    assert sidecar_path(db_path).exists(), "The filter should be saved next to the database."
+
+
+def test_filter_follows_the_table(tmp_path: Path):
+    db_path = tmp_path / "test_article_cache__005.db"
+    today = date.today()
+
+    with ArticleURLStore(db_path) as store:
+        for i in range(4):
+            store.insert_if_new(f"https://example.com/article{i}", (today - timedelta(days=5 * i)).isoformat())
+
+    # Rows inserted by another process are added when the filter is loaded again
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO articles (canonical_url, scrape_date) VALUES (?, ?);", ("https://example.com/other", "2000-01-01"))
+    conn.commit()
+    conn.close()
+    with ArticleURLStore(db_path) as store:
+        assert store.exists("https://example.com/other")
+
+    # Purged rows are removed from the saved filter, which stays in sync with the table
+    assert purge_older_than(db_path, days=7) == 3
+    url_filter = URLFilter.load(sidecar_path(db_path))
+    assert url_filter.rows == 2
+    with ArticleURLStore(db_path) as store:
+        assert not store.exists("https://example.com/article3")
+        assert store.insert_if_new("https://example.com/article3", today.isoformat())
+
+    # Rows deleted behind the filter's back make it rebuild, without false negatives
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM articles;")
+    conn.execute("INSERT INTO articles (canonical_url, scrape_date) VALUES (?, ?);", ("https://example.com/again", "2000-01-01"))
+    conn.commit()
+    conn.close()
+    with ArticleURLStore(db_path) as store:
+        assert store.exists("https://example.com/again")
+        assert store.insert_if_new("https://example.com/article0", today.isoformat())
+
+    with ArticleURLStore(db_path, DedupConfig(URL_FILTER=False)) as store:
+        assert store.exists("https://example.com/again")
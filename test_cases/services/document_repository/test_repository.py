@@ -0,0 +1,99 @@
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+
+from FCI_NewsAgents.services.document_repository.repository import DocumentRepository, document_key
+from FCI_NewsAgents.utils import alignment_checker
+from FCI_NewsAgents.utils.alignment_checker import get_document_embeddings
+
+
+def test_document_key_is_normalised():
+    assert document_key(" https://example.com/1?b=2&a=1 ") == document_key("https://example.com/1?a=1&b=2")
+
+
+def test_documents_and_scores(tmp_path: Path, make_document):
+    repository = DocumentRepository(tmp_path / "documents.sqlite")
+    repository.save_documents([make_document(1), make_document(2, source="Other")], seen=date(2025, 12, 18))
+    # Seen again later: the first scrape date is kept
+    repository.save_documents([make_document(1)], seen=date(2025, 12, 20))
+
+    assert repository.load_score(make_document(1).url, "prompt") is None
+    repository.save_score(make_document(1).url, "prompt", 8.5)
+    repository.save_score(make_document(2).url, "prompt", 3.0)
+    assert repository.load_score(" https://example.com/1#abstract", "prompt") == 8.5
+    assert repository.load_score(make_document(1).url, "another prompt") is None
+
+    documents = repository.find_documents("prompt", seen_from=date(2025, 12, 18), seen_to=date(2025, 12, 18))
+    assert [(doc.title, doc.score) for doc in documents] == [("Document 1", 8.5), ("Document 2", 3.0)]
+    assert documents[0].authors == ["Author"] and documents[0].published_date == datetime(2025, 12, 18)
+    assert [doc.title for doc in repository.find_documents("prompt", min_score=5)] == ["Document 1"]
+    assert [doc.title for doc in repository.find_documents("prompt", source="Other")] == ["Document 2"]
+    assert repository.find_documents("prompt", seen_from=date(2025, 12, 19)) == []
+    repository.close()
+
+
+def test_texts_and_segments(tmp_path: Path, make_document):
+    repository = DocumentRepository(tmp_path / "documents.sqlite")
+    url = make_document(1).url
+    text = "Full text of the document. " * 1000
+
+    assert repository.load_text(url) is None
+    repository.save_text(url, text)
+    assert repository.load_text(url) == text
+    stored_size = repository._conn.execute("SELECT length(text) FROM texts;").fetchone()[0]
+    assert stored_size < len(text) / 10, "The text should be stored compressed."
+
+    repository.save_segment(url, "report", "prompt", "Segment")
+    assert repository.load_segment(url, "report", "prompt") == "Segment"
+    assert repository.load_segment(url, "highlight", "prompt") is None
+    assert repository.load_segment(url, "report", "another prompt") is None
+    repository.close()
+
+
+def test_embeddings_are_reused(tmp_path: Path, monkeypatch, make_document):
+    repository = DocumentRepository(tmp_path / "documents.sqlite")
+    embedded = []
+
+    def get_embedding(texts):
+        embedded.append(list(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+    monkeypatch.setattr(alignment_checker, "get_embedding", get_embedding)
+    documents = [make_document(1), make_document(2)]
+    key_strings = ["passage: 1", "passage: 22"]
+
+    first = get_document_embeddings(documents, key_strings, repository)
+    second = get_document_embeddings(documents, ["passage: 1", "passage: 333"], repository)
+
+    # The second document changed, so only it is embedded again
+    assert embedded == [["passage: 1", "passage: 22"], ["passage: 333"]]
+    np.testing.assert_allclose(first, [[10.0, 1.0], [11.0, 1.0]])
+    np.testing.assert_allclose(second, [[10.0, 1.0], [12.0, 1.0]])
+    repository.close()
+
+
+def test_threads_share_one_connection(tmp_path: Path, monkeypatch):
+    import sqlite3
+    from concurrent.futures import ThreadPoolExecutor
+
+    from FCI_NewsAgents.services.document_repository import repository as repository_module
+
+    connections = []
+    connect = sqlite3.connect
+
+    def counting_connect(*args, **kwargs):
+        connections.append(connect(*args, **kwargs))
+        return connections[-1]
+
+    monkeypatch.setattr(repository_module.sqlite3, "connect", counting_connect)
+    repository = DocumentRepository(tmp_path / "documents.sqlite")
+
+    # Like LangGraph, every invocation runs on new threads
+    for run in range(5):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: repository.save_score(f"https://example.com/{i}", f"prompt {run}", i), range(32)))
+
+    assert len(connections) == 1
+    assert [repository.load_score(f"https://example.com/{i}", "prompt 4") for i in range(32)] == list(range(32))
+    repository.close()
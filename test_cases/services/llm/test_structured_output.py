@@ -0,0 +1,101 @@
+import os
+import sys
+
+import pytest
+import requests
+from pydantic import BaseModel
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+from FCI_NewsAgents.services.llm import structured_output
+from FCI_NewsAgents.services.llm.structured_output import (
+    StructuredOutputError,
+    call_llm_structured,
+    extract_score,
+    get_parse_stats,
+    parse_structured,
+    reset_parse_stats,
+)
+
+
+class Selection(BaseModel):
+    index: int
+    explanation: str
+
+
+def test_parse_structured_finds_json_after_reasoning():
+    response = 'Comparing {a} and {b}... the best is 3.\n{"index": 3, "explanation": "new model",}'
+
+    result = parse_structured(response, Selection)
+
+    assert result.index == 3
+    assert result.explanation == "new model"
+
+
+def test_parse_structured_fenced_block():
+    response = 'Here:\n```json\n{"index": 2, "explanation": "x"}\n```\nDone'
+
+    assert parse_structured(response, Selection).index == 2
+
+
+def test_parse_structured_raises_without_match():
+    with pytest.raises(StructuredOutputError):
+        parse_structured('{"foo": 1}', Selection)
+
+
+@pytest.mark.parametrize(
+    "response, expected",
+    [
+        ('{"score": 7}', 7),
+        ("8", 8),
+        ("Published in 2025, 3 authors. Relevant to cloud.\nScore: 6", 6),
+        ('{"score": 42}\n9', 9),
+        ("Score: 7/10", 7),
+        ("I rate this 7 out of 10", 7),
+        ("Final score: 3 (on a 0-10 scale)", 3),
+        ("Score (0-10): 8", 8),
+        ("On a scale from 1 to 10, I would set it to 6", 6),
+    ],
+)
+def test_extract_score(response: str, expected: int):
+    assert extract_score(response) == expected
+
+
+def test_extract_score_rejects_out_of_range():
+    with pytest.raises(StructuredOutputError):
+        extract_score("Published in 2025")
+
+
+def test_call_llm_structured_records_first_try(monkeypatch: pytest.MonkeyPatch):
+    responses = iter(["not json", '{"index": 1, "explanation": "ok"}', '{"index": 2, "explanation": "ok"}'])
+    monkeypatch.setattr(structured_output, "call_llm", lambda **kwargs: next(responses))
+    reset_parse_stats()
+
+    assert call_llm_structured("u", "s", Selection, task="t").index == 1
+    assert call_llm_structured("u", "s", Selection, task="t").index == 2
+
+    stats = get_parse_stats()["t"]
+    assert stats.calls == 2
+    assert stats.first_try_successes == 1
+    assert stats.retries == 1
+    assert stats.failures == 0
+
+
+def test_call_llm_structured_falls_back_without_response_format(monkeypatch: pytest.MonkeyPatch):
+    formats = []
+
+    def fake_call_llm(**kwargs):
+        formats.append(kwargs["response_format"])
+        if kwargs["response_format"] is not None:
+            response = requests.Response()
+            response.status_code = 400
+            raise requests.HTTPError("Error from GPT API (400): response_format is not supported", response=response)
+        return '{"index": 4, "explanation": "ok"}'
+
+    monkeypatch.setattr(structured_output, "call_llm", fake_call_llm)
+    monkeypatch.setattr(structured_output, "_response_format_supported", True)
+    reset_parse_stats()
+
+    assert call_llm_structured("u", "s", Selection, task="t").index == 4
+    assert formats[0] is not None and formats[1] is None
+    assert get_parse_stats()["t"].first_try_successes == 1
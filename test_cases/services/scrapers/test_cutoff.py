@@ -0,0 +1,62 @@
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+from FCI_NewsAgents.services.scrapers import google_research_scraper
+from FCI_NewsAgents.services.scrapers.base_scraper import feed_entry_date, find_listing_date
+from FCI_NewsAgents.services.scrapers.google_research_scraper import GoogleResearchScraper
+
+TODAY = date.today()
+STALE = TODAY - timedelta(days=30)
+
+
+def test_listing_and_feed_dates():
+    assert find_listing_date("Research  December 18, 2025 Title") == date(2025, 12, 18)
+    assert find_listing_date("Dec. 8, 2025") == date(2025, 12, 8)
+    assert find_listing_date("No date, 2025") is None
+    assert feed_entry_date({"published_parsed": (2025, 12, 18, 6, 30, 0, 3, 352, 0)}) == datetime(2025, 12, 18, 6, 30)
+    assert feed_entry_date({}) is None
+
+
+def test_iter_recent_stops_at_first_stale_item_of_sorted_listing():
+    scraper = GoogleResearchScraper()
+    items = [TODAY, None, STALE, TODAY]
+    assert list(scraper.iter_recent(items, lambda item: item)) == [TODAY, None, TODAY]
+    assert list(scraper.iter_recent(items, lambda item: item, sorted_by_date=True)) == [TODAY, None]
+
+    assert scraper.is_stale(STALE.isoformat()) and not scraper.is_stale(TODAY.isoformat())
+    assert not scraper.is_stale("") and not scraper.is_stale(None)
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+def test_stale_cards_are_not_fetched(monkeypatch):
+    cards = "".join(
+        f'<a class="glue-card not-glue" href="/blog/post-{i}/"><p>{day:%B %d, %Y}</p>'
+        f'<span class="headline-5 js-gt-item-id">Post {i}</span></a>'
+        for i, day in enumerate([TODAY, STALE, TODAY])
+    )
+    fetched = []
+
+    def http_get(url, **kwargs):
+        fetched.append(url)
+        if url.endswith("/blog/"):
+            return FakeResponse(f"<html><body>{cards}</body></html>")
+        return FakeResponse(
+            f'<div class="basic-hero--blog-detail__description"><p>{TODAY:%B %d, %Y}</p><p>Author</p></div><p>Text</p>'
+        )
+
+    monkeypatch.setattr(google_research_scraper, "http_get", http_get)
+    articles = GoogleResearchScraper().scrape()
+
+    assert [article.title for article in articles] == ["Post 0", "Post 2"]
+    assert "https://research.google/blog/post-1/" not in fetched
+    assert len(fetched) == 3
@@ -0,0 +1,78 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+from FCI_NewsAgents.core.config import SourcesConfig
+from FCI_NewsAgents.models.article import Article
+from FCI_NewsAgents.services.scrapers import run_article_scrapers
+from FCI_NewsAgents.services.scrapers.sources import SourceCache, plan_sources, resolve_sources
+
+NOW = datetime(2025, 12, 18, 12, 0)
+
+
+def make_config(tmp_path, **intervals) -> SourcesConfig:
+    return SourcesConfig(REFRESH_INTERVAL_HOURS=intervals, CACHE_DIR=str(tmp_path))
+
+
+def test_resolve_sources():
+    assert resolve_sources(["arxiv", "MITNEWS", "arXiv"]) == ["arXiv", "MITNews"]
+    assert "TechRepublic" in resolve_sources(None)
+    with pytest.raises(ValueError, match="Unknown source"):
+        resolve_sources(["arXiv", "Reddit"])
+
+
+def test_plan_sources_follows_refresh_intervals(tmp_path):
+    config = make_config(tmp_path, arXiv=1, MITNews=24)
+    cache = SourceCache(config.CACHE_DIR)
+    cache.save("arXiv", [], NOW - timedelta(hours=2))
+    cache.save("MITNews", [], NOW - timedelta(hours=2))
+    # Scraped a few seconds less than an interval ago: due, within the tolerance
+    cache.save("NeuronDaily", [], NOW - timedelta(minutes=59, seconds=50))
+    config.REFRESH_INTERVAL_HOURS["NeuronDaily"] = 1
+
+    plan = plan_sources(config, ["arXiv", "MITNews", "NeuronDaily", "OpenAINews"], now=NOW)
+    assert plan.due == ["arXiv", "NeuronDaily", "OpenAINews"]
+    assert plan.cached == ["MITNews"]
+    assert plan.last_scraped["MITNews"] == NOW - timedelta(hours=2)
+
+    forced = plan_sources(config, ["arXiv", "MITNews"], force_refresh=True, now=NOW)
+    assert forced.due == ["arXiv", "MITNews"] and forced.cached == []
+
+    config.ENABLED_SOURCES = ["mitnews"]
+    assert plan_sources(config, now=NOW).cached == ["MITNews"]
+
+
+class FakeScraper:
+    calls = 0
+
+    def get_name(self):
+        return "Fake"
+
+    def get_hosts(self):
+        return []
+
+    def is_enabled(self):
+        return True
+
+    def scrape(self):
+        FakeScraper.calls += 1
+        return [Article(url=f"https://example.com/{FakeScraper.calls}", title="Title", source="Fake")]
+
+
+def test_scrape_articles_reuses_cached_sources(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_article_scrapers, "SCRAPERS", {"Fake": FakeScraper})
+    monkeypatch.setattr("FCI_NewsAgents.services.scrapers.sources.SCRAPERS", {"Fake": FakeScraper})
+    config = make_config(tmp_path, Fake=6)
+
+    first = run_article_scrapers.scrape_articles(parallel=False, config=config, plan=plan_sources(config, ["Fake"]))
+    second = run_article_scrapers.scrape_articles(parallel=False, config=config, plan=plan_sources(config, ["Fake"]))
+    assert FakeScraper.calls == 1
+    assert second == first
+
+    forced = run_article_scrapers.scrape_articles(parallel=False, config=config, plan=plan_sources(config, ["Fake"], force_refresh=True))
+    assert FakeScraper.calls == 2
+    assert forced[0].url == "https://example.com/2"
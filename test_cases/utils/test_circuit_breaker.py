@@ -0,0 +1,83 @@
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from FCI_NewsAgents.utils import http_client
+from FCI_NewsAgents.utils.circuit_breaker import (
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    CircuitState,
+    host_of,
+)
+
+
+def test_host_of():
+    assert host_of("https://WWW.TechRepublic.com/rssfeeds/topic/ai/") == "www.techrepublic.com"
+    assert host_of("fpt-llm") == "fpt-llm"
+
+
+def test_open_circuit_keeps_cached_error_until_next_run():
+    registry = CircuitBreakerRegistry(failure_threshold=2)
+    breaker = registry.for_url("https://down.example.com/feed")
+
+    breaker.record_failure(requests.ConnectionError("connection refused"))
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure(requests.Timeout("read timed out"))
+    assert breaker.state == CircuitState.OPEN
+
+    with pytest.raises(CircuitOpenError, match="read timed out"):
+        registry.get("down.example.com").before_call()
+    assert registry.open_circuits() == {"down.example.com": "Timeout: read timed out"}
+
+    # The next run gets a single trial call
+    registry.start_new_run()
+    assert breaker.state == CircuitState.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_failed_trial_reopens_circuit():
+    registry = CircuitBreakerRegistry(failure_threshold=3)
+    breaker = registry.get("flaky.example.com")
+    for _ in range(3):
+        breaker.record_failure("HTTP 503")
+
+    registry.start_new_run()
+    breaker.before_call()
+    breaker.record_failure("HTTP 503")
+
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_http_get_fails_fast_once_open(monkeypatch):
+    registry = CircuitBreakerRegistry(failure_threshold=2)
+    monkeypatch.setattr(http_client, "CIRCUIT_BREAKERS", registry)
+
+    calls = []
+
+    def refused(url, **kwargs):
+        calls.append(url)
+        raise requests.ConnectionError("connection refused")
+
+    monkeypatch.setattr(http_client.requests, "get", refused)
+
+    for path in ("a", "b"):
+        with pytest.raises(requests.ConnectionError):
+            http_client.http_get(f"https://dead.example.com/{path}", timeout=10)
+
+    with pytest.raises(CircuitOpenError):
+        http_client.http_get("https://dead.example.com/c", timeout=10)
+    assert len(calls) == 2
+
+    # Other hosts are unaffected
+    with pytest.raises(requests.ConnectionError):
+        http_client.http_get("https://other.example.com/", timeout=10)
+    assert len(calls) == 3
@@ -0,0 +1,105 @@
+import os
+import re
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from FCI_NewsAgents.utils.content_budgeter import (
+    ContentBudgeter,
+    choose_max_tokens,
+    heuristic_token_count,
+)
+
+
+def word_count(text: str) -> int:
+    return len(text.split())
+
+
+def test_content_within_budget_is_not_split():
+    budgeter = ContentBudgeter(max_input_tokens=100, chunk_tokens=50, count_tokens=word_count)
+    text = "word " * 80
+
+    assert budgeter.fits(text)
+    assert budgeter.truncate(text) == text
+
+
+def test_split_respects_chunk_budget_and_keeps_order():
+    budgeter = ContentBudgeter(max_input_tokens=100, chunk_tokens=50, count_tokens=word_count)
+    paragraphs = [" ".join(f"p{i}w{j}" for j in range(20)) for i in range(10)]
+    text = "\n\n".join(paragraphs)
+
+    chunks = budgeter.split(text)
+
+    assert not budgeter.fits(text)
+    assert all(word_count(chunk) <= 50 for chunk in chunks)
+    assert " ".join(" ".join(chunks).split()) == " ".join(text.split())
+
+
+def test_split_breaks_oversized_paragraph():
+    budgeter = ContentBudgeter(max_input_tokens=100, chunk_tokens=10, count_tokens=word_count)
+    text = " ".join(f"w{i}" for i in range(35))
+
+    chunks = budgeter.split(text)
+
+    assert len(chunks) == 4
+    assert all(word_count(chunk) <= 10 for chunk in chunks)
+
+
+def test_truncate_keeps_prefix():
+    budgeter = ContentBudgeter(max_input_tokens=5, count_tokens=heuristic_token_count)
+    text = "abcd" * 20
+
+    truncated = budgeter.truncate(text)
+
+    assert text.startswith(truncated)
+    assert heuristic_token_count(truncated) <= 5
+
+
+def test_choose_max_tokens_is_bounded():
+    assert choose_max_tokens(80, reasoning_tokens=0, min_tokens=1024) == 1024
+    assert choose_max_tokens(1000, tokens_per_word=3.0, reasoning_tokens=1000) == 4000
+    assert choose_max_tokens(100000) == 16384
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="report_generator_utils needs Python 3.12")
+def test_over_budget_content_is_summarised_by_chunk(monkeypatch):
+    from FCI_NewsAgents.utils import report_generator_utils
+    from FCI_NewsAgents.utils.retry import RetryPolicy
+
+    budgeter = ContentBudgeter(max_input_tokens=100, chunk_tokens=48, count_tokens=word_count)
+    content = "\n\n".join(" ".join(f"p{i}w{j}" for j in range(20)) for i in range(10))
+    chunks = budgeter.split(content)
+    lock = threading.Lock()
+    calls, active = [], {"now": 0, "max": 0}
+
+    def call_llm(user_prompt, **kwargs):
+        index, total = map(int, re.search(r"phần (\d+)/(\d+)", user_prompt).groups())
+        with lock:
+            calls.append((index, total))
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        if index == 2:
+            raise TimeoutError("read timed out")
+        return f"summary {index}"
+
+    monkeypatch.setattr(report_generator_utils, "call_llm", call_llm)
+    monkeypatch.setattr(report_generator_utils, "LLM_RETRY_POLICY", RetryPolicy(max_attempts=1, budget=None))
+
+    reduced = report_generator_utils.fit_content_to_budget(content, "system", budgeter=budgeter, max_workers=2)
+
+    # One summary per chunk, at most `max_workers` at a time
+    assert len(chunks) > 2
+    assert sorted(calls) == [(i, len(chunks)) for i in range(1, len(chunks) + 1)]
+    assert active["max"] == 2
+    # The chunk whose summary failed is truncated instead
+    assert reduced.split("\n\n") == [
+        "summary 1", budgeter.truncate(chunks[1], budgeter.chunk_tokens // 8),
+        *(f"summary {i}" for i in range(3, len(chunks) + 1)),
+    ]
@@ -0,0 +1,89 @@
+import json
+import os
+import sys
+import urllib.request
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from FCI_NewsAgents.utils.metrics import (
+    METRICS,
+    MetricsRegistry,
+    record_stage,
+    reset_metrics,
+    start_metrics_server,
+    timer,
+    write_prometheus_textfile,
+    write_run_summary,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+def test_timer_as_decorator_and_context_manager():
+    @timer("node", node="guardrails")
+    def node():
+        return "done"
+
+    assert node() == "done"
+    assert node() == "done"
+
+    with pytest.raises(ValueError):
+        with timer("llm_call", model="gpt-oss-120b"):
+            raise ValueError()
+
+    timers = {(t["name"], tuple(sorted(t["labels"].items()))): t for t in METRICS.snapshot()["timers"]}
+    assert timers[("node", (("node", "guardrails"), ("outcome", "ok")))]["count"] == 2
+    assert timers[("llm_call", (("model", "gpt-oss-120b"), ("outcome", "error")))]["count"] == 1
+
+
+def test_prometheus_rendering():
+    registry = MetricsRegistry()
+    registry.inc("stage_documents_in", 10, stage="dedup")
+    registry.inc("stage_documents_in", 5, stage="dedup")
+    registry.set_gauge("run_duration_seconds", 12.5)
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        registry.observe("http_request", seconds, host="example.com")
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE fci_newsagents_stage_documents_in_total counter" in text
+    assert 'fci_newsagents_stage_documents_in_total{stage="dedup"} 15.0' in text
+    assert "fci_newsagents_run_duration_seconds 12.5" in text
+    assert 'fci_newsagents_http_request_seconds{host="example.com",quantile="0.5"} 0.2' in text
+    assert 'fci_newsagents_http_request_seconds_count{host="example.com"} 4' in text
+
+
+def test_exports(tmp_path):
+    record_stage("alignment", 40, 25)
+
+    prom_path = tmp_path / "metrics" / "run.prom"
+    write_prometheus_textfile(str(prom_path))
+    assert 'fci_newsagents_stage_documents_out_total{stage="alignment"} 25.0' in prom_path.read_text()
+
+    summary_path = tmp_path / "summary.json"
+    write_run_summary(str(summary_path), run_id="test")
+    summary = json.loads(summary_path.read_text())
+    assert summary["run_id"] == "test"
+    assert {"name": "stage_documents_in", "labels": {"stage": "alignment"}, "value": 40.0} in summary["counters"]
+
+
+def test_metrics_endpoint():
+    record_stage("dedup", 3, 2)
+    server = start_metrics_server(0)
+    try:
+        host, port = server.server_address
+        # Only reachable from this host unless asked otherwise
+        assert host == "127.0.0.1"
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+
+    assert 'fci_newsagents_stage_documents_in_total{stage="dedup"} 3.0' in body
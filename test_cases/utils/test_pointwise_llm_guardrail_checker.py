@@ -0,0 +1,22 @@
+from FCI_NewsAgents.utils.pointwise_llm_guardrail_checker import select_top_documents
+
+
+def test_select_top_documents_annotates_without_copying(make_document):
+    papers = [make_document(i, "paper") for i in range(5)]
+    articles = [make_document(10 + i, "article") for i in range(5)]
+    scores = [3, 9, 5, 7, 4]
+
+    selected = select_top_documents(
+        [(doc, score) for doc, score in zip(papers, scores)] + [(doc, score) for doc, score in zip(articles, scores)],
+        threshold=4,
+        max_papers=2,
+        max_articles=3,
+    )
+
+    assert [(doc.title, doc.score) for doc in selected] == [
+        ("Document 1", 9), ("Document 11", 9), ("Document 3", 7), ("Document 13", 7), ("Document 12", 5),
+    ]
+    # The selected documents share the fields of the scored ones
+    assert selected[0].summary is papers[1].summary and selected[0].authors is papers[1].authors
+    assert not hasattr(selected[0], "__dict__")
+    assert selected[0].with_score(9) is selected[0]
@@ -0,0 +1,124 @@
+import asyncio
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from FCI_NewsAgents.utils.circuit_breaker import CircuitOpenError, CircuitState, get_circuit_breaker
+from FCI_NewsAgents.utils.retry import RetryBudget, RetryPolicy, is_retryable
+
+
+def http_error(status_code: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(f"HTTP {status_code}", response=response)
+
+
+class Flaky:
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def no_delay_policy(**kwargs) -> RetryPolicy:
+    return RetryPolicy(base_delay=0.0, budget=None, **kwargs)
+
+
+def test_classification():
+    assert is_retryable(http_error(429))
+    assert is_retryable(http_error(503))
+    assert is_retryable(requests.ConnectionError())
+    assert is_retryable(ValueError("unparsable"))
+    assert not is_retryable(http_error(400))
+    assert not is_retryable(http_error(401))
+    assert not is_retryable(NotImplementedError())
+    assert not is_retryable(CircuitOpenError("llm", 1.0))
+
+
+def test_retries_transient_errors():
+    fn = Flaky([http_error(503), requests.Timeout()])
+
+    assert no_delay_policy(max_attempts=3).call(fn) == "ok"
+    assert fn.calls == 3
+
+
+def test_fatal_error_is_not_retried():
+    fn = Flaky([http_error(400)])
+
+    with pytest.raises(requests.HTTPError):
+        no_delay_policy(max_attempts=3).call(fn)
+    assert fn.calls == 1
+
+
+def test_answer_without_content_is_retried(monkeypatch: pytest.MonkeyPatch):
+    from FCI_NewsAgents.utils import llm_guardrail_checker
+
+    responses = iter([None, "<start>\n1|1|relevant\n2|0|not relevant\n<end>"])
+    monkeypatch.setattr(llm_guardrail_checker, "call_llm", lambda **kwargs: next(responses))
+    monkeypatch.setattr(llm_guardrail_checker, "LLM_RETRY_POLICY", no_delay_policy(max_attempts=3))
+    document = llm_guardrail_checker.IRRELEVANT_DOCS[0]
+
+    assert llm_guardrail_checker._get_llm_score(document, [document]) == 1
+
+
+def test_backoff_is_capped_and_jittered():
+    policy = RetryPolicy(base_delay=1.0, multiplier=2.0, max_delay=5.0, jitter="none")
+    assert [policy.compute_delay(a) for a in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+
+    policy = RetryPolicy(base_delay=1.0, multiplier=2.0, max_delay=5.0, jitter="full")
+    assert all(0.0 <= policy.compute_delay(3) <= 4.0 for _ in range(100))
+
+
+def test_retry_after_header_takes_precedence():
+    error = http_error(429)
+    error.response.headers["Retry-After"] = "3"
+
+    assert RetryPolicy(max_delay=10.0).compute_delay(1, error) == 3.0
+
+
+def test_retry_budget_stops_retries():
+    budget = RetryBudget(ratio=0.0, min_retries=1, max_retries=1)
+    policy = RetryPolicy(base_delay=0.0, budget=budget, max_attempts=5)
+
+    first = Flaky([ValueError()])
+    assert policy.call(first) == "ok"
+
+    second = Flaky([ValueError(), ValueError()])
+    with pytest.raises(ValueError):
+        policy.call(second)
+    assert second.calls == 1
+
+
+def test_circuit_opens_after_consecutive_failures():
+    endpoint = "test-endpoint-open"
+    breaker = get_circuit_breaker(endpoint, failure_threshold=2, recovery_timeout=60.0)
+    policy = no_delay_policy(max_attempts=1, endpoint=endpoint)
+
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            policy.call(Flaky([http_error(503)]))
+
+    assert breaker.state == CircuitState.OPEN
+    fn = Flaky([])
+    with pytest.raises(CircuitOpenError):
+        policy.call(fn)
+    assert fn.calls == 0
+
+
+def test_async_variant():
+    fn = Flaky([http_error(502)])
+
+    async def afn():
+        return fn()
+
+    assert asyncio.run(no_delay_policy(max_attempts=2).acall(afn)) == "ok"
+    assert fn.calls == 2
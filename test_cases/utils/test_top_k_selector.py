@@ -0,0 +1,57 @@
+import threading
+import time
+
+from FCI_NewsAgents.utils import pointwise_llm_guardrail_checker
+from FCI_NewsAgents.utils.pointwise_llm_guardrail_checker import filter_documents_by_score
+from FCI_NewsAgents.utils.top_k_selector import StreamingTopKSelector
+
+
+def test_selection_as_scores_arrive(make_document):
+    documents = [make_document(i, "paper" if i < 4 else "article") for i in range(8)]
+    selector = StreamingTopKSelector(documents, threshold=4, max_per_type={"paper": 2, "article": 1}, max_score=10)
+
+    for index, score in [(2, 7), (0, 3), (5, 8), (1, 10)]:
+        selector.add(index, score)
+    assert [(doc.title, doc.score) for doc in selector.selected()] == [
+        ("Document 1", 10), ("Document 5", 8), ("Document 2", 7),
+    ]
+    # Unscored documents could still score 10
+    assert not selector.stable.is_set()
+
+    selector.add(4, 10)
+    selector.add(3, 10)
+    assert [(doc.title, doc.score) for doc in selector.selected()] == [
+        ("Document 1", 10), ("Document 3", 10), ("Document 4", 10),
+    ]
+    # Document 4 wins a tie against the unscored articles after it, and the papers are all scored
+    assert selector.stable.is_set()
+
+
+def test_tie_with_an_earlier_unscored_document_is_not_stable(make_document):
+    documents = [make_document(i, "article") for i in range(3)]
+    selector = StreamingTopKSelector(documents, threshold=4, max_per_type={"article": 1}, max_score=10)
+
+    selector.add(1, 10)
+    assert not selector.stable.is_set()
+    selector.add(0, None)
+    assert selector.stable.is_set()
+    assert [doc.title for doc in selector.selected()] == ["Document 1"]
+
+
+def test_scoring_stops_once_the_selection_is_stable(monkeypatch, make_document):
+    documents = [make_document(i, "article") for i in range(50)]
+    scored = []
+    lock = threading.Lock()
+
+    def get_score(doc, system_prompt):
+        with lock:
+            scored.append(doc.url)
+        time.sleep(0.01)
+        return 10.0
+
+    monkeypatch.setattr(pointwise_llm_guardrail_checker, "get_score", get_score)
+
+    selected = filter_documents_by_score(documents, threshold=4, system_prompt="", max_articles=2, max_workers=2)
+
+    assert [doc.title for doc in selected] == ["Document 0", "Document 1"]
+    assert len(scored) < 10
@@ -0,0 +1,121 @@
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from FCI_NewsAgents.utils.tracing import Tracer, _current_span, propagate
+
+URL = "https://example.com/post"
+
+
+def spans_by_name(tracer: Tracer):
+    return {span.name: span for span in tracer.end_trace()}
+
+
+def test_document_span_tree_across_threads():
+    tracer = Tracer()
+    trace_id = tracer.start_trace()
+    tracer.annotate_document(URL, source="Example")
+
+    def canonicalise(url):
+        with tracer.span("canonicalise", document=url):
+            with tracer.span("fetch", document=url, host="example.com"):
+                pass
+
+    with tracer.span("dedup"):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(canonicalise, [URL]))
+
+    with tracer.span("score", document=URL) as score_span:
+        with tracer.span("llm_call"):
+            pass
+        score_span.add("llm.prompt_tokens", 120)
+        score_span.add("llm.prompt_tokens", 30)
+
+    spans = spans_by_name(tracer)
+    root = spans["document"]
+
+    assert {span.trace_id for span in spans.values()} == {trace_id}
+    assert root.parent_span_id == spans["run"].span_id
+    assert root.attributes["source"] == "Example"
+    assert spans["canonicalise"].parent_span_id == root.span_id
+    assert spans["fetch"].parent_span_id == spans["canonicalise"].span_id
+    assert spans["score"].parent_span_id == root.span_id
+    assert spans["llm_call"].parent_span_id == spans["score"].span_id
+    assert spans["score"].attributes["llm.prompt_tokens"] == 150
+    assert spans["dedup"].parent_span_id == spans["run"].span_id
+    assert root.start_ns <= spans["canonicalise"].start_ns and root.end_ns >= spans["score"].end_ns
+
+
+def test_error_status_and_slowest_documents():
+    tracer = Tracer()
+    tracer.start_trace()
+
+    with pytest.raises(RuntimeError):
+        with tracer.span("extract", document=URL):
+            raise RuntimeError("boom")
+    tracer.record_span("embed", 0, 2_000_000_000, document="https://example.com/slow")
+
+    spans = spans_by_name(tracer)
+    assert spans["extract"].status == "error"
+    assert "boom" in spans["extract"].status_message
+    assert tracer.slowest_documents(1)[0] == ("https://example.com/slow", 2.0)
+
+
+def test_propagate_keeps_parent_in_worker_threads():
+    tracer = Tracer()
+    tracer.start_trace()
+
+    def work(_):
+        return _current_span.get().name
+
+    with tracer.span("generate", document=URL):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            names = list(executor.map(propagate(work), range(3)))
+
+    assert names == ["generate"] * 3
+
+
+def test_otlp_json_export(tmp_path):
+    tracer = Tracer()
+    trace_id = tracer.start_trace()
+    with tracer.span("score", document=URL, score=7):
+        pass
+
+    path = tmp_path / "trace.json"
+    tracer.export_otlp_json(str(path))
+    export = json.loads(path.read_text().splitlines()[0])
+
+    spans = export["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert {span["traceId"] for span in spans} == {trace_id}
+    score = next(span for span in spans if span["name"] == "score")
+    assert {"key": "score", "value": {"intValue": "7"}} in score["attributes"]
+    assert score["status"] == {"code": 1}
+
+
+def test_fetch_joins_a_document_tree_only_for_documents(monkeypatch):
+    import requests
+
+    from FCI_NewsAgents.utils import http_client
+    from FCI_NewsAgents.utils.tracing import TRACER
+
+    def get(url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+    monkeypatch.setattr(http_client.requests, "get", get)
+    TRACER.start_trace()
+    http_client.http_get("https://example.com/feed.xml")
+    http_client.http_get("https://example.com/pdf/post", document=URL)
+
+    # A listing page or a feed is not a document
+    assert [url for url, _ in TRACER.slowest_documents()] == [URL]
+    fetches = [span for span in TRACER.end_trace() if span.name == "fetch"]
+    assert [(span.document, span.attributes["url"]) for span in fetches] == [
+        (None, "https://example.com/feed.xml"), (URL, "https://example.com/pdf/post"),
+    ]
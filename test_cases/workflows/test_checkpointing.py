@@ -0,0 +1,158 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+from FCI_NewsAgents.workflows.checkpointing import RunStore
+
+
+def test_run_store_round_trip(tmp_path, make_document):
+    store = RunStore("run", root=str(tmp_path))
+    assert not store.exists()
+    assert store.load_documents("scored") is None
+    # Looking a run up does not create its folder
+    assert not os.path.exists(store.path)
+
+    documents = [
+        make_document(1, "paper", published_date=datetime(2025, 12, 18, 6, 30), score=1.0),
+        make_document(2, score=2.0),
+    ]
+    store.save_documents("scored", documents)
+    store.save_text("segments", documents[0].url, "Đoạn văn")
+    store.save_value("highlight_index", 1)
+    store.set_status("failed", failed_node="generate_article", error="timeout")
+
+    reopened = RunStore("run", root=str(tmp_path))
+    loaded = reopened.load_documents("scored")
+    assert loaded == documents
+    assert [(doc.published_date, doc.content_type, doc.score) for doc in loaded] == [
+        (doc.published_date, doc.content_type, doc.score) for doc in documents
+    ]
+    assert reopened.load_text("segments", documents[0].url) == "Đoạn văn"
+    assert reopened.load_text("segments", documents[1].url) is None
+    assert reopened.load_value("highlight_index") == 1
+    assert reopened.exists()
+    assert reopened.status()["failed_node"] == "generate_article"
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="report_generator_utils needs Python 3.12")
+def test_resume_restarts_at_failed_node(tmp_path, monkeypatch, make_document):
+    from FCI_NewsAgents.workflows import workflow_builder
+
+    calls = {"dedup": 0, "score": 0, "segment": 0, "opening": 0}
+    fail_opening = {"on": True}
+
+    def dedup(docs, **kwargs):
+        calls["dedup"] += 1
+        return docs
+
+    def score(doc, system_prompt):
+        calls["score"] += 1
+        return 5.0
+
+    def segment(segment, **kwargs):
+        calls["segment"] += 1
+        return f"Segment of {segment}"
+
+    def opening_and_conclusion(system_prompt, segments):
+        calls["opening"] += 1
+        if fail_opening["on"]:
+            raise TimeoutError("read timed out")
+        return "Opening", "Conclusion"
+
+    monkeypatch.setattr(workflow_builder, "remove_duplicate_documents", dedup)
+    monkeypatch.setattr(workflow_builder, "get_most_aligned_documents", lambda documents, **kwargs: documents)
+    monkeypatch.setattr(workflow_builder, "get_score", score)
+    monkeypatch.setattr(workflow_builder, "select_highlight", lambda docs, system_prompt: 0)
+    monkeypatch.setattr(workflow_builder, "extract_text_from_paper", lambda doc: doc.title)
+    monkeypatch.setattr(workflow_builder, "extract_text_from_web_article", lambda doc: doc.title)
+    monkeypatch.setattr(workflow_builder, "generate_highlight_segment", segment)
+    monkeypatch.setattr(workflow_builder, "generate_report_segment", segment)
+    monkeypatch.setattr(workflow_builder, "generate_opening_and_conclusion", opening_and_conclusion)
+    monkeypatch.setattr(workflow_builder, "markdown_string_to_pdf", lambda markdown_string: None)
+
+    papers, articles = [make_document(1, "paper")], [make_document(2), make_document(3)]
+    run_kwargs = dict(output_folder_md=str(tmp_path), output_folder_pdf=str(tmp_path), runs_dir=str(tmp_path / "runs"))
+
+    with pytest.raises(TimeoutError):
+        workflow_builder.workflow_execution(papers, articles, run_id="nightly", **run_kwargs)
+    status = RunStore("nightly", root=str(tmp_path / "runs")).status()
+    assert (status["status"], status["failed_node"]) == ("failed", "assemble_report")
+
+    fail_opening["on"] = False
+    final_state = workflow_builder.workflow_execution([], [], run_id="nightly", resume=True, **run_kwargs)
+
+    assert "Opening" in final_state["final_report"]
+    assert calls == {"dedup": 1, "score": 3, "segment": 3, "opening": 2}
+    assert RunStore("nightly", root=str(tmp_path / "runs")).status()["status"] == "completed"
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="report_generator_utils needs Python 3.12")
+def test_resume_retries_only_failed_branch(tmp_path, monkeypatch, make_document):
+    from FCI_NewsAgents.workflows import workflow_builder
+
+    scored = []
+    failing = {"https://example.com/2"}
+
+    def score(doc, system_prompt):
+        scored.append(doc.url)
+        if doc.url in failing:
+            raise TimeoutError("read timed out")
+        return 5.0
+
+    monkeypatch.setattr(workflow_builder, "remove_duplicate_documents", lambda docs, **kwargs: docs)
+    monkeypatch.setattr(workflow_builder, "get_most_aligned_documents", lambda documents, **kwargs: documents)
+    monkeypatch.setattr(workflow_builder, "get_score", score)
+    monkeypatch.setattr(workflow_builder, "select_highlight", lambda docs, system_prompt: 0)
+    monkeypatch.setattr(workflow_builder, "extract_text_from_web_article", lambda doc: doc.title)
+    monkeypatch.setattr(workflow_builder, "generate_highlight_segment", lambda segment, **kwargs: f"Highlight {segment}")
+    monkeypatch.setattr(workflow_builder, "generate_report_segment", lambda segment, **kwargs: f"Segment {segment}")
+    monkeypatch.setattr(workflow_builder, "generate_opening_and_conclusion", lambda system_prompt, segments: ("Opening", "Conclusion"))
+    monkeypatch.setattr(workflow_builder, "markdown_string_to_pdf", lambda markdown_string: None)
+
+    articles = [make_document(i) for i in range(1, 4)]
+    run_kwargs = dict(output_folder_md=str(tmp_path), output_folder_pdf=str(tmp_path), runs_dir=str(tmp_path / "runs"))
+
+    with pytest.raises(TimeoutError):
+        workflow_builder.workflow_execution([], articles, run_id="nightly", **run_kwargs)
+
+    failing.clear()
+    final_state = workflow_builder.workflow_execution([], [], run_id="nightly", resume=True, **run_kwargs)
+
+    assert sorted(scored) == sorted([doc.url for doc in articles] + ["https://example.com/2"])
+    assert set(final_state["segments"]) == {doc.url for doc in articles}
+    assert "Highlight Document 1" in final_state["final_report"]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="report_generator_utils needs Python 3.12")
+def test_stale_highlight_is_selected_again(tmp_path, monkeypatch, make_document):
+    from FCI_NewsAgents.workflows import workflow_builder
+
+    selections = []
+
+    def select_highlight(docs, system_prompt):
+        selections.append([doc.url for doc in docs])
+        return 0
+
+    monkeypatch.setattr(workflow_builder, "remove_duplicate_documents", lambda docs, **kwargs: docs)
+    monkeypatch.setattr(workflow_builder, "get_most_aligned_documents", lambda documents, **kwargs: documents)
+    monkeypatch.setattr(workflow_builder, "get_score", lambda doc, system_prompt: 5.0)
+    monkeypatch.setattr(workflow_builder, "select_highlight", select_highlight)
+    monkeypatch.setattr(workflow_builder, "extract_text_from_web_article", lambda doc: doc.title)
+    monkeypatch.setattr(workflow_builder, "generate_highlight_segment", lambda segment, **kwargs: f"Highlight {segment}")
+    monkeypatch.setattr(workflow_builder, "generate_report_segment", lambda segment, **kwargs: f"Segment {segment}")
+    monkeypatch.setattr(workflow_builder, "generate_opening_and_conclusion", lambda system_prompt, segments: ("Opening", "Conclusion"))
+    monkeypatch.setattr(workflow_builder, "markdown_string_to_pdf", lambda markdown_string: None)
+
+    # Left by an earlier attempt of the run, for a document that is no longer selected
+    RunStore("nightly", root=str(tmp_path / "runs")).save_value("highlight_url", "https://example.com/stale")
+    articles = [make_document(i) for i in range(1, 3)]
+    final_state = workflow_builder.workflow_execution(
+        [], articles, run_id="nightly", output_folder_md=str(tmp_path), output_folder_pdf=str(tmp_path),
+        runs_dir=str(tmp_path / "runs"),
+    )
+
+    assert len(selections) == 1
+    assert "Highlight Document 1" in final_state["final_report"]
+    assert RunStore("nightly", root=str(tmp_path / "runs")).load_value("highlight_url") == articles[0].url
@@ -0,0 +1,86 @@
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 12), reason="report_generator_utils needs Python 3.12")
+
+
+def test_schedule_next_run():
+    from FCI_NewsAgents.workflows.daemon import Schedule
+
+    now = datetime(2025, 12, 18, 12, 0)
+    schedule = Schedule(["18:00", "06:30"])
+    assert schedule.next_run(now) == datetime(2025, 12, 18, 18, 0)
+    assert schedule.next_run(datetime(2025, 12, 18, 18, 0)) == datetime(2025, 12, 19, 6, 30)
+
+    schedule = Schedule(["06:30"], interval_minutes=60)
+    assert schedule.next_run(now) == datetime(2025, 12, 18, 13, 0)
+    assert schedule.next_run(now, last_run=datetime(2025, 12, 18, 11, 30)) == datetime(2025, 12, 18, 12, 30)
+    # A run missed while another one was in progress is not replayed in a burst
+    assert schedule.next_run(now, last_run=datetime(2025, 12, 18, 6, 0)) == now
+
+    assert Schedule().next_run(now) is None
+    with pytest.raises(ValueError):
+        Schedule(["6h30"])
+    with pytest.raises(ValueError):
+        Schedule(interval_minutes=0)
+
+
+def test_http_trigger_reuses_warm_workflow(tmp_path, monkeypatch):
+    from FCI_NewsAgents.workflows import daemon as daemon_module
+    from FCI_NewsAgents.workflows.pipeline import PipelineResult
+
+    release = threading.Event()
+    runs = []
+
+    def run_pipeline(run_id, resume, streaming, workflow_manager, **kwargs):
+        runs.append((run_id, resume, streaming, workflow_manager))
+        release.wait(5)
+        return PipelineResult(run_id=run_id, trace_id="trace", articles=1, papers=2, total_seconds=0.1)
+
+    monkeypatch.setattr(daemon_module, "run_pipeline", run_pipeline)
+    monkeypatch.setattr(daemon_module, "get_query_embeddings", lambda query_strings: [[1.0]])
+
+    daemon = daemon_module.NewsAgentsDaemon(
+        output_folder_md=str(tmp_path),
+        output_folder_pdf=str(tmp_path),
+        metrics_path=str(tmp_path),
+        trace_path=str(tmp_path),
+        runs_dir=str(tmp_path / "runs"),
+        port=0,
+    )
+    daemon.start()
+    try:
+        base_url = f"http://127.0.0.1:{daemon.port}"
+        assert requests.get(f"{base_url}/health", timeout=5).json() == {"status": "ok"}
+
+        status_code, answer = daemon_module.trigger_run("127.0.0.1", daemon.port, streaming=True)
+        assert status_code == 202
+        # Runs never overlap
+        assert daemon_module.trigger_run("127.0.0.1", daemon.port)[0] == 409
+        assert requests.get(f"{base_url}/status", timeout=5).json()["current_run"]["run_id"] == answer["run_id"]
+
+        release.set()
+        while daemon.is_running():
+            time.sleep(0.01)
+        assert daemon.status()["last_run"]["status"] == "completed"
+
+        assert daemon_module.trigger_run("127.0.0.1", daemon.port)[0] == 202
+        while daemon.is_running():
+            time.sleep(0.01)
+        assert requests.get(f"{base_url}/runs/missing", timeout=5).status_code == 404
+        # A run ID is never a path
+        assert daemon_module.trigger_run("127.0.0.1", daemon.port, resume="../../escaped")[0] == 400
+        assert not (tmp_path.parent / "escaped").exists()
+    finally:
+        daemon.stop()
+
+    assert [(streaming, manager) for _, _, streaming, manager in runs] == [(True, daemon.workflow_manager), (False, daemon.workflow_manager)]
+    assert runs[0][3] is not None
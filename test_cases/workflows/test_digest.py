@@ -0,0 +1,63 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 12), reason="report_generator_utils needs Python 3.12")
+
+from FCI_NewsAgents.core.config import DigestConfig
+from FCI_NewsAgents.prompts.get_prompts import get_generation_prompt, get_pointwise_guardrails_prompt
+from FCI_NewsAgents.services.document_repository.repository import DocumentRepository
+
+
+def test_digest_period():
+    from FCI_NewsAgents.workflows.digest import digest_period
+
+    assert digest_period("weekly", date(2025, 12, 21)) == (date(2025, 12, 15), date(2025, 12, 21))
+    assert digest_period("monthly", date(2025, 12, 31)) == (date(2025, 12, 2), date(2025, 12, 31))
+    with pytest.raises(ValueError):
+        digest_period("yearly", date(2025, 12, 31))
+
+
+def test_digest_reuses_stored_segments(tmp_path: Path, monkeypatch, make_document):
+    from FCI_NewsAgents.workflows import digest
+
+    scoring_prompt = get_pointwise_guardrails_prompt()
+    generation_prompt = get_generation_prompt()
+    repository = DocumentRepository(tmp_path / "documents.sqlite")
+    # Three daily runs of the week, and one of the week before
+    for day, i in [(15, 1), (16, 2), (17, 3), (8, 4)]:
+        repository.save_documents([make_document(i), make_document(10 + i, "paper")], seen=date(2025, 12, day))
+        repository.save_score(make_document(i).url, scoring_prompt, 5 + i)
+        repository.save_score(make_document(10 + i).url, scoring_prompt, 4.5 + i)
+    repository.save_segment(make_document(1).url, "report", generation_prompt, "Segment 1")
+    repository.save_segment(make_document(2).url, "highlight", generation_prompt, "Highlight 2")
+    repository.save_segment(make_document(12).url, "report", generation_prompt, "Segment 12")
+    repository.save_segment(make_document(4).url, "report", generation_prompt, "Segment 4")
+    # Scored, but in no daily report: no segment to reuse
+    repository.save_score(make_document(3).url, scoring_prompt, 10)
+
+    calls = []
+
+    def select_highlight(docs, system_prompt):
+        calls.append(("select_highlight", [doc.title for doc in docs]))
+        return [doc.title for doc in docs].index("Document 1")
+
+    def generate_opening_and_conclusion(system_prompt, segments):
+        calls.append(("generate_opening_and_conclusion", segments))
+        return "Opening", "Conclusion"
+
+    monkeypatch.setattr(digest, "select_highlight", select_highlight)
+    monkeypatch.setattr(digest, "generate_opening_and_conclusion", generate_opening_and_conclusion)
+
+    report = digest.build_digest(repository, date(2025, 12, 15), date(2025, 12, 21), DigestConfig(MAX_ARTICLES=5))
+
+    # Only the highlight selection and the opening and conclusion are generated
+    assert calls == [
+        ("select_highlight", ["Document 2", "Document 12", "Document 1"]),
+        ("generate_opening_and_conclusion", ["Segment 1", "Highlight 2", "Segment 12"]),
+    ]
+    assert report.startswith("# Bản tin công nghệ tổng hợp - 15/12/2025 - 21/12/2025")
+    assert "Document 3" not in report and "Segment 4" not in report
+    repository.close()
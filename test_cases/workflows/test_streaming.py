@@ -0,0 +1,122 @@
+import sys
+import time
+from dataclasses import replace
+
+import pytest
+
+from FCI_NewsAgents.core.config import GuardrailsConfig
+from FCI_NewsAgents.workflows import streaming
+from FCI_NewsAgents.workflows.checkpointing import RunStore
+from FCI_NewsAgents.workflows.streaming import StreamingPipeline
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    calls = {"dedup": [], "align": [], "scored_at": {}}
+
+    def dedup(batch, **kwargs):
+        calls["dedup"].append(len(batch))
+        return [doc for doc in batch if not doc.url.endswith("/0")]
+
+    def align(documents, **kwargs):
+        calls["align"].append(len(documents))
+        return documents
+
+    def score(doc, system_prompt):
+        calls["scored_at"][doc.url] = time.monotonic()
+        return float(doc.url.rsplit("/", 1)[1])
+
+    monkeypatch.setattr(streaming, "remove_duplicate_documents", dedup)
+    monkeypatch.setattr(streaming, "get_most_aligned_documents", align)
+    monkeypatch.setattr(streaming, "get_score", score)
+    return calls
+
+
+def test_scoring_overlaps_scraping(tmp_path, stages, make_document):
+    config = replace(GuardrailsConfig(), STREAM_QUEUE_SIZE=4, STREAM_BATCH_SIZE=3, STREAM_BATCH_WAIT_SECONDS=0.05, MAX_PARALLEL_BRANCHES=2)
+    slow_source_done = {}
+
+    def fast_source():
+        yield from (make_document(i) for i in range(10))
+
+    def slow_source():
+        for i in range(10, 13):
+            time.sleep(0.1)
+            yield make_document(i)
+        slow_source_done["at"] = time.monotonic()
+
+    store = RunStore("stream", root=str(tmp_path))
+    result = StreamingPipeline(config, run_store=store).run([fast_source, slow_source])
+
+    assert len(result.raw_documents) == 13
+    assert {doc.url for doc in result.aligned_documents} == {make_document(i).url for i in range(1, 13)}
+    assert result.scores[make_document(12).url] == 12.0
+    assert max(stages["dedup"]) <= 3 and sum(stages["dedup"]) == 13
+    # The fast source is scored while the slow one is still scraping
+    assert stages["scored_at"][make_document(1).url] < slow_source_done["at"]
+
+    assert len(store.load_documents("raw")) == 13
+    assert len(store.load_documents("aligned")) == 12
+    assert store.load_text("scores", make_document(5).url) == "5.0"
+
+
+def test_stage_error_aborts_pipeline(tmp_path, stages, monkeypatch, make_document):
+    def failing_score(doc, system_prompt):
+        time.sleep(0.2)
+        raise TimeoutError("read timed out")
+
+    monkeypatch.setattr(streaming, "get_score", failing_score)
+    config = replace(GuardrailsConfig(), STREAM_QUEUE_SIZE=2, STREAM_BATCH_WAIT_SECONDS=0.01, MAX_PARALLEL_BRANCHES=2)
+
+    def slow_source():
+        for i in range(1, 50):
+            time.sleep(0.02)
+            yield make_document(i)
+
+    # Scoring fails while documents are still being scraped: nothing to resume from
+    store = RunStore("aborted", root=str(tmp_path))
+    with pytest.raises(TimeoutError):
+        StreamingPipeline(config, run_store=store).run([slow_source])
+    assert not store.exists()
+
+    # Scoring fails after scraping completed: the run can be resumed by the workflow
+    store = RunStore("resumable", root=str(tmp_path))
+    with pytest.raises(TimeoutError):
+        StreamingPipeline(config, run_store=store).run([lambda: (make_document(i) for i in range(1, 3))])
+    assert store.status()["failed_node"] == "streaming"
+    assert len(store.load_documents("raw")) == 2
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="report_generator_utils needs Python 3.12")
+def test_streaming_run_shares_and_closes_its_repository(tmp_path, stages, monkeypatch, make_document):
+    from FCI_NewsAgents.workflows import pipeline
+
+    repositories, workflow_repositories = [], []
+
+    class Repository(pipeline.DocumentRepository):
+        def __init__(self, db_path):
+            super().__init__(db_path)
+            self.closed = False
+            repositories.append(self)
+
+        def close(self):
+            super().close()
+            self.closed = True
+
+    def workflow_execution(repository=None, **kwargs):
+        workflow_repositories.append(repository)
+
+    monkeypatch.setattr(pipeline, "DocumentRepository", Repository)
+    monkeypatch.setattr(pipeline, "plan_sources", lambda *args: None)
+    monkeypatch.setattr(pipeline, "print_source_plan", lambda plan: None)
+    monkeypatch.setattr(pipeline, "scraper_sources", lambda **kwargs: [lambda: (make_document(i) for i in range(1, 3))])
+    monkeypatch.setattr(pipeline, "workflow_execution", workflow_execution)
+
+    pipeline.run_pipeline(
+        output_folder_md=str(tmp_path), output_folder_pdf=str(tmp_path), metrics_path=str(tmp_path),
+        trace_path=str(tmp_path), runs_dir=str(tmp_path / "runs"), streaming=True,
+    )
+
+    # The workflow reuses the repository of the streaming stage, which is closed once the run is over
+    assert len(repositories) == 1 and workflow_repositories == repositories
+    assert repositories[0].closed